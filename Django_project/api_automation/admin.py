@@ -13,8 +13,12 @@ Django Admin 管理后台配置。
 from django.contrib import admin
 
 from .models import (
+    ApiCleanupCheckpoint,
     ApiCollection,
+    ApiContentBlob,
+    ApiDashboardRollup,
     ApiDataDriver,
+    ApiExecutionJob,
     ApiGeneratedArtifact,
     ApiProject,
     ApiTestScenario,
@@ -140,6 +144,69 @@ class ApiTestExecutionAdmin(admin.ModelAdmin):
         return qs.filter(project__owner=request.user, is_deleted=False)
 
 
+@admin.register(ApiExecutionJob)
+class ApiExecutionJobAdmin(admin.ModelAdmin):
+    """执行任务管理 -- 展示队列中任务的状态、优先级与租约信息。"""
+
+    list_display = [
+        'execution', 'project', 'status', 'priority',
+        'attempts', 'worker_id', 'lease_expires_at', 'created_time'
+    ]
+    list_filter = ['status', 'project']
+    search_fields = ['execution__name', 'worker_id']
+    readonly_fields = [
+        'created_time', 'updated_time', 'started_time', 'finished_time',
+        'heartbeat_time', 'lease_expires_at'
+    ]
+
+    def get_queryset(self, request):
+        """按项目归属过滤执行任务。"""
+        qs = super().get_queryset(request)
+        if request.user.is_superuser:
+            return qs
+        return qs.filter(project__owner=request.user)
+
+
+@admin.register(ApiDashboardRollup)
+class ApiDashboardRollupAdmin(admin.ModelAdmin):
+    """仪表盘日汇总管理 -- 只读查看按天预聚合的结果计数。"""
+
+    list_display = [
+        'stat_date', 'project', 'environment', 'collection',
+        'module', 'status', 'result_count', 'response_time_sum'
+    ]
+    list_filter = ['status', 'stat_date', 'project']
+    readonly_fields = ['updated_time']
+
+    def get_queryset(self, request):
+        """按项目归属过滤汇总行。"""
+        qs = super().get_queryset(request)
+        if request.user.is_superuser:
+            return qs
+        return qs.filter(project__owner=request.user)
+
+
+@admin.register(ApiContentBlob)
+class ApiContentBlobAdmin(admin.ModelAdmin):
+    """内容存储管理 -- 查看请求/响应体对象的大小与引用计数。"""
+
+    list_display = ['digest', 'encoding', 'size', 'stored_size', 'ref_count', 'created_time']
+    list_filter = ['encoding']
+    search_fields = ['digest']
+    exclude = ['data']
+    readonly_fields = ['digest', 'encoding', 'size', 'stored_size', 'ref_count', 'created_time']
+
+
+@admin.register(ApiCleanupCheckpoint)
+class ApiCleanupCheckpointAdmin(admin.ModelAdmin):
+    """数据清理检查点管理 -- 查看分批清理任务的进度。"""
+
+    list_display = ['name', 'status', 'stage', 'last_pk', 'cutoff_time', 'started_time', 'finished_time']
+    list_filter = ['status']
+    search_fields = ['name']
+    readonly_fields = ['updated_time']
+
+
 @admin.register(ApiTestReport)
 class ApiTestReportAdmin(admin.ModelAdmin):
     """测试报告管理 -- 展示报告与执行记录的关联。"""
@@ -18,6 +18,7 @@ class ExecutionStatusConsumer(AsyncWebsocketConsumer):
     支持的消息类型:
     - status: 执行状态更新 (pending/running/completed/failed/cancelled)
     - test_result: 单个测试用例结果
+    - test_results: 批量测试用例结果（节流广播器攒批发送）
     - log: 执行日志
     - variable_extracted: 变量提取通知
     - assertion_result: 断言结果
@@ -137,6 +138,13 @@ class ExecutionStatusConsumer(AsyncWebsocketConsumer):
             'data': event.get('data')
         }))
 
+    async def test_results(self, event):
+        """发送批量测试结果"""
+        await self.send(text_data=json.dumps({
+            'type': 'test_results',
+            'data': event.get('data')
+        }))
+
     async def execution_log(self, event):
         """发送执行日志"""
         await self.send(text_data=json.dumps({
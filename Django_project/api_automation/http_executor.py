@@ -9,11 +9,16 @@ HTTP执行器 - API视图层
 - POST /batch/        - 批量执行多个HTTP请求
 - GET  /history/      - 获取执行历史记录
 - POST /cancel/{id}/  - 取消正在执行的请求
+- GET  /pool-stats/   - 获取共享连接池统计信息
 """
 
+import asyncio
 import json
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings as django_settings
 
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
@@ -25,6 +30,8 @@ from rest_framework.response import Response
 
 from api_automation.models import ApiTestExecution, ApiTestResult
 from api_automation.services.assertion_engine import AssertionEngine
+from api_automation.services.async_http_executor import ASYNC_HTTP_ENABLED, AsyncHttpExecutor
+from api_automation.services.connection_pool_registry import connection_pool_registry
 from api_automation.services.http_executor import HttpExecutor
 
 logger = logging.getLogger(__name__)
@@ -88,13 +95,19 @@ def execute_http_request(request: Request):
         # 创建执行器并发送请求
         timeout = settings.get('timeout', 30)
         verify_ssl = settings.get('verify_ssl', True)
-        executor = HttpExecutor(timeout=timeout, verify_ssl=verify_ssl)
+        executor = HttpExecutor(
+            timeout=timeout, verify_ssl=verify_ssl,
+            proxy=settings.get('proxy'), pool_registry=connection_pool_registry
+        )
 
         start_time = time.time()
-        response = executor.execute_request(
-            method=method, url=url, headers=headers,
-            params=params, body=body, global_variables=variables
-        )
+        try:
+            response = executor.execute_request(
+                method=method, url=url, headers=headers,
+                params=params, body=body, global_variables=variables
+            )
+        finally:
+            executor.close()
         execution_time = time.time() - start_time
 
         # 构建响应数据
@@ -185,7 +198,21 @@ def _parse_cookies(headers: dict) -> dict:
 @swagger_auto_schema(
     method='POST',
     tags=['HTTP Executor'],
-    operation_description='批量执行HTTP请求'
+    operation_description='批量执行HTTP请求',
+    request_body=openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            'requests': openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                items=openapi.Schema(type=openapi.TYPE_OBJECT),
+                description='请求配置列表'
+            ),
+            'concurrency': openapi.Schema(
+                type=openapi.TYPE_INTEGER,
+                description='并发数，默认1（逐条执行），上限由 API_HTTP_BATCH_MAX_CONCURRENCY 控制'
+            ),
+        }
+    )
 )
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -193,19 +220,43 @@ def execute_batch_requests(request: Request):
     """
     批量执行HTTP请求
 
-    接受请求数组，逐条执行并返回汇总结果。
-    单条请求失败不影响后续请求的执行。
+    接受请求数组并返回汇总结果，结果顺序与请求顺序一致。
+    concurrency > 1 时优先在单个事件循环中用 AsyncHttpExecutor 并发执行
+    （需要安装 httpx，且各条请求的超时、SSL 校验一致并且未设置代理），
+    否则使用有界线程池。两种方式下每条请求都使用独立的 Cookie，
+    底层TCP/TLS连接来自共享连接池。单条请求失败不影响其他请求的执行。
     """
     try:
         requests_data = request.data.get('requests', [])
-        results = []
+        concurrency = _resolve_batch_concurrency(request.data.get('concurrency', 1))
 
-        for i, req_data in enumerate(requests_data):
+        def run(index: int, req_data: dict) -> dict:
+            start_time = time.time()
             try:
                 result = execute_single_request(req_data)
-                results.append({'index': i, 'success': True, 'data': result})
+                result['execution_time'] = round((time.time() - start_time) * 1000)
+                return {'index': index, 'success': True, 'data': result}
             except Exception as e:
-                results.append({'index': i, 'success': False, 'error': str(e)})
+                return {'index': index, 'success': False, 'error': str(e)}
+
+        batch_start = time.time()
+        async_options = None
+        if concurrency > 1 and len(requests_data) > 1:
+            async_options = _batch_async_options(requests_data)
+        if concurrency <= 1 or len(requests_data) <= 1:
+            results = [run(i, req_data) for i, req_data in enumerate(requests_data)]
+        elif async_options is not None:
+            results = asyncio.run(
+                _execute_batch_async(requests_data, concurrency, *async_options)
+            )
+        else:
+            with ThreadPoolExecutor(
+                max_workers=min(concurrency, len(requests_data)),
+                thread_name_prefix='http-batch',
+            ) as pool:
+                results = list(pool.map(
+                    run, range(len(requests_data)), requests_data
+                ))
 
         success_count = sum(1 for r in results if r['success'])
 
@@ -216,6 +267,8 @@ def execute_batch_requests(request: Request):
                 'total': len(requests_data),
                 'success_count': success_count,
                 'failed_count': len(requests_data) - success_count,
+                'concurrency': concurrency,
+                'total_time': round((time.time() - batch_start) * 1000),
                 'results': results
             }
         })
@@ -227,6 +280,89 @@ def execute_batch_requests(request: Request):
         )
 
 
+def _batch_async_options(requests_data: list):
+    """
+    判断批量请求能否走异步执行路径
+
+    异步执行器的超时与SSL校验作用于整个连接池，且不支持代理，
+    因此只有所有请求的这两项设置一致且均未设置代理时才使用。
+
+    Args:
+        requests_data: 请求配置列表
+
+    Returns:
+        (timeout, verify_ssl) 元组；不能走异步路径时返回 None
+    """
+    if not ASYNC_HTTP_ENABLED or not getattr(django_settings, 'API_HTTP_BATCH_ASYNC_ENABLED', True):
+        return None
+
+    options = set()
+    for req_data in requests_data:
+        if not isinstance(req_data, dict):
+            return None
+        item_settings = req_data.get('settings') or {}
+        if not isinstance(item_settings, dict) or item_settings.get('proxy'):
+            return None
+        options.add((item_settings.get('timeout', 30), item_settings.get('verify_ssl', True)))
+    return options.pop() if len(options) == 1 else None
+
+
+async def _execute_batch_async(
+    requests_data: list, concurrency: int, timeout, verify_ssl
+) -> list:
+    """
+    在单个事件循环中并发执行批量请求
+
+    Args:
+        requests_data: 请求配置列表
+        concurrency: 同时在途的最大请求数
+        timeout: 请求超时时间（秒）
+        verify_ssl: 是否验证SSL证书
+
+    Returns:
+        与输入顺序一致的结果列表，结构与线程池路径相同
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async with AsyncHttpExecutor(
+        timeout=timeout, verify_ssl=verify_ssl,
+        max_connections=concurrency, isolate_cookies=True,
+    ) as executor:
+
+        async def run(index: int, req_data: dict) -> dict:
+            async with semaphore:
+                start_time = time.time()
+                try:
+                    response = await executor.execute_request(**_request_kwargs(req_data))
+                    result = _response_data(response)
+                    result['execution_time'] = round((time.time() - start_time) * 1000)
+                    return {'index': index, 'success': True, 'data': result}
+                except Exception as e:
+                    return {'index': index, 'success': False, 'error': str(e)}
+
+        return list(await asyncio.gather(
+            *(run(i, req_data) for i, req_data in enumerate(requests_data))
+        ))
+
+
+def _resolve_batch_concurrency(value) -> int:
+    """
+    解析批量执行的并发数，限制在 [1, API_HTTP_BATCH_MAX_CONCURRENCY] 区间
+
+    Args:
+        value: 请求中传入的并发数
+
+    Returns:
+        有效的并发数
+    """
+    max_concurrency = getattr(django_settings, 'API_HTTP_BATCH_MAX_CONCURRENCY', 20)
+    try:
+        concurrency = int(value)
+    except (TypeError, ValueError):
+        concurrency = 1
+    return max(1, min(concurrency, max_concurrency))
+
+
 def execute_single_request(request_data: dict) -> dict:
     """
     执行单个HTTP请求的内部函数
@@ -239,24 +375,40 @@ def execute_single_request(request_data: dict) -> dict:
     Returns:
         响应数据字典
     """
-    method = request_data.get('method', 'GET')
-    url = request_data.get('url', '')
-    headers = request_data.get('headers', {})
-    params = request_data.get('params', {})
-    body = request_data.get('body')
-    variables = request_data.get('variables', {})
     settings = request_data.get('settings', {})
 
+    timeout = settings.get('timeout', 30)
+    verify_ssl = settings.get('verify_ssl', True)
+    proxy = settings.get('proxy')
+
+    # 每条请求使用独立的会话（Cookie互不影响），底层连接来自进程级共享连接池
     executor = HttpExecutor(
-        timeout=settings.get('timeout', 30),
-        verify_ssl=settings.get('verify_ssl', True)
+        timeout=timeout, verify_ssl=verify_ssl,
+        proxy=proxy, pool_registry=connection_pool_registry
     )
 
-    response = executor.execute_request(
-        method=method, url=url, headers=headers,
-        params=params, body=body, global_variables=variables
-    )
+    try:
+        response = executor.execute_request(**_request_kwargs(request_data))
+    finally:
+        executor.close()
+
+    return _response_data(response)
 
+
+def _request_kwargs(request_data: dict) -> dict:
+    """将请求配置转换为 execute_request 的关键字参数"""
+    return {
+        'method': request_data.get('method', 'GET'),
+        'url': request_data.get('url', ''),
+        'headers': request_data.get('headers', {}),
+        'params': request_data.get('params', {}),
+        'body': request_data.get('body'),
+        'global_variables': request_data.get('variables', {}),
+    }
+
+
+def _response_data(response) -> dict:
+    """将 HttpResponse 转换为接口返回的响应数据字典"""
     return {
         'status_code': response.status_code,
         'headers': response.headers,
@@ -332,14 +484,13 @@ def save_execution_history(user, execution_data: dict):
             status_record = 'FAILED'
             error_message = '断言失败'
 
-        # 处理响应体（区分JSON和文本）
+        # 响应体存入内容寻址存储，记录只保存摘要（序列化器按类型还原为JSON或文本）
+        from api_automation.services.blob_store import blob_store
+
         response_body_raw = response_data.get('body', {})
-        if isinstance(response_body_raw, (dict, list)):
-            response_body = response_body_raw
-            response_body_text = None
-        else:
-            response_body = {}
-            response_body_text = response_body_raw
+        response_body_hash = ''
+        if response_body_raw not in (None, '', {}, []):
+            response_body_hash = blob_store.put_json(response_body_raw)
 
         execution_record = ApiHttpExecutionRecord.objects.create(
             project=None,
@@ -364,8 +515,9 @@ def save_execution_history(user, execution_data: dict):
             response_status=status_code,
             response_status_text='',
             response_headers=response_data.get('headers', {}),
-            response_body=response_body,
-            response_body_text=response_body_text,
+            response_body={},
+            response_body_text=None,
+            response_body_hash=response_body_hash,
             response_size=response_data.get('body_size', 0),
             response_encoding='utf-8',
             status=status_record,
@@ -456,4 +608,24 @@ def cancel_execution(request: Request, execution_id: str):
         return Response(
             {'code': 500, 'message': f'取消执行失败: {str(e)}', 'data': None},
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+        )
+
+
+@swagger_auto_schema(
+    method='GET',
+    tags=['HTTP Executor'],
+    operation_description='获取共享连接池统计信息'
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_connection_pool_stats(request: Request):
+    """
+    获取共享连接池统计信息
+
+    返回连接池数量、命中次数、新建连接数和空闲回收次数。
+    """
+    return Response({
+        'code': 200,
+        'message': 'success',
+        'data': connection_pool_registry.get_stats()
+    })
@@ -0,0 +1,50 @@
+"""
+Django 管理命令：回填仪表盘日汇总
+
+用法：
+    python manage.py backfill_dashboard_rollups
+    python manage.py backfill_dashboard_rollups --project 1 --project 2
+    python manage.py backfill_dashboard_rollups --rebuild
+
+新执行结束时会自动累加到汇总表；本命令用于上线后处理历史执行，
+以及补齐累加失败（如工作进程崩溃）的执行。--rebuild 会先清空汇总再全部重算。
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api_automation.services.dashboard_rollup_service import DashboardRollupService
+
+
+class Command(BaseCommand):
+    help = '回填仪表盘日汇总'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--project',
+            type=int,
+            action='append',
+            dest='project_ids',
+            help='只处理指定项目（可重复指定）',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=getattr(settings, 'API_DASHBOARD_ROLLUP_BATCH_SIZE', 500),
+            help='每批处理的执行数（默认：API_DASHBOARD_ROLLUP_BATCH_SIZE）',
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='清空已有汇总后按当前测试结果重新计算',
+        )
+
+    def handle(self, *args, **options):
+        service = DashboardRollupService(batch_size=options['batch_size'])
+        project_ids = options['project_ids']
+
+        if options['rebuild']:
+            count = service.rebuild(project_ids)
+        else:
+            count = service.backfill(project_ids)
+
+        self.stdout.write(self.style.SUCCESS(f'已汇总 {count} 个执行记录'))
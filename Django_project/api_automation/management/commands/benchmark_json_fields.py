@@ -0,0 +1,128 @@
+"""
+Django 管理命令：测量测试结果列表的 JSON 反序列化耗时
+
+用法：
+    python manage.py benchmark_json_fields
+    python manage.py benchmark_json_fields --rows 10000 --repeat 3
+
+在事务中写入一批模拟测试结果（结束时回滚，不保留数据），分别测量：
+    - 全量解析：读取全部列并访问所有 JSON 字段（等同于逐行 json.loads 的旧行为）
+    - 延迟解析：读取全部列，只访问结果列表序列化器输出的 JSON 字段
+    - 延迟解析 + defer 预设：按 ApiTestResult.LIST_DEFERRED_FIELDS 不读取大字段
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from api_automation.models import (
+    ApiProject,
+    ApiTestCase,
+    ApiTestEnvironment,
+    ApiTestExecution,
+    ApiTestResult,
+    JSONField,
+)
+
+# 结果列表序列化器（ApiTestResultSerializer）输出的 JSON 字段
+LISTED_JSON_FIELDS = (
+    'request_headers', 'request_body', 'response_headers', 'response_body', 'assertion_results',
+)
+
+
+class Command(BaseCommand):
+    help = '测量测试结果列表的 JSON 反序列化耗时（数据在事务中生成并回滚）'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=10000,
+            help='模拟的测试结果行数（默认：10000）',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=3,
+            help='每种方式的重复次数，取最短耗时（默认：3）',
+        )
+
+    def handle(self, *args, **options):
+        rows = max(1, options['rows'])
+        repeat = max(1, options['repeat'])
+        json_fields = [
+            field.attname for field in ApiTestResult._meta.concrete_fields
+            if isinstance(field, JSONField)
+        ]
+
+        with transaction.atomic():
+            execution = self._create_results(rows)
+            queryset = ApiTestResult.objects.filter(execution=execution)
+
+            timings = [
+                ('全量解析', self._measure(queryset, json_fields, repeat)),
+                ('延迟解析', self._measure(queryset, LISTED_JSON_FIELDS, repeat)),
+                ('延迟解析 + defer 预设', self._measure(
+                    queryset.defer(*ApiTestResult.LIST_DEFERRED_FIELDS), LISTED_JSON_FIELDS, repeat
+                )),
+            ]
+            transaction.set_rollback(True)
+
+        baseline = timings[0][1]
+        self.stdout.write(f'{rows} 行测试结果，每种方式取 {repeat} 次中的最短耗时：')
+        for label, seconds in timings:
+            self.stdout.write(f'  {label}: {seconds * 1000:.1f} ms ({seconds / baseline:.1%})')
+
+    @staticmethod
+    def _measure(queryset, accessed_fields, repeat):
+        """读取查询集全部行并访问指定 JSON 字段，返回最短耗时（秒）。"""
+        best = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for result in queryset.iterator(chunk_size=2000):
+                for field in accessed_fields:
+                    getattr(result, field)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    @staticmethod
+    def _create_results(rows):
+        """写入模拟的项目、执行和测试结果（失败结果保存完整请求/响应）。"""
+        project = ApiProject.objects.create(name='benchmark')
+        environment = ApiTestEnvironment.objects.create(
+            name='benchmark', project=project, base_url='http://example.com',
+        )
+        test_case = ApiTestCase.objects.create(
+            name='benchmark', project=project, method='POST', url='/orders',
+        )
+        execution = ApiTestExecution.objects.create(
+            name='benchmark', project=project, environment=environment, status='COMPLETED',
+        )
+
+        headers = {f'X-Header-{index}': 'v' * 40 for index in range(20)}
+        body = {'items': [{'sku': index, 'name': f'商品{index}', 'qty': 1} for index in range(30)]}
+        full = {'url': 'http://example.com/orders', 'method': 'POST', 'headers': headers}
+        now = timezone.now()
+
+        ApiTestResult.objects.bulk_create(
+            (
+                ApiTestResult(
+                    execution=execution, test_case=test_case, status='FAILED',
+                    response_status=500, response_time=120, start_time=now,
+                    request_headers={'Content-Type': 'application/json'},
+                    response_headers={'Content-Type': 'application/json'},
+                    request_summary={'method': 'POST', 'headers_count': len(headers)},
+                    response_summary={'status_code': 500, 'content_length': 2048},
+                    request_full=full,
+                    response_full={'status_code': 500, 'headers': headers, 'body': body},
+                    error_info={'type': 'AssertionError', 'message': 'status != 200'},
+                    assertion_results=[{'type': 'status_code', 'passed': False}],
+                    extracted_variables={'order_id': index},
+                )
+                for index in range(rows)
+            ),
+            batch_size=1000,
+        )
+        return execution
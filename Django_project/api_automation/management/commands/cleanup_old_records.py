@@ -3,13 +3,19 @@ Django 管理命令：自动清理过期的HTTP执行记录
 
 用法：
     python manage.py cleanup_old_records
+    python manage.py cleanup_old_records --days 30 --batch-size 500 --sleep-ms 200
 
 可通过 cron 或 Windows 计划任务设置每天凌晨0点执行
+
+记录按主键顺序分批删除，进度保存在检查点中；命令被中断后再次执行会
+从断点继续（沿用首次执行时的截止时间），--restart 可丢弃断点重新开始。
 """
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import timedelta
 from api_automation.models import ApiHttpExecutionRecord
+from api_automation.services.data_cleanup_service import RetentionCleanup, STAGE_HTTP_RECORDS
 
 
 class Command(BaseCommand):
@@ -27,39 +33,59 @@ class Command(BaseCommand):
             action='store_true',
             help='仅显示将要删除的记录数量，不实际删除',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=getattr(settings, 'API_CLEANUP_BATCH_SIZE', 1000),
+            help='每批删除的记录数（默认：API_CLEANUP_BATCH_SIZE）',
+        )
+        parser.add_argument(
+            '--sleep-ms',
+            type=int,
+            default=getattr(settings, 'API_CLEANUP_SLEEP_MS', 100),
+            help='批间休眠毫秒数（默认：API_CLEANUP_SLEEP_MS）',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='丢弃未完成的清理进度，重新计算截止时间',
+        )
 
     def handle(self, *args, **options):
         days = options['days']
         dry_run = options['dry_run']
 
-        # 计算截止日期
-        cutoff_date = timezone.now() - timedelta(days=days)
-
-        # 查询需要删除的记录
-        old_records = ApiHttpExecutionRecord.objects.filter(
-            created_time__lt=cutoff_date
-        )
-
-        count = old_records.count()
-
-        if count == 0:
-            self.stdout.write(self.style.WARNING(f'没有找到{days}天前的执行记录'))
-            return
-
         if dry_run:
+            # 计算截止日期
+            cutoff_date = timezone.now() - timedelta(days=days)
+            count = ApiHttpExecutionRecord.objects.filter(
+                created_time__lt=cutoff_date
+            ).count()
             self.stdout.write(
                 self.style.WARNING(f'[Dry Run] 将要删除 {count} 条执行记录（{days}天前）')
             )
             return
 
-        # 确认删除
-        self.stdout.write(f'准备删除 {count} 条执行记录（{days}天前）...')
+        self.stdout.write(f'开始分批删除{days}天前的执行记录...')
 
-        # 批量删除
-        deleted_count, _ = old_records.delete()
+        # 分批删除（同时释放响应体引用）
+        cleanup = RetentionCleanup(
+            batch_size=options['batch_size'], sleep_ms=options['sleep_ms']
+        )
+        result = cleanup.run(
+            'cleanup_old_records', days,
+            stages=[STAGE_HTTP_RECORDS], restart=options['restart'],
+        )
 
+        if result['resumed']:
+            self.stdout.write(
+                self.style.WARNING(f"从上次中断处继续（截止时间 {result['cutoff_date']}）")
+            )
         self.stdout.write(
-            self.style.SUCCESS(f'成功删除 {deleted_count} 条执行记录')
+            self.style.SUCCESS(
+                f"成功删除 {result['http_records_deleted']} 条执行记录，"
+                f"本次耗时 {result['elapsed_seconds']} 秒（{result['rows_per_second']} 行/秒）"
+            )
         )
 
         # 输出统计信息
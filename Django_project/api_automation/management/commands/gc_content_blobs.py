@@ -0,0 +1,33 @@
+"""
+Django 管理命令：回收无引用的内容存储对象
+
+用法：
+    python manage.py gc_content_blobs
+    python manage.py gc_content_blobs --grace-minutes 120
+
+正常删除路径会按引用计数释放内容；外键级联删除等绕过业务代码的删除由本命令
+按实际引用重算计数并删除孤立对象。可与 cleanup_old_records 一起定时执行。
+"""
+from django.core.management.base import BaseCommand
+
+from api_automation.services.blob_store import blob_store
+
+
+class Command(BaseCommand):
+    help = '回收无引用的内容存储对象'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-minutes',
+            type=int,
+            default=60,
+            help='新写入对象的保护期（分钟），避免删除尚未保存业务行的内容（默认：60）',
+        )
+
+    def handle(self, *args, **options):
+        result = blob_store.sweep(grace_minutes=options['grace_minutes'])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"已修正 {result['updated']} 个引用计数，删除 {result['deleted']} 个孤立对象"
+            )
+        )
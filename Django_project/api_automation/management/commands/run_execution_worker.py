@@ -0,0 +1,115 @@
+"""
+Django 管理命令：启动批量执行队列工作进程
+
+用法：
+    python manage.py run_execution_worker
+    python manage.py run_execution_worker --threads 4 --processes 2
+    python manage.py run_execution_worker --once
+
+视图层只负责将执行记录入队，实际执行由本命令启动的工作进程完成。
+可同时在多台机器上运行，任务通过数据库租约保证只被一个工作线程执行。
+"""
+import multiprocessing
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from api_automation.services.execution_queue import ExecutionWorker
+
+
+def _install_stop_handlers(stop_event):
+    """收到 SIGINT/SIGTERM 时设置停止信号，当前任务执行完后退出"""
+    def handle_signal(signum, frame):
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, handle_signal)
+    signal.signal(signal.SIGTERM, handle_signal)
+
+
+def _run_worker_process(threads, poll_interval):
+    """子进程入口：运行一个多线程工作者直到收到停止信号"""
+    stop_event = threading.Event()
+    _install_stop_handlers(stop_event)
+    ExecutionWorker(threads=threads, poll_interval=poll_interval).run(stop_event)
+
+
+class Command(BaseCommand):
+    help = '启动批量执行队列工作进程'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=getattr(settings, 'API_EXECUTION_WORKER_THREADS', 2),
+            help='每个工作进程的工作线程数（默认：API_EXECUTION_WORKER_THREADS）',
+        )
+        parser.add_argument(
+            '--processes',
+            type=int,
+            default=getattr(settings, 'API_EXECUTION_WORKER_PROCESSES', 1),
+            help='工作进程数（默认：API_EXECUTION_WORKER_PROCESSES）',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=getattr(settings, 'API_EXECUTION_QUEUE_POLL_INTERVAL', 2),
+            help='队列为空时的轮询间隔秒数（默认：API_EXECUTION_QUEUE_POLL_INTERVAL）',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='处理完当前队列中的任务后退出（适合由计划任务调用）',
+        )
+
+    def handle(self, *args, **options):
+        threads = max(1, options['threads'])
+        processes = max(1, options['processes'])
+        poll_interval = options['poll_interval']
+
+        if options['once']:
+            worker = ExecutionWorker(threads=1, poll_interval=poll_interval)
+            worker.queue.recover_expired()
+            count = 0
+            while worker.run_once():
+                count += 1
+            self.stdout.write(self.style.SUCCESS(f'已处理 {count} 个执行任务'))
+            return
+
+        self.stdout.write(
+            f'启动执行队列工作进程: {processes} 个进程 x {threads} 个线程'
+        )
+
+        if processes == 1:
+            _run_worker_process(threads, poll_interval)
+            return
+
+        # 子进程不能继承父进程的数据库连接
+        connections.close_all()
+        children = [
+            multiprocessing.Process(
+                target=_run_worker_process,
+                args=(threads, poll_interval),
+                name=f'execution-worker-process-{index}',
+            )
+            for index in range(processes)
+        ]
+        for child in children:
+            child.start()
+
+        stop_event = threading.Event()
+        _install_stop_handlers(stop_event)
+        try:
+            while not stop_event.wait(1):
+                if not any(child.is_alive() for child in children):
+                    break
+        finally:
+            for child in children:
+                if child.is_alive():
+                    child.terminate()
+            for child in children:
+                child.join()
+
+        self.stdout.write(self.style.SUCCESS('执行队列工作进程已停止'))
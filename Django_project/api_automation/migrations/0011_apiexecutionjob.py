@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_automation', '0010_apigeneratedartifact_apitestscenario_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiExecutionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('QUEUED', '排队中'), ('RUNNING', '执行中'), ('SUCCEEDED', '已完成'), ('FAILED', '失败'), ('CANCELLED', '已取消')], default='QUEUED', max_length=20, verbose_name='任务状态')),
+                ('priority', models.IntegerField(default=0, help_text='数值越大越先执行', verbose_name='优先级')),
+                ('attempts', models.IntegerField(default=0, verbose_name='已尝试次数')),
+                ('max_attempts', models.IntegerField(default=3, verbose_name='最大尝试次数')),
+                ('worker_id', models.CharField(blank=True, default='', max_length=100, verbose_name='工作进程标识')),
+                ('lease_expires_at', models.DateTimeField(blank=True, null=True, verbose_name='租约到期时间')),
+                ('heartbeat_time', models.DateTimeField(blank=True, null=True, verbose_name='最近心跳时间')),
+                ('error_message', models.TextField(blank=True, default='', verbose_name='错误信息')),
+                ('started_time', models.DateTimeField(blank=True, null=True, verbose_name='开始时间')),
+                ('finished_time', models.DateTimeField(blank=True, null=True, verbose_name='结束时间')),
+                ('created_time', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+                ('updated_time', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+                ('execution', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='job', to='api_automation.apitestexecution', verbose_name='执行记录')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='execution_jobs', to='api_automation.apiproject', verbose_name='所属项目')),
+            ],
+            options={
+                'verbose_name': 'API执行任务',
+                'verbose_name_plural': 'API执行任务',
+                'db_table': 'api_execution_jobs',
+                'ordering': ['-priority', 'created_time'],
+                'indexes': [models.Index(fields=['status', 'priority', 'created_time'], name='job_status_priority_idx'), models.Index(fields=['status', 'lease_expires_at'], name='job_status_lease_idx'), models.Index(fields=['project', 'status'], name='job_project_status_idx')],
+            },
+        ),
+    ]
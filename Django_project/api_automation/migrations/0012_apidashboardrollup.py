@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:37
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_automation', '0011_apiexecutionjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apitestexecution',
+            name='is_rolled_up',
+            field=models.BooleanField(default=False, help_text='执行结果已累加到 ApiDashboardRollup，防止重复累加', verbose_name='已计入仪表盘汇总'),
+        ),
+        migrations.CreateModel(
+            name='ApiDashboardRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stat_date', models.DateField(verbose_name='统计日期')),
+                ('module', models.CharField(blank=True, max_length=100, null=True, verbose_name='所属模块')),
+                ('status', models.CharField(max_length=20, verbose_name='结果状态')),
+                ('result_count', models.IntegerField(default=0, verbose_name='结果数')),
+                ('response_time_sum', models.BigIntegerField(default=0, verbose_name='响应时间合计(ms)')),
+                ('response_time_count', models.IntegerField(default=0, verbose_name='有响应时间的结果数')),
+                ('updated_time', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+                ('collection', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='dashboard_rollups', to='api_automation.apicollection', verbose_name='所属集合')),
+                ('environment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='dashboard_rollups', to='api_automation.apitestenvironment', verbose_name='执行环境')),
+                ('owner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='dashboard_rollups', to=settings.AUTH_USER_MODEL, verbose_name='负责人')),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_rollups', to='api_automation.apiproject', verbose_name='所属项目')),
+            ],
+            options={
+                'verbose_name': '仪表盘日汇总',
+                'verbose_name_plural': '仪表盘日汇总',
+                'db_table': 'api_dashboard_rollups',
+                'ordering': ['-stat_date'],
+                'indexes': [models.Index(fields=['project', 'stat_date'], name='rollup_project_date_idx'), models.Index(fields=['stat_date', 'project', 'environment', 'collection', 'status'], name='rollup_dimension_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_automation', '0012_apidashboardrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apidashboardrollup',
+            name='last_execution',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='api_automation.apitestexecution', verbose_name='最近执行'),
+        ),
+        migrations.AddField(
+            model_name='apidashboardrollup',
+            name='latency_gt_10000',
+            field=models.IntegerField(default=0, verbose_name='响应时间>10s'),
+        ),
+        migrations.AddField(
+            model_name='apidashboardrollup',
+            name='latency_le_100',
+            field=models.IntegerField(default=0, verbose_name='响应时间≤100ms'),
+        ),
+        migrations.AddField(
+            model_name='apidashboardrollup',
+            name='latency_le_1000',
+            field=models.IntegerField(default=0, verbose_name='响应时间≤1s'),
+        ),
+        migrations.AddField(
+            model_name='apidashboardrollup',
+            name='latency_le_10000',
+            field=models.IntegerField(default=0, verbose_name='响应时间≤10s'),
+        ),
+        migrations.AddField(
+            model_name='apidashboardrollup',
+            name='latency_le_200',
+            field=models.IntegerField(default=0, verbose_name='响应时间≤200ms'),
+        ),
+        migrations.AddField(
+            model_name='apidashboardrollup',
+            name='latency_le_2000',
+            field=models.IntegerField(default=0, verbose_name='响应时间≤2s'),
+        ),
+        migrations.AddField(
+            model_name='apidashboardrollup',
+            name='latency_le_50',
+            field=models.IntegerField(default=0, verbose_name='响应时间≤50ms'),
+        ),
+        migrations.AddField(
+            model_name='apidashboardrollup',
+            name='latency_le_500',
+            field=models.IntegerField(default=0, verbose_name='响应时间≤500ms'),
+        ),
+        migrations.AddField(
+            model_name='apidashboardrollup',
+            name='latency_le_5000',
+            field=models.IntegerField(default=0, verbose_name='响应时间≤5s'),
+        ),
+        migrations.AddField(
+            model_name='apidashboardrollup',
+            name='response_time_max',
+            field=models.IntegerField(default=0, verbose_name='最大响应时间(ms)'),
+        ),
+    ]
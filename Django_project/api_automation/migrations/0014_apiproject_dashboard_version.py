@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_automation', '0013_dashboard_rollup_latency'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apiproject',
+            name='dashboard_version',
+            field=models.IntegerField(default=0, help_text='执行结束或结果删除时递增，使仪表盘响应缓存失效', verbose_name='仪表盘数据版本'),
+        ),
+    ]
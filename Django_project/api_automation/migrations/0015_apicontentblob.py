@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_automation', '0014_apiproject_dashboard_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='apihttpexecutionrecord',
+            name='response_body_hash',
+            field=models.CharField(blank=True, default='', help_text='响应体存储在 ApiContentBlob 中时保存其摘要，response_body/response_body_text 留空', max_length=64, verbose_name='响应体引用'),
+        ),
+        migrations.AddField(
+            model_name='apitestresult',
+            name='request_body_hash',
+            field=models.CharField(blank=True, default='', help_text='完整请求体存储在 ApiContentBlob 中，此处保存其摘要', max_length=64, verbose_name='完整请求体引用'),
+        ),
+        migrations.AddField(
+            model_name='apitestresult',
+            name='response_body_hash',
+            field=models.CharField(blank=True, default='', help_text='完整响应体存储在 ApiContentBlob 中，此处保存其摘要', max_length=64, verbose_name='完整响应体引用'),
+        ),
+        migrations.CreateModel(
+            name='ApiContentBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=64, unique=True, verbose_name='内容摘要(SHA-256)')),
+                ('data', models.BinaryField(verbose_name='存储内容')),
+                ('encoding', models.CharField(choices=[('zlib', 'zlib压缩'), ('identity', '未压缩')], default='zlib', max_length=10, verbose_name='存储编码')),
+                ('size', models.IntegerField(default=0, verbose_name='原始大小(bytes)')),
+                ('stored_size', models.IntegerField(default=0, verbose_name='存储大小(bytes)')),
+                ('ref_count', models.IntegerField(default=0, verbose_name='引用计数')),
+                ('created_time', models.DateTimeField(auto_now_add=True, verbose_name='创建时间')),
+            ],
+            options={
+                'verbose_name': '内容存储对象',
+                'verbose_name_plural': '内容存储对象',
+                'db_table': 'api_content_blobs',
+                'ordering': ['-created_time'],
+                'indexes': [models.Index(fields=['ref_count', 'created_time'], name='blob_ref_created_idx')],
+            },
+        ),
+    ]
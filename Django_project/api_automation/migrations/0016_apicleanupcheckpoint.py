@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:49
+
+import api_automation.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_automation', '0015_apicontentblob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiCleanupCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='清理任务标识')),
+                ('cutoff_time', models.DateTimeField(verbose_name='截止时间')),
+                ('stage', models.CharField(blank=True, default='', max_length=50, verbose_name='当前阶段')),
+                ('last_pk', models.BigIntegerField(default=0, verbose_name='已处理的最大主键')),
+                ('deleted_counts', api_automation.models.JSONField(default=dict, verbose_name='各阶段已删除行数')),
+                ('status', models.CharField(choices=[('RUNNING', '进行中'), ('COMPLETED', '已完成')], default='RUNNING', max_length=20, verbose_name='状态')),
+                ('started_time', models.DateTimeField(verbose_name='开始时间')),
+                ('finished_time', models.DateTimeField(blank=True, null=True, verbose_name='完成时间')),
+                ('updated_time', models.DateTimeField(auto_now=True, verbose_name='更新时间')),
+            ],
+            options={
+                'verbose_name': '数据清理检查点',
+                'verbose_name_plural': '数据清理检查点',
+                'db_table': 'api_cleanup_checkpoints',
+                'ordering': ['-updated_time'],
+            },
+        ),
+    ]
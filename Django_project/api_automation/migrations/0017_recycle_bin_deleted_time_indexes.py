@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 06:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_automation', '0016_apicleanupcheckpoint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='apicollection',
+            index=models.Index(fields=['is_deleted', 'updated_time'], name='collection_deleted_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='apidatadriver',
+            index=models.Index(fields=['is_deleted', 'updated_time'], name='driver_deleted_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='apiproject',
+            index=models.Index(fields=['is_deleted', 'updated_time'], name='project_deleted_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='apitestcase',
+            index=models.Index(fields=['is_deleted', 'updated_time'], name='case_deleted_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='apitestenvironment',
+            index=models.Index(fields=['is_deleted', 'updated_time'], name='env_deleted_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='apitestexecution',
+            index=models.Index(fields=['is_deleted', 'updated_time'], name='exec_deleted_time_idx'),
+        ),
+    ]
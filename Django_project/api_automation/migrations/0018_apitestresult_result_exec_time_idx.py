@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 08:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api_automation', '0017_recycle_bin_deleted_time_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='apitestresult',
+            index=models.Index(fields=['execution', 'start_time'], name='result_exec_time_idx'),
+        ),
+    ]
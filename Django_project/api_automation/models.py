@@ -25,6 +25,12 @@ import json
 
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+try:
+    import orjson
+except ImportError:  # 可选依赖，未安装时使用标准库解析
+    orjson = None
 
 
 # =============================================================================
@@ -32,6 +38,47 @@ from django.db import models
 # =============================================================================
 
 
+def loads_json(text):
+    """
+    解析 JSON 文本。
+
+    安装了 orjson 时优先使用（解析速度约为标准库的数倍），
+    orjson 不支持的扩展语法（如 NaN）回退到标准库。
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(text)
+        except ValueError:
+            pass
+    return json.loads(text)
+
+
+class RawJSON(str):
+    """从数据库读出、尚未解析的 JSON 文本。"""
+
+    __slots__ = ()
+
+
+class LazyJSONDescriptor(DeferredAttribute):
+    """
+    JSONField 的属性描述符：首次访问属性时才解析 JSON，解析结果缓存在实例上。
+
+    列表等只读取部分字段的场景不再为每一行的每个 JSON 列支付解析开销。
+    """
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+        value = super().__get__(instance, cls)
+        if type(value) is RawJSON:
+            value = JSONField.parse(value)
+            instance.__dict__[self.field.attname] = value
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
 class JSONField(models.TextField):
     """
     兼容 SQLite 的自定义 JSON 字段。
@@ -39,32 +86,51 @@ class JSONField(models.TextField):
     在数据库中以 TEXT 类型存储 JSON 字符串，
     读取时自动反序列化为 Python 字典/列表，写入时自动序列化为 JSON 字符串。
     适用于不支持原生 JSONField 的数据库后端（如 SQLite）。
+
+    模型实例上的值延迟解析：查询只保存原始文本（RawJSON），首次访问属性时才解析；
+    未访问过的字段保存时直接写回原文本。values()/values_list() 不经过模型属性，
+    返回 RawJSON 文本，需要时用 JSONField.parse 解析。
     """
 
     description = "JSON data"
+    descriptor_class = LazyJSONDescriptor
 
-    def from_db_value(self, value, expression, connection):
-        """从数据库读取时，将 JSON 字符串反序列化为 Python 对象。"""
-        if value is None:
-            return value
+    @staticmethod
+    def parse(value):
+        """解析 JSON 文本，非法 JSON 原样返回字符串。"""
         try:
-            return json.loads(value)
+            return loads_json(value)
         except (TypeError, ValueError):
+            return str(value)
+
+    def from_db_value(self, value, expression, connection):
+        """从数据库读取时保留原始文本，由属性描述符在首次访问时解析。"""
+        if value is None:
             return value
+        return RawJSON(value)
 
     def to_python(self, value):
         """将值转换为 Python 对象（表单验证和反序列化时调用）。"""
         if isinstance(value, str):
             try:
-                return json.loads(value)
+                return loads_json(value)
             except (TypeError, ValueError):
-                return value
+                return str(value)
         return value
 
+    def pre_save(self, model_instance, add):
+        """未访问过的值仍是原始文本，直接写回而不解析。"""
+        value = model_instance.__dict__.get(self.attname)
+        if type(value) is RawJSON:
+            return value
+        return super().pre_save(model_instance, add)
+
     def get_prep_value(self, value):
         """写入数据库前，将 Python 对象序列化为 JSON 字符串。"""
         if value is None:
             return value
+        if type(value) is RawJSON:
+            return str(value)
         return json.dumps(value, ensure_ascii=False)
 
     def value_to_string(self, obj):
@@ -100,6 +166,11 @@ class ApiProject(models.Model):
     created_time = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
     updated_time = models.DateTimeField(auto_now=True, verbose_name='更新时间')
     is_deleted = models.BooleanField(default=False, verbose_name='是否删除')
+    dashboard_version = models.IntegerField(
+        default=0,
+        verbose_name='仪表盘数据版本',
+        help_text='执行结束或结果删除时递增，使仪表盘响应缓存失效'
+    )
 
     class Meta:
         db_table = 'api_projects'
@@ -109,6 +180,7 @@ class ApiProject(models.Model):
         indexes = [
             models.Index(fields=['owner', 'is_deleted'], name='project_owner_deleted_idx'),
             models.Index(fields=['created_time'], name='project_created_idx'),
+            models.Index(fields=['is_deleted', 'updated_time'], name='project_deleted_time_idx'),
         ]
 
     def __str__(self):
@@ -153,6 +225,7 @@ class ApiCollection(models.Model):
             models.Index(fields=['project', 'name'], name='collection_project_name_idx'),
             models.Index(fields=['created_time'], name='collection_created_idx'),
             models.Index(fields=['owner'], name='collection_owner_idx'),
+            models.Index(fields=['is_deleted', 'updated_time'], name='collection_deleted_time_idx'),
             models.Index(fields=['module'], name='collection_module_idx'),
         ]
 
@@ -173,6 +246,11 @@ class ApiTestCase(models.Model):
     断言配置以及用于串联执行的输入/输出变量定义。
     """
 
+    # 列表接口不展示的 JSON 大字段，列表查询统一 defer
+    LIST_DEFERRED_FIELDS = (
+        'headers', 'params', 'body', 'tests', 'input_variables', 'output_variables',
+    )
+
     name = models.CharField(max_length=100, verbose_name='用例名称')
     description = models.TextField(blank=True, null=True, verbose_name='用例描述')
     project = models.ForeignKey(
@@ -255,6 +333,7 @@ class ApiTestCase(models.Model):
             models.Index(fields=['project', 'is_deleted'], name='case_project_deleted_idx'),
             models.Index(fields=['created_time'], name='case_created_idx'),
             models.Index(fields=['owner'], name='case_owner_idx'),
+            models.Index(fields=['is_deleted', 'updated_time'], name='case_deleted_time_idx'),
             models.Index(fields=['module'], name='case_module_idx'),
         ]
 
@@ -465,6 +544,7 @@ class ApiTestEnvironment(models.Model):
             models.Index(fields=['project', 'is_deleted'], name='env_project_deleted_idx'),
             models.Index(fields=['project', 'is_default'], name='env_project_default_idx'),
             models.Index(fields=['is_favorite'], name='env_favorite_idx'),
+            models.Index(fields=['is_deleted', 'updated_time'], name='env_deleted_time_idx'),
         ]
 
     def __str__(self):
@@ -531,6 +611,11 @@ class ApiTestExecution(models.Model):
     created_time = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
     updated_time = models.DateTimeField(auto_now=True, verbose_name='更新时间')
     is_deleted = models.BooleanField(default=False, verbose_name='是否删除')
+    is_rolled_up = models.BooleanField(
+        default=False,
+        verbose_name='已计入仪表盘汇总',
+        help_text='执行结果已累加到 ApiDashboardRollup，防止重复累加'
+    )
 
     class Meta:
         db_table = 'api_test_executions'
@@ -541,6 +626,7 @@ class ApiTestExecution(models.Model):
             models.Index(fields=['project', 'created_time'], name='exec_project_created_idx'),
             models.Index(fields=['environment', 'status'], name='exec_env_status_idx'),
             models.Index(fields=['status', 'created_time'], name='exec_status_created_idx'),
+            models.Index(fields=['is_deleted', 'updated_time'], name='exec_deleted_time_idx'),
         ]
 
     def __str__(self):
@@ -578,6 +664,69 @@ class ApiTestReport(models.Model):
         return f"{self.execution.project.name} - {self.name}"
 
 
+class ApiExecutionJob(models.Model):
+    """
+    API执行任务 -- 数据库队列中的一条待执行/执行中的批量执行任务。
+
+    Web 请求只负责创建执行记录并入队，由 run_execution_worker 管理命令
+    启动的工作进程按优先级领取任务。领取时写入租约到期时间，执行期间
+    工作线程定期心跳续约；工作进程崩溃导致租约过期的任务会被重新入队
+    （超过最大尝试次数则标记为失败）。
+    """
+
+    STATUS_CHOICES = [
+        ('QUEUED', '排队中'),
+        ('RUNNING', '执行中'),
+        ('SUCCEEDED', '已完成'),
+        ('FAILED', '失败'),
+        ('CANCELLED', '已取消'),
+    ]
+
+    execution = models.OneToOneField(
+        ApiTestExecution,
+        on_delete=models.CASCADE,
+        related_name='job',
+        verbose_name='执行记录'
+    )
+    project = models.ForeignKey(
+        ApiProject,
+        on_delete=models.CASCADE,
+        related_name='execution_jobs',
+        verbose_name='所属项目'
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='QUEUED',
+        verbose_name='任务状态'
+    )
+    priority = models.IntegerField(default=0, verbose_name='优先级', help_text='数值越大越先执行')
+    attempts = models.IntegerField(default=0, verbose_name='已尝试次数')
+    max_attempts = models.IntegerField(default=3, verbose_name='最大尝试次数')
+    worker_id = models.CharField(max_length=100, blank=True, default='', verbose_name='工作进程标识')
+    lease_expires_at = models.DateTimeField(null=True, blank=True, verbose_name='租约到期时间')
+    heartbeat_time = models.DateTimeField(null=True, blank=True, verbose_name='最近心跳时间')
+    error_message = models.TextField(blank=True, default='', verbose_name='错误信息')
+    started_time = models.DateTimeField(null=True, blank=True, verbose_name='开始时间')
+    finished_time = models.DateTimeField(null=True, blank=True, verbose_name='结束时间')
+    created_time = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+    updated_time = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+
+    class Meta:
+        db_table = 'api_execution_jobs'
+        verbose_name = 'API执行任务'
+        verbose_name_plural = 'API执行任务'
+        ordering = ['-priority', 'created_time']
+        indexes = [
+            models.Index(fields=['status', 'priority', 'created_time'], name='job_status_priority_idx'),
+            models.Index(fields=['status', 'lease_expires_at'], name='job_status_lease_idx'),
+            models.Index(fields=['project', 'status'], name='job_project_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.execution.name} ({self.status})"
+
+
 class ApiTestResult(models.Model):
     """
     API测试结果 -- 记录单个测试用例在一次执行中的详细结果。
@@ -587,6 +736,12 @@ class ApiTestResult(models.Model):
         - 非 2xx 或错误响应：存储完整请求/响应数据（方便问题排查）
     """
 
+    # 结果列表（ApiTestResultSerializer）不输出的 JSON 大字段，列表查询统一 defer
+    LIST_DEFERRED_FIELDS = (
+        'request_summary', 'response_summary', 'request_full', 'response_full',
+        'error_info', 'extracted_variables',
+    )
+
     execution = models.ForeignKey(
         ApiTestExecution,
         on_delete=models.CASCADE,
@@ -654,6 +809,20 @@ class ApiTestResult(models.Model):
         verbose_name='错误详情',
         help_text='存储错误类型、堆栈、断言失败详情等'
     )
+    request_body_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        verbose_name='完整请求体引用',
+        help_text='完整请求体存储在 ApiContentBlob 中，此处保存其摘要'
+    )
+    response_body_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        verbose_name='完整响应体引用',
+        help_text='完整响应体存储在 ApiContentBlob 中，此处保存其摘要'
+    )
 
     assertion_results = JSONField(default=list, blank=True, verbose_name='断言结果')
     error_message = models.TextField(blank=True, null=True, verbose_name='错误信息')
@@ -676,6 +845,7 @@ class ApiTestResult(models.Model):
         ordering = ['-start_time']
         indexes = [
             models.Index(fields=['execution', 'status'], name='result_exec_status_idx'),
+            models.Index(fields=['execution', 'start_time'], name='result_exec_time_idx'),
             models.Index(fields=['test_case', 'start_time'], name='result_case_time_idx'),
             models.Index(fields=['status', 'start_time'], name='result_status_time_idx'),
         ]
@@ -684,6 +854,102 @@ class ApiTestResult(models.Model):
         return f"{self.test_case.name} - {self.status}"
 
 
+class ApiDashboardRollup(models.Model):
+    """
+    仪表盘日汇总 -- 按天预聚合的测试结果计数与响应耗时。
+
+    每行对应 (日期, 项目, 环境, 集合, 负责人, 模块, 结果状态) 一个维度组合，
+    日期取执行记录创建时间的本地日期，集合/负责人/模块取执行时用例的归属。
+    执行结束时由 dashboard_rollup_service 增量累加，仪表盘统计只读取本表，
+    不再扫描 ApiTestResult。
+
+    同一维度组合可能因并发写入或回填出现多行，读取时总是按维度求和。
+
+    响应时间按 LATENCY_BUCKETS 划分为固定区间计数（每个区间 (上一边界, 边界]），
+    汇总后据此估算分位数；last_execution 记录最近一次计入该行的执行。
+    """
+
+    # 响应时间分桶上边界（毫秒），与 latency_* 字段一一对应，最后一个字段为超出最大边界的计数
+    LATENCY_BUCKETS = (50, 100, 200, 500, 1000, 2000, 5000, 10000)
+    LATENCY_FIELDS = (
+        'latency_le_50', 'latency_le_100', 'latency_le_200', 'latency_le_500',
+        'latency_le_1000', 'latency_le_2000', 'latency_le_5000', 'latency_le_10000',
+        'latency_gt_10000',
+    )
+
+    stat_date = models.DateField(verbose_name='统计日期')
+    project = models.ForeignKey(
+        ApiProject,
+        on_delete=models.CASCADE,
+        related_name='dashboard_rollups',
+        verbose_name='所属项目'
+    )
+    environment = models.ForeignKey(
+        ApiTestEnvironment,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='dashboard_rollups',
+        verbose_name='执行环境'
+    )
+    collection = models.ForeignKey(
+        ApiCollection,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='dashboard_rollups',
+        verbose_name='所属集合'
+    )
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='dashboard_rollups',
+        verbose_name='负责人'
+    )
+    module = models.CharField(max_length=100, null=True, blank=True, verbose_name='所属模块')
+    status = models.CharField(max_length=20, verbose_name='结果状态')
+    result_count = models.IntegerField(default=0, verbose_name='结果数')
+    response_time_sum = models.BigIntegerField(default=0, verbose_name='响应时间合计(ms)')
+    response_time_count = models.IntegerField(default=0, verbose_name='有响应时间的结果数')
+    response_time_max = models.IntegerField(default=0, verbose_name='最大响应时间(ms)')
+    latency_le_50 = models.IntegerField(default=0, verbose_name='响应时间≤50ms')
+    latency_le_100 = models.IntegerField(default=0, verbose_name='响应时间≤100ms')
+    latency_le_200 = models.IntegerField(default=0, verbose_name='响应时间≤200ms')
+    latency_le_500 = models.IntegerField(default=0, verbose_name='响应时间≤500ms')
+    latency_le_1000 = models.IntegerField(default=0, verbose_name='响应时间≤1s')
+    latency_le_2000 = models.IntegerField(default=0, verbose_name='响应时间≤2s')
+    latency_le_5000 = models.IntegerField(default=0, verbose_name='响应时间≤5s')
+    latency_le_10000 = models.IntegerField(default=0, verbose_name='响应时间≤10s')
+    latency_gt_10000 = models.IntegerField(default=0, verbose_name='响应时间>10s')
+    last_execution = models.ForeignKey(
+        ApiTestExecution,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='最近执行'
+    )
+    updated_time = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+
+    class Meta:
+        db_table = 'api_dashboard_rollups'
+        verbose_name = '仪表盘日汇总'
+        verbose_name_plural = '仪表盘日汇总'
+        ordering = ['-stat_date']
+        indexes = [
+            models.Index(fields=['project', 'stat_date'], name='rollup_project_date_idx'),
+            models.Index(
+                fields=['stat_date', 'project', 'environment', 'collection', 'status'],
+                name='rollup_dimension_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.stat_date} {self.project_id} {self.status}: {self.result_count}"
+
+
 # =============================================================================
 # 数据驱动
 # =============================================================================
@@ -735,6 +1001,9 @@ class ApiDataDriver(models.Model):
         verbose_name = 'API数据驱动'
         verbose_name_plural = 'API数据驱动'
         ordering = ['-created_time']
+        indexes = [
+            models.Index(fields=['is_deleted', 'updated_time'], name='driver_deleted_time_idx'),
+        ]
 
     def __str__(self):
         return f"{self.project.name} - {self.name}"
@@ -808,6 +1077,13 @@ class ApiHttpExecutionRecord(models.Model):
     response_body_text = models.TextField(
         blank=True, null=True, verbose_name='响应体原文(非JSON)'
     )
+    response_body_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default='',
+        verbose_name='响应体引用',
+        help_text='响应体存储在 ApiContentBlob 中时保存其摘要，response_body/response_body_text 留空'
+    )
     response_size = models.IntegerField(null=True, blank=True, verbose_name='响应大小(bytes)')
     response_encoding = models.CharField(
         max_length=50, blank=True, null=True, verbose_name='响应编码'
@@ -901,6 +1177,92 @@ class ApiHttpExecutionRecord(models.Model):
         return f"{self.request_method} {self.request_url} - {self.status}"
 
 
+# =============================================================================
+# 内容寻址存储
+# =============================================================================
+
+
+class ApiContentBlob(models.Model):
+    """
+    内容寻址的压缩大对象 -- 存储完整请求/响应体。
+
+    以内容的 SHA-256 摘要为键，相同内容只存储一份；测试结果与HTTP执行记录
+    只保存摘要引用。ref_count 记录引用行数，引用全部删除后对象随之删除。
+    读写统一通过 services.blob_store。
+    """
+
+    digest = models.CharField(max_length=64, unique=True, verbose_name='内容摘要(SHA-256)')
+    data = models.BinaryField(verbose_name='存储内容')
+    encoding = models.CharField(
+        max_length=10,
+        choices=[
+            ('zlib', 'zlib压缩'),
+            ('identity', '未压缩'),
+        ],
+        default='zlib',
+        verbose_name='存储编码'
+    )
+    size = models.IntegerField(default=0, verbose_name='原始大小(bytes)')
+    stored_size = models.IntegerField(default=0, verbose_name='存储大小(bytes)')
+    ref_count = models.IntegerField(default=0, verbose_name='引用计数')
+    created_time = models.DateTimeField(auto_now_add=True, verbose_name='创建时间')
+
+    class Meta:
+        db_table = 'api_content_blobs'
+        verbose_name = '内容存储对象'
+        verbose_name_plural = '内容存储对象'
+        ordering = ['-created_time']
+        indexes = [
+            models.Index(fields=['ref_count', 'created_time'], name='blob_ref_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.digest[:12]} ({self.size} B, refs={self.ref_count})"
+
+
+# =============================================================================
+# 数据维护
+# =============================================================================
+
+
+class ApiCleanupCheckpoint(models.Model):
+    """
+    数据清理进度检查点 -- 记录分批清理任务的进度，中断后从断点继续。
+
+    每个清理任务（全局、按项目、按环境、HTTP执行记录）对应一行；
+    cutoff_time 在任务开始时确定，续跑时沿用，保证一次清理的范围不变。
+    """
+
+    STATUS_CHOICES = [
+        ('RUNNING', '进行中'),
+        ('COMPLETED', '已完成'),
+    ]
+
+    name = models.CharField(max_length=100, unique=True, verbose_name='清理任务标识')
+    cutoff_time = models.DateTimeField(verbose_name='截止时间')
+    stage = models.CharField(max_length=50, blank=True, default='', verbose_name='当前阶段')
+    last_pk = models.BigIntegerField(default=0, verbose_name='已处理的最大主键')
+    deleted_counts = JSONField(default=dict, verbose_name='各阶段已删除行数')
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='RUNNING',
+        verbose_name='状态'
+    )
+    started_time = models.DateTimeField(verbose_name='开始时间')
+    finished_time = models.DateTimeField(null=True, blank=True, verbose_name='完成时间')
+    updated_time = models.DateTimeField(auto_now=True, verbose_name='更新时间')
+
+    class Meta:
+        db_table = 'api_cleanup_checkpoints'
+        verbose_name = '数据清理检查点'
+        verbose_name_plural = '数据清理检查点'
+        ordering = ['-updated_time']
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
+
+
 # =============================================================================
 # 流量录制回放生成用例（方案A）
 # =============================================================================
@@ -0,0 +1,127 @@
+"""
+api_automation/pagination.py
+
+键集（游标）分页。
+
+执行记录、测试结果等历史表行数可达百万级，偏移分页翻到第 N 页时数据库需要
+扫描并丢弃前 N * page_size 行。KeysetPagination 按 (时间字段, id) 倒序排列，
+以上一页最后一行的键作为游标，用 "时间 <= t 且 (时间 < t 或 id < 上一行id)"
+定位下一页：时间条件可直接利用 (过滤列, 时间) 复合索引做范围扫描，
+任意深度翻页的代价只与页大小相关。
+
+请求携带 cursor 参数时启用（首页传空值，之后传上一页返回的 next_cursor），
+否则保持原有的页码分页，兼容现有前端。
+"""
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    按 (ordering_field, id) 倒序的键集分页，未传 cursor 时退化为页码分页。
+
+    子类通过 ordering_field 指定排序的时间字段（需为非空字段）。
+    """
+
+    ordering_field = 'created_time'
+    cursor_query_param = 'cursor'
+    keyset_page_size_query_param = 'page_size'
+    max_keyset_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """携带 cursor 参数时按键集分页，否则使用页码分页。"""
+        self.use_keyset = self.cursor_query_param in request.query_params
+        if not self.use_keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.keyset_page_size = self.get_keyset_page_size(request)
+        try:
+            rows, self.next_cursor = self.paginate_keyset(
+                queryset, request.query_params.get(self.cursor_query_param), self.keyset_page_size
+            )
+        except ValueError as e:
+            raise ValidationError({self.cursor_query_param: str(e)})
+        return rows
+
+    def get_paginated_response(self, data):
+        """键集分页不统计总数，返回下一页游标（没有更多数据时为 None）。"""
+        if not getattr(self, 'use_keyset', False):
+            return super().get_paginated_response(data)
+        return Response({
+            'results': data,
+            'next_cursor': self.next_cursor,
+            'page_size': self.keyset_page_size,
+        })
+
+    def get_keyset_page_size(self, request):
+        """读取每页数量，非法值使用默认值，超过上限时截断。"""
+        try:
+            page_size = int(request.query_params.get(self.keyset_page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            page_size = self.page_size
+        return max(1, min(page_size, self.max_keyset_page_size))
+
+    def paginate_keyset(self, queryset, cursor, page_size):
+        """
+        取出游标之后的一页数据
+
+        Args:
+            queryset: 已应用权限和筛选条件的查询集
+            cursor: 上一页返回的游标，为空表示第一页
+            page_size: 每页数量
+
+        Returns:
+            (当前页数据列表, 下一页游标或 None)
+
+        Raises:
+            ValueError: 游标无效
+        """
+        field = self.ordering_field
+        queryset = queryset.order_by(f'-{field}', '-id')
+        if cursor:
+            value, last_id = self.decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(**{f'{field}__lte': value}),
+                Q(**{f'{field}__lt': value}) | Q(id__lt=last_id),
+            )
+
+        rows = list(queryset[:page_size + 1])
+        if len(rows) <= page_size:
+            return rows, None
+
+        rows = rows[:page_size]
+        last = rows[-1]
+        return rows, self.encode_cursor(getattr(last, field), last.pk)
+
+    @staticmethod
+    def encode_cursor(value, pk):
+        """将排序键编码为游标。"""
+        payload = json.dumps([value.isoformat(), pk])
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """解析游标，无效时抛出 ValueError。"""
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8'))
+            return datetime.fromisoformat(value), int(pk)
+        except (TypeError, ValueError, UnicodeError):
+            raise ValueError('无效的分页游标')
+
+
+class CreatedTimeKeysetPagination(KeysetPagination):
+    """按 (created_time, id) 倒序分页，用于 HTTP 执行记录。"""
+
+    ordering_field = 'created_time'
+
+
+class StartTimeKeysetPagination(KeysetPagination):
+    """按 (start_time, id) 倒序分页，用于测试结果。"""
+
+    ordering_field = 'start_time'
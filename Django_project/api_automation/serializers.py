@@ -12,12 +12,15 @@ Django REST Framework 序列化器定义。
     基础序列化器 -- 用于列表和创建/更新操作
     详情序列化器 -- 继承基础序列化器，额外包含关联数据（如嵌套的子资源列表）
 """
+import itertools
 import json
 import re
 
 from django.contrib.auth.models import User
 from rest_framework import serializers
 
+from config.query_utils import count_subquery
+
 from .models import (
     ApiCollection,
     ApiDataDriver,
@@ -37,6 +40,8 @@ from .models import (
     ApiTestResult,
     ApiTestScenario,
 )
+from .services.blob_store import blob_store
+from .services.result_storage_service import ResultStorageService
 
 
 class JSONFieldSerializer(serializers.Field):
@@ -105,13 +110,31 @@ class ApiProjectSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_time', 'updated_time']
 
+    @staticmethod
+    def annotate_queryset(queryset):
+        """为查询集附加负责人和集合/用例数量，列表序列化时不再逐行查询。"""
+        return queryset.select_related('owner').annotate(
+            collections_count=count_subquery(
+                ApiCollection.objects.filter(is_deleted=False), 'project'
+            ),
+            test_cases_count=count_subquery(
+                ApiTestCase.objects.filter(is_deleted=False), 'project'
+            ),
+        )
+
     def get_collections_count(self, obj):
-        """统计项目下未删除的集合数量。"""
-        return obj.api_collections.filter(is_deleted=False).count()
+        """统计项目下未删除的集合数量（优先读取查询集注解）。"""
+        count = getattr(obj, 'collections_count', None)
+        if count is None:
+            count = obj.api_collections.filter(is_deleted=False).count()
+        return count
 
     def get_test_cases_count(self, obj):
-        """统计项目下未删除的测试用例数量。"""
-        return obj.test_cases.filter(is_deleted=False).count()
+        """统计项目下未删除的测试用例数量（优先读取查询集注解）。"""
+        count = getattr(obj, 'test_cases_count', None)
+        if count is None:
+            count = obj.test_cases.filter(is_deleted=False).count()
+        return count
 
     def validate_name(self, value):
         """校验项目名称：不允许为空或纯空格。"""
@@ -153,9 +176,21 @@ class ApiCollectionSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'created_time', 'updated_time']
 
+    @staticmethod
+    def annotate_queryset(queryset):
+        """为查询集附加项目、负责人和用例数量，列表序列化时不再逐行查询。"""
+        return queryset.select_related('project', 'owner').annotate(
+            test_cases_count=count_subquery(
+                ApiTestCase.objects.filter(is_deleted=False), 'collection'
+            )
+        )
+
     def get_test_cases_count(self, obj):
-        """统计集合下未删除的测试用例数量。"""
-        return obj.test_cases.filter(is_deleted=False).count()
+        """统计集合下未删除的测试用例数量（优先读取查询集注解）。"""
+        count = getattr(obj, 'test_cases_count', None)
+        if count is None:
+            count = obj.test_cases.filter(is_deleted=False).count()
+        return count
 
     def validate_name(self, value):
         """校验集合名称：不允许为空或纯空格。"""
@@ -281,7 +316,9 @@ class ApiCollectionDetailSerializer(ApiCollectionSerializer):
 
     def get_test_cases(self, obj):
         """获取集合下未删除的测试用例列表（精简格式）。"""
-        test_cases = obj.test_cases.filter(is_deleted=False)
+        test_cases = obj.test_cases.filter(is_deleted=False).select_related(
+            'project', 'collection'
+        ).defer(*ApiTestCase.LIST_DEFERRED_FIELDS)
         return ApiTestCaseListSerializer(test_cases, many=True).data
 
     class Meta(ApiCollectionSerializer.Meta):
@@ -423,6 +460,35 @@ class ApiTestExecutionSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class ApiTestExecutionSummarySerializer(serializers.ModelSerializer):
+    """
+    API测试执行精简序列化器（只读），用于执行列表的精简模式。
+
+    只输出状态与计数字段，不包含用例ID列表等 JSON 字段。
+    """
+
+    project_name = serializers.CharField(source='project.name', read_only=True)
+    environment_name = serializers.CharField(source='environment.name', read_only=True)
+    created_by_name = serializers.CharField(source='created_by.username', read_only=True)
+
+    class Meta:
+        model = ApiTestExecution
+        fields = [
+            'id', 'name', 'project', 'project_name', 'environment', 'environment_name',
+            'status', 'total_count', 'passed_count', 'failed_count', 'skipped_count',
+            'start_time', 'end_time', 'duration',
+            'created_by', 'created_by_name', 'created_time', 'updated_time'
+        ]
+        read_only_fields = fields
+
+    @classmethod
+    def load_only(cls, queryset):
+        """限制查询集只读取序列化所需的列。"""
+        columns = [field for field in cls.Meta.fields if not field.endswith('_name')]
+        columns += ['project__name', 'environment__name', 'created_by__username']
+        return queryset.select_related('project', 'environment', 'created_by').only(*columns)
+
+
 class ApiTestResultSerializer(serializers.ModelSerializer):
     """
     API测试结果序列化器。
@@ -466,6 +532,85 @@ class ApiTestResultSerializer(serializers.ModelSerializer):
         return attrs
 
 
+class ApiTestResultSummaryListSerializer(serializers.ListSerializer):
+    """
+    API测试结果精简列表序列化器。
+
+    请求完整请求/响应体时，序列化前一次性预取整页结果引用的内容。
+    """
+
+    def to_representation(self, data):
+        results = data.all() if hasattr(data, 'all') else data
+        results = list(results)
+        ApiTestResultSummarySerializer.prefetch_bodies(results, self.context.get('include', ()))
+        return super().to_representation(results)
+
+
+class ApiTestResultSummarySerializer(serializers.ModelSerializer):
+    """
+    API测试结果精简序列化器（只读），用于执行下的结果分页列表。
+
+    默认只读取状态、耗时等标量列，请求/响应 JSON 等大字段不加载；
+    通过 context['include'] 显式请求 INCLUDE_FIELDS 中的字段时才读取并输出。
+    """
+
+    INCLUDE_FIELDS = ('assertion_results', 'request_full', 'response_full')
+
+    test_case_name = serializers.CharField(source='test_case.name', read_only=True)
+    test_case_method = serializers.CharField(source='test_case.method', read_only=True)
+    test_case_url = serializers.CharField(source='test_case.url', read_only=True)
+
+    class Meta:
+        model = ApiTestResult
+        fields = [
+            'id', 'execution', 'test_case', 'test_case_name',
+            'test_case_method', 'test_case_url', 'status',
+            'response_status', 'response_time', 'response_size',
+            'request_url', 'request_method', 'error_message',
+            'start_time', 'end_time', 'duration'
+        ]
+        read_only_fields = fields
+        list_serializer_class = ApiTestResultSummaryListSerializer
+
+    @staticmethod
+    def prefetch_bodies(results, include=()):
+        """请求 request_full/response_full 时，用一次查询预取这批结果引用的请求体与响应体。"""
+        if 'request_full' not in include and 'response_full' not in include:
+            return
+        blob_store.prefetch(itertools.chain.from_iterable(
+            (result.request_body_hash, result.response_body_hash) for result in results
+        ))
+
+    @classmethod
+    def load_only(cls, queryset, include=()):
+        """限制查询集只读取序列化所需的列（包括显式请求的大字段）。"""
+        columns = [
+            field for field in cls.Meta.fields
+            if field not in ('test_case_name', 'test_case_method', 'test_case_url')
+        ]
+        columns += ['test_case__name', 'test_case__method', 'test_case__url']
+        if 'assertion_results' in include:
+            columns.append('assertion_results')
+        if 'request_full' in include or 'response_full' in include:
+            # load_full_bodies 同时读取请求与响应，一并加载避免逐行补查延迟字段
+            columns += ['request_full', 'request_body_hash', 'response_full', 'response_body_hash']
+        return queryset.select_related('test_case').only(*columns)
+
+    def to_representation(self, instance):
+        """按 context['include'] 附加请求的大字段，完整请求/响应体从内容存储读取。"""
+        data = super().to_representation(instance)
+        include = self.context.get('include', ())
+        if 'assertion_results' in include:
+            data['assertion_results'] = instance.assertion_results or []
+        if 'request_full' in include or 'response_full' in include:
+            full = ResultStorageService.load_full_bodies(instance)
+            if 'request_full' in include:
+                data['request_full'] = full['request']
+            if 'response_full' in include:
+                data['response_full'] = full['response']
+        return data
+
+
 # =============================================================================
 # 报告序列化器
 # =============================================================================
@@ -847,11 +992,26 @@ class ApiTestCaseDetailSerializer(ApiTestCaseSerializer):
 # =============================================================================
 
 
+class ApiHttpExecutionRecordListSerializer(serializers.ListSerializer):
+    """
+    HTTP执行记录列表序列化器。
+
+    序列化前一次性预取整页记录引用的响应体，避免逐条查询内容存储。
+    """
+
+    def to_representation(self, data):
+        records = data.all() if hasattr(data, 'all') else data
+        records = list(records)
+        blob_store.prefetch(record.response_body_hash for record in records)
+        return super().to_representation(records)
+
+
 class ApiHttpExecutionRecordSerializer(serializers.ModelSerializer):
     """
     HTTP执行记录序列化器。
 
     包含完整的请求/响应信息，以及格式化后的大小和耗时展示字段。
+    响应体保存在内容寻址存储中，按摘要加载后还原为 JSON（response_body）或文本（response_body_text）。
     """
 
     project_name = serializers.CharField(source='project.name', read_only=True)
@@ -868,8 +1028,13 @@ class ApiHttpExecutionRecordSerializer(serializers.ModelSerializer):
     response_size_formatted = serializers.SerializerMethodField()
     duration_formatted = serializers.SerializerMethodField()
 
+    # 响应体（按摘要延迟加载）
+    response_body = serializers.SerializerMethodField()
+    response_body_text = serializers.SerializerMethodField()
+
     class Meta:
         model = ApiHttpExecutionRecord
+        list_serializer_class = ApiHttpExecutionRecordListSerializer
         fields = [
             'id', 'test_case', 'test_case_name', 'execution', 'project', 'project_name',
             'request_method', 'request_url', 'request_base_url', 'request_path',
@@ -885,6 +1050,22 @@ class ApiHttpExecutionRecordSerializer(serializers.ModelSerializer):
             'request_size_formatted', 'response_size_formatted', 'duration_formatted'
         ]
 
+    def _load_response_body(self, obj):
+        """读取响应体，未使用内容存储的旧记录返回字段原值。"""
+        if not obj.response_body_hash:
+            return obj.response_body_text if obj.response_body_text is not None else obj.response_body
+        return blob_store.get_json(obj.response_body_hash)
+
+    def get_response_body(self, obj):
+        """JSON 响应体（字典或列表），文本响应返回空字典。"""
+        body = self._load_response_body(obj)
+        return body if isinstance(body, (dict, list)) else {}
+
+    def get_response_body_text(self, obj):
+        """文本响应体，JSON 响应返回 None。"""
+        body = self._load_response_body(obj)
+        return None if isinstance(body, (dict, list)) or body is None else body
+
     def get_request_size_formatted(self, obj):
         """将请求大小格式化为可读字符串（如 '128 B'）。"""
         if obj.request_size:
@@ -3,13 +3,28 @@ API自动化测试 - 服务层模块
 
 本模块包含API自动化测试平台的核心业务服务：
 - http_executor: HTTP请求执行引擎
+- async_http_executor: 基于asyncio的异步HTTP请求执行引擎
+- connection_pool_registry: 进程级HTTP连接池注册表
 - assertion_engine: 测试断言引擎
+- assertion_plan: 按用例预编译的断言计划
 - extraction_engine: 变量提取引擎
+- json_path: 断言与提取共用的JSONPath编译器
+- response_document: 断言与提取共享的响应文档解析缓存
 - websocket_service: WebSocket实时广播服务
+- execution_broadcaster: 按执行合并节流的WebSocket进度广播
 - variable_pool_service: 变量池管理服务
+- request_template: 请求模板编译与缓存
 - recycle_bin_service: 回收站管理服务
 - result_storage_service: 测试结果分级存储服务
-- data_cleanup_service: 数据定时清理服务
+- blob_store: 请求/响应体的内容寻址压缩存储
+- data_cleanup_service: 分批、可断点续跑的过期数据清理服务
+- cold_archive: 过期结果按天/项目分区的压缩归档与惰性查询
+- dashboard_rollup_service: 仪表盘日汇总的增量维护与查询
+- dashboard_cache: 按项目数据版本失效的仪表盘响应缓存
 - cascade_delete_service: 级联删除服务
 - batch_execution_service: 批量执行服务
+- execution_scheduler: 依赖感知的并发调度器
+- compiled_cache: 按用例版本缓存编译结果
+- execution_queue: 基于数据库的批量执行任务队列与工作者
+- cancellation: 批量执行的协作式取消标志
 """
\ No newline at end of file
@@ -10,10 +10,16 @@ import json
 import logging
 import operator
 import re
+from functools import lru_cache
 from typing import Any, Dict, List, Tuple, Union
 
+from api_automation.services.json_path import compile_json_path
+
 logger = logging.getLogger(__name__)
 
+# matches 操作符使用的正则编译缓存
+_compile_regex = lru_cache(maxsize=512)(re.compile)
+
 
 class AssertionResult:
     """
@@ -68,7 +74,7 @@ class AssertionEngine:
         'not_contains': lambda x, y: y not in x,
         'starts_with': lambda x, y: str(x).startswith(str(y)),
         'ends_with': lambda x, y: str(x).endswith(str(y)),
-        'matches': lambda x, y: bool(re.search(str(y), str(x))),
+        'matches': lambda x, y: bool(_compile_regex(str(y)).search(str(x))),
         'exists': lambda x, y: x is not None,
         'not_exists': lambda x, y: x is None,
         'is_empty': lambda x, y: not x,
@@ -235,93 +241,28 @@ class AssertionEngine:
         """
         从JSON数据中按路径提取指定值
 
-        支持点号分隔的对象属性访问和方括号数组索引访问。
-        例如: "data.user.name"、"users[0].id"
+        使用共享的 JSONPath 编译器（编译结果带LRU缓存），支持点号/方括号、
+        通配符、切片、递归下降和过滤表达式。
+        例如: "data.user.name"、"$.users[0].id"、"$.users[?(@.age > 18)].id"
 
         Args:
             data: 已解析的JSON数据（dict或list）
             json_path: JSON路径表达式
 
         Returns:
-            路径指向的值，路径无效时返回None
+            路径指向的值（不确定路径返回匹配值列表），路径无效时返回None
         """
         if not json_path or not data:
             return data
 
         try:
-            current = data
-            path_parts = self._parse_json_path(json_path)
-
-            for part in path_parts:
-                if isinstance(current, dict):
-                    current = current.get(part)
-                elif isinstance(current, list) and part.isdigit():
-                    index = int(part)
-                    if 0 <= index < len(current):
-                        current = current[index]
-                    else:
-                        return None
-                else:
-                    return None
-
-                if current is None:
-                    return None
-
-            return current
+            return compile_json_path(json_path).evaluate(data)
         except Exception as e:
             logger.error(
                 f"Error extracting JSON value from path {json_path}: {str(e)}"
             )
             return None
 
-    def _parse_json_path(self, json_path: str) -> List[str]:
-        """
-        解析JSON路径表达式为路径片段列表
-
-        处理规则：
-        - 去除 "$." 前缀（如果存在）
-        - 以点号 "." 分隔对象属性
-        - 以方括号 "[n]" 分隔数组索引
-
-        示例: "$.data.users[0].name" -> ["data", "users", "0", "name"]
-
-        Args:
-            json_path: JSON路径字符串
-
-        Returns:
-            路径片段列表
-        """
-        # 去除 $. 前缀
-        if json_path.startswith('$.'):
-            json_path = json_path[2:]
-
-        parts = []
-        current_part = ""
-        in_brackets = False
-
-        for char in json_path:
-            if char == '.' and not in_brackets:
-                if current_part:
-                    parts.append(current_part)
-                    current_part = ""
-            elif char == '[':
-                if current_part:
-                    parts.append(current_part)
-                    current_part = ""
-                in_brackets = True
-            elif char == ']':
-                if current_part:
-                    parts.append(current_part)
-                    current_part = ""
-                in_brackets = False
-            else:
-                current_part += char
-
-        if current_part:
-            parts.append(current_part)
-
-        return parts
-
     def _assert_status_code(
         self,
         expected: Union[int, List[int]],
@@ -0,0 +1,405 @@
+"""
+断言计划编译服务
+
+将测试用例的全部启用断言一次性编译为不可变的「断言计划」：
+操作符预先解析为比较函数，正则表达式和 JSONPath 预先编译，
+期望值预先反序列化。执行时只需按顺序取值并比较，
+不再查询数据库、构建处理函数字典或重复编译正则。
+
+断言计划通过 assertion_plan_cache 按用例ID缓存，版本号为用例的
+updated_time（断言配置变更时由视图层刷新用例的 updated_time）。
+
+同时兼容两种断言配置来源：
+- ApiTestCaseAssertion 模型（assertion_type/target/operator/expected_value）
+- AssertionEngine 的字典配置（type/json_path/source/operator/expected）
+"""
+
+import json
+import logging
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+
+from api_automation.services.assertion_engine import AssertionEngine, AssertionResult
+from api_automation.services.compiled_cache import CompiledCaseCache
+from api_automation.services.json_path import compile_json_path
+from api_automation.services.response_document import ResponseDocument
+
+logger = logging.getLogger(__name__)
+
+# 模型中的操作符名称到断言引擎操作符的映射
+OPERATOR_ALIASES = {
+    'less_than_equal': 'less_equal',
+    'greater_than_equal': 'greater_equal',
+    'regex': 'matches',
+    'valid': 'exists',
+    'invalid': 'not_exists',
+    'json_path': 'exists',
+}
+
+# 模型中的断言类型到断言引擎类型的映射
+TYPE_ALIASES = {
+    'response_headers': 'response_header',
+}
+
+# 用于 json_schema 断言的共享引擎（无状态）
+_schema_engine = AssertionEngine()
+
+
+class CompiledAssertion:
+    """
+    单条编译后的断言
+
+    所有属性在构造时确定，evaluate 只做取值和比较。
+    """
+
+    __slots__ = (
+        'assertion_type', 'operator_name', 'expected', 'target',
+        'compare', 'path', 'header_name',
+    )
+
+    def __init__(
+        self,
+        assertion_type: str,
+        operator_name: str,
+        expected: Any,
+        target: str = '',
+    ):
+        self.assertion_type = TYPE_ALIASES.get(assertion_type, assertion_type)
+        self.operator_name = OPERATOR_ALIASES.get(operator_name, operator_name) or 'equals'
+        self.expected = expected
+        self.target = target or ''
+        self.path = None
+        self.header_name = None
+
+        if self.assertion_type in ('json_value', 'response_body') and self.target:
+            self.path = compile_json_path(self.target)
+        elif self.assertion_type == 'response_header' and self.target:
+            name = self.target
+            if name.lower().startswith('headers.'):
+                name = name[len('headers.'):]
+            self.header_name = name
+
+        self.compare = _build_comparator(self.operator_name, expected)
+
+    def evaluate(
+        self,
+        http_response: Any,
+        response_body: Any,
+        document: ResponseDocument,
+    ) -> AssertionResult:
+        """
+        对响应执行本条断言
+
+        Args:
+            http_response: HTTP响应对象
+            response_body: 已解析的响应体
+            document: 响应文档（共享的文本等解析结果）
+
+        Returns:
+            AssertionResult: 断言结果
+        """
+        handler = _TYPE_HANDLERS.get(self.assertion_type)
+        if handler is None:
+            return AssertionResult(
+                self.assertion_type, self.expected, None, False,
+                f"不支持的断言类型: {self.assertion_type}"
+            )
+        return handler(self, http_response, response_body, document)
+
+
+class AssertionPlan:
+    """
+    测试用例的断言计划（不可变，可在线程间共享）
+    """
+
+    __slots__ = ('assertions',)
+
+    def __init__(self, assertions: Iterable[CompiledAssertion]):
+        self.assertions: Tuple[CompiledAssertion, ...] = tuple(assertions)
+
+    @classmethod
+    def from_test_case(cls, test_case: Any) -> 'AssertionPlan':
+        """
+        编译测试用例的所有启用断言
+
+        使用 test_case.assertions.all() 并在内存中过滤启用状态，
+        调用方预取（prefetch_related）断言时不会产生额外查询。
+
+        Args:
+            test_case: 测试用例对象
+
+        Returns:
+            AssertionPlan 实例
+        """
+        return cls.from_models(
+            assertion for assertion in test_case.assertions.all()
+            if assertion.is_enabled
+        )
+
+    @classmethod
+    def from_models(cls, assertions: Iterable[Any]) -> 'AssertionPlan':
+        """
+        从 ApiTestCaseAssertion 模型实例编译断言计划
+
+        Args:
+            assertions: 断言模型实例序列（已按执行顺序排列）
+
+        Returns:
+            AssertionPlan 实例
+        """
+        compiled = []
+        for assertion in assertions:
+            compiled.append(_compile_or_error(
+                assertion.assertion_type,
+                assertion.operator,
+                _parse_expected(assertion.expected_value),
+                assertion.target,
+            ))
+        return cls(compiled)
+
+    @classmethod
+    def from_configs(cls, configs: Iterable[Dict[str, Any]]) -> 'AssertionPlan':
+        """
+        从断言引擎的字典配置编译断言计划
+
+        Args:
+            configs: 断言配置字典序列
+
+        Returns:
+            AssertionPlan 实例
+        """
+        compiled = []
+        for config in configs:
+            if not config.get('enabled', True):
+                continue
+            compiled.append(_compile_or_error(
+                config.get('type', ''),
+                config.get('operator', 'equals'),
+                config.get('expected'),
+                config.get('json_path') or config.get('source') or '',
+            ))
+        return cls(compiled)
+
+    def evaluate(
+        self,
+        http_response: Any,
+        response_body: Any = None,
+        document: Optional[ResponseDocument] = None,
+    ) -> List[AssertionResult]:
+        """
+        对响应执行全部断言
+
+        Args:
+            http_response: HTTP响应对象（包含 status_code/headers/response_time）
+            response_body: 已解析的响应体，默认取 http_response.body
+            document: 响应文档，传入时与提取阶段共享解析结果
+
+        Returns:
+            断言结果列表
+        """
+        if response_body is None:
+            response_body = getattr(http_response, 'body', None)
+        if document is None:
+            document = ResponseDocument(response_body)
+
+        results = []
+        for assertion in self.assertions:
+            try:
+                results.append(assertion.evaluate(http_response, response_body, document))
+            except Exception as e:
+                logger.error(f"Error evaluating assertion {assertion.assertion_type}: {e}")
+                results.append(AssertionResult(
+                    assertion.assertion_type, assertion.expected, 'ERROR', False,
+                    f"断言执行错误: {str(e)}"
+                ))
+        return results
+
+    def __len__(self) -> int:
+        return len(self.assertions)
+
+
+class _InvalidAssertion(CompiledAssertion):
+    """编译失败的断言（如非法正则/JSONPath），执行时直接返回失败结果"""
+
+    __slots__ = ('error',)
+
+    def __init__(self, assertion_type: str, expected: Any, error: str):
+        self.assertion_type = assertion_type
+        self.expected = expected
+        self.error = error
+
+    def evaluate(
+        self,
+        http_response: Any,
+        response_body: Any,
+        document: ResponseDocument,
+    ) -> AssertionResult:
+        return AssertionResult(
+            self.assertion_type, self.expected, 'ERROR', False,
+            f"断言配置错误: {self.error}"
+        )
+
+
+def _compile_or_error(
+    assertion_type: str,
+    operator_name: str,
+    expected: Any,
+    target: str,
+) -> CompiledAssertion:
+    try:
+        return CompiledAssertion(assertion_type, operator_name, expected, target)
+    except Exception as e:
+        logger.warning(f"Invalid assertion {assertion_type} {target}: {e}")
+        return _InvalidAssertion(assertion_type, expected, str(e))
+
+
+def _parse_expected(raw: Optional[str]) -> Any:
+    """将模型中以文本保存的期望值反序列化（非JSON文本按原字符串处理）"""
+    if raw is None:
+        return None
+    try:
+        return json.loads(raw)
+    except (TypeError, ValueError):
+        return raw
+
+
+# ============================================================
+# 比较函数
+# ============================================================
+
+def _build_comparator(operator_name: str, expected: Any) -> Optional[Callable[[Any], bool]]:
+    """
+    预先构建 actual -> bool 的比较函数
+
+    Returns:
+        比较函数；不支持的操作符返回None（按字符串相等比较）
+    """
+    if operator_name == 'matches':
+        pattern = re.compile(str(expected))
+        return lambda actual: actual is not None and bool(pattern.search(str(actual)))
+
+    if operator_name == 'range':
+        if not isinstance(expected, (list, tuple)) or len(expected) != 2:
+            raise ValueError("range 操作符的期望值应为 [最小值, 最大值]")
+        low, high = expected
+        return lambda actual: actual is not None and low <= actual <= high
+
+    operator_func = AssertionEngine.OPERATORS.get(operator_name)
+    if operator_func is None:
+        expected_text = str(expected)
+        return lambda actual: str(actual) == expected_text
+
+    return lambda actual: bool(operator_func(actual, expected))
+
+
+# ============================================================
+# 各断言类型的处理函数
+# ============================================================
+
+def _assert_status_code(
+    assertion: CompiledAssertion, http_response: Any, body: Any, document: ResponseDocument,
+) -> AssertionResult:
+    actual = getattr(http_response, 'status_code', None)
+    expected = assertion.expected
+    if assertion.operator_name == 'equals' and isinstance(expected, list):
+        passed = actual in expected
+        message = f"状态码 {actual} 是否在期望列表 {expected} 中"
+    else:
+        passed = assertion.compare(actual)
+        message = f"状态码 {actual} {assertion.operator_name} {expected}"
+    return AssertionResult('status_code', expected, actual, passed, message)
+
+
+def _assert_response_time(
+    assertion: CompiledAssertion, http_response: Any, body: Any, document: ResponseDocument,
+) -> AssertionResult:
+    actual = getattr(http_response, 'response_time', 0)
+    passed = assertion.compare(actual)
+    message = f"响应时间 {actual}ms {assertion.operator_name} {assertion.expected}ms"
+    return AssertionResult('response_time', assertion.expected, actual, passed, message)
+
+
+def _assert_response_body(
+    assertion: CompiledAssertion, http_response: Any, body: Any, document: ResponseDocument,
+) -> AssertionResult:
+    actual = assertion.path.evaluate(body) if assertion.path and body else body
+    expected = assertion.expected
+
+    if assertion.operator_name in ('contains', 'not_contains'):
+        if isinstance(actual, (dict, list)):
+            actual_text = json.dumps(actual, ensure_ascii=False)
+        else:
+            actual_text = str(actual)
+        found = str(expected) in actual_text
+        passed = found if assertion.operator_name == 'contains' else not found
+    else:
+        passed = assertion.compare(actual)
+
+    path_display = assertion.target or '根节点'
+    message = f"响应体路径 {path_display} 的值 {actual} {assertion.operator_name} {expected}"
+    return AssertionResult('response_body', expected, actual, passed, message)
+
+
+def _assert_response_header(
+    assertion: CompiledAssertion, http_response: Any, body: Any, document: ResponseDocument,
+) -> AssertionResult:
+    headers = getattr(http_response, 'headers', None) or {}
+    name = assertion.header_name
+    if name:
+        actual = headers.get(name)
+        if actual is None:
+            lowered = name.lower()
+            actual = next(
+                (value for key, value in headers.items() if key.lower() == lowered), ''
+            )
+    else:
+        actual = headers
+
+    passed = assertion.compare(actual)
+    message = f"响应头 {name}: {actual} {assertion.operator_name} {assertion.expected}"
+    return AssertionResult('response_header', assertion.expected, actual, passed, message)
+
+
+def _assert_json_value(
+    assertion: CompiledAssertion, http_response: Any, body: Any, document: ResponseDocument,
+) -> AssertionResult:
+    actual = assertion.path.evaluate(body) if assertion.path and body else body
+    passed = assertion.compare(actual)
+    message = f"JSON路径 {assertion.target} 的值 {actual} {assertion.operator_name} {assertion.expected}"
+    return AssertionResult('json_value', assertion.expected, actual, passed, message)
+
+
+def _assert_text_contains(
+    assertion: CompiledAssertion, http_response: Any, body: Any, document: ResponseDocument,
+) -> AssertionResult:
+    actual_text = document.text or ''
+    expected = assertion.expected
+    passed = str(expected) in actual_text
+    message = f"响应文本包含 '{expected}'"
+    return AssertionResult('text_contains', expected, body, passed, message)
+
+
+def _assert_json_schema(
+    assertion: CompiledAssertion, http_response: Any, body: Any, document: ResponseDocument,
+) -> AssertionResult:
+    return _schema_engine._assert_json_schema(assertion.expected, body)
+
+
+_TYPE_HANDLERS = {
+    'status_code': _assert_status_code,
+    'response_time': _assert_response_time,
+    'response_body': _assert_response_body,
+    'response_header': _assert_response_header,
+    'json_value': _assert_json_value,
+    'text_contains': _assert_text_contains,
+    'json_schema': _assert_json_schema,
+}
+
+
+# 测试用例断言计划缓存（用例 updated_time 变化时自动重新编译）
+assertion_plan_cache = CompiledCaseCache(
+    AssertionPlan.from_test_case,
+    maxsize=getattr(settings, 'API_ASSERTION_PLAN_CACHE_SIZE', 1024),
+)
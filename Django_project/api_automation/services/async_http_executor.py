@@ -0,0 +1,261 @@
+"""
+异步HTTP请求执行引擎
+
+基于 asyncio + httpx.AsyncClient 实现，与 HttpExecutor 保持相同的
+execute_request 调用约定和 HttpResponse 响应结构，用于批量执行和
+/batch/ 端点中需要同时驱动大量请求的场景：单个工作进程即可通过
+有界连接池并发发送数百个请求，而无需为每个在途请求占用一个线程。
+
+httpx 为可选依赖，未安装时 ASYNC_HTTP_ENABLED 为 False，
+调用方应回退到同步的 HttpExecutor。
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+
+from api_automation.services.http_executor import HttpExecutor, HttpResponse
+
+logger = logging.getLogger(__name__)
+
+# 尝试导入httpx（非必须依赖，不可用时静默降级）
+try:
+    import httpx
+    ASYNC_HTTP_ENABLED = True
+except ImportError:
+    httpx = None
+    ASYNC_HTTP_ENABLED = False
+
+# 连接池默认保活连接数上限
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+
+
+class AsyncHttpExecutor(HttpExecutor):
+    """
+    异步HTTP请求执行器
+
+    复用 HttpExecutor 的URL拼接、变量替换、请求体准备和响应解析逻辑，
+    仅将网络发送替换为 httpx.AsyncClient。连接池大小由 max_connections
+    限制，execute_many 额外通过信号量限制同时在途的请求数。
+    isolate_cookies 为 True 时每个请求使用独立的客户端（独立 Cookie），
+    底层连接仍来自同一个有界连接池。
+
+    使用方式:
+        async with AsyncHttpExecutor(max_connections=200) as executor:
+            response = await executor.execute_request('GET', '/users', base_url)
+    """
+
+    def __init__(
+        self,
+        timeout: int = 30,
+        verify_ssl: bool = True,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: int = DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+        isolate_cookies: bool = False,
+    ):
+        """
+        初始化异步HTTP执行器
+
+        Args:
+            timeout: 请求超时时间（秒），默认30秒
+            verify_ssl: 是否验证SSL证书，默认True
+            max_connections: 连接池最大连接数，默认取 settings.API_ASYNC_MAX_CONNECTIONS
+            max_keepalive_connections: 连接池最大保活连接数
+            isolate_cookies: 是否为每个请求使用独立的 Cookie（互不相关的请求并发执行时使用）
+        """
+        if not ASYNC_HTTP_ENABLED:
+            raise RuntimeError("httpx库未安装，异步HTTP执行器不可用")
+
+        if max_connections is None:
+            max_connections = getattr(settings, 'API_ASYNC_MAX_CONNECTIONS', 100)
+
+        self.timeout = timeout
+        self.verify_ssl = verify_ssl
+        self.max_connections = max_connections
+        self.isolate_cookies = isolate_cookies
+        self.session = None
+        self.transport = httpx.AsyncHTTPTransport(
+            verify=verify_ssl,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=min(
+                    max_keepalive_connections, max_connections
+                ),
+            ),
+        )
+        self.client = self._new_client()
+
+    def _new_client(self) -> 'httpx.AsyncClient':
+        """创建共享 transport（连接池）的客户端，每个客户端持有独立的 Cookie"""
+        return httpx.AsyncClient(
+            transport=self.transport,
+            timeout=self.timeout,
+            headers={'User-Agent': 'API-Automation-Platform/1.0'},
+        )
+
+    async def __aenter__(self) -> 'AsyncHttpExecutor':
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    async def execute_request(
+        self,
+        method: str,
+        url: str,
+        base_url: str = "",
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[Dict[str, Any]] = None,
+        global_variables: Optional[Dict[str, Any]] = None
+    ) -> HttpResponse:
+        """
+        异步执行HTTP请求
+
+        参数与返回值同 HttpExecutor.execute_request。
+
+        Returns:
+            HttpResponse: 统一封装的响应对象
+        """
+        response = HttpResponse()
+
+        try:
+            full_url = self._build_full_url(base_url, url)
+
+            if global_variables:
+                full_url = self._replace_variables(full_url, global_variables)
+                headers = self._replace_variables_dict(headers, global_variables)
+                params = self._replace_variables_dict(params, global_variables)
+                body = self._replace_variables_dict(body, global_variables)
+
+            request_headers = dict(headers) if headers else {}
+            request_params = params or {}
+            request_kwargs = {}
+
+            # multipart文件上传：移除手动设置的Content-Type，由httpx生成boundary
+            files = self._split_multipart_files(method, request_headers, body)
+            if files is not None:
+                files, data = files
+                request_headers = {
+                    k: v for k, v in request_headers.items()
+                    if k.lower() != 'content-type'
+                }
+                request_kwargs = {'files': files, 'data': data}
+            else:
+                request_body = self._prepare_request_body(
+                    method, body, request_headers
+                )
+                if isinstance(request_body, dict):
+                    request_kwargs = {'data': request_body}
+                elif request_body is not None:
+                    request_kwargs = {'content': request_body}
+
+            logger.info(f"Executing async {method} {full_url}")
+
+            # 独立客户端不单独关闭：关闭会连带关闭共享的 transport，
+            # 连接池统一由 aclose 释放
+            client = self._new_client() if self.isolate_cookies else self.client
+
+            start_time = time.time()
+            raw_response = await client.request(
+                method=method.upper(),
+                url=full_url,
+                headers=request_headers,
+                params=request_params,
+                **request_kwargs
+            )
+
+            response.response_time = round((time.time() - start_time) * 1000)
+            response.status_code = raw_response.status_code
+            response.headers = dict(raw_response.headers)
+            response.raw_response = raw_response
+            response.body = self._parse_response_body(raw_response)
+            response.body_size = len(raw_response.content)
+
+            logger.info(
+                f"Response received: {response.status_code} "
+                f"in {response.response_time}ms"
+            )
+
+        except httpx.TimeoutException:
+            response.error = f"Request timeout after {self.timeout} seconds"
+            logger.error(f"Request timeout: {url}")
+
+        except httpx.TransportError as e:
+            response.error = f"Connection error: {str(e)}"
+            logger.error(f"Connection error: {url} - {str(e)}")
+
+        except httpx.HTTPError as e:
+            response.error = f"Request error: {str(e)}"
+            logger.error(f"Request error: {url} - {str(e)}")
+
+        except Exception as e:
+            response.error = f"Unexpected error: {str(e)}"
+            logger.error(f"Unexpected error: {url} - {str(e)}")
+
+        return response
+
+    async def execute_many(
+        self,
+        requests_data: List[Dict[str, Any]],
+        concurrency: int = 50,
+    ) -> List[HttpResponse]:
+        """
+        并发执行多个请求，返回顺序与输入一致
+
+        Args:
+            requests_data: 请求配置列表，每项为 execute_request 的关键字参数
+            concurrency: 同时在途的最大请求数
+
+        Returns:
+            与输入顺序一一对应的 HttpResponse 列表
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(request_data: Dict[str, Any]) -> HttpResponse:
+            async with semaphore:
+                return await self.execute_request(**request_data)
+
+        return list(await asyncio.gather(*(run(item) for item in requests_data)))
+
+    def _split_multipart_files(
+        self,
+        method: str,
+        request_headers: Dict[str, str],
+        body: Any,
+    ) -> Optional[tuple]:
+        """
+        拆分multipart请求体中的文件字段和普通字段
+
+        Returns:
+            (files, data) 元组；非multipart或不含文件时返回None
+        """
+        if method.upper() not in self.BODY_METHODS or not isinstance(body, dict):
+            return None
+        if 'multipart/form-data' not in request_headers.get('Content-Type', ''):
+            return None
+
+        files = {}
+        data = {}
+        for key, value in body.items():
+            if hasattr(value, 'read') or isinstance(value, tuple):
+                files[key] = value
+            else:
+                data[key] = value
+
+        if not files:
+            return None
+        return files, data
+
+    async def aclose(self):
+        """关闭异步客户端，释放连接池资源"""
+        if self.client:
+            await self.client.aclose()
+
+    def close(self):
+        """同步关闭入口（在事件循环外调用）"""
+        if self.client and not self.client.is_closed:
+            asyncio.run(self.client.aclose())
@@ -7,31 +7,53 @@
 1. 获取待执行的测试用例列表
 2. 创建执行记录（ApiTestExecution）
 3. 初始化变量池和HTTP执行器
-4. 按顺序逐条执行测试用例：
+4. 按依赖关系调度执行测试用例（max_workers<=1 时按顺序逐条执行）：
    - 构建请求（替换变量占位符）
    - 发送HTTP请求
    - 执行断言验证
    - 执行数据提取（填充变量池）
    - 保存测试结果（分级存储）
 5. 通过WebSocket实时推送执行进度
+6. 执行可被取消：取消标志在用例之间和等待HTTP响应时检查，
+   取消后不再调度剩余用例，等待中的请求被放弃，执行状态置为 CANCELLED
+
+数据库访问按批进行：用例连同启用的断言/提取配置一次性预取，
+测试结果先写入缓冲区，每满 result_chunk_size 条通过 bulk_create 写入
+并同步一次执行统计，数据库往返次数与用例数无关。
 """
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
+from django.conf import settings
+from django.db.models import Prefetch, QuerySet
 from django.utils import timezone
 
 from api_automation.models import (
     ApiCollection,
     ApiProject,
     ApiTestCase,
+    ApiTestCaseAssertion,
+    ApiTestCaseExtraction,
     ApiTestEnvironment,
     ApiTestExecution,
     ApiTestResult,
 )
-from api_automation.services.assertion_engine import AssertionEngine
+from api_automation.services.assertion_plan import assertion_plan_cache
+from api_automation.services.cancellation import (
+    REASON_LEASE_LOST, ExecutionCancelled, cancellation_registry,
+)
+from api_automation.services.connection_pool_registry import connection_pool_registry
+from api_automation.services.dashboard_cache import dashboard_cache
+from api_automation.services.dashboard_rollup_service import dashboard_rollup_service
+from api_automation.services.execution_broadcaster import ExecutionBroadcaster
+from api_automation.services.execution_scheduler import DependencyScheduler
 from api_automation.services.extraction_engine import ExtractionEngine
-from api_automation.services.http_executor import HttpExecutor
+from api_automation.services.http_executor import HttpExecutor, HttpResponse
+from api_automation.services.request_template import request_template_cache
+from api_automation.services.response_document import ResponseDocument
 from api_automation.services.result_storage_service import ResultStorageService
 from api_automation.services.variable_pool_service import VariablePool
 from api_automation.services.websocket_service import WebSocketBroadcastService
@@ -44,13 +66,46 @@ class BatchExecutionService:
     批量执行服务
 
     管理测试用例的批量执行生命周期，包括执行记录创建、
-    变量池管理、逐条用例执行、结果统计和WebSocket通知。
+    变量池管理、用例调度执行、结果统计和WebSocket通知。
+
+    并发度由 max_workers 控制（默认读取 settings.API_BATCH_MAX_WORKERS，
+    未配置时为1即顺序执行）。并发模式下无变量依赖的用例同时执行，
+    存在 ${shared.x}/${global.x} 依赖的用例仍按生产者 -> 消费者顺序执行。
+
+    测试结果按 result_chunk_size（默认读取 settings.API_BATCH_RESULT_CHUNK_SIZE）
+    分块批量写入，执行统计在每块写入时同步一次。
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        result_chunk_size: Optional[int] = None,
+    ):
+        """
+        初始化批量执行服务
+
+        Args:
+            max_workers: 最大并发执行数（可选，默认读取配置）
+            result_chunk_size: 测试结果批量写入的块大小（可选，默认读取配置）
+        """
+        if max_workers is None:
+            max_workers = getattr(settings, 'API_BATCH_MAX_WORKERS', 1)
+        if result_chunk_size is None:
+            result_chunk_size = getattr(settings, 'API_BATCH_RESULT_CHUNK_SIZE', 50)
+
+        self.max_workers = max(1, int(max_workers))     # 最大并发执行数
+        self.result_chunk_size = max(1, int(result_chunk_size))  # 结果批量写入块大小
+        self.request_timeout = getattr(settings, 'API_BATCH_REQUEST_TIMEOUT', 30)  # 单个请求超时（秒）
         self.variable_pool = None                       # 当前执行周期的变量池
         self.websocket = WebSocketBroadcastService()    # WebSocket广播服务
-        self.executor = None                            # HTTP执行器实例
+        self.broadcaster = None                         # 当前执行的节流广播器
+        self.executor = None                            # HTTP执行器实例（主线程）
+        self._thread_local = threading.local()          # 并发模式下各线程独立的执行器
+        self._thread_executors = []                     # 已创建的线程执行器（用于统一关闭）
+        self._stats_lock = threading.Lock()             # 保护执行统计与结果缓冲区的并发更新
+        self._pending_results = []                      # 待批量写入的测试结果
+        self._cancel_token = None                       # 当前执行的取消标志
+        self._request_pool = None                       # 发送HTTP请求的线程池（等待响应时可响应取消）
 
     def execute_by_collection(
         self,
@@ -58,6 +113,7 @@ class BatchExecutionService:
         environment_id: int,
         user_id: int,
         execution_name: Optional[str] = None,
+        run_now: bool = True,
     ) -> ApiTestExecution:
         """
         按集合执行测试
@@ -67,6 +123,8 @@ class BatchExecutionService:
             environment_id: 环境ID
             user_id: 执行用户ID
             execution_name: 执行名称（可选）
+            run_now: 是否立即在当前线程执行；为False时仅创建 PENDING
+                执行记录，由执行队列的工作进程调用 run_execution 执行
 
         Returns:
             ApiTestExecution实例
@@ -76,8 +134,8 @@ class BatchExecutionService:
             collection = ApiCollection.objects.get(id=collection_id)
             environment = ApiTestEnvironment.objects.get(id=environment_id)
 
-            # 获取集合中所有测试用例
-            test_cases = list(collection.test_cases.filter(is_deleted=False))
+            # 获取集合中所有测试用例（连同断言/提取配置一次性预取）
+            test_cases = self._load_test_cases(collection.test_cases.filter(is_deleted=False))
 
             if not test_cases:
                 raise ValueError(f"集合 {collection.name} 中没有测试用例")
@@ -93,7 +151,8 @@ class BatchExecutionService:
             )
 
             # 执行测试
-            self._execute_batch(execution, test_cases, environment)
+            if run_now:
+                self._execute_batch(execution, test_cases, environment)
 
             return execution
 
@@ -107,6 +166,7 @@ class BatchExecutionService:
         environment_id: int,
         user_id: int,
         execution_name: Optional[str] = None,
+        run_now: bool = True,
     ) -> ApiTestExecution:
         """
         按项目执行所有测试用例
@@ -116,6 +176,8 @@ class BatchExecutionService:
             environment_id: 环境ID
             user_id: 执行用户ID
             execution_name: 执行名称（可选）
+            run_now: 是否立即在当前线程执行；为False时仅创建 PENDING
+                执行记录，由执行队列的工作进程调用 run_execution 执行
 
         Returns:
             ApiTestExecution实例
@@ -126,7 +188,7 @@ class BatchExecutionService:
             environment = ApiTestEnvironment.objects.get(id=environment_id)
 
             # 获取项目下所有测试用例（包括未分配到集合的）
-            test_cases = list(project.test_cases.filter(is_deleted=False))
+            test_cases = self._load_test_cases(project.test_cases.filter(is_deleted=False))
 
             if not test_cases:
                 raise ValueError(f"项目 {project.name} 中没有测试用例")
@@ -142,7 +204,8 @@ class BatchExecutionService:
             )
 
             # 执行测试
-            self._execute_batch(execution, test_cases, environment)
+            if run_now:
+                self._execute_batch(execution, test_cases, environment)
 
             return execution
 
@@ -156,6 +219,7 @@ class BatchExecutionService:
         environment_id: int,
         user_id: int,
         execution_name: Optional[str] = None,
+        run_now: bool = True,
     ) -> ApiTestExecution:
         """
         按手动选择的测试用例执行
@@ -165,17 +229,29 @@ class BatchExecutionService:
             environment_id: 环境ID
             user_id: 执行用户ID
             execution_name: 执行名称（可选）
+            run_now: 是否立即在当前线程执行；为False时仅创建 PENDING
+                执行记录，由执行队列的工作进程调用 run_execution 执行
 
         Returns:
             ApiTestExecution实例
         """
         try:
+            # 一次查询加载所有选中用例，并按选择顺序排列
+            cases_by_id = {
+                test_case.id: test_case
+                for test_case in self._load_test_cases(
+                    ApiTestCase.objects.filter(id__in=test_case_ids)
+                )
+            }
+
             # 验证所有用例属于同一项目
             test_cases = []
             project_id = None
 
             for tc_id in test_case_ids:
-                test_case = ApiTestCase.objects.get(id=tc_id)
+                test_case = cases_by_id.get(int(tc_id))
+                if test_case is None:
+                    raise ApiTestCase.DoesNotExist(f"测试用例 {tc_id} 不存在")
                 if project_id is None:
                     project_id = test_case.project_id
                 elif test_case.project_id != project_id:
@@ -201,7 +277,8 @@ class BatchExecutionService:
             )
 
             # 执行测试
-            self._execute_batch(execution, test_cases, environment)
+            if run_now:
+                self._execute_batch(execution, test_cases, environment)
 
             return execution
 
@@ -209,6 +286,59 @@ class BatchExecutionService:
             logger.error(f"Error executing by selection: {e}")
             raise
 
+    def run_execution(self, execution: ApiTestExecution) -> ApiTestExecution:
+        """
+        执行一条已创建的执行记录（供执行队列工作进程调用）
+
+        按执行记录中保存的用例ID顺序加载用例，已删除的用例被跳过。
+
+        Args:
+            execution: 执行记录（通常为 PENDING 状态）
+
+        Returns:
+            执行完成后的执行记录
+        """
+        environment = execution.environment
+        if environment is None:
+            raise ValueError(f"执行 {execution.name} 的执行环境不存在")
+
+        cases_by_id = {
+            test_case.id: test_case
+            for test_case in self._load_test_cases(
+                ApiTestCase.objects.filter(id__in=execution.test_cases, is_deleted=False)
+            )
+        }
+        test_cases = [
+            cases_by_id[tc_id] for tc_id in execution.test_cases if tc_id in cases_by_id
+        ]
+
+        self._execute_batch(execution, test_cases, environment)
+        return execution
+
+    def _load_test_cases(self, queryset: QuerySet) -> List[ApiTestCase]:
+        """
+        加载测试用例并预取启用的断言和提取配置
+
+        执行阶段的断言计划编译和数据提取都读取预取结果，
+        不再为每个用例单独查询。
+
+        Args:
+            queryset: 测试用例查询集
+
+        Returns:
+            测试用例列表
+        """
+        return list(queryset.prefetch_related(
+            Prefetch(
+                'assertions',
+                queryset=ApiTestCaseAssertion.objects.filter(is_enabled=True),
+            ),
+            Prefetch(
+                'extractions',
+                queryset=ApiTestCaseExtraction.objects.filter(is_enabled=True),
+            ),
+        ))
+
     def _create_execution(
         self,
         project: ApiProject,
@@ -263,24 +393,27 @@ class BatchExecutionService:
             test_cases: 测试用例列表
             environment: 测试环境
         """
+        # 进度与结果事件经节流广播器合并发送，状态事件立即发送
+        self.broadcaster = ExecutionBroadcaster(execution.id, self.websocket).start()
         try:
             # 更新执行状态为运行中
             execution.status = 'RUNNING'
             execution.start_time = timezone.now()
             execution.save()
+            dashboard_cache.bump([execution.project_id])
 
             # 初始化变量池
             self.variable_pool = VariablePool(environment)
-            self.executor = HttpExecutor()
+            self.executor = HttpExecutor(
+                timeout=self.request_timeout, pool_registry=connection_pool_registry
+            )
 
             # 通过WebSocket通知执行开始
-            self.websocket.broadcast_execution_status(
-                execution.id,
-                {'status': 'RUNNING', 'message': '开始执行批量测试'}
-            )
+            self.broadcaster.status('RUNNING', '开始执行批量测试')
 
-            # 按顺序执行每个测试用例
-            for index, test_case in enumerate(test_cases):
+            def run_test_case(index: int, test_case: ApiTestCase):
+                if cancel_token.is_cancelled:
+                    return
                 try:
                     # 执行单个测试用例
                     self._execute_single_test_case(
@@ -291,11 +424,40 @@ class BatchExecutionService:
                         total=len(test_cases),
                     )
 
+                except ExecutionCancelled:
+                    logger.info(f"Test case {test_case.name} aborted by cancellation")
+
                 except Exception as e:
                     logger.error(f"Error executing test case {test_case.name}: {e}")
                     # 创建错误结果
                     self._create_error_result(execution, test_case, str(e))
 
+            # 按依赖关系调度执行每个测试用例
+            cancel_token = cancellation_registry.register(execution.id)
+            self._cancel_token = cancel_token
+            self._request_pool = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix='api-http',
+            )
+            try:
+                DependencyScheduler(self.max_workers).run(
+                    test_cases, run_test_case, cancel_token=cancel_token
+                )
+            finally:
+                cancellation_registry.unregister(execution.id)
+                self._release_http_resources()
+                # 写入缓冲区中剩余的测试结果（失去租约时任务已交给下一次尝试，丢弃缓冲）
+                if cancel_token.reason != REASON_LEASE_LOST:
+                    with self._stats_lock:
+                        self._flush_results(execution)
+
+            if cancel_token.reason == REASON_LEASE_LOST:
+                logger.warning(f"Execution {execution.id} abandoned after losing its queue lease")
+                return
+            if cancel_token.is_cancelled:
+                self._finish_cancelled(execution)
+                return
+
             # 更新执行状态为完成
             execution.status = 'COMPLETED'
             execution.end_time = timezone.now()
@@ -308,15 +470,10 @@ class BatchExecutionService:
             execution.save()
 
             # 通过WebSocket通知执行完成
-            self.websocket.broadcast_execution_status(
-                execution.id,
-                {
-                    'status': 'COMPLETED',
-                    'passed_count': execution.passed_count,
-                    'failed_count': execution.failed_count,
-                    'skipped_count': execution.skipped_count,
-                    'message': '批量测试执行完成'
-                }
+            self.broadcaster.status(
+                'COMPLETED',
+                f'批量测试执行完成: {execution.passed_count} 通过, '
+                f'{execution.failed_count} 失败, {execution.skipped_count} 跳过'
             )
 
             logger.info(f"Execution {execution.name} completed: {execution.passed_count} passed, {execution.failed_count} failed")
@@ -327,12 +484,27 @@ class BatchExecutionService:
             execution.end_time = timezone.now()
             execution.save()
 
-            self.websocket.broadcast_execution_status(
-                execution.id,
-                {'status': 'FAILED', 'message': f'批量执行失败: {str(e)}'}
-            )
+            self.broadcaster.status('FAILED', f'批量执行失败: {str(e)}')
             raise
 
+        finally:
+            self.broadcaster.close()
+            self._apply_rollup(execution)
+
+    def _apply_rollup(self, execution: ApiTestExecution):
+        """
+        将已结束执行的结果累加到仪表盘日汇总，失败时只记录日志（可由回填命令补齐），
+        并使项目的仪表盘缓存失效
+
+        Args:
+            execution: 执行记录
+        """
+        try:
+            dashboard_rollup_service.apply_execution(execution)
+        except Exception as e:
+            logger.error(f"Error updating dashboard rollups for execution {execution.id}: {e}")
+        dashboard_cache.bump([execution.project_id])
+
     def _execute_single_test_case(
         self,
         execution: ApiTestExecution,
@@ -353,55 +525,43 @@ class BatchExecutionService:
         """
         start_time = timezone.now()
 
-        # 通过WebSocket通知当前执行进度
-        self.websocket.broadcast_execution_status(
-            execution.id,
-            {
-                'current_index': index,
-                'total': total,
-                'current_test_case': test_case.name,
-                'progress': int((index / total) * 100),
-            }
-        )
-
         # 构建请求数据（替换变量）
         request_data = self._build_request_data(test_case, environment)
 
         # 执行HTTP请求
-        http_response = self.executor.execute_request(
-            method=request_data['method'],
-            url=request_data['url'],
-            headers=request_data.get('headers', {}),
-            params=request_data.get('params', {}),
-            body=request_data.get('body', {}),
-        )
+        http_response = self._send_request(request_data)
 
         # 构建响应数据
         response_data = self._build_response_data(http_response)
 
+        # 响应文档：断言与数据提取共享同一份解析结果
+        document = ResponseDocument.from_response(http_response)
+
         # 执行断言
-        assertion_results = self._execute_assertions(test_case, http_response)
+        assertion_results = self._execute_assertions(test_case, http_response, document)
 
         # 数据提取
-        self._execute_extractions(test_case, http_response)
+        self._execute_extractions(test_case, http_response, document)
 
         # 判断测试状态
         status = self._determine_test_status(assertion_results, http_response)
 
-        # 创建测试结果（使用分级存储）
-        test_result = ApiTestResult.objects.create(
+        # 构建测试结果（使用分级存储），写入缓冲区等待批量保存
+        test_result = ApiTestResult(
             execution=execution,
             test_case=test_case,
             status=status,
-            response_status=http_response.get('status_code'),
-            response_time=http_response.get('response_time', 0),
+            response_status=http_response.status_code,
+            response_time=int(http_response.response_time or 0),
+            response_size=http_response.body_size,
             request_url=request_data['url'],
             request_method=request_data['method'],
+            error_message=http_response.error,
             start_time=start_time,
             end_time=timezone.now(),
         )
 
-        # 使用分级存储服务保存结果
+        # 使用分级存储服务填充结果字段
         ResultStorageService.save_result(
             test_result=test_result,
             http_response=http_response,
@@ -411,16 +571,173 @@ class BatchExecutionService:
         )
 
         # 更新执行统计
-        if status == 'PASSED':
-            execution.passed_count += 1
-        elif status == 'FAILED':
-            execution.failed_count += 1
-        else:
-            execution.skipped_count += 1
+        counter = {
+            'PASSED': 'passed_count',
+            'FAILED': 'failed_count',
+        }.get(status, 'skipped_count')
+        self._record_result(execution, test_result, counter)
+
+        logger.debug(f"Test case {test_case.name} completed with status: {status}")
 
+    def _send_request(self, request_data: Dict[str, Any]) -> HttpResponse:
+        """
+        发送HTTP请求，等待响应期间响应取消信号
+
+        请求在 _request_pool 中执行，当前线程同时等待响应完成和取消信号；
+        取消时立即放弃等待并抛出 ExecutionCancelled。被放弃的请求使用的连接
+        来自共享连接池，无法在不影响其他执行的情况下从外部关闭，因此最迟在
+        API_BATCH_REQUEST_TIMEOUT 秒后超时结束，其连接随后被丢弃。
+
+        Args:
+            request_data: 请求数据
+
+        Returns:
+            HttpResponse
+
+        Raises:
+            ExecutionCancelled: 执行已被取消
+        """
+        executor = self._get_executor()
+        request_kwargs = {
+            'method': request_data['method'],
+            'url': request_data['url'],
+            'base_url': request_data.get('base_url', ''),
+            'headers': request_data.get('headers', {}),
+            'params': request_data.get('params', {}),
+            'body': request_data.get('body', {}),
+        }
+
+        cancel_token, request_pool = self._cancel_token, self._request_pool
+        if cancel_token is None or request_pool is None:
+            return executor.execute_request(**request_kwargs)
+
+        cancel_token.raise_if_cancelled()
+        finished = threading.Event()
+        future = request_pool.submit(executor.execute_request, **request_kwargs)
+        future.add_done_callback(lambda _: finished.set())
+        cancel_token.add_callback(finished.set)
+        try:
+            finished.wait()
+        finally:
+            cancel_token.remove_callback(finished.set)
+
+        if not future.done():
+            raise ExecutionCancelled()
+        return future.result()
+
+    def _release_http_resources(self):
+        """关闭本次执行使用的HTTP执行器和请求线程池，归还连接"""
+        self._close_thread_executors()
+        if self.executor is not None:
+            self.executor.close()
+        if self._request_pool is not None:
+            # 不等待被放弃的请求，它们会在执行器超时后自行结束
+            self._request_pool.shutdown(wait=False, cancel_futures=True)
+        self._cancel_token = None
+        self._request_pool = None
+
+    def _finish_cancelled(self, execution: ApiTestExecution):
+        """
+        将被取消的执行标记为 CANCELLED 并通知前端
+
+        Args:
+            execution: 执行记录
+        """
+        execution.status = 'CANCELLED'
+        execution.end_time = timezone.now()
+        if execution.start_time:
+            execution.duration = int((execution.end_time - execution.start_time).total_seconds())
         execution.save()
 
-        logger.debug(f"Test case {test_case.name} completed with status: {status}")
+        self.broadcaster.status(
+            'CANCELLED',
+            f'执行已取消: 已完成 {execution.passed_count + execution.failed_count + execution.skipped_count}'
+            f'/{execution.total_count} 个用例'
+        )
+        logger.info(f"Execution {execution.name} cancelled")
+
+    def _record_result(
+        self,
+        execution: ApiTestExecution,
+        test_result: ApiTestResult,
+        counter: str,
+    ):
+        """
+        将测试结果加入写入缓冲区并累加执行统计
+
+        缓冲区满 result_chunk_size 条时批量写入。
+
+        Args:
+            execution: 执行记录
+            test_result: 未保存的测试结果
+            counter: 需要累加的统计字段（passed_count/failed_count/skipped_count）
+        """
+        with self._stats_lock:
+            self._pending_results.append(test_result)
+            setattr(execution, counter, getattr(execution, counter) + 1)
+            completed = execution.passed_count + execution.failed_count + execution.skipped_count
+            passed_count, failed_count = execution.passed_count, execution.failed_count
+            if len(self._pending_results) >= self.result_chunk_size:
+                self._flush_results(execution)
+
+        # 通过WebSocket（节流）通知用例结果和执行进度
+        if self.broadcaster is not None:
+            self.broadcaster.test_result(
+                test_case_id=test_result.test_case_id,
+                test_case_name=test_result.test_case.name,
+                result=test_result.status,
+                response_time=test_result.response_time,
+                status_code=test_result.response_status,
+                error_message=test_result.error_message,
+            )
+            self.broadcaster.progress(
+                completed, execution.total_count,
+                passed_count=passed_count, failed_count=failed_count,
+            )
+
+    def _flush_results(self, execution: ApiTestExecution):
+        """
+        批量写入缓冲区中的测试结果并同步执行统计（调用方需持有 _stats_lock）
+
+        Args:
+            execution: 执行记录
+        """
+        results, self._pending_results = self._pending_results, []
+        if not results:
+            return
+
+        ApiTestResult.objects.bulk_create(results, batch_size=self.result_chunk_size)
+        execution.save(update_fields=['passed_count', 'failed_count', 'skipped_count'])
+
+    def _get_executor(self) -> HttpExecutor:
+        """
+        获取当前线程使用的HTTP执行器
+
+        主线程（顺序执行）直接使用 self.executor；并发模式下每个工作线程
+        持有独立的执行器，避免多个线程共享同一个 requests.Session。
+
+        Returns:
+            HttpExecutor实例
+        """
+        if threading.current_thread() is threading.main_thread():
+            return self.executor
+
+        executor = getattr(self._thread_local, 'executor', None)
+        if executor is None:
+            executor = HttpExecutor(
+                timeout=self.request_timeout, pool_registry=connection_pool_registry
+            )
+            self._thread_local.executor = executor
+            with self._stats_lock:
+                self._thread_executors.append(executor)
+        return executor
+
+    def _close_thread_executors(self):
+        """关闭并发模式下创建的所有线程执行器"""
+        with self._stats_lock:
+            executors, self._thread_executors = self._thread_executors, []
+        for executor in executors:
+            executor.close()
 
     def _build_request_data(
         self,
@@ -437,14 +754,18 @@ class BatchExecutionService:
         Returns:
             请求数据字典
         """
-        # 合并环境变量和全局变量
-        headers = {**environment.global_headers, **test_case.headers}
-
-        # 替换变量
-        url = self.variable_pool.replace_variables(test_case.url)
-        headers = self.variable_pool.replace_variables_in_dict(headers)
-        params = self.variable_pool.replace_variables_in_dict(test_case.params)
-        body = self.variable_pool.replace_variables_in_dict(test_case.body)
+        # 用例请求定义的编译模板（按用例缓存，用例更新后自动重新编译）
+        templates = request_template_cache.get(test_case)
+        render = self.variable_pool.render_template
+
+        # 合并环境请求头和用例请求头，并替换变量
+        headers = {
+            **self.variable_pool.replace_variables_in_dict(environment.global_headers),
+            **(render(templates['headers']) or {}),
+        }
+        url = render(templates['url'])
+        params = render(templates['params'])
+        body = render(templates['body'])
 
         return {
             'method': test_case.method,
@@ -455,7 +776,7 @@ class BatchExecutionService:
             'body': body,
         }
 
-    def _build_response_data(self, http_response: Dict[str, Any]) -> Dict[str, Any]:
+    def _build_response_data(self, http_response: HttpResponse) -> Dict[str, Any]:
         """
         构建响应数据
 
@@ -465,90 +786,109 @@ class BatchExecutionService:
         Returns:
             响应数据字典
         """
+        raw_response = http_response.raw_response
         return {
-            'status_code': http_response.get('status_code'),
-            'status_text': http_response.get('status_text', ''),
-            'response_time': http_response.get('response_time', 0),
-            'headers': http_response.get('headers', {}),
-            'body': http_response.get('body', {}),
-            'content_length': len(str(http_response.get('body', ''))),
+            'status_code': http_response.status_code,
+            'status_text': getattr(raw_response, 'reason', '') or '',
+            'response_time': http_response.response_time,
+            'headers': http_response.headers or {},
+            'body': http_response.body if http_response.body is not None else {},
+            'content_length': http_response.body_size,
         }
 
     def _execute_assertions(
         self,
         test_case: ApiTestCase,
-        http_response: Dict[str, Any],
+        http_response: HttpResponse,
+        document: Optional[ResponseDocument] = None,
     ) -> List[Dict[str, Any]]:
         """
         执行断言
 
+        使用按用例缓存的断言计划（用例未变更时不再查询断言配置）。
+
         Args:
             test_case: 测试用例
             http_response: HTTP响应
+            document: 共享的响应文档
 
         Returns:
             断言结果列表
         """
-        assertion_engine = AssertionEngine()
-        results = []
-
-        # 获取用例的所有断言配置
-        assertions = test_case.assertions.filter(is_enabled=True)
-
-        for assertion in assertions:
-            result = assertion_engine.evaluate(
-                assertion=assertion,
-                response=http_response,
-            )
-            results.append(result)
-
-        return results
+        plan = assertion_plan_cache.get(test_case)
+        return [
+            result.to_dict()
+            for result in plan.evaluate(http_response, document=document)
+        ]
 
     def _execute_extractions(
         self,
         test_case: ApiTestCase,
-        http_response: Dict[str, Any],
+        http_response: HttpResponse,
+        document: Optional[ResponseDocument] = None,
     ):
         """
         执行数据提取，并将提取的变量添加到变量池
 
+        所有提取规则共享同一个响应文档，XPath/CSS 规则再多也只解析一次响应体。
+
         Args:
             test_case: 测试用例
             http_response: HTTP响应
+            document: 共享的响应文档
         """
-        extraction_engine = ExtractionEngine()
-
-        # 获取用例的所有提取配置
-        extractions = test_case.extractions.filter(is_enabled=True)
+        # 获取用例的所有启用提取配置（在内存中过滤，兼容 prefetch_related）
+        extractions = [
+            extraction for extraction in test_case.extractions.all()
+            if extraction.is_enabled
+        ]
+        if not extractions:
+            return
+
+        if document is None:
+            document = ResponseDocument.from_response(http_response)
+
+        configs = [
+            {
+                'variable_name': extraction.variable_name,
+                'extract_type': extraction.extract_type,
+                'extract_expression': extraction.extract_expression,
+                'extract_scope': extraction.extract_scope,
+                'default_value': extraction.default_value,
+            }
+            for extraction in extractions
+        ]
+        variables, _ = ExtractionEngine().extract_variables(
+            configs,
+            http_response,
+            response_body=document.body,
+            response_text=document.raw_text,
+            document=document,
+        )
 
         for extraction in extractions:
-            try:
-                value = extraction_engine.extract(
-                    extraction=extraction,
-                    response=http_response,
+            if extraction.variable_name not in variables:
+                logger.warning(f"Failed to extract {extraction.variable_name}")
+                continue
+
+            value = variables[extraction.variable_name]
+            # 根据作用域决定添加到哪个变量池
+            if extraction.variable_scope == 'global':
+                self.variable_pool.add_global_variable(
+                    extraction.variable_name, value
+                )
+            else:
+                # 默认添加到共享变量（用例间传递）
+                self.variable_pool.add_shared_variable(
+                    extraction.variable_name, value
                 )
 
-                if value is not None:
-                    # 根据作用域决定添加到哪个变量池
-                    if extraction.variable_scope == 'global':
-                        self.variable_pool.add_global_variable(
-                            extraction.variable_name, value
-                        )
-                    else:
-                        # 默认添加到共享变量（用例间传递）
-                        self.variable_pool.add_shared_variable(
-                            extraction.variable_name, value
-                        )
-
-                    logger.debug(f"Extracted variable: {extraction.variable_name} = {value}")
-
-            except Exception as e:
-                logger.warning(f"Failed to extract {extraction.variable_name}: {e}")
+            logger.debug(f"Extracted variable: {extraction.variable_name} = {value}")
 
     def _determine_test_status(
         self,
         assertion_results: List[Dict[str, Any]],
-        http_response: Dict[str, Any],
+        http_response: HttpResponse,
     ) -> str:
         """
         判断测试状态
@@ -561,7 +901,7 @@ class BatchExecutionService:
             测试状态 (PASSED/FAILED/ERROR)
         """
         # 检查HTTP状态码
-        status_code = http_response.get('status_code', 0)
+        status_code = http_response.status_code
 
         # 如果HTTP请求失败
         if status_code == 0:
@@ -589,14 +929,13 @@ class BatchExecutionService:
             test_case: 测试用例
             error_message: 错误信息
         """
-        ApiTestResult.objects.create(
+        now = timezone.now()
+        test_result = ApiTestResult(
             execution=execution,
             test_case=test_case,
             status='ERROR',
             error_message=error_message,
-            start_time=timezone.now(),
-            end_time=timezone.now(),
+            start_time=now,
+            end_time=now,
         )
-
-        execution.failed_count += 1
-        execution.save()
+        self._record_result(execution, test_result, 'failed_count')
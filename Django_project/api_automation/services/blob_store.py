@@ -0,0 +1,316 @@
+"""
+内容寻址的大对象存储
+
+完整请求/响应体原先以 JSON 文本直接写入 ApiTestResult / ApiHttpExecutionRecord，
+同一个失败接口反复返回相同的大错误页时会成倍放大数据库体积。
+
+BlobStore 将内容按 SHA-256 摘要存入 ApiContentBlob：
+- 写入：相同内容只存储一份（zlib 压缩，压缩无收益时原样存储），每次写入引用计数加一，
+  业务行只保存摘要
+- 读取：按摘要延迟加载，解压结果按总字节数受限的 LRU 缓存（内容不可变，缓存无需失效）；
+  列表展示可先用 prefetch 一次查询加载整页内容
+- 删除：删除业务行前调用 release / release_for 按引用数递减，计数归零的对象随之删除；
+  外键级联删除等绕过业务代码的路径由 sweep（gc_content_blobs 管理命令）按实际引用重算计数
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from datetime import timedelta
+from typing import Any, Dict, Iterable, Optional
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, QuerySet
+from django.utils import timezone
+
+from api_automation.models import ApiContentBlob, ApiHttpExecutionRecord, ApiTestResult
+
+logger = logging.getLogger(__name__)
+
+# 保存摘要引用的模型字段，sweep 据此重算引用计数
+REFERENCE_FIELDS = (
+    (ApiTestResult, ('request_body_hash', 'response_body_hash')),
+    (ApiHttpExecutionRecord, ('response_body_hash',)),
+)
+
+
+class BlobStore:
+    """
+    内容寻址、引用计数的压缩存储
+    """
+
+    def __init__(self, compress_level: Optional[int] = None, cache_bytes: Optional[int] = None):
+        """
+        初始化存储
+
+        Args:
+            compress_level: zlib 压缩级别（0-9），默认读取 API_BLOB_COMPRESS_LEVEL
+            cache_bytes: 解压内容缓存的最大总字节数，默认读取 API_BLOB_CACHE_BYTES
+        """
+        if compress_level is None:
+            compress_level = getattr(settings, 'API_BLOB_COMPRESS_LEVEL', 6)
+        if cache_bytes is None:
+            cache_bytes = getattr(settings, 'API_BLOB_CACHE_BYTES', 32 * 1024 * 1024)
+
+        self.compress_level = min(9, max(0, int(compress_level)))
+        self.cache_bytes = max(0, int(cache_bytes))
+        self._cache: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._cached_bytes = 0
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+
+    def put(self, content: bytes) -> str:
+        """
+        存储内容并增加一次引用
+
+        Args:
+            content: 原始内容
+
+        Returns:
+            内容摘要
+        """
+        digest = hashlib.sha256(content).hexdigest()
+
+        with transaction.atomic():
+            if ApiContentBlob.objects.filter(digest=digest).update(ref_count=F('ref_count') + 1):
+                return digest
+
+            data, encoding = self._encode(content)
+            try:
+                with transaction.atomic():
+                    ApiContentBlob.objects.create(
+                        digest=digest,
+                        data=data,
+                        encoding=encoding,
+                        size=len(content),
+                        stored_size=len(data),
+                        ref_count=1,
+                    )
+            except IntegrityError:
+                # 并发写入了相同内容
+                ApiContentBlob.objects.filter(digest=digest).update(ref_count=F('ref_count') + 1)
+
+        self._remember(digest, content)
+        return digest
+
+    def put_json(self, value: Any) -> str:
+        """
+        将值序列化为 JSON 后存储（字符串同样序列化，读取时还原原类型）
+
+        Args:
+            value: 可 JSON 序列化的值
+
+        Returns:
+            内容摘要
+        """
+        return self.put(self._dumps(value))
+
+    def _encode(self, content: bytes):
+        """压缩内容，压缩无收益时原样存储"""
+        compressed = zlib.compress(content, self.compress_level)
+        if len(compressed) < len(content):
+            return compressed, 'zlib'
+        return content, 'identity'
+
+    @staticmethod
+    def _dumps(value: Any) -> bytes:
+        """序列化为 UTF-8 JSON"""
+        return json.dumps(value, ensure_ascii=False, default=str).encode('utf-8')
+
+    # ------------------------------------------------------------------
+    # 读取
+    # ------------------------------------------------------------------
+
+    def get(self, digest: str) -> Optional[bytes]:
+        """
+        按摘要读取内容
+
+        Args:
+            digest: 内容摘要
+
+        Returns:
+            原始内容，不存在时返回 None
+        """
+        if not digest:
+            return None
+
+        with self._lock:
+            content = self._cache.get(digest)
+            if content is not None:
+                self._cache.move_to_end(digest)
+                return content
+
+        blob = ApiContentBlob.objects.filter(digest=digest).only('data', 'encoding').first()
+        if blob is None:
+            logger.warning(f"Content blob {digest} not found")
+            return None
+        content = self._decode(blob)
+        self._remember(digest, content)
+        return content
+
+    def get_json(self, digest: str, default: Any = None) -> Any:
+        """
+        按摘要读取 put_json 存储的值
+
+        Args:
+            digest: 内容摘要
+            default: 不存在时的返回值
+
+        Returns:
+            反序列化后的值
+        """
+        content = self.get(digest)
+        if content is None:
+            return default
+        return json.loads(content)
+
+    def prefetch(self, digests: Iterable[str]):
+        """
+        用一次查询将尚未缓存的内容加载到缓存（用于列表序列化）
+
+        Args:
+            digests: 内容摘要
+        """
+        with self._lock:
+            missing = {digest for digest in digests if digest and digest not in self._cache}
+        if not missing:
+            return
+        for blob in ApiContentBlob.objects.filter(digest__in=missing).only('digest', 'data', 'encoding'):
+            self._remember(blob.digest, self._decode(blob))
+
+    @staticmethod
+    def _decode(blob: ApiContentBlob) -> bytes:
+        """按存储编码还原原始内容"""
+        data = bytes(blob.data)
+        if blob.encoding == 'zlib':
+            return zlib.decompress(data)
+        return data
+
+    def _remember(self, digest: str, content: bytes):
+        """将内容放入LRU缓存，超出总字节数时淘汰最久未用的条目"""
+        if len(content) > self.cache_bytes:
+            return
+        with self._lock:
+            if digest in self._cache:
+                self._cache.move_to_end(digest)
+                return
+            self._cache[digest] = content
+            self._cached_bytes += len(content)
+            while self._cached_bytes > self.cache_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cached_bytes -= len(evicted)
+
+    # ------------------------------------------------------------------
+    # 删除
+    # ------------------------------------------------------------------
+
+    def release(self, digests: Iterable[str]) -> int:
+        """
+        释放引用（每出现一次递减一次），删除引用计数归零的对象
+
+        Args:
+            digests: 被删除的行所引用的摘要（可重复、可为空串）
+
+        Returns:
+            删除的对象数
+        """
+        counts = Counter(digest for digest in digests if digest)
+        if not counts:
+            return 0
+
+        # 按释放次数分组，每组一条 UPDATE
+        by_count: Dict[int, list] = {}
+        for digest, count in counts.items():
+            by_count.setdefault(count, []).append(digest)
+
+        with transaction.atomic():
+            for count, group in by_count.items():
+                ApiContentBlob.objects.filter(digest__in=group).update(
+                    ref_count=F('ref_count') - count
+                )
+            deleted, _ = ApiContentBlob.objects.filter(
+                digest__in=list(counts), ref_count__lte=0
+            ).delete()
+        return deleted
+
+    def release_for(self, queryset: QuerySet) -> int:
+        """
+        释放查询集中各行引用的内容（需在删除这些行之前调用）
+
+        Args:
+            queryset: ApiTestResult 或 ApiHttpExecutionRecord 查询集
+
+        Returns:
+            删除的对象数
+        """
+        fields = dict(REFERENCE_FIELDS).get(queryset.model)
+        if not fields:
+            return 0
+        digests = []
+        for row in queryset.exclude(self._no_reference_filter(fields)).values_list(*fields):
+            digests.extend(row)
+        return self.release(digests)
+
+    @staticmethod
+    def _no_reference_filter(fields) -> Q:
+        """所有引用字段均为空的行"""
+        condition = Q()
+        for field in fields:
+            condition &= Q(**{field: ''})
+        return condition
+
+    def sweep(self, grace_minutes: int = 60) -> Dict[str, int]:
+        """
+        按实际引用重算引用计数，删除无引用的对象
+
+        刚写入尚未保存业务行的对象在 grace_minutes 内不会被删除。
+
+        Args:
+            grace_minutes: 新对象的保护期（分钟）
+
+        Returns:
+            {'updated': 修正计数的对象数, 'deleted': 删除的对象数}
+        """
+        references: Counter = Counter()
+        for model, fields in REFERENCE_FIELDS:
+            for field in fields:
+                rows = model.objects.exclude(**{field: ''}).values(field).annotate(
+                    refs=Count('id')
+                ).order_by()
+                for row in rows:
+                    references[row[field]] += row['refs']
+
+        updated = 0
+        cutoff = timezone.now() - timedelta(minutes=grace_minutes)
+        orphans: Dict[int, list] = {}
+        for blob_id, digest, ref_count, created_time in ApiContentBlob.objects.values_list(
+            'id', 'digest', 'ref_count', 'created_time'
+        ).iterator():
+            actual = references.get(digest, 0)
+            if actual == 0 and created_time < cutoff:
+                orphans.setdefault(ref_count, []).append(blob_id)
+            elif actual and actual != ref_count:
+                ApiContentBlob.objects.filter(pk=blob_id).update(ref_count=actual)
+                updated += 1
+
+        # 只删除计数未变化的对象，避免删除扫描期间刚被重新引用的内容
+        deleted = 0
+        for ref_count, blob_ids in orphans.items():
+            for start in range(0, len(blob_ids), 500):
+                deleted += ApiContentBlob.objects.filter(
+                    pk__in=blob_ids[start:start + 500], ref_count=ref_count
+                ).delete()[0]
+
+        logger.info(f"Content blob sweep: {updated} recounted, {deleted} deleted")
+        return {'updated': updated, 'deleted': deleted}
+
+
+# 全局存储实例
+blob_store = BlobStore()
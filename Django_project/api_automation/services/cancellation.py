@@ -0,0 +1,224 @@
+"""
+执行取消服务
+
+为运行中的批量执行提供协作式取消：
+
+- CancellationToken：基于 threading.Event 的内存取消标志，批量执行在用例之间、
+  调度器在提交任务前、等待HTTP响应时检查该标志，检查本身不访问数据库
+- CancellationRegistry：按执行ID登记本进程内运行中的执行；
+  取消接口在同一进程内可直接置位标志。执行可能运行在其他 Web 进程或
+  队列工作进程中，因此注册表在有登记执行时启动一个后台线程，
+  每隔 poll_interval 秒用一条查询批量检查这些执行是否已在数据库中被标记为 CANCELLED
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+# 取消原因：队列工作者失去任务租约，任务已被回收并可能由其他工作者重新执行，
+# 被放弃的执行只需尽快停止，不得再写入结果或执行状态
+REASON_LEASE_LOST = 'LEASE_LOST'
+
+
+class ExecutionCancelled(Exception):
+    """执行已被取消"""
+
+
+class CancellationToken:
+    """
+    单次执行的取消标志
+
+    cancel 时依次调用已注册的回调（如中止等待中的HTTP请求），回调异常只记录日志。
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+        self.reason: Optional[str] = None
+
+    @property
+    def is_cancelled(self) -> bool:
+        """是否已取消"""
+        return self._event.is_set()
+
+    def cancel(self, reason: Optional[str] = None):
+        """
+        置位取消标志并触发回调（重复调用无副作用）
+
+        Args:
+            reason: 取消原因，None 表示用户取消；仅首次取消时记录
+        """
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Cancellation callback failed: {e}")
+
+    def add_callback(self, callback: Callable[[], None]):
+        """
+        注册取消回调，已取消时立即调用
+
+        Args:
+            callback: 无参回调
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]):
+        """
+        移除尚未触发的取消回调
+
+        Args:
+            callback: 之前注册的回调
+        """
+        with self._lock:
+            try:
+                self._callbacks.remove(callback)
+            except ValueError:
+                pass
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        等待取消信号
+
+        Args:
+            timeout: 最长等待秒数
+
+        Returns:
+            是否已取消
+        """
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self):
+        """已取消时抛出 ExecutionCancelled"""
+        if self._event.is_set():
+            raise ExecutionCancelled()
+
+
+class CancellationRegistry:
+    """
+    进程内运行中执行的取消标志注册表
+    """
+
+    def __init__(self, poll_interval: Optional[float] = None):
+        """
+        初始化注册表
+
+        Args:
+            poll_interval: 检查数据库取消状态的间隔（秒），<=0 时不启动检查线程；
+                默认读取 API_EXECUTION_CANCEL_CHECK_INTERVAL
+        """
+        if poll_interval is None:
+            poll_interval = getattr(settings, 'API_EXECUTION_CANCEL_CHECK_INTERVAL', 2)
+
+        self.poll_interval = float(poll_interval)
+        self._tokens: Dict[int, CancellationToken] = {}
+        self._lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+
+    def register(self, execution_id: int) -> CancellationToken:
+        """
+        登记执行并返回其取消标志
+
+        Args:
+            execution_id: 执行ID
+
+        Returns:
+            CancellationToken 实例（同一执行重复登记返回同一个标志）
+        """
+        with self._lock:
+            token = self._tokens.get(execution_id)
+            if token is None:
+                token = self._tokens[execution_id] = CancellationToken()
+            self._ensure_watcher()
+        return token
+
+    def unregister(self, execution_id: int):
+        """
+        注销执行
+
+        Args:
+            execution_id: 执行ID
+        """
+        with self._lock:
+            self._tokens.pop(execution_id, None)
+
+    def get(self, execution_id: int) -> Optional[CancellationToken]:
+        """获取执行的取消标志，未登记时返回None"""
+        with self._lock:
+            return self._tokens.get(execution_id)
+
+    def cancel(self, execution_id: int, reason: Optional[str] = None) -> bool:
+        """
+        取消本进程内的执行
+
+        Args:
+            execution_id: 执行ID
+            reason: 取消原因，None 表示用户取消
+
+        Returns:
+            执行是否在本进程内运行
+        """
+        token = self.get(execution_id)
+        if token is None:
+            return False
+        token.cancel(reason)
+        return True
+
+    def _ensure_watcher(self):
+        """启动数据库取消状态检查线程（调用方需持有 _lock）"""
+        if self.poll_interval <= 0:
+            return
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._watcher = threading.Thread(
+            target=self._watch, name='execution-cancel-watcher', daemon=True
+        )
+        self._watcher.start()
+
+    def _watch(self):
+        """后台线程：批量检查已登记执行的取消状态，注册表为空时退出"""
+        from api_automation.models import ApiTestExecution
+
+        try:
+            while True:
+                time.sleep(self.poll_interval)
+                with self._lock:
+                    execution_ids = list(self._tokens)
+                    if not execution_ids:
+                        self._watcher = None
+                        return
+                try:
+                    cancelled_ids = ApiTestExecution.objects.filter(
+                        id__in=execution_ids, status='CANCELLED'
+                    ).values_list('id', flat=True)
+                    for execution_id in cancelled_ids:
+                        if self.cancel(execution_id):
+                            logger.info(f"Execution {execution_id} cancelled")
+                except Exception as e:
+                    logger.error(f"Error checking cancelled executions: {e}")
+                finally:
+                    close_old_connections()
+        finally:
+            close_old_connections()
+
+
+# 全局取消注册表实例
+cancellation_registry = CancellationRegistry()
@@ -6,19 +6,23 @@
 也会被级联标记为 is_deleted=True。
 
 主要功能：
-- 预览删除影响：展示将被级联删除的所有子数据
-- 级联软删除：递归标记父子数据的 is_deleted 字段
-- 级联恢复：递归恢复已删除的父子数据
+- 预览删除影响：按模型分组统计将被级联删除的子数据
+- 级联软删除：逐层批量标记父子数据的 is_deleted 字段
+- 级联恢复：逐层批量恢复已删除的父子数据
 - 物理删除：从数据库中彻底删除数据（用于回收站清空）
 
+各层子数据以父层的子查询表示，每层每种关系一条 UPDATE/DELETE，在同一事务中
+自底向上执行，语句数只与级联关系的层数有关，与数据量无关。
 包含SQLite数据库锁定的指数退避重试机制。
 """
 
 import logging
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Tuple
 
 from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
@@ -67,8 +71,8 @@ class CascadeDeleteService:
     """
     级联逻辑删除服务
 
-    通过配置化的级联关系映射表，实现递归的软删除、恢复和物理删除。
-    使用 visited 集合防止循环引用导致的无限递归。
+    通过配置化的级联关系映射表，按层展开子数据集合，实现批量的软删除、恢复和物理删除。
+    展开时跳过当前路径上已出现的模型，防止循环引用导致的无限展开。
     """
 
     # 级联关系配置：父模型 -> [(子模型名, 关联字段名), ...]
@@ -130,47 +134,11 @@ class CascadeDeleteService:
             'ApiTestCaseExtraction': ApiTestCaseExtraction,
         }
 
-    def _get_children(
-        self,
-        obj,
-        child_model_name: str,
-        relation_field: str,
-        is_deleted: bool
-    ):
-        """
-        获取指定父对象的子数据查询集
-
-        ApiTestCase的collection字段可能为空（未分配到集合的用例），
-        需要特殊处理查询方式。
-
-        Args:
-            obj: 父对象实例
-            child_model_name: 子模型名称
-            relation_field: 关联字段名
-            is_deleted: 过滤的is_deleted值
-
-        Returns:
-            子数据QuerySet，如果模型不存在或无is_deleted字段则返回None
-        """
-        child_model = self.model_classes.get(child_model_name)
-        if not child_model or not hasattr(child_model, 'is_deleted'):
-            return None
-
-        # ApiTestCase的collection字段特殊处理
-        if child_model_name == 'ApiTestCase' and relation_field == 'collection':
-            return child_model.objects.filter(
-                **{relation_field: obj}
-            ).filter(is_deleted=is_deleted)
-
-        return child_model.objects.filter(
-            **{relation_field: obj, 'is_deleted': is_deleted}
-        )
-
     def preview_delete(self, obj) -> Dict[str, Any]:
         """
         预览删除操作的影响范围
 
-        递归统计将被级联删除的所有子数据数量和名称。
+        按模型分组统计将被级联删除的子数据数量和名称。
 
         Args:
             obj: 要删除的模型实例
@@ -179,7 +147,9 @@ class CascadeDeleteService:
             包含目标对象信息和级联影响详情的字典
         """
         model_name = obj.__class__.__name__
-        cascade_info = self._get_cascade_info(obj, model_name)
+        cascade_info = self._summarize_levels(
+            self._descendant_levels(obj, is_deleted=False)
+        )
 
         return {
             'target': {
@@ -199,7 +169,7 @@ class CascadeDeleteService:
         """
         执行级联逻辑删除
 
-        在数据库事务中递归标记父对象及其所有子对象的 is_deleted=True。
+        在数据库事务中逐层批量标记父对象及其所有子对象的 is_deleted=True。
 
         Args:
             obj: 要删除的模型实例
@@ -211,13 +181,17 @@ class CascadeDeleteService:
 
         try:
             with transaction.atomic():
-                # 先递归删除所有子数据
-                deleted_count = self._cascade_delete_recursive(obj, model_name)
+                # 先逐层标记所有子数据
+                deleted_count = self._update_levels(
+                    self._descendant_levels(obj, is_deleted=False), is_deleted=True
+                )
 
                 # 最后标记父对象自身
                 if hasattr(obj, 'is_deleted'):
                     obj.is_deleted = True
-                    obj.save(update_fields=['is_deleted'])
+                    obj.save(update_fields=['is_deleted', 'updated_time'])
+
+                self._bump_dashboard(obj)
 
                 logger.info(
                     f"级联删除成功: {model_name}(id={obj.id}), "
@@ -243,7 +217,7 @@ class CascadeDeleteService:
         """
         恢复已删除的数据及其所有子数据
 
-        在数据库事务中递归恢复 is_deleted=True 的父对象及其子对象。
+        在数据库事务中逐层批量恢复 is_deleted=True 的父对象及其子对象。
 
         Args:
             model_name: 模型名称（如 'ApiProject'）
@@ -263,12 +237,15 @@ class CascadeDeleteService:
             with transaction.atomic():
                 obj = model_class.objects.get(id=obj_id, is_deleted=True)
 
-                # 先恢复父对象自身
-                obj.is_deleted = False
-                obj.save(update_fields=['is_deleted'])
+                # 先逐层恢复所有子数据（子数据集合以已删除的父层为条件）
+                restored_count = self._update_levels(
+                    self._descendant_levels(obj, is_deleted=True), is_deleted=False
+                )
 
-                # 再递归恢复所有子数据
-                restored_count = self._restore_recursive(obj, model_name)
+                # 再恢复父对象自身
+                obj.is_deleted = False
+                obj.save(update_fields=['is_deleted', 'updated_time'])
+                self._bump_dashboard(obj)
 
                 logger.info(
                     f"恢复数据成功: {model_name}(id={obj_id}), "
@@ -292,190 +269,159 @@ class CascadeDeleteService:
             )
             raise
 
-    def _get_cascade_info(
-        self,
-        obj,
-        model_name: str,
-        visited: Optional[set] = None
-    ) -> Dict[str, Any]:
+    @staticmethod
+    def _bump_dashboard(obj):
         """
-        递归收集级联删除的影响信息
-
-        统计每种子类型的数量和名称（最多显示前10个）。
+        递增对象所属项目的仪表盘数据版本，使仪表盘缓存失效
 
         Args:
-            obj: 模型实例
-            model_name: 模型名称
-            visited: 已访问对象的唯一标识集合（防止循环）
+            obj: 被删除或恢复的模型实例
+        """
+        from .dashboard_cache import dashboard_cache
 
-        Returns:
-            {'count': {类型: 数量}, 'details': [详情列表]}
+        project_id = obj.id if obj.__class__.__name__ == 'ApiProject' else getattr(obj, 'project_id', None)
+        if project_id:
+            dashboard_cache.bump([project_id])
+
+    def _release_executions(self, obj, levels: List[Tuple[str, QuerySet]]):
         """
-        if visited is None:
-            visited = set()
+        物理删除前撤销被清除执行的仪表盘汇总贡献，并释放其测试结果引用的内容
 
-        key = f"{model_name}_{obj.id}"
-        if key in visited:
-            return {'count': {}, 'details': []}
-        visited.add(key)
+        与删除执行接口的处理一致。项目被删除时其下所有执行随之级联删除，
+        包括未软删除的执行。
 
-        cascade_count = {}
-        cascade_details = []
+        Args:
+            obj: 被物理删除的模型实例
+            levels: _descendant_levels 返回的各层子数据
+        """
+        from .blob_store import blob_store
+        from .dashboard_cache import dashboard_cache
+        from .dashboard_rollup_service import dashboard_rollup_service
 
-        for child_model_name, relation_field in self.CASCADE_MAPPING.get(model_name, []):
-            children = self._get_children(
-                obj, child_model_name, relation_field, is_deleted=False
-            )
-            if children is None:
-                continue
+        execution_model = self.model_classes['ApiTestExecution']
+        model_name = obj.__class__.__name__
+        if model_name == 'ApiProject':
+            querysets = [execution_model.objects.filter(project=obj)]
+        else:
+            querysets = [children for name, children in levels if name == 'ApiTestExecution']
+            if model_name == 'ApiTestExecution':
+                querysets.append(execution_model.objects.filter(pk=obj.pk))
+
+        executions = {}
+        for queryset in querysets:
+            for execution in queryset:
+                executions[execution.pk] = execution
+        if not executions:
+            return
 
-            count = children.count()
-            if count == 0:
-                continue
+        for execution in executions.values():
+            dashboard_rollup_service.revert_execution(execution)
+        blob_store.release_for(
+            self.model_classes['ApiTestResult'].objects.filter(execution_id__in=list(executions))
+        )
+        dashboard_cache.bump({execution.project_id for execution in executions.values()})
 
-            display_name = self.MODEL_DISPLAY_NAMES.get(
-                child_model_name, child_model_name
-            )
-            cascade_count[child_model_name.lower()] = count
+    def _descendant_levels(self, obj, is_deleted: bool) -> List[Tuple[str, QuerySet]]:
+        """
+        按级联关系逐层展开对象的子数据
 
-            # 收集名称（前10个，超出则显示省略提示）
-            names = list(children.values_list('name', flat=True)[:10])
-            if count > 10:
-                names.append(f'...等{count}个')
+        每层子数据是以父层为子查询的查询集（不在此处求值），只包含带 is_deleted
+        字段且删除标记等于 is_deleted 的行。同一模型可能经由多条路径出现多次
+        （如测试执行同时属于项目和环境），批量更新时以删除标记条件去重。
 
-            cascade_details.append({
-                'type': child_model_name.lower(),
-                'display_type': display_name,
-                'count': count,
-                'names': names
-            })
+        Args:
+            obj: 根对象实例
+            is_deleted: 子数据的删除标记过滤值
 
-            # 递归收集子数据的级联信息
-            for child in children:
-                child_info = self._get_cascade_info(
-                    child, child_model_name, visited
-                )
-                for k, v in child_info['count'].items():
-                    cascade_count[k] = cascade_count.get(k, 0) + v
-                cascade_details.extend(child_info['details'])
+        Returns:
+            [(模型名, 查询集)]，按层级由浅到深排列
+        """
+        root_name = obj.__class__.__name__
+        levels = []
+        frontier = [(root_name, obj.__class__.objects.filter(pk=obj.pk), {root_name})]
+
+        while frontier:
+            next_frontier = []
+            for parent_name, parent_queryset, path in frontier:
+                for child_model_name, relation_field in self.CASCADE_MAPPING.get(parent_name, []):
+                    child_model = self.model_classes.get(child_model_name)
+                    if child_model_name in path or not child_model or not hasattr(child_model, 'is_deleted'):
+                        continue
+                    children = child_model.objects.filter(**{
+                        f'{relation_field}__in': parent_queryset.values('pk'),
+                        'is_deleted': is_deleted,
+                    })
+                    levels.append((child_model_name, children))
+                    next_frontier.append((child_model_name, children, path | {child_model_name}))
+            frontier = next_frontier
 
-        return {'count': cascade_count, 'details': cascade_details}
+        return levels
 
-    def _cascade_delete_recursive(
-        self,
-        obj,
-        model_name: str,
-        visited: Optional[set] = None
-    ) -> Dict[str, int]:
+    def _summarize_levels(self, levels: List[Tuple[str, QuerySet]]) -> Dict[str, Any]:
         """
-        递归执行级联软删除
+        按模型分组统计子数据数量和名称（最多显示前10个）
 
-        先深度递归删除所有子孙数据，再标记当前层级的子数据。
+        同一模型的多条路径合并为一个查询集去重，每种模型只需一次计数和一次名称查询。
 
         Args:
-            obj: 模型实例
-            model_name: 模型名称
-            visited: 已访问对象集合
+            levels: _descendant_levels 的返回值
 
         Returns:
-            各模型类型的删除数量统计
+            {'count': {类型: 数量}, 'details': [详情列表]}
         """
-        if visited is None:
-            visited = set()
+        grouped: Dict[str, Q] = {}
+        for model_name, queryset in levels:
+            condition = Q(pk__in=queryset.values('pk'))
+            grouped[model_name] = grouped[model_name] | condition if model_name in grouped else condition
 
-        key = f"{model_name}_{obj.id}"
-        if key in visited:
-            return {}
-        visited.add(key)
-
-        deleted_count = {}
-
-        for child_model_name, relation_field in self.CASCADE_MAPPING.get(model_name, []):
-            children = self._get_children(
-                obj, child_model_name, relation_field, is_deleted=False
-            )
-            if children is None:
+        cascade_count = {}
+        cascade_details = []
+        for model_name, condition in grouped.items():
+            children = self.model_classes[model_name].objects.filter(condition)
+            count = children.count()
+            if count == 0:
                 continue
 
-            # 先递归删除子数据的子数据
-            for child in children:
-                child_deleted = self._cascade_delete_recursive(
-                    child, child_model_name, visited
-                )
-                for k, v in child_deleted.items():
-                    deleted_count[k] = deleted_count.get(k, 0) + v
-
-                # 标记当前子数据为删除（带数据库锁定重试）
-                self._save_with_retry(child)
+            cascade_count[model_name.lower()] = count
 
-            type_key = child_model_name.lower()
-            deleted_count[type_key] = (
-                deleted_count.get(type_key, 0) + children.count()
-            )
+            # 收集名称（前10个，超出则显示省略提示）
+            names = list(children.order_by('pk').values_list('name', flat=True)[:10])
+            if count > 10:
+                names.append(f'...等{count}个')
 
-        return deleted_count
+            cascade_details.append({
+                'type': model_name.lower(),
+                'display_type': self.MODEL_DISPLAY_NAMES.get(model_name, model_name),
+                'count': count,
+                'names': names
+            })
 
-    @retry_on_db_lock(max_retries=3, delay=0.05)
-    def _save_with_retry(self, obj):
-        """标记对象为已删除，带数据库锁定重试"""
-        obj.is_deleted = True
-        obj.save(update_fields=['is_deleted'])
+        return {'count': cascade_count, 'details': cascade_details}
 
-    def _restore_recursive(
-        self,
-        obj,
-        model_name: str,
-        visited: Optional[set] = None
-    ) -> Dict[str, int]:
+    @staticmethod
+    def _update_levels(levels: List[Tuple[str, QuerySet]], is_deleted: bool) -> Dict[str, int]:
         """
-        递归恢复已删除的子数据
+        自底向上逐层批量更新删除标记
+
+        深层先更新，保证浅层作为子查询的父集合在更新时尚未改变。
+        批量更新不会触发 auto_now，同时写入 updated_time（回收站以其作为删除时间）。
 
         Args:
-            obj: 模型实例
-            model_name: 模型名称
-            visited: 已访问对象集合
+            levels: _descendant_levels 的返回值
+            is_deleted: 要写入的删除标记
 
         Returns:
-            各模型类型的恢复数量统计
+            各模型类型的更新数量统计
         """
-        if visited is None:
-            visited = set()
-
-        key = f"{model_name}_{obj.id}"
-        if key in visited:
-            return {}
-        visited.add(key)
-
-        restored_count = {}
-
-        for child_model_name, relation_field in self.CASCADE_MAPPING.get(model_name, []):
-            children = self._get_children(
-                obj, child_model_name, relation_field, is_deleted=True
+        updated_count = {}
+        now = timezone.now()
+        for model_name, queryset in reversed(levels):
+            type_key = model_name.lower()
+            updated_count[type_key] = (
+                updated_count.get(type_key, 0)
+                + queryset.update(is_deleted=is_deleted, updated_time=now)
             )
-            if children is None:
-                continue
-
-            for child in children:
-                child_restored = self._restore_recursive(
-                    child, child_model_name, visited
-                )
-                for k, v in child_restored.items():
-                    restored_count[k] = restored_count.get(k, 0) + v
-
-                self._restore_with_retry(child)
-
-            type_key = child_model_name.lower()
-            restored_count[type_key] = (
-                restored_count.get(type_key, 0) + children.count()
-            )
-
-        return restored_count
-
-    @retry_on_db_lock(max_retries=3, delay=0.05)
-    def _restore_with_retry(self, obj):
-        """恢复对象（取消删除标记），带数据库锁定重试"""
-        obj.is_deleted = False
-        obj.save(update_fields=['is_deleted'])
+        return updated_count
 
     def permanent_delete(self, model_name: str, obj_id: int) -> Dict[str, Any]:
         """
@@ -502,12 +448,18 @@ class CascadeDeleteService:
                 obj = model_class.objects.get(id=obj_id, is_deleted=True)
 
                 # 收集级联信息用于返回结果
-                preview_info = self.preview_delete(obj)
+                levels = self._descendant_levels(obj, is_deleted=True)
+                cascade_info = self._summarize_levels(levels)
+
+                # 先撤销将被删除的执行的汇总贡献并释放其结果引用的内容
+                self._release_executions(obj, levels)
 
-                # 递归物理删除所有子数据
-                self._permanent_delete_recursive(obj, model_name)
+                # 自底向上逐层物理删除已软删除的子数据
+                for _, children in reversed(levels):
+                    children.delete()
 
-                # 物理删除对象自身
+                # 物理删除对象自身（测试结果随之级联删除），先递增仪表盘版本
+                self._bump_dashboard(obj)
                 obj.delete()
 
                 logger.info(f"物理删除成功: {model_name}(id={obj_id})")
@@ -518,7 +470,7 @@ class CascadeDeleteService:
                         'name': getattr(obj, 'name', str(obj)),
                         'type': model_name.lower()
                     },
-                    'cascade_permanent_deleted': preview_info['cascade_count']
+                    'cascade_permanent_deleted': cascade_info['count']
                 }
 
         except model_class.DoesNotExist:
@@ -529,54 +481,6 @@ class CascadeDeleteService:
             )
             raise
 
-    def _permanent_delete_recursive(
-        self,
-        obj,
-        model_name: str,
-        visited: Optional[set] = None
-    ):
-        """
-        递归物理删除子数据
-
-        先深度递归处理所有子孙数据，最后批量删除当前层级。
-
-        Args:
-            obj: 模型实例
-            model_name: 模型名称
-            visited: 已访问对象集合
-        """
-        if visited is None:
-            visited = set()
-
-        key = f"{model_name}_{obj.id}"
-        if key in visited:
-            return
-        visited.add(key)
-
-        for child_model_name, relation_field in self.CASCADE_MAPPING.get(model_name, []):
-            child_model = self.model_classes.get(child_model_name)
-            if not child_model:
-                continue
-
-            # 获取已删除的子数据
-            if child_model_name == 'ApiTestCase' and relation_field == 'collection':
-                children = child_model.objects.filter(
-                    **{relation_field: obj}
-                ).filter(is_deleted=True)
-            else:
-                children = child_model.objects.filter(
-                    **{relation_field: obj, 'is_deleted': True}
-                )
-
-            # 先递归处理更深层的子数据
-            for child in children:
-                self._permanent_delete_recursive(
-                    child, child_model_name, visited
-                )
-
-            # 批量物理删除当前层级
-            children.delete()
-
 
 # 全局服务实例，供其他模块直接导入使用
 cascade_delete_service = CascadeDeleteService()
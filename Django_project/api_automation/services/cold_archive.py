@@ -0,0 +1,433 @@
+"""
+过期测试数据的冷归档
+
+数据清理在删除过期的 ApiTestResult / ApiHttpExecutionRecord 前，将其导出为按
+天、按项目分区的压缩 JSONL 文件，数据库只保留近期的热数据：
+
+    {API_ARCHIVE_ROOT}/{results|http_records}/project={id}/date={YYYY-MM-DD}/
+        part-{最小主键}-{最大主键}-{主键集合摘要}.jsonl.zst        （未安装 zstandard 时为 .jsonl.gz）
+        part-{最小主键}-{最大主键}-{主键集合摘要}.jsonl.zst.meta.json（该分片的主键、行数、状态计数等统计）
+
+- 归档行是自包含的：内容存储中的请求体/响应体会内联回行内，删除后仍可查看
+- 查询只读且惰性：先按目录裁剪项目与日期，再按清单中的状态与用例ID跳过分片，
+  最后逐行流式解压过滤；趋势统计在不按用例过滤时直接由清单汇总，无需解压
+- 分片按主键集合命名，同一批次重试时覆盖原分片；主键集合被新分片包含的旧分片
+  （清理事务回滚后重试的更大批次）随之移除，主键交错但行不同的分片互不影响
+- 每个分片有独立的清单文件，多个进程同时清理时不会互相覆盖清单
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import threading
+from collections import Counter
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from api_automation.models import ApiHttpExecutionRecord, ApiTestResult, JSONField, RawJSON
+from api_automation.services.blob_store import blob_store
+
+try:
+    import zstandard
+except ImportError:  # 未安装时使用 gzip
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+KIND_RESULTS = 'results'
+KIND_HTTP_RECORDS = 'http_records'
+
+PART_META_SUFFIX = '.meta.json'
+
+_PROJECT_DIR = re.compile(r'^project=(\d+|none)$')
+_DATE_DIR = re.compile(r'^date=(\d{4}-\d{2}-\d{2})$')
+
+# 各类归档的模型、分区所用的时间字段与项目字段
+ARCHIVE_KINDS = {
+    KIND_RESULTS: {
+        'model': ApiTestResult,
+        'date_field': 'start_time',
+        'project_field': 'execution__project_id',
+        'extra_fields': ('execution__project_id', 'execution__environment_id', 'test_case__name'),
+    },
+    KIND_HTTP_RECORDS: {
+        'model': ApiHttpExecutionRecord,
+        'date_field': 'created_time',
+        'project_field': 'project_id',
+        'extra_fields': (),
+    },
+}
+
+
+class ColdArchive:
+    """
+    按天、按项目分区的压缩归档
+    """
+
+    def __init__(
+        self,
+        root: Optional[str] = None,
+        enabled: Optional[bool] = None,
+        compress_level: Optional[int] = None,
+    ):
+        """
+        初始化归档
+
+        Args:
+            root: 归档根目录，默认读取 API_ARCHIVE_ROOT
+            enabled: 清理时是否归档，默认读取 API_ARCHIVE_ENABLED
+            compress_level: 压缩级别，默认读取 API_ARCHIVE_COMPRESS_LEVEL
+        """
+        if root is None:
+            root = getattr(settings, 'API_ARCHIVE_ROOT', os.path.join(settings.BASE_DIR, 'archives'))
+        if enabled is None:
+            enabled = getattr(settings, 'API_ARCHIVE_ENABLED', True)
+        if compress_level is None:
+            compress_level = getattr(settings, 'API_ARCHIVE_COMPRESS_LEVEL', 6)
+
+        self.root = Path(root)
+        self.enabled = bool(enabled)
+        self.compress_level = int(compress_level)
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+
+    def archive(self, kind: str, queryset: QuerySet) -> int:
+        """
+        将查询集中的行写入归档（需在删除这些行之前调用）
+
+        Args:
+            kind: 归档类型（results / http_records）
+            queryset: 待归档的行
+
+        Returns:
+            归档的行数
+        """
+        spec = ARCHIVE_KINDS[kind]
+        field_names = [field.attname for field in spec['model']._meta.concrete_fields]
+        rows = list(queryset.order_by('pk').values(*field_names, *spec['extra_fields']))
+        if not rows:
+            return 0
+
+        # values() 返回的 JSON 列是未解析的原始文本
+        for row in rows:
+            for key, value in row.items():
+                if type(value) is RawJSON:
+                    row[key] = JSONField.parse(value)
+
+        self._inline_bodies(kind, rows)
+
+        partitions: Dict[tuple, List[dict]] = {}
+        for row in rows:
+            project_id = row.get(spec['project_field'])
+            day = self._local_date(row.get(spec['date_field'])) or timezone.localdate()
+            partitions.setdefault((project_id, day), []).append(row)
+
+        with self._lock:
+            for (project_id, day), partition_rows in partitions.items():
+                self._write_part(kind, project_id, day, partition_rows)
+        return len(rows)
+
+    @staticmethod
+    def _inline_bodies(kind: str, rows: List[dict]):
+        """将内容存储中的请求体/响应体写回行内，使归档行不依赖内容存储"""
+        hash_fields = ('request_body_hash', 'response_body_hash')
+        blob_store.prefetch(row.get(field) for row in rows for field in hash_fields)
+
+        for row in rows:
+            request_hash = row.pop('request_body_hash', '')
+            response_hash = row.pop('response_body_hash', '')
+            if kind == KIND_RESULTS:
+                if request_hash:
+                    row['request_full'] = dict(row.get('request_full') or {})
+                    row['request_full']['body'] = blob_store.get_json(request_hash, {})
+                if response_hash:
+                    row['response_full'] = dict(row.get('response_full') or {})
+                    row['response_full']['body'] = blob_store.get_json(response_hash, {})
+            elif response_hash:
+                body = blob_store.get_json(response_hash)
+                if isinstance(body, (dict, list)):
+                    row['response_body'] = body
+                else:
+                    row['response_body_text'] = body
+
+    def _write_part(self, kind: str, project_id, day: date, rows: List[dict]):
+        """写入一个分区的分片文件及其清单，并移除被本分片包含的旧分片"""
+        directory = self._partition_dir(kind, project_id, day)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        pks = [row['id'] for row in rows]
+        digest = hashlib.sha1(','.join(map(str, pks)).encode('ascii')).hexdigest()[:16]
+        filename = f'part-{pks[0]:012d}-{pks[-1]:012d}-{digest}.jsonl{self._extension()}'
+        payload = ''.join(
+            json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n' for row in rows
+        ).encode('utf-8')
+        self._atomic_write(directory / filename, self._compress(payload))
+
+        response_times = [row['response_time'] for row in rows if row.get('response_time') is not None]
+        meta = {
+            'rows': len(rows),
+            'min_pk': pks[0],
+            'max_pk': pks[-1],
+            'pks': pks,
+            'status_counts': dict(Counter(row.get('status') for row in rows)),
+            'test_case_ids': sorted({row['test_case_id'] for row in rows if row.get('test_case_id')}),
+            'response_time_sum': sum(response_times),
+            'response_time_count': len(response_times),
+        }
+        # 清单最后写入：读取方只认有清单的分片，写了一半的分片不可见
+        self._atomic_write(
+            directory / (filename + PART_META_SUFFIX),
+            json.dumps(meta, ensure_ascii=False, sort_keys=True).encode('utf-8'),
+        )
+
+        # 清理重试时同一批数据会再次归档（可能并入更大的批次），
+        # 只移除主键集合被本分片完全包含的旧分片
+        pk_set = set(pks)
+        for name, part in self._load_manifest(directory)['parts'].items():
+            if name != filename and part['min_pk'] >= pks[0] and part['max_pk'] <= pks[-1] \
+                    and pk_set.issuperset(part['pks']):
+                (directory / (name + PART_META_SUFFIX)).unlink(missing_ok=True)
+                (directory / name).unlink(missing_ok=True)
+
+    def _compress(self, payload: bytes) -> bytes:
+        """按可用的编码压缩"""
+        if zstandard is not None:
+            return zstandard.ZstdCompressor(level=self.compress_level).compress(payload)
+        return gzip.compress(payload, compresslevel=min(9, max(1, self.compress_level)))
+
+    @staticmethod
+    def _extension() -> str:
+        """分片文件的压缩扩展名"""
+        return '.zst' if zstandard is not None else '.gz'
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes):
+        """先写临时文件再替换，读取方不会看到写了一半的文件"""
+        tmp_path = path.with_name(path.name + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+
+    def scan(
+        self,
+        kind: str,
+        project_ids: Optional[Iterable[int]] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        statuses: Optional[Iterable[str]] = None,
+        test_case_ids: Optional[Iterable[int]] = None,
+    ) -> Iterator[dict]:
+        """
+        惰性扫描归档行
+
+        按目录裁剪项目与日期，按清单跳过不含目标状态/用例的分片，
+        其余分片逐行解压过滤。调用方停止迭代时不再读取后续文件。
+
+        Args:
+            kind: 归档类型（results / http_records）
+            project_ids: 项目ID，为空表示不限
+            start_date: 起始日期（含）
+            end_date: 结束日期（含）
+            statuses: 状态，为空表示不限
+            test_case_ids: 测试用例ID，为空表示不限
+
+        Returns:
+            归档行（字典）的迭代器，按项目、日期、主键排序
+        """
+        statuses = set(statuses) if statuses else None
+        test_case_ids = {int(value) for value in test_case_ids} if test_case_ids else None
+
+        for directory, day, manifest in self._partitions(kind, project_ids, start_date, end_date):
+            for name, part in sorted(manifest['parts'].items()):
+                if statuses and not statuses & set(part['status_counts']):
+                    continue
+                if test_case_ids and not test_case_ids & set(part['test_case_ids']):
+                    continue
+                for row in self._read_part(directory / name):
+                    if statuses and row.get('status') not in statuses:
+                        continue
+                    if test_case_ids and row.get('test_case_id') not in test_case_ids:
+                        continue
+                    yield row
+
+    def daily_summary(
+        self,
+        project_ids: Optional[Iterable[int]] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        statuses: Optional[Iterable[str]] = None,
+        test_case_ids: Optional[Iterable[int]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        按天汇总归档的测试结果，用于历史趋势报告
+
+        不按用例过滤时直接读取各分区清单中的统计，无需解压数据文件。
+
+        Args:
+            project_ids: 项目ID，为空表示不限
+            start_date: 起始日期（含）
+            end_date: 结束日期（含）
+            statuses: 状态，为空表示不限
+            test_case_ids: 测试用例ID，为空表示不限
+
+        Returns:
+            按日期升序的统计列表
+        """
+        statuses = set(statuses) if statuses else None
+        days: Dict[date, Dict[str, int]] = {}
+
+        def bucket(day):
+            return days.setdefault(day, {
+                'total': 0, 'PASSED': 0, 'FAILED': 0, 'SKIPPED': 0, 'ERROR': 0,
+                'response_time_sum': 0, 'response_time_count': 0,
+            })
+
+        if test_case_ids:
+            for row in self.scan(
+                KIND_RESULTS, project_ids, start_date, end_date, statuses, test_case_ids
+            ):
+                day = self._local_date(row.get('start_time'))
+                if day is None:
+                    continue
+                stats = bucket(day)
+                stats['total'] += 1
+                stats[row.get('status')] = stats.get(row.get('status'), 0) + 1
+                if row.get('response_time') is not None:
+                    stats['response_time_sum'] += row['response_time']
+                    stats['response_time_count'] += 1
+        else:
+            for _, day, manifest in self._partitions(KIND_RESULTS, project_ids, start_date, end_date):
+                stats = bucket(day)
+                for part in manifest['parts'].values():
+                    counts = part['status_counts']
+                    if statuses:
+                        counts = {key: value for key, value in counts.items() if key in statuses}
+                    for key, value in counts.items():
+                        stats[key] = stats.get(key, 0) + value
+                        stats['total'] += value
+                    # 按状态过滤时清单中的响应时间无法拆分，只在不过滤时汇总
+                    if not statuses:
+                        stats['response_time_sum'] += part['response_time_sum']
+                        stats['response_time_count'] += part['response_time_count']
+
+        summary = []
+        for day in sorted(days):
+            stats = days[day]
+            total = stats['total']
+            if not total:
+                continue
+            summary.append({
+                'date': day.isoformat(),
+                'total': total,
+                'passed': stats['PASSED'],
+                'failed': stats['FAILED'],
+                'skipped': stats['SKIPPED'],
+                'error': stats['ERROR'],
+                'pass_rate': round(stats['PASSED'] / total * 100, 2),
+                'avg_response_time': (
+                    round(stats['response_time_sum'] / stats['response_time_count'])
+                    if stats['response_time_count'] else None
+                ),
+            })
+        return summary
+
+    def _partitions(self, kind, project_ids, start_date, end_date):
+        """按目录名裁剪项目与日期，依次返回 (分区目录, 日期, 清单)"""
+        base = self.root / kind
+        if not base.is_dir():
+            return
+        wanted = {str(project_id) for project_id in project_ids} if project_ids is not None else None
+
+        for project_dir in sorted(base.iterdir()):
+            match = _PROJECT_DIR.match(project_dir.name)
+            if not match or (wanted is not None and match.group(1) not in wanted):
+                continue
+            for date_dir in sorted(project_dir.iterdir()):
+                match = _DATE_DIR.match(date_dir.name)
+                if not match:
+                    continue
+                day = date.fromisoformat(match.group(1))
+                if (start_date and day < start_date) or (end_date and day > end_date):
+                    continue
+                manifest = self._load_manifest(date_dir)
+                if manifest['parts']:
+                    yield date_dir, day, manifest
+
+    @staticmethod
+    def _read_part(path: Path) -> Iterator[dict]:
+        """逐行流式解压读取分片"""
+        try:
+            if path.suffix == '.zst':
+                if zstandard is None:
+                    logger.error(f"Cannot read {path}: zstandard is not installed")
+                    return
+                raw = open(path, 'rb')
+                stream = zstandard.ZstdDecompressor().stream_reader(raw)
+            else:
+                raw = None
+                stream = gzip.open(path, 'rb')
+        except FileNotFoundError:
+            # 分片在列出清单后被另一次清理替换，其行已包含在新分片中
+            return
+        try:
+            for line in io.TextIOWrapper(stream, encoding='utf-8'):
+                if line.strip():
+                    yield json.loads(line)
+        finally:
+            stream.close()
+            if raw is not None:
+                raw.close()
+
+    # ------------------------------------------------------------------
+    # 工具
+    # ------------------------------------------------------------------
+
+    def _partition_dir(self, kind: str, project_id, day: date) -> Path:
+        """分区目录：{类型}/project={项目ID}/date={日期}"""
+        project_part = f'project={project_id}' if project_id is not None else 'project=none'
+        return self.root / kind / project_part / f'date={day.isoformat()}'
+
+    @staticmethod
+    def _load_manifest(directory: Path) -> dict:
+        """汇总分区内各分片的清单：{'parts': {分片文件名: 统计}}"""
+        parts = {}
+        for path in directory.glob(f'part-*{PART_META_SUFFIX}'):
+            try:
+                with open(path, 'rb') as f:
+                    parts[path.name[:-len(PART_META_SUFFIX)]] = json.loads(f.read())
+            except FileNotFoundError:
+                # 其他进程正在移除被包含的旧分片
+                continue
+        return {'parts': parts}
+
+    @staticmethod
+    def _local_date(value) -> Optional[date]:
+        """将时间（或ISO字符串）转换为本地日期"""
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if timezone.is_aware(value):
+            value = timezone.localtime(value)
+        return value.date()
+
+
+# 全局归档实例
+cold_archive = ColdArchive()
@@ -0,0 +1,79 @@
+"""
+测试用例编译结果缓存
+
+请求模板、断言计划等「由测试用例定义编译得到的只读结构」共用的缓存：
+以用例ID为键、用例 updated_time 为版本号，版本变化时重新编译，
+按最近最少使用（LRU）策略限制缓存条目数。
+
+编译结果在进程内共享，调用方不应修改。
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar('T')
+
+
+class CompiledCaseCache(Generic[T]):
+    """
+    按测试用例缓存编译结果的线程安全LRU缓存
+    """
+
+    def __init__(self, builder: Callable[[Any], T], maxsize: int = 1024):
+        """
+        初始化缓存
+
+        Args:
+            builder: 编译函数，参数为测试用例对象
+            maxsize: 最大缓存用例数
+        """
+        self.builder = builder
+        self.maxsize = max(1, int(maxsize))
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, test_case: Any) -> T:
+        """
+        获取测试用例的编译结果，缓存缺失或版本变化时重新编译
+
+        Args:
+            test_case: 测试用例对象（需包含 pk 和 updated_time）
+
+        Returns:
+            编译结果
+        """
+        key = test_case.pk
+        version = getattr(test_case, 'updated_time', None)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        compiled = self.builder(test_case)
+
+        with self._lock:
+            self._entries[key] = (version, compiled)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        return compiled
+
+    def invalidate(self, test_case_id: Any = None):
+        """
+        清除缓存
+
+        Args:
+            test_case_id: 指定用例ID时只清除该用例，否则清空全部
+        """
+        with self._lock:
+            if test_case_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(test_case_id, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
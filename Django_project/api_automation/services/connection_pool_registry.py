@@ -0,0 +1,217 @@
+"""
+进程级HTTP连接池注册表
+
+为 HttpExecutor 提供长期存活、可复用的连接池。连接池以
+(scheme, host, port, verify_ssl, proxy) 为键，以 requests 的 HTTPAdapter
+形式保存：执行器仍然各自持有 requests.Session（独立的Cookie和默认请求头），
+但在发送请求前将目标地址对应的共享 HTTPAdapter 挂载到自己的会话上，
+从而跨批量执行、跨请求复用已建立的TCP/TLS连接。
+
+超过空闲时间未被使用的连接池会在下次获取时被回收；注册表同时统计
+连接池命中次数、新建连接池数量和新建连接数量，便于观察复用效果。
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+PoolKey = Tuple[str, str, int, bool, Optional[str]]
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+class _PoolEntry:
+    """注册表中的单个连接池条目"""
+
+    def __init__(self, adapter: HTTPAdapter):
+        self.adapter = adapter
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+
+class ConnectionPoolRegistry:
+    """
+    HTTP连接池注册表
+
+    线程安全；默认通过模块级实例 connection_pool_registry 在进程内共享。
+    """
+
+    def __init__(
+        self,
+        pool_size: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+    ):
+        """
+        初始化连接池注册表
+
+        Args:
+            pool_size: 单个连接池的最大连接数，默认取 settings.API_HTTP_POOL_SIZE
+            idle_timeout: 连接池空闲回收时间（秒），默认取 settings.API_HTTP_POOL_IDLE_TIMEOUT
+        """
+        if pool_size is None:
+            pool_size = getattr(settings, 'API_HTTP_POOL_SIZE', 10)
+        if idle_timeout is None:
+            idle_timeout = getattr(settings, 'API_HTTP_POOL_IDLE_TIMEOUT', 300)
+
+        self.pool_size = max(1, int(pool_size))
+        self.idle_timeout = float(idle_timeout)
+        self._entries: Dict[PoolKey, _PoolEntry] = {}
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._evicted_connections = 0
+
+    @staticmethod
+    def build_key(url: str, verify_ssl: bool = True, proxy: Optional[str] = None) -> Optional[PoolKey]:
+        """
+        根据请求地址和连接配置计算连接池键
+
+        Args:
+            url: 完整请求URL
+            verify_ssl: 是否验证SSL证书
+            proxy: 代理地址
+
+        Returns:
+            连接池键；URL无法解析出 scheme/host 时返回None
+        """
+        try:
+            parts = urlsplit(url)
+            port = parts.port
+        except ValueError:
+            return None
+
+        scheme = (parts.scheme or '').lower()
+        host = (parts.hostname or '').lower()
+        if scheme not in DEFAULT_PORTS or not host:
+            return None
+
+        return (scheme, host, port or DEFAULT_PORTS[scheme], bool(verify_ssl), proxy or None)
+
+    @staticmethod
+    def mount_prefix(key: PoolKey) -> str:
+        """
+        返回连接池在 requests.Session 上的挂载前缀
+
+        Args:
+            key: 连接池键
+
+        Returns:
+            形如 https://host:port/ 的前缀
+        """
+        scheme, host, port, _, _ = key
+        if port == DEFAULT_PORTS[scheme]:
+            return f'{scheme}://{host}/'
+        return f'{scheme}://{host}:{port}/'
+
+    def get_adapter(self, key: PoolKey) -> HTTPAdapter:
+        """
+        获取（或创建）连接池键对应的共享 HTTPAdapter
+
+        Args:
+            key: 连接池键
+
+        Returns:
+            HTTPAdapter 实例
+        """
+        self._evict_if_due()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _PoolEntry(HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=self.pool_size,
+                ))
+                self._entries[key] = entry
+                self._misses += 1
+                logger.debug(f"Created connection pool for {key}")
+            else:
+                self._hits += 1
+            entry.last_used = time.monotonic()
+            return entry.adapter
+
+    def evict_idle(self) -> int:
+        """
+        回收超过空闲时间未被使用的连接池
+
+        Returns:
+            回收的连接池数量
+        """
+        now = time.monotonic()
+        with self._lock:
+            self._last_sweep = now
+            expired = [
+                key for key, entry in self._entries.items()
+                if now - entry.last_used > self.idle_timeout
+            ]
+            entries = [self._entries.pop(key) for key in expired]
+            for entry in entries:
+                self._evicted_connections += _count_connections(entry.adapter)
+            self._evictions += len(entries)
+
+        for entry in entries:
+            entry.adapter.close()
+
+        if entries:
+            logger.info(f"Evicted {len(entries)} idle connection pools")
+        return len(entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取连接池统计信息
+
+        Returns:
+            包含连接池数量、命中/新建次数、新建连接数和回收次数的字典
+        """
+        with self._lock:
+            live_connections = sum(
+                _count_connections(entry.adapter) for entry in self._entries.values()
+            )
+            return {
+                'pools': len(self._entries),
+                'pool_size': self.pool_size,
+                'idle_timeout': self.idle_timeout,
+                'pool_hits': self._hits,
+                'pool_misses': self._misses,
+                'new_connections': live_connections + self._evicted_connections,
+                'evictions': self._evictions,
+            }
+
+    def close_all(self):
+        """关闭并清空所有连接池"""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            entry.adapter.close()
+
+    def _evict_if_due(self):
+        """距离上次回收超过空闲时间的一半时触发一次回收"""
+        if time.monotonic() - self._last_sweep >= self.idle_timeout / 2:
+            self.evict_idle()
+
+
+def _count_connections(adapter: HTTPAdapter) -> int:
+    """统计 HTTPAdapter 下所有 urllib3 连接池累计建立的连接数"""
+    managers = [adapter.poolmanager] + list(adapter.proxy_manager.values())
+    total = 0
+    for manager in managers:
+        if manager is None:
+            continue
+        for pool_key in list(manager.pools.keys()):
+            pool = manager.pools.get(pool_key)
+            if pool is not None:
+                total += getattr(pool, 'num_connections', 0)
+    return total
+
+
+connection_pool_registry = ConnectionPoolRegistry()
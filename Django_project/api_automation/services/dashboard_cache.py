@@ -0,0 +1,161 @@
+"""
+仪表盘响应缓存
+
+前端每次切换标签页都会以相同的筛选参数重新请求仪表盘接口。本模块将接口响应
+缓存在 Django 缓存（本地内存或文件缓存均可）中：
+
+- 缓存键：接口名 + 用户可见范围 + 查询参数 + 可见项目的数据版本
+- 失效：ApiProject.dashboard_version 在执行开始/结束、测试结果被删除时递增，
+  版本变化后缓存键随之变化，旧条目自然过期。版本号存放在数据库中，
+  因此多个 Web 进程、队列工作进程之间无需共享缓存即可正确失效
+- 命中时只需一条查询读取可见项目的版本号，不访问 ApiTestResult
+"""
+
+import functools
+import hashlib
+import json
+import logging
+from typing import Callable, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import F
+from rest_framework import status
+from rest_framework.response import Response
+
+from api_automation.models import ApiProject
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardCache:
+    """
+    按项目数据版本失效的仪表盘响应缓存
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        alias: Optional[str] = None,
+        timeout: Optional[int] = None,
+    ):
+        """
+        初始化仪表盘缓存
+
+        Args:
+            enabled: 是否启用，默认读取 API_DASHBOARD_CACHE_ENABLED
+            alias: Django 缓存别名，默认读取 API_DASHBOARD_CACHE_ALIAS
+            timeout: 缓存过期秒数，默认读取 API_DASHBOARD_CACHE_TIMEOUT
+        """
+        if enabled is None:
+            enabled = getattr(settings, 'API_DASHBOARD_CACHE_ENABLED', True)
+        if alias is None:
+            alias = getattr(settings, 'API_DASHBOARD_CACHE_ALIAS', 'default')
+        if timeout is None:
+            timeout = getattr(settings, 'API_DASHBOARD_CACHE_TIMEOUT', 60)
+
+        self.enabled = bool(enabled)
+        self.alias = alias
+        self.timeout = max(1, int(timeout))
+
+    @property
+    def cache(self):
+        """底层 Django 缓存"""
+        return caches[self.alias]
+
+    def bump(self, project_ids: Iterable[int]):
+        """
+        递增项目的仪表盘数据版本，使相关缓存失效
+
+        Args:
+            project_ids: 项目ID
+        """
+        project_ids = [project_id for project_id in set(project_ids) if project_id]
+        if not project_ids:
+            return
+        try:
+            ApiProject.objects.filter(id__in=project_ids).update(
+                dashboard_version=F('dashboard_version') + 1
+            )
+        except Exception as e:
+            logger.error(f"Error bumping dashboard version for projects {project_ids}: {e}")
+
+    def build_key(self, request, endpoint: str) -> str:
+        """
+        根据用户可见范围、查询参数和项目数据版本生成缓存键
+
+        Args:
+            request: DRF 请求
+            endpoint: 接口名
+
+        Returns:
+            缓存键
+        """
+        user = request.user
+        if user.is_superuser:
+            scope = 'all'
+            projects = ApiProject.objects.filter(is_deleted=False)
+        else:
+            scope = f'user:{user.pk}'
+            projects = ApiProject.objects.filter(owner=user, is_deleted=False)
+
+        versions = list(projects.order_by('id').values_list('id', 'dashboard_version'))
+        params = sorted(
+            (key, request.query_params.getlist(key)) for key in request.query_params
+        )
+        digest = hashlib.sha1(
+            json.dumps([params, versions], separators=(',', ':')).encode('utf-8')
+        ).hexdigest()
+        return f'api_dashboard:{endpoint}:{scope}:{digest}'
+
+    def respond(self, request, endpoint: str, compute: Callable[[], Response]) -> Response:
+        """
+        返回缓存的响应，未命中时调用 compute 并缓存成功响应
+
+        Args:
+            request: DRF 请求
+            endpoint: 接口名
+            compute: 生成响应的函数
+
+        Returns:
+            Response 实例
+        """
+        if not self.enabled:
+            return compute()
+
+        key = self.build_key(request, endpoint)
+        try:
+            data = self.cache.get(key)
+        except Exception as e:
+            logger.error(f"Error reading dashboard cache: {e}")
+            data = None
+        if data is not None:
+            return Response(data)
+
+        response = compute()
+        if response.status_code == status.HTTP_200_OK:
+            try:
+                self.cache.set(key, response.data, self.timeout)
+            except Exception as e:
+                logger.error(f"Error writing dashboard cache: {e}")
+        return response
+
+
+# 全局仪表盘缓存实例
+dashboard_cache = DashboardCache()
+
+
+def cache_dashboard_response(view_method):
+    """
+    仪表盘视图方法装饰器：按 dashboard_cache 缓存响应
+
+    需放在 @action 之下，缓存键使用视图方法名区分接口。
+    """
+    @functools.wraps(view_method)
+    def wrapper(viewset, request, *args, **kwargs):
+        return dashboard_cache.respond(
+            request,
+            view_method.__name__,
+            lambda: view_method(viewset, request, *args, **kwargs),
+        )
+    return wrapper
@@ -0,0 +1,465 @@
+"""
+仪表盘日汇总服务
+
+仪表盘的结果统计原先每次加载都对 ApiTestResult 做多次 COUNT ... FILTER 聚合，
+结果表增长到百万级后单次请求需要数秒。本服务维护 ApiDashboardRollup 日汇总表：
+
+- 增量累加：执行进入终态（完成、失败、取消）时，用一条分组查询统计该执行的结果，
+  按维度累加到汇总行；执行记录上的 is_rolled_up 标志保证同一执行只累加一次
+- 撤销：重试前清除旧结果时先从汇总中减去该执行的贡献
+- 回填：backfill_dashboard_rollups 管理命令按批处理历史执行
+- 读取：仪表盘接口按与原查询相同的筛选条件对汇总行求和，
+  响应时间分位数由汇总行中的分桶计数估算
+"""
+
+import logging
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Max, Q, QuerySet, Sum, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from api_automation.models import ApiDashboardRollup, ApiTestExecution, ApiTestResult
+
+logger = logging.getLogger(__name__)
+
+# 进入以下状态的执行不会再产生新结果，可以计入汇总
+TERMINAL_STATUSES = ('COMPLETED', 'FAILED', 'CANCELLED')
+
+# 汇总行的维度字段（除 status 外）
+DIMENSION_FIELDS = ('stat_date', 'project_id', 'environment_id', 'collection_id', 'owner_id', 'module')
+
+# 合并时求和的计数字段、取最大值的字段
+SUM_FIELDS = (
+    'result_count', 'response_time_sum', 'response_time_count',
+) + ApiDashboardRollup.LATENCY_FIELDS
+MAX_FIELDS = ('response_time_max', 'last_execution_id')
+
+# 汇总报告给出的响应时间分位数
+PERCENTILES = (50, 90, 95, 99)
+
+
+def _latency_annotations() -> Dict[str, Count]:
+    """按 LATENCY_BUCKETS 生成各响应时间区间的条件计数"""
+    bounds = ApiDashboardRollup.LATENCY_BUCKETS
+    annotations = {}
+    for index, field in enumerate(ApiDashboardRollup.LATENCY_FIELDS):
+        condition = Q(response_time__isnull=False)
+        if index > 0:
+            condition &= Q(response_time__gt=bounds[index - 1])
+        if index < len(bounds):
+            condition &= Q(response_time__lte=bounds[index])
+        annotations[field] = Count('id', filter=condition)
+    return annotations
+
+
+LATENCY_ANNOTATIONS = _latency_annotations()
+
+
+class DashboardRollupService:
+    """
+    仪表盘日汇总的写入与查询
+    """
+
+    def __init__(self, batch_size: Optional[int] = None):
+        """
+        初始化汇总服务
+
+        Args:
+            batch_size: 回填时每批处理的执行数，默认读取 API_DASHBOARD_ROLLUP_BATCH_SIZE
+        """
+        if batch_size is None:
+            batch_size = getattr(settings, 'API_DASHBOARD_ROLLUP_BATCH_SIZE', 500)
+        self.batch_size = max(1, int(batch_size))
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+
+    def apply_execution(self, execution: ApiTestExecution) -> bool:
+        """
+        将已结束执行的结果累加到汇总表
+
+        Args:
+            execution: 执行记录
+
+        Returns:
+            是否本次完成累加（未结束或已累加过时返回 False）
+        """
+        if execution.status not in TERMINAL_STATUSES:
+            return False
+
+        with transaction.atomic():
+            claimed = ApiTestExecution.objects.filter(
+                pk=execution.pk, is_rolled_up=False, status__in=TERMINAL_STATUSES
+            ).update(is_rolled_up=True)
+            if not claimed:
+                return False
+            self._upsert(self._collect([execution]), sign=1)
+
+        execution.is_rolled_up = True
+        return True
+
+    def revert_execution(self, execution: ApiTestExecution) -> bool:
+        """
+        从汇总表中减去执行的贡献（需在删除其结果之前调用）
+
+        Args:
+            execution: 执行记录
+
+        Returns:
+            是否本次完成撤销（从未累加时返回 False）
+        """
+        with transaction.atomic():
+            reverted = ApiTestExecution.objects.filter(
+                pk=execution.pk, is_rolled_up=True
+            ).update(is_rolled_up=False)
+            if not reverted:
+                return False
+            self._upsert(self._collect([execution]), sign=-1)
+
+        execution.is_rolled_up = False
+        return True
+
+    def backfill(self, project_ids: Optional[Sequence[int]] = None) -> int:
+        """
+        将尚未计入汇总的已结束执行批量累加到汇总表
+
+        每批执行只需一次标记更新、一次分组查询和一次批量插入。
+
+        Args:
+            project_ids: 限定项目ID，None 表示全部项目
+
+        Returns:
+            本次累加的执行数
+        """
+        pending = ApiTestExecution.objects.filter(
+            is_rolled_up=False, status__in=TERMINAL_STATUSES
+        )
+        if project_ids is not None:
+            pending = pending.filter(project_id__in=project_ids)
+
+        total = 0
+        last_id = 0
+        while True:
+            with transaction.atomic():
+                executions = list(
+                    pending.select_for_update()
+                    .filter(id__gt=last_id)
+                    .order_by('id')
+                    .only('id', 'project_id', 'environment_id', 'created_time')[:self.batch_size]
+                )
+                if not executions:
+                    break
+                last_id = executions[-1].id
+                ApiTestExecution.objects.filter(
+                    id__in=[execution.id for execution in executions]
+                ).update(is_rolled_up=True)
+                rows = self._collect(executions)
+                ApiDashboardRollup.objects.bulk_create(
+                    [self._build_row(key, values) for key, values in rows.items()],
+                    batch_size=self.batch_size,
+                )
+            total += len(executions)
+            logger.info(f"Backfilled dashboard rollups for {total} executions")
+
+        return total
+
+    def rebuild(self, project_ids: Optional[Sequence[int]] = None) -> int:
+        """
+        清空汇总并按当前结果重新回填
+
+        Args:
+            project_ids: 限定项目ID，None 表示全部项目
+
+        Returns:
+            回填的执行数
+        """
+        rollups = ApiDashboardRollup.objects.all()
+        executions = ApiTestExecution.objects.filter(is_rolled_up=True)
+        if project_ids is not None:
+            rollups = rollups.filter(project_id__in=project_ids)
+            executions = executions.filter(project_id__in=project_ids)
+
+        with transaction.atomic():
+            rollups.delete()
+            executions.update(is_rolled_up=False)
+
+        return self.backfill(project_ids)
+
+    def _collect(
+        self, executions: Iterable[ApiTestExecution]
+    ) -> Dict[Tuple[Any, ...], Dict[str, int]]:
+        """
+        用一条分组查询统计执行结果，按汇总维度合并
+
+        Args:
+            executions: 执行记录
+
+        Returns:
+            {(维度..., status): {计数字段: 值}}，计数字段见 SUM_FIELDS，
+            另含 response_time_max 与 last_execution_id
+        """
+        execution_keys = {
+            execution.id: (
+                self._stat_date(execution.created_time),
+                execution.project_id,
+                execution.environment_id,
+            )
+            for execution in executions
+        }
+
+        groups = ApiTestResult.objects.filter(
+            execution_id__in=list(execution_keys)
+        ).values(
+            'execution_id',
+            'test_case__collection_id',
+            'test_case__owner_id',
+            'test_case__module',
+            'status',
+        ).annotate(
+            result_count=Count('id'),
+            response_time_sum=Sum('response_time'),
+            response_time_count=Count('response_time'),
+            response_time_max=Max('response_time'),
+            **LATENCY_ANNOTATIONS,
+        ).order_by()
+
+        rows: Dict[Tuple[Any, ...], Dict[str, int]] = {}
+        for group in groups:
+            execution_id = group['execution_id']
+            key = execution_keys[execution_id] + (
+                group['test_case__collection_id'],
+                group['test_case__owner_id'],
+                group['test_case__module'],
+                group['status'],
+            )
+            values = rows.setdefault(key, dict.fromkeys(SUM_FIELDS + MAX_FIELDS, 0))
+            for field in SUM_FIELDS:
+                values[field] += group[field] or 0
+            values['response_time_max'] = max(
+                values['response_time_max'], group['response_time_max'] or 0
+            )
+            values['last_execution_id'] = max(values['last_execution_id'], execution_id)
+        return rows
+
+    def _upsert(self, rows: Dict[Tuple[Any, ...], Dict[str, int]], sign: int):
+        """
+        将增量累加到已有汇总行，不存在时新建（调用方需在事务中）
+
+        撤销时只减去计数，最大响应时间与最近执行保持不变。
+
+        Args:
+            rows: _collect 的返回值
+            sign: 1 表示累加，-1 表示撤销
+        """
+        for key, values in rows.items():
+            # 同一维度可能有多行（回填批量插入），增量只加到其中一行
+            row_id = ApiDashboardRollup.objects.filter(
+                **self._key_filters(key)
+            ).values_list('id', flat=True).first()
+            if row_id is not None:
+                updates = {
+                    field: F(field) + sign * values[field] for field in SUM_FIELDS
+                }
+                if sign > 0:
+                    updates['response_time_max'] = Greatest(
+                        F('response_time_max'), Value(values['response_time_max'])
+                    )
+                    updates['last_execution_id'] = Greatest(
+                        Coalesce(F('last_execution_id'), Value(0)),
+                        Value(values['last_execution_id']),
+                    )
+                ApiDashboardRollup.objects.filter(pk=row_id).update(
+                    updated_time=timezone.now(), **updates
+                )
+            elif sign > 0:
+                self._build_row(key, values).save()
+
+    @staticmethod
+    def _key_filters(key: Tuple[Any, ...]) -> Dict[str, Any]:
+        """将维度键转换为 ORM 过滤条件（None 维度使用 isnull）"""
+        filters: Dict[str, Any] = {'status': key[-1]}
+        for field, value in zip(DIMENSION_FIELDS, key[:-1]):
+            if value is None:
+                filters[f'{field.removesuffix("_id")}__isnull'] = True
+            else:
+                filters[field] = value
+        return filters
+
+    @staticmethod
+    def _build_row(key: Tuple[Any, ...], values: Dict[str, int]) -> ApiDashboardRollup:
+        """根据维度键和累计值构建未保存的汇总行"""
+        return ApiDashboardRollup(
+            **dict(zip(DIMENSION_FIELDS, key[:-1])), status=key[-1], **values
+        )
+
+    @staticmethod
+    def _stat_date(value) -> date:
+        """执行创建时间对应的本地日期"""
+        if timezone.is_aware(value):
+            return timezone.localdate(value)
+        return value.date()
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+
+    def filter_rollups(
+        self,
+        project_ids: Sequence[int],
+        environment_id=None,
+        collection_id=None,
+        owner_id=None,
+        module: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+    ) -> QuerySet:
+        """
+        按仪表盘筛选参数过滤汇总行
+
+        Args:
+            project_ids: 可见项目ID列表
+            environment_id: 环境ID
+            collection_id: 集合ID
+            owner_id: 用例负责人ID
+            module: 用例所属模块
+            start_date: 起始日期（含）
+            end_date: 结束日期（含）
+
+        Returns:
+            ApiDashboardRollup 查询集
+        """
+        queryset = ApiDashboardRollup.objects.filter(project_id__in=project_ids)
+        if environment_id:
+            queryset = queryset.filter(environment_id=environment_id)
+        if collection_id:
+            queryset = queryset.filter(collection_id=collection_id)
+        if owner_id:
+            queryset = queryset.filter(owner_id=owner_id)
+        if module:
+            queryset = queryset.filter(module=module)
+        if start_date:
+            queryset = queryset.filter(stat_date__gte=start_date)
+        if end_date:
+            queryset = queryset.filter(stat_date__lte=end_date)
+        return queryset
+
+    def summarize(self, queryset: QuerySet) -> Dict[str, Any]:
+        """
+        汇总结果统计
+
+        Args:
+            queryset: filter_rollups 返回的查询集
+
+        Returns:
+            统计字典，字段见 empty_stats
+        """
+        return self.summarize_by(queryset, ()).get((), self.empty_stats())
+
+    def summarize_by(
+        self, queryset: QuerySet, group_by: Sequence[str]
+    ) -> Dict[Tuple[Any, ...], Dict[str, Any]]:
+        """
+        按指定维度分组汇总结果统计（一条查询）
+
+        Args:
+            queryset: filter_rollups 返回的查询集
+            group_by: 分组字段，如 ('project_id',)
+
+        Returns:
+            {分组值元组: 统计字典}
+        """
+        groups = queryset.values(*group_by, 'status').annotate(
+            **{field: Sum(field) for field in SUM_FIELDS},
+            **{field: Max(field) for field in MAX_FIELDS},
+        ).order_by()
+
+        totals: Dict[Tuple[Any, ...], Dict[str, int]] = {}
+        stats: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        for group in groups:
+            key = tuple(group[field] for field in group_by)
+            item = stats.setdefault(key, self.empty_stats())
+            status_key = group['status'].lower()
+            if status_key in item:
+                item[status_key] += group['result_count'] or 0
+
+            values = totals.setdefault(key, dict.fromkeys(SUM_FIELDS + MAX_FIELDS, 0))
+            for field in SUM_FIELDS:
+                values[field] += group[field] or 0
+            for field in MAX_FIELDS:
+                values[field] = max(values[field], group[field] or 0)
+
+        for key, item in stats.items():
+            values = totals[key]
+            result_count = values['result_count']
+            item['total'] = result_count
+            if result_count > 0:
+                item['pass_rate'] = round((item['passed'] / result_count) * 100, 2)
+            if values['response_time_count'] > 0:
+                item['avg_response_time'] = round(
+                    values['response_time_sum'] / values['response_time_count'], 2
+                )
+                buckets = [values[field] for field in ApiDashboardRollup.LATENCY_FIELDS]
+                for percentile in PERCENTILES:
+                    item[f'p{percentile}_response_time'] = self._estimate_percentile(
+                        buckets, values['response_time_max'], percentile
+                    )
+            item['max_response_time'] = values['response_time_max']
+            item['last_execution_id'] = values['last_execution_id'] or None
+        return stats
+
+    @staticmethod
+    def _estimate_percentile(buckets: List[int], max_value: int, percentile: float) -> float:
+        """
+        根据区间计数估算响应时间分位数（区间内线性插值）
+
+        Args:
+            buckets: 与 LATENCY_FIELDS 对应的区间计数
+            max_value: 最大响应时间，作为最后一个区间的上界
+            percentile: 分位数（0-100）
+
+        Returns:
+            估算的响应时间（毫秒）
+        """
+        total = sum(buckets)
+        if total <= 0:
+            return 0
+        bounds = ApiDashboardRollup.LATENCY_BUCKETS
+        rank = total * percentile / 100
+        seen = 0
+        for index, count in enumerate(buckets):
+            if count and seen + count >= rank:
+                lower = bounds[index - 1] if index > 0 else 0
+                upper = bounds[index] if index < len(bounds) else max(max_value, lower)
+                # 最大响应时间落在更低区间时，不超过最大值
+                upper = min(upper, max_value) if max_value else upper
+                lower = min(lower, upper)
+                return round(lower + (upper - lower) * (rank - seen) / count, 2)
+            seen += count
+        return max_value
+
+    @staticmethod
+    def empty_stats() -> Dict[str, Any]:
+        """空统计"""
+        stats = {
+            'total': 0,
+            'passed': 0,
+            'failed': 0,
+            'skipped': 0,
+            'error': 0,
+            'pass_rate': 0.0,
+            'avg_response_time': 0,
+            'max_response_time': 0,
+            'last_execution_id': None,
+        }
+        for percentile in PERCENTILES:
+            stats[f'p{percentile}_response_time'] = 0
+        return stats
+
+
+# 全局汇总服务实例
+dashboard_rollup_service = DashboardRollupService()
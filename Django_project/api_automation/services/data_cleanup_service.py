@@ -13,26 +13,242 @@
 - 按项目清理：清理指定项目的过期数据
 - 按环境清理：清理指定环境的过期数据
 
+删除按主键顺序分批进行（每批一个短事务，批间休眠），避免单条无界 DELETE
+长时间锁表、撑大 MySQL undo log。进度写入 ApiCleanupCheckpoint，
+任务中断后再次执行会从断点继续。仪表盘日汇总作为历史统计保留，不随明细删除。
+
+启用冷归档（API_ARCHIVE_ENABLED）时，测试结果与HTTP执行记录在删除前先写入
+按天、按项目分区的压缩归档文件，历史趋势可通过 services.cold_archive 查询。
+
 建议配置 Celery Beat 定时任务，在每天凌晨低峰期执行。
 """
 
 import logging
+import time
 from datetime import timedelta
+from typing import Dict, Iterable, Optional
 
-from django.celery import shared_task
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 
 from api_automation.models import (
+    ApiCleanupCheckpoint,
     ApiHttpExecutionRecord,
     ApiTestExecution,
     ApiTestResult,
 )
+from api_automation.services.blob_store import blob_store
+from api_automation.services.cold_archive import KIND_HTTP_RECORDS, KIND_RESULTS, cold_archive
+from api_automation.services.dashboard_cache import dashboard_cache
+
+try:
+    from celery import shared_task
+except ImportError:  # 未安装 Celery 时任务函数仍可直接调用
+    def shared_task(func=None, **kwargs):
+        return func if func is not None else (lambda f: f)
 
 logger = logging.getLogger(__name__)
 
 # 默认数据保留天数
 DEFAULT_RETENTION_DAYS = 7
 
+# 清理阶段（先子表后主表，避免外键约束冲突）
+STAGE_RESULTS = 'results'
+STAGE_HTTP_RECORDS = 'http_records'
+STAGE_EXECUTIONS = 'executions'
+ALL_STAGES = (STAGE_RESULTS, STAGE_HTTP_RECORDS, STAGE_EXECUTIONS)
+
+# 仍在执行中的记录不清理
+ACTIVE_EXECUTION_STATUSES = ('PENDING', 'RUNNING')
+
+
+class RetentionCleanup:
+    """
+    分批、可续跑的过期数据清理
+    """
+
+    def __init__(self, batch_size: Optional[int] = None, sleep_ms: Optional[int] = None):
+        """
+        初始化清理器
+
+        Args:
+            batch_size: 每批删除的行数，默认读取 API_CLEANUP_BATCH_SIZE
+            sleep_ms: 批间休眠毫秒数，默认读取 API_CLEANUP_SLEEP_MS
+        """
+        if batch_size is None:
+            batch_size = getattr(settings, 'API_CLEANUP_BATCH_SIZE', 1000)
+        if sleep_ms is None:
+            sleep_ms = getattr(settings, 'API_CLEANUP_SLEEP_MS', 100)
+
+        self.batch_size = max(1, int(batch_size))
+        self.sleep_ms = max(0, int(sleep_ms))
+
+    def run(
+        self,
+        name: str,
+        days: int = DEFAULT_RETENTION_DAYS,
+        scope: Optional[Dict[str, int]] = None,
+        stages: Iterable[str] = ALL_STAGES,
+        restart: bool = False,
+    ) -> dict:
+        """
+        执行清理，存在未完成的同名检查点时从断点继续
+
+        Args:
+            name: 清理任务标识（检查点名称）
+            days: 保留天数
+            scope: 执行记录的过滤条件，如 {'project_id': 1}，为空表示全局
+            stages: 要执行的清理阶段，按给定顺序执行
+            restart: 丢弃未完成的检查点，重新开始
+
+        Returns:
+            清理结果统计（各阶段删除数、耗时、每秒删除行数）
+        """
+        stages = list(stages)
+        checkpoint, resumed = self._load_checkpoint(name, days, restart)
+        counts = {stage: int(checkpoint.deleted_counts.get(stage, 0)) for stage in stages}
+        started = time.monotonic()
+        deleted_this_run = 0
+
+        start_index = stages.index(checkpoint.stage) if checkpoint.stage in stages else 0
+        for index in range(start_index, len(stages)):
+            stage = stages[index]
+            if stage != checkpoint.stage:
+                checkpoint.stage = stage
+                checkpoint.last_pk = 0
+                checkpoint.save(update_fields=['stage', 'last_pk', 'updated_time'])
+
+            queryset = self._stage_queryset(stage, checkpoint.cutoff_time, scope or {})
+            while True:
+                ids = list(
+                    queryset.filter(pk__gt=checkpoint.last_pk)
+                    .order_by('pk')
+                    .values_list('pk', flat=True)[:self.batch_size]
+                )
+                if not ids:
+                    break
+
+                batch_started = time.monotonic()
+                with transaction.atomic():
+                    deleted = self._delete_batch(stage, ids)
+                    counts[stage] += deleted
+                    checkpoint.last_pk = ids[-1]
+                    checkpoint.deleted_counts = counts
+                    checkpoint.save(update_fields=['last_pk', 'deleted_counts', 'updated_time'])
+
+                deleted_this_run += deleted
+                elapsed = time.monotonic() - batch_started
+                logger.info(
+                    f"[{name}] {stage}: 删除 {deleted} 行（至主键 {ids[-1]}），"
+                    f"{self._rate(deleted, elapsed)} 行/秒"
+                )
+                if self.sleep_ms:
+                    time.sleep(self.sleep_ms / 1000)
+
+        checkpoint.status = 'COMPLETED'
+        checkpoint.finished_time = timezone.now()
+        checkpoint.save(update_fields=['status', 'finished_time', 'updated_time'])
+
+        elapsed = time.monotonic() - started
+        return {
+            'status': 'success',
+            'resumed': resumed,
+            'executions_deleted': counts.get(STAGE_EXECUTIONS, 0),
+            'results_deleted': counts.get(STAGE_RESULTS, 0),
+            'http_records_deleted': counts.get(STAGE_HTTP_RECORDS, 0),
+            'deleted_this_run': deleted_this_run,
+            'elapsed_seconds': round(elapsed, 2),
+            'rows_per_second': self._rate(deleted_this_run, elapsed),
+            'cutoff_date': timezone.localtime(checkpoint.cutoff_time).strftime('%Y-%m-%d %H:%M:%S'),
+        }
+
+    @staticmethod
+    def _load_checkpoint(name: str, days: int, restart: bool):
+        """读取未完成的检查点，否则以当前时间计算截止时间开始新一轮清理"""
+        checkpoint = ApiCleanupCheckpoint.objects.filter(name=name).first()
+        if checkpoint and checkpoint.status == 'RUNNING' and not restart:
+            logger.info(
+                f"[{name}] 从检查点继续: 阶段 {checkpoint.stage or '-'}，主键 {checkpoint.last_pk}"
+            )
+            return checkpoint, True
+
+        now = timezone.now()
+        checkpoint, _ = ApiCleanupCheckpoint.objects.update_or_create(
+            name=name,
+            defaults={
+                'cutoff_time': now - timedelta(days=days),
+                'stage': '',
+                'last_pk': 0,
+                'deleted_counts': {},
+                'status': 'RUNNING',
+                'started_time': now,
+                'finished_time': None,
+            },
+        )
+        return checkpoint, False
+
+    @staticmethod
+    def _stage_queryset(stage: str, cutoff, scope: Dict[str, int]):
+        """
+        构建清理阶段的过期数据查询集
+
+        测试结果按所属执行的创建时间判断是否过期；全局清理时HTTP执行记录
+        按自身创建时间判断（包含不属于任何执行的调试请求），按范围清理时按所属执行判断。
+        """
+        def execution_lookups(prefix=''):
+            lookups = {f'{prefix}created_time__lt': cutoff}
+            lookups.update({f'{prefix}{key}': value for key, value in scope.items()})
+            return lookups
+
+        active = ACTIVE_EXECUTION_STATUSES
+        if stage == STAGE_RESULTS:
+            return ApiTestResult.objects.filter(**execution_lookups('execution__')).exclude(
+                execution__status__in=active
+            )
+        if stage == STAGE_HTTP_RECORDS:
+            if not scope:
+                return ApiHttpExecutionRecord.objects.filter(created_time__lt=cutoff)
+            return ApiHttpExecutionRecord.objects.filter(
+                **execution_lookups('execution__')
+            ).exclude(execution__status__in=active)
+        if stage == STAGE_EXECUTIONS:
+            return ApiTestExecution.objects.filter(**execution_lookups()).exclude(
+                status__in=active
+            )
+        raise ValueError(f"未知的清理阶段: {stage}")
+
+    @staticmethod
+    def _delete_batch(stage: str, ids: list) -> int:
+        """归档并删除一批数据、释放其引用的内容存储对象，返回本阶段模型的删除行数"""
+        if stage == STAGE_RESULTS:
+            queryset = ApiTestResult.objects.filter(pk__in=ids)
+            if cold_archive.enabled:
+                cold_archive.archive(KIND_RESULTS, queryset)
+            blob_store.release_for(queryset)
+        elif stage == STAGE_HTTP_RECORDS:
+            queryset = ApiHttpExecutionRecord.objects.filter(pk__in=ids)
+            if cold_archive.enabled:
+                cold_archive.archive(KIND_HTTP_RECORDS, queryset)
+            blob_store.release_for(queryset)
+        else:
+            queryset = ApiTestExecution.objects.filter(pk__in=ids)
+            dashboard_cache.bump(queryset.values_list('project_id', flat=True))
+
+        _, per_model = queryset.delete()
+        return per_model.get(queryset.model._meta.label, 0)
+
+    @staticmethod
+    def _rate(rows: int, seconds: float) -> float:
+        """每秒删除行数"""
+        if seconds <= 0:
+            return float(rows)
+        return round(rows / seconds, 1)
+
+
+# 全局清理器实例
+retention_cleanup = RetentionCleanup()
+
 
 @shared_task
 def cleanup_old_test_data():
@@ -56,90 +272,26 @@ def cleanup_old_test_data():
         清理结果统计字典
     """
     try:
-        cutoff_date = timezone.now() - timedelta(days=DEFAULT_RETENTION_DAYS)
-
-        logger.info(f"开始清理 {cutoff_date} 之前的测试数据")
-
-        # 清理前统计
-        stats_before = {
-            'executions': ApiTestExecution.objects.filter(
-                created_time__lt=cutoff_date
-            ).count(),
-            'results': ApiTestResult.objects.filter(
-                created_time__lt=cutoff_date
-            ).count(),
-            'http_records': ApiHttpExecutionRecord.objects.filter(
-                created_time__lt=cutoff_date
-            ).count(),
-        }
-
-        logger.info(
-            f"清理前统计: Executions={stats_before['executions']}, "
-            f"Results={stats_before['results']}, "
-            f"HttpRecords={stats_before['http_records']}"
-        )
-
-        # 按顺序删除：先子表后主表
-        results_deleted, _ = ApiTestResult.objects.filter(
-            created_time__lt=cutoff_date
-        ).delete()
-
-        http_records_deleted, _ = ApiHttpExecutionRecord.objects.filter(
-            created_time__lt=cutoff_date
-        ).delete()
-
-        executions_deleted, _ = ApiTestExecution.objects.filter(
-            created_time__lt=cutoff_date
-        ).delete()
-
+        result = retention_cleanup.run('global', DEFAULT_RETENTION_DAYS)
         logger.info(
-            f"清理完成: 删除了 {executions_deleted} 条执行记录, "
-            f"{results_deleted} 条测试结果, "
-            f"{http_records_deleted} 条HTTP记录"
+            f"清理完成: 删除了 {result['executions_deleted']} 条执行记录, "
+            f"{result['results_deleted']} 条测试结果, "
+            f"{result['http_records_deleted']} 条HTTP记录, "
+            f"{result['rows_per_second']} 行/秒"
         )
-
-        return {
-            'status': 'success',
-            'executions_deleted': executions_deleted,
-            'results_deleted': results_deleted,
-            'http_records_deleted': http_records_deleted,
-            'cleanup_date': cutoff_date.strftime('%Y-%m-%d %H:%M:%S'),
-        }
+        return result
 
     except Exception as e:
         logger.error(f"清理数据时出错: {e}")
         return {'status': 'error', 'error': str(e)}
 
 
-def _cleanup_by_execution_ids(execution_ids: list) -> tuple:
-    """
-    根据执行记录ID列表清理关联的子数据
-
-    这是 cleanup_by_project 和 cleanup_by_environment 的共用逻辑。
-
-    Args:
-        execution_ids: 执行记录ID列表
-
-    Returns:
-        (results_deleted, http_records_deleted) 元组
-    """
-    results_deleted = ApiTestResult.objects.filter(
-        execution_id__in=execution_ids
-    ).delete()[0]
-
-    http_records_deleted = ApiHttpExecutionRecord.objects.filter(
-        execution_id__in=execution_ids
-    ).delete()[0]
-
-    return results_deleted, http_records_deleted
-
-
 @shared_task
 def cleanup_by_project(project_id: int, days: int = DEFAULT_RETENTION_DAYS):
     """
     按项目清理指定天数前的测试数据
 
-    先查找项目下的过期执行记录，再级联删除关联的结果和HTTP记录。
+    先删除项目下过期执行的结果和HTTP记录，再删除执行记录。
 
     Args:
         project_id: 项目ID
@@ -149,37 +301,14 @@ def cleanup_by_project(project_id: int, days: int = DEFAULT_RETENTION_DAYS):
         清理结果统计字典
     """
     try:
-        cutoff_date = timezone.now() - timedelta(days=days)
-
-        logger.info(
-            f"开始清理项目 {project_id} {days}天前的数据"
-            f"（{cutoff_date}之前）"
-        )
-
-        executions = ApiTestExecution.objects.filter(
-            project_id=project_id,
-            created_time__lt=cutoff_date
-        )
-
-        execution_ids = list(executions.values_list('id', flat=True))
-        results_deleted, http_records_deleted = _cleanup_by_execution_ids(
-            execution_ids
+        result = retention_cleanup.run(
+            f'project:{project_id}', days, scope={'project_id': project_id}
         )
-        executions_deleted = executions.delete()[0]
-
         logger.info(
             f"项目 {project_id} 清理完成: "
-            f"删除了 {executions_deleted} 条执行记录"
+            f"删除了 {result['executions_deleted']} 条执行记录"
         )
-
-        return {
-            'status': 'success',
-            'project_id': project_id,
-            'executions_deleted': executions_deleted,
-            'results_deleted': results_deleted,
-            'http_records_deleted': http_records_deleted,
-            'cutoff_date': cutoff_date.strftime('%Y-%m-%d %H:%M:%S'),
-        }
+        return {'project_id': project_id, **result}
 
     except Exception as e:
         logger.error(f"按项目清理数据时出错: {e}")
@@ -198,7 +327,7 @@ def cleanup_by_environment(
     """
     按环境清理指定天数前的测试数据
 
-    先查找环境下的过期执行记录，再级联删除关联的结果和HTTP记录。
+    先删除环境下过期执行的结果和HTTP记录，再删除执行记录。
 
     Args:
         environment_id: 环境ID
@@ -208,37 +337,14 @@ def cleanup_by_environment(
         清理结果统计字典
     """
     try:
-        cutoff_date = timezone.now() - timedelta(days=days)
-
-        logger.info(
-            f"开始清理环境 {environment_id} {days}天前的数据"
-            f"（{cutoff_date}之前）"
-        )
-
-        executions = ApiTestExecution.objects.filter(
-            environment_id=environment_id,
-            created_time__lt=cutoff_date
-        )
-
-        execution_ids = list(executions.values_list('id', flat=True))
-        results_deleted, http_records_deleted = _cleanup_by_execution_ids(
-            execution_ids
+        result = retention_cleanup.run(
+            f'environment:{environment_id}', days, scope={'environment_id': environment_id}
         )
-        executions_deleted = executions.delete()[0]
-
         logger.info(
             f"环境 {environment_id} 清理完成: "
-            f"删除了 {executions_deleted} 条执行记录"
+            f"删除了 {result['executions_deleted']} 条执行记录"
         )
-
-        return {
-            'status': 'success',
-            'environment_id': environment_id,
-            'executions_deleted': executions_deleted,
-            'results_deleted': results_deleted,
-            'http_records_deleted': http_records_deleted,
-            'cutoff_date': cutoff_date.strftime('%Y-%m-%d %H:%M:%S'),
-        }
+        return {'environment_id': environment_id, **result}
 
     except Exception as e:
         logger.error(f"按环境清理数据时出错: {e}")
@@ -269,7 +375,7 @@ def get_cleanup_stats() -> dict:
         created_time__lt=cutoff_date
     ).count()
     old_results = ApiTestResult.objects.filter(
-        created_time__lt=cutoff_date
+        execution__created_time__lt=cutoff_date
     ).count()
     old_http_records = ApiHttpExecutionRecord.objects.filter(
         created_time__lt=cutoff_date
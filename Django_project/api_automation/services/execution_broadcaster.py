@@ -0,0 +1,159 @@
+"""
+执行进度节流广播
+
+批量执行每完成一个用例都会产生进度和结果事件，逐条调用
+async_to_sync(channel_layer.group_send) 在高吞吐时会占用大量执行器 CPU，
+并让浏览器收到远超其渲染能力的消息。
+
+ExecutionBroadcaster 为单次执行缓冲这些事件，由后台刷新线程按固定频率发送：
+- 进度事件合并，每次刷新只发送最新的一条
+- 用例结果事件攒批，以数组形式通过 test.results 事件发送
+- 执行状态事件（开始、完成、失败、取消）不节流，发送前先刷新已缓冲的事件，
+  保证前端收到终态时已拿到全部结果
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+
+from api_automation.services.websocket_service import WebSocketBroadcastService, websocket_service
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionBroadcaster:
+    """
+    单次执行的节流广播器
+
+    用法：
+        broadcaster = ExecutionBroadcaster(execution.id).start()
+        broadcaster.progress(...) / broadcaster.test_result(...)
+        broadcaster.status('COMPLETED', '...')
+        broadcaster.close()
+    """
+
+    def __init__(
+        self,
+        execution_id: int,
+        service: Optional[WebSocketBroadcastService] = None,
+        messages_per_second: Optional[float] = None,
+        max_batch_size: Optional[int] = None,
+    ):
+        """
+        初始化广播器
+
+        Args:
+            execution_id: 执行ID
+            service: 底层广播服务，默认使用全局实例
+            messages_per_second: 每秒最多刷新次数，默认读取 API_WS_MESSAGES_PER_SECOND
+            max_batch_size: 单条结果批量消息包含的最大结果数，默认读取 API_WS_RESULT_BATCH_SIZE
+        """
+        if messages_per_second is None:
+            messages_per_second = getattr(settings, 'API_WS_MESSAGES_PER_SECOND', 4)
+        if max_batch_size is None:
+            max_batch_size = getattr(settings, 'API_WS_RESULT_BATCH_SIZE', 200)
+
+        self.execution_id = execution_id
+        self.service = service or websocket_service
+        self.interval = 1.0 / max(0.1, float(messages_per_second))
+        self.max_batch_size = max(1, int(max_batch_size))
+
+        self._lock = threading.Lock()           # 保护缓冲区
+        self._send_lock = threading.Lock()      # 保证消息按顺序发送
+        self._progress: Optional[Dict[str, Any]] = None
+        self._results: List[Dict[str, Any]] = []
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> 'ExecutionBroadcaster':
+        """启动后台刷新线程"""
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._flush_loop,
+                name=f'execution-broadcaster-{self.execution_id}',
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def close(self):
+        """停止刷新线程并发送剩余事件"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def progress(
+        self,
+        current: int,
+        total: int,
+        passed_count: int = 0,
+        failed_count: int = 0,
+    ):
+        """
+        记录执行进度（只保留最新一条，下次刷新时发送）
+
+        Args:
+            current: 已完成的用例数
+            total: 总用例数
+            passed_count: 已通过数量
+            failed_count: 已失败数量
+        """
+        with self._lock:
+            self._progress = {
+                'current': current,
+                'total': total,
+                'passed_count': passed_count,
+                'failed_count': failed_count,
+            }
+
+    def test_result(self, **data: Any):
+        """
+        缓冲单个用例结果（参数同 WebSocketBroadcastService.broadcast_test_result）
+
+        Args:
+            **data: 结果字段（test_case_id、test_case_name、result 等）
+        """
+        with self._lock:
+            self._results.append(data)
+
+    def status(self, status: str, message: Optional[str] = None):
+        """
+        立即发送执行状态事件（先刷新已缓冲的进度和结果）
+
+        Args:
+            status: 执行状态
+            message: 状态描述
+        """
+        with self._send_lock:
+            self._flush_locked()
+            self.service.broadcast_execution_status(self.execution_id, status, message)
+
+    def flush(self):
+        """立即发送已缓冲的进度和结果"""
+        with self._send_lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        """发送缓冲区内容（调用方需持有 _send_lock）"""
+        with self._lock:
+            results, self._results = self._results, []
+            progress, self._progress = self._progress, None
+
+        for start in range(0, len(results), self.max_batch_size):
+            self.service.broadcast_test_results(
+                self.execution_id, results[start:start + self.max_batch_size]
+            )
+        if progress is not None:
+            self.service.broadcast_execution_progress(self.execution_id, **progress)
+
+    def _flush_loop(self):
+        """后台刷新线程"""
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Error flushing broadcasts for execution {self.execution_id}: {e}")
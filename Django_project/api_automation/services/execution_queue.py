@@ -0,0 +1,411 @@
+"""
+执行任务队列服务
+
+基于数据库的批量执行任务队列，无需额外的消息中间件：
+
+- 入队：视图层创建 PENDING 执行记录后调用 execution_queue.enqueue 写入任务
+- 领取：工作线程按「优先级降序、入队时间升序」领取任务，
+  同一项目同时执行的任务数不超过 project_concurrency
+- 租约：领取时写入租约到期时间，执行期间由心跳线程定期续约
+- 恢复：租约过期（工作进程崩溃）的任务重新入队，超过最大尝试次数则标记失败
+
+任务状态的每次变更都使用带条件的 UPDATE（比较并交换），
+多个工作进程同时领取同一任务时只有一个能成功。
+工作进程由 run_execution_worker 管理命令启动，见 ExecutionWorker。
+"""
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import timedelta
+from typing import Optional
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from api_automation.models import ApiExecutionJob, ApiProject, ApiTestExecution, ApiTestResult
+from api_automation.services.blob_store import blob_store
+from api_automation.services.cancellation import REASON_LEASE_LOST, cancellation_registry
+from api_automation.services.dashboard_cache import dashboard_cache
+from api_automation.services.dashboard_rollup_service import dashboard_rollup_service
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutionQueue:
+    """
+    数据库执行任务队列
+    """
+
+    def __init__(
+        self,
+        lease_seconds: Optional[int] = None,
+        project_concurrency: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+    ):
+        """
+        初始化执行队列
+
+        Args:
+            lease_seconds: 任务租约时长（秒），默认读取 API_EXECUTION_LEASE_SECONDS
+            project_concurrency: 单个项目同时执行的最大任务数，默认读取 API_EXECUTION_PROJECT_CONCURRENCY
+            max_attempts: 任务最大尝试次数，默认读取 API_EXECUTION_MAX_ATTEMPTS
+        """
+        if lease_seconds is None:
+            lease_seconds = getattr(settings, 'API_EXECUTION_LEASE_SECONDS', 60)
+        if project_concurrency is None:
+            project_concurrency = getattr(settings, 'API_EXECUTION_PROJECT_CONCURRENCY', 2)
+        if max_attempts is None:
+            max_attempts = getattr(settings, 'API_EXECUTION_MAX_ATTEMPTS', 3)
+
+        self.lease_seconds = max(1, int(lease_seconds))
+        self.project_concurrency = max(1, int(project_concurrency))
+        self.max_attempts = max(1, int(max_attempts))
+
+    def enqueue(self, execution: ApiTestExecution, priority: int = 0) -> ApiExecutionJob:
+        """
+        将执行记录加入队列
+
+        Args:
+            execution: PENDING 状态的执行记录
+            priority: 优先级，数值越大越先执行
+
+        Returns:
+            ApiExecutionJob 实例
+        """
+        job = ApiExecutionJob.objects.create(
+            execution=execution,
+            project_id=execution.project_id,
+            priority=int(priority or 0),
+            max_attempts=self.max_attempts,
+        )
+        logger.info(f"Enqueued execution {execution.id} (priority={job.priority})")
+        return job
+
+    def claim(self, worker_id: str) -> Optional[ApiExecutionJob]:
+        """
+        领取下一个可执行的任务
+
+        跳过已达到并发上限的项目；候选任务所属项目的行在事务内加锁，
+        保证并发领取时项目并发数不超限。
+
+        Args:
+            worker_id: 工作线程标识
+
+        Returns:
+            领取到的任务，没有可执行任务时返回None
+        """
+        saturated_projects = set()
+
+        while True:
+            candidate = (
+                ApiExecutionJob.objects
+                .filter(status='QUEUED')
+                .exclude(project_id__in=saturated_projects)
+                .order_by('-priority', 'created_time', 'id')
+                .only('id', 'project_id')
+                .first()
+            )
+            if candidate is None:
+                return None
+
+            with transaction.atomic():
+                # 锁定项目行，串行化同一项目的并发数检查（SQLite 下为空操作）
+                list(ApiProject.objects.select_for_update().filter(pk=candidate.project_id).values('pk'))
+
+                running = ApiExecutionJob.objects.filter(
+                    project_id=candidate.project_id, status='RUNNING'
+                ).count()
+                if running >= self.project_concurrency:
+                    saturated_projects.add(candidate.project_id)
+                    continue
+
+                now = timezone.now()
+                claimed = ApiExecutionJob.objects.filter(
+                    pk=candidate.pk, status='QUEUED'
+                ).update(
+                    status='RUNNING',
+                    worker_id=worker_id,
+                    attempts=F('attempts') + 1,
+                    started_time=now,
+                    heartbeat_time=now,
+                    lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                    updated_time=now,
+                )
+
+            if claimed:
+                return ApiExecutionJob.objects.select_related('execution').get(pk=candidate.pk)
+            # 被其他工作线程抢先领取，继续尝试下一个
+
+    def heartbeat(self, job: ApiExecutionJob, worker_id: str) -> bool:
+        """
+        续约任务租约
+
+        Args:
+            job: 执行中的任务
+            worker_id: 持有任务的工作线程标识
+
+        Returns:
+            是否仍持有该任务（租约已被回收时返回False）
+        """
+        now = timezone.now()
+        return bool(ApiExecutionJob.objects.filter(
+            pk=job.pk, status='RUNNING', worker_id=worker_id
+        ).update(
+            heartbeat_time=now,
+            lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+            updated_time=now,
+        ))
+
+    def complete(
+        self,
+        job: ApiExecutionJob,
+        worker_id: str,
+        status: str = 'SUCCEEDED',
+        error_message: str = '',
+    ) -> bool:
+        """
+        结束任务
+
+        Args:
+            job: 执行中的任务
+            worker_id: 持有任务的工作线程标识
+            status: 结束状态（SUCCEEDED/FAILED/CANCELLED）
+            error_message: 错误信息
+
+        Returns:
+            是否更新成功（任务已被回收时返回False）
+        """
+        now = timezone.now()
+        return bool(ApiExecutionJob.objects.filter(
+            pk=job.pk, status='RUNNING', worker_id=worker_id
+        ).update(
+            status=status,
+            error_message=error_message or '',
+            finished_time=now,
+            lease_expires_at=None,
+            updated_time=now,
+        ))
+
+    def recover_expired(self) -> int:
+        """
+        回收租约过期的任务
+
+        未超过最大尝试次数的任务重新入队，否则标记任务和执行记录为失败。
+
+        Returns:
+            回收的任务数
+        """
+        now = timezone.now()
+        expired = ApiExecutionJob.objects.filter(status='RUNNING', lease_expires_at__lt=now)
+
+        requeued = expired.filter(attempts__lt=F('max_attempts')).update(
+            status='QUEUED', worker_id='', lease_expires_at=None, updated_time=now,
+        )
+
+        exhausted_ids = list(
+            expired.filter(attempts__gte=F('max_attempts')).values_list('id', flat=True)
+        )
+        failed = 0
+        if exhausted_ids:
+            failed = ApiExecutionJob.objects.filter(
+                id__in=exhausted_ids, status='RUNNING', lease_expires_at__lt=now
+            ).update(
+                status='FAILED',
+                error_message='工作进程失去响应，已超过最大尝试次数',
+                finished_time=now,
+                lease_expires_at=None,
+                updated_time=now,
+            )
+            ApiTestExecution.objects.filter(
+                job__id__in=exhausted_ids, status__in=['PENDING', 'RUNNING']
+            ).update(status='FAILED', end_time=now)
+
+        if requeued or failed:
+            logger.warning(f"Recovered expired jobs: {requeued} requeued, {failed} failed")
+        return requeued + failed
+
+
+class _Heartbeat:
+    """
+    任务执行期间在后台线程中定期续约租约的上下文管理器
+
+    续约失败（租约已被回收）时以 REASON_LEASE_LOST 取消本进程内的执行。
+    """
+
+    def __init__(self, queue: ExecutionQueue, job: ApiExecutionJob, worker_id: str):
+        self.queue = queue
+        self.job = job
+        self.worker_id = worker_id
+        self.interval = max(1.0, queue.lease_seconds / 3)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name=f'heartbeat-{job.pk}', daemon=True
+        )
+
+    def _run(self):
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    if not self.queue.heartbeat(self.job, self.worker_id):
+                        # 任务已被回收并可能重新入队，停止本次执行，避免与下一次尝试同时写入结果
+                        logger.warning(
+                            f"Lost lease on job {self.job.pk}, abandoning execution {self.job.execution_id}"
+                        )
+                        cancellation_registry.cancel(self.job.execution_id, reason=REASON_LEASE_LOST)
+                        return
+                except Exception as e:
+                    logger.error(f"Heartbeat failed for job {self.job.pk}: {e}")
+        finally:
+            close_old_connections()
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._stop.set()
+        self._thread.join()
+
+
+class ExecutionWorker:
+    """
+    执行队列工作者
+
+    启动 threads 个工作线程循环领取并执行任务；
+    每轮空闲等待前回收一次租约过期的任务。
+    """
+
+    def __init__(
+        self,
+        queue: Optional[ExecutionQueue] = None,
+        threads: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        worker_name: Optional[str] = None,
+    ):
+        """
+        初始化工作者
+
+        Args:
+            queue: 执行队列，默认使用模块级实例
+            threads: 工作线程数，默认读取 API_EXECUTION_WORKER_THREADS
+            poll_interval: 队列为空时的轮询间隔（秒），默认读取 API_EXECUTION_QUEUE_POLL_INTERVAL
+            worker_name: 工作者名称前缀，默认为 主机名:进程号
+        """
+        if threads is None:
+            threads = getattr(settings, 'API_EXECUTION_WORKER_THREADS', 2)
+        if poll_interval is None:
+            poll_interval = getattr(settings, 'API_EXECUTION_QUEUE_POLL_INTERVAL', 2)
+
+        self.queue = queue or execution_queue
+        self.threads = max(1, int(threads))
+        self.poll_interval = max(0.1, float(poll_interval))
+        self.worker_name = worker_name or f'{socket.gethostname()}:{os.getpid()}'
+
+    def run(self, stop_event: Optional[threading.Event] = None):
+        """
+        启动工作线程并阻塞直到 stop_event 被设置
+
+        Args:
+            stop_event: 停止信号，为空时一直运行
+        """
+        stop_event = stop_event or threading.Event()
+        workers = [
+            threading.Thread(
+                target=self._loop,
+                args=(f'{self.worker_name}:{index}', stop_event),
+                name=f'execution-worker-{index}',
+                daemon=True,
+            )
+            for index in range(self.threads)
+        ]
+        for worker in workers:
+            worker.start()
+        logger.info(f"Execution worker {self.worker_name} started with {self.threads} threads")
+
+        try:
+            while not stop_event.wait(self.poll_interval):
+                pass
+        finally:
+            stop_event.set()
+            for worker in workers:
+                worker.join()
+            logger.info(f"Execution worker {self.worker_name} stopped")
+
+    def _loop(self, worker_id: str, stop_event: threading.Event):
+        """单个工作线程的主循环"""
+        try:
+            while not stop_event.is_set():
+                try:
+                    if self.run_once(worker_id):
+                        continue
+                    self.queue.recover_expired()
+                except Exception as e:
+                    logger.error(f"Execution worker {worker_id} error: {e}")
+                stop_event.wait(self.poll_interval)
+        finally:
+            close_old_connections()
+
+    def run_once(self, worker_id: Optional[str] = None) -> bool:
+        """
+        领取并执行一个任务
+
+        Args:
+            worker_id: 工作线程标识
+
+        Returns:
+            是否领取到任务
+        """
+        from api_automation.services.batch_execution_service import BatchExecutionService
+
+        worker_id = worker_id or f'{self.worker_name}:{uuid.uuid4().hex[:8]}'
+        close_old_connections()
+
+        job = self.queue.claim(worker_id)
+        if job is None:
+            return False
+
+        execution = job.execution
+        if execution.status == 'CANCELLED':
+            self.queue.complete(job, worker_id, status='CANCELLED')
+            return True
+
+        logger.info(f"Worker {worker_id} running execution {execution.id} (attempt {job.attempts})")
+        try:
+            with _Heartbeat(self.queue, job, worker_id):
+                if job.attempts > 1:
+                    self._reset_execution(execution)
+                BatchExecutionService().run_execution(execution)
+
+            status = 'SUCCEEDED' if execution.status == 'COMPLETED' else 'FAILED'
+            if execution.status == 'CANCELLED':
+                status = 'CANCELLED'
+            self.queue.complete(job, worker_id, status=status)
+        except Exception as e:
+            logger.error(f"Execution {execution.id} failed in worker {worker_id}: {e}")
+            ApiTestExecution.objects.filter(
+                pk=execution.pk, status__in=['PENDING', 'RUNNING']
+            ).update(status='FAILED', end_time=timezone.now())
+            self.queue.complete(job, worker_id, status='FAILED', error_message=str(e))
+        return True
+
+    def _reset_execution(self, execution: ApiTestExecution):
+        """重试前清除上一次尝试留下的部分结果与统计"""
+        dashboard_rollup_service.revert_execution(execution)
+        results = ApiTestResult.objects.filter(execution=execution)
+        blob_store.release_for(results)
+        results.delete()
+        dashboard_cache.bump([execution.project_id])
+        execution.passed_count = 0
+        execution.failed_count = 0
+        execution.skipped_count = 0
+        execution.status = 'PENDING'
+        execution.save(update_fields=['passed_count', 'failed_count', 'skipped_count', 'status'])
+
+
+# 全局执行队列实例，供视图层和工作进程使用
+execution_queue = ExecutionQueue()
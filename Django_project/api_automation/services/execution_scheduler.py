@@ -0,0 +1,251 @@
+"""
+依赖感知的并发调度器
+
+根据测试用例之间的变量引用关系构建依赖图（DAG），在保证
+「生产者 -> 消费者」执行顺序的前提下并发执行相互独立的用例。
+
+依赖判定规则：
+- 用例的 url/headers/params/body 中出现的 ${shared.x} / ${global.x}
+  引用视为对变量 x 的读取（通过 VariablePool.VARIABLE_PATTERN 识别）
+- 用例启用的 ApiTestCaseExtraction.variable_name 视为对变量的写入
+  （variable_scope='global' 写入 global 作用域，其余写入 shared 作用域）
+- 读取依赖于列表中位于其之前的最近一次写入（读后写）
+- 写入依赖于之前的写入以及上次写入之后的所有读取（写后写、写后读），
+  确保并发执行时每个用例读到的变量值与顺序执行完全一致
+
+max_workers <= 1 时退化为按列表顺序逐条执行。
+传入取消标志时，标志置位后不再提交新的用例，等待已运行的用例结束后返回。
+"""
+
+import logging
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db import connections
+
+from api_automation.services.cancellation import CancellationToken
+from api_automation.services.variable_pool_service import VariablePool
+
+logger = logging.getLogger(__name__)
+
+# 参与依赖分析的变量作用域（env 只读、local 仅当前用例有效，不产生用例间依赖）
+DEPENDENCY_SCOPES = ('shared', 'global')
+
+VariableKey = Tuple[str, str]
+
+
+class DependencyScheduler:
+    """
+    依赖感知的并发调度器
+
+    先通过 build_dependencies 计算每个用例的前置用例集合，
+    再由 run 使用线程池按拓扑顺序调度执行。
+    """
+
+    def __init__(self, max_workers: int = 1):
+        """
+        初始化调度器
+
+        Args:
+            max_workers: 最大并发工作线程数，<=1 时按顺序执行
+        """
+        self.max_workers = max(1, int(max_workers or 1))
+
+    @staticmethod
+    def collect_references(test_case: Any) -> Set[VariableKey]:
+        """
+        收集测试用例请求定义中引用的共享/全局变量
+
+        Args:
+            test_case: 测试用例对象（需包含 url/headers/params/body 属性）
+
+        Returns:
+            (作用域, 变量名) 集合，变量名取引用路径的第一级
+        """
+        references = set()
+        sources = [
+            getattr(test_case, 'url', ''),
+            getattr(test_case, 'headers', None),
+            getattr(test_case, 'params', None),
+            getattr(test_case, 'body', None),
+        ]
+
+        for text in _iter_strings(sources):
+            for match in VariablePool.VARIABLE_PATTERN.finditer(text):
+                parts = match.group(1).split('.')
+                if parts[0] in DEPENDENCY_SCOPES:
+                    references.add((parts[0], parts[1]))
+
+        return references
+
+    @staticmethod
+    def collect_productions(test_case: Any) -> Set[VariableKey]:
+        """
+        收集测试用例通过数据提取产出的变量
+
+        Args:
+            test_case: 测试用例对象
+
+        Returns:
+            (作用域, 变量名) 集合
+        """
+        productions = set()
+        # 使用 all() 复用批量执行预取的提取规则，启用状态在内存中过滤
+        for extraction in test_case.extractions.all():
+            if not extraction.is_enabled:
+                continue
+            scope = 'global' if extraction.variable_scope == 'global' else 'shared'
+            productions.add((scope, extraction.variable_name))
+        return productions
+
+    def build_dependencies(self, test_cases: List[Any]) -> Dict[int, Set[int]]:
+        """
+        构建用例依赖图
+
+        Args:
+            test_cases: 按顺序排列的测试用例列表
+
+        Returns:
+            {用例索引: 前置用例索引集合}
+        """
+        dependencies = {index: set() for index in range(len(test_cases))}
+        last_writer: Dict[VariableKey, int] = {}
+        readers_since_write: Dict[VariableKey, List[int]] = {}
+
+        for index, test_case in enumerate(test_cases):
+            reads = self.collect_references(test_case)
+            writes = self.collect_productions(test_case)
+
+            for key in reads:
+                if key in last_writer:
+                    dependencies[index].add(last_writer[key])
+
+            for key in writes:
+                if key in last_writer:
+                    dependencies[index].add(last_writer[key])
+                dependencies[index].update(
+                    reader for reader in readers_since_write.get(key, [])
+                    if reader != index
+                )
+
+            for key in reads:
+                readers_since_write.setdefault(key, []).append(index)
+
+            for key in writes:
+                last_writer[key] = index
+                readers_since_write[key] = []
+
+        return dependencies
+
+    def run(
+        self,
+        test_cases: List[Any],
+        worker: Callable[[int, Any], None],
+        cancel_token: Optional[CancellationToken] = None,
+    ):
+        """
+        按依赖关系调度执行所有用例
+
+        worker 负责单个用例的完整执行及其异常处理；若 worker 抛出异常，
+        调度器仅记录日志并继续调度其后继用例，与顺序执行时的行为一致。
+
+        Args:
+            test_cases: 按顺序排列的测试用例列表
+            worker: 执行单个用例的回调，参数为 (索引, 用例)
+            cancel_token: 取消标志（可选），置位后停止调度剩余用例
+        """
+        if self.max_workers <= 1 or len(test_cases) <= 1:
+            for index, test_case in enumerate(test_cases):
+                if cancel_token is not None and cancel_token.is_cancelled:
+                    logger.info(f"Scheduling cancelled, {len(test_cases) - index} test cases skipped")
+                    return
+                self._run_task(worker, index, test_case)
+            return
+
+        dependencies = self.build_dependencies(test_cases)
+        dependents: Dict[int, List[int]] = {index: [] for index in dependencies}
+        remaining = {}
+        for index, prerequisites in dependencies.items():
+            remaining[index] = len(prerequisites)
+            for prerequisite in prerequisites:
+                dependents[prerequisite].append(index)
+
+        ready = [index for index in sorted(remaining) if remaining[index] == 0]
+        running = {}
+
+        logger.info(
+            f"Scheduling {len(test_cases)} test cases with "
+            f"{self.max_workers} workers"
+        )
+
+        with ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='api-batch',
+        ) as pool:
+            while ready or running:
+                if ready and cancel_token is not None and cancel_token.is_cancelled:
+                    logger.info(f"Scheduling cancelled, {len(ready)} ready test cases skipped")
+                    ready.clear()
+                    if not running:
+                        break
+                while ready:
+                    index = ready.pop(0)
+                    future = pool.submit(
+                        self._run_task, worker, index, test_cases[index]
+                    )
+                    running[future] = index
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                newly_ready = []
+                for future in done:
+                    index = running.pop(future)
+                    for dependent in dependents[index]:
+                        remaining[dependent] -= 1
+                        if remaining[dependent] == 0:
+                            newly_ready.append(dependent)
+                ready.extend(newly_ready)
+                ready.sort()
+
+            self._close_worker_connections(pool)
+
+    def _run_task(self, worker: Callable[[int, Any], None], index: int, test_case: Any):
+        """执行单个调度任务，吞掉异常以保证后继用例继续调度"""
+        try:
+            worker(index, test_case)
+        except Exception as e:
+            logger.error(f"Scheduled task {index} failed: {e}")
+
+    def _close_worker_connections(self, pool: ThreadPoolExecutor):
+        """
+        调度结束时在每个工作线程中各释放一次数据库连接
+
+        数据库连接按线程持有，只能由所属线程关闭，用例之间则保持复用。
+        提交与线程数相同的任务并在屏障处等待，保证每个线程恰好领到一个。
+
+        Args:
+            pool: 调度使用的线程池
+        """
+        barrier = threading.Barrier(self.max_workers)
+
+        def close():
+            try:
+                barrier.wait(timeout=30)
+            except threading.BrokenBarrierError:
+                logger.warning("Worker barrier broken, closing connections anyway")
+            connections.close_all()
+
+        for _ in range(self.max_workers):
+            pool.submit(close)
+
+
+def _iter_strings(value: Any) -> Iterable[str]:
+    """递归遍历嵌套的 dict/list 结构，产出其中所有字符串"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _iter_strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _iter_strings(item)
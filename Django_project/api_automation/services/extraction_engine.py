@@ -12,6 +12,9 @@ import re
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import parse_qs, urlparse
 
+from api_automation.services.json_path import compile_json_path
+from api_automation.services.response_document import ResponseDocument, etree
+
 logger = logging.getLogger(__name__)
 
 # 尝试导入WebSocket服务（非必须依赖，不可用时静默降级）
@@ -72,7 +75,8 @@ class ExtractionEngine:
         response_body: Any = None,
         response_text: str = None,
         execution_id: Optional[int] = None,
-        test_case_id: Optional[int] = None
+        test_case_id: Optional[int] = None,
+        document: Optional[ResponseDocument] = None
     ) -> Tuple[Dict[str, Any], List[ExtractionResult]]:
         """
         批量执行变量提取
@@ -80,6 +84,7 @@ class ExtractionEngine:
         遍历提取配置列表，逐条执行提取操作并收集结果。
         提取成功的变量会加入返回的变量字典，失败时使用默认值（如果有）。
         每次提取结果都会通过WebSocket广播（如果可用）。
+        所有规则共享同一个 ResponseDocument，响应体只解析一次。
 
         Args:
             extractions: 提取配置列表
@@ -88,12 +93,15 @@ class ExtractionEngine:
             response_text: 原始响应文本
             execution_id: 执行ID（用于WebSocket广播标识）
             test_case_id: 测试用例ID（用于WebSocket广播标识）
+            document: 响应文档（已由断言阶段创建时传入以复用解析结果）
 
         Returns:
             (提取到的变量字典, 提取结果列表)
         """
         variables = {}
         results = []
+        if document is None:
+            document = ResponseDocument(response_body, response_text)
 
         for extraction in extractions:
             # 跳过已禁用的提取配置
@@ -102,7 +110,8 @@ class ExtractionEngine:
 
             try:
                 result = self._extract_single_variable(
-                    extraction, http_response, response_body, response_text
+                    extraction, http_response, response_body, response_text,
+                    document
                 )
                 results.append(result)
 
@@ -171,7 +180,8 @@ class ExtractionEngine:
         extraction: Dict[str, Any],
         http_response: Any,
         response_body: Any,
-        response_text: str
+        response_text: str,
+        document: Optional[ResponseDocument] = None
     ) -> ExtractionResult:
         """
         执行单个变量提取
@@ -184,6 +194,7 @@ class ExtractionEngine:
             http_response: HTTP响应对象
             response_body: 已解析的响应体
             response_text: 原始响应文本
+            document: 响应文档（body 范围的规则复用其解析结果）
 
         Returns:
             ExtractionResult: 提取结果
@@ -194,17 +205,28 @@ class ExtractionEngine:
         extract_scope = extraction.get('extract_scope', 'body')
         default_value = extraction.get('default_value')
 
-        # 根据提取范围确定数据源
-        source_data = self._get_source_data(
-            extract_scope, http_response, response_body, response_text
-        )
+        # 根据提取范围确定数据源：body 范围直接使用共享的响应文档
+        if extract_scope in ('headers', 'url'):
+            source_data = self._get_source_data(
+                extract_scope, http_response, response_body, response_text
+            )
+            source_text = source_data
+            source_document = ResponseDocument(source_data)
+        else:
+            if document is None:
+                document = ResponseDocument(response_body, response_text)
+            source_data = document.json
+            source_text = document.text
+            source_document = document
 
         # 根据提取类型分派到对应方法
         type_to_handler = {
-            'regex': lambda: self._extract_regex(source_data, extract_expression),
-            'json_path': lambda: self._extract_json_path(source_data, extract_expression),
-            'xpath': lambda: self._extract_xpath(source_data, extract_expression),
-            'css_selector': lambda: self._extract_css_selector(source_data, extract_expression),
+            'regex': lambda: self._extract_regex(source_text, extract_expression),
+            'json_path': lambda: self._extract_json_path(
+                source_data if source_data is not None else source_text, extract_expression
+            ),
+            'xpath': lambda: self._extract_xpath(source_document, extract_expression),
+            'css_selector': lambda: self._extract_css_selector(source_document, extract_expression),
             'header': lambda: self._extract_header(http_response, extract_expression),
             'cookie': lambda: self._extract_cookie(http_response, extract_expression),
         }
@@ -309,8 +331,8 @@ class ExtractionEngine:
         """
         使用JSONPath表达式从数据中提取值
 
-        支持 $.key.subkey[0].field 格式的路径表达式。
-        source可以是dict/list或JSON字符串（会自动解析）。
+        使用共享的 JSONPath 编译器，支持 $.key.subkey[0].field、通配符、
+        切片、递归下降和过滤表达式。source可以是dict/list或JSON字符串（会自动解析）。
 
         Args:
             source: 源数据
@@ -332,95 +354,21 @@ class ExtractionEngine:
         if not isinstance(source, (dict, list)):
             return None
 
-        # 去除 $. 前缀
-        path = json_path[2:] if json_path.startswith('$.') else json_path
-        return self._navigate_json_path(source, path)
-
-    def _navigate_json_path(self, data: Any, path: str) -> Optional[Any]:
-        """
-        沿JSON路径逐级导航到目标值
-
-        Args:
-            data: JSON数据（dict或list）
-            path: 路径字符串（不含$.前缀）
-
-        Returns:
-            路径指向的值
-        """
-        if not path:
-            return data
-
         try:
-            current = data
-            parts = self._parse_json_path(path)
-
-            for part in parts:
-                if current is None:
-                    return None
-
-                if isinstance(current, dict):
-                    current = current.get(part)
-                elif isinstance(current, list) and part.isdigit():
-                    index = int(part)
-                    if 0 <= index < len(current):
-                        current = current[index]
-                    else:
-                        return None
-                else:
-                    return None
-
-            return current
+            return compile_json_path(json_path).evaluate(source)
         except Exception as e:
-            logger.error(f"Error navigating JSON path {path}: {str(e)}")
+            logger.error(f"Error evaluating JSON path {json_path}: {str(e)}")
             return None
 
-    def _parse_json_path(self, path: str) -> List[str]:
-        """
-        解析JSON路径为路径片段列表
-
-        将 "data.users[0].name" 解析为 ["data", "users", "0", "name"]
-
-        Args:
-            path: JSON路径字符串
-
-        Returns:
-            路径片段列表
-        """
-        parts = []
-        current_part = ""
-        in_brackets = False
-
-        for char in path:
-            if char == '.' and not in_brackets:
-                if current_part:
-                    parts.append(current_part)
-                    current_part = ""
-            elif char == '[':
-                if current_part:
-                    parts.append(current_part)
-                    current_part = ""
-                in_brackets = True
-            elif char == ']':
-                if current_part:
-                    parts.append(current_part)
-                    current_part = ""
-                in_brackets = False
-            else:
-                current_part += char
-
-        if current_part:
-            parts.append(current_part)
-
-        return parts
-
     def _extract_xpath(self, source: Any, xpath: str) -> Optional[str]:
         """
         使用XPath表达式从HTML/XML中提取数据
 
         依赖lxml库，如未安装则返回None并记录警告。
+        传入 ResponseDocument 时复用其已解析的文档树和编译缓存。
 
         Args:
-            source: HTML/XML源文本
+            source: ResponseDocument 或 HTML/XML源文本
             xpath: XPath表达式
 
         Returns:
@@ -430,11 +378,9 @@ class ExtractionEngine:
             return None
 
         try:
-            from lxml import etree
-            from io import StringIO
-
-            tree = etree.parse(StringIO(str(source)), etree.HTMLParser())
-            nodes = tree.xpath(xpath)
+            if not isinstance(source, ResponseDocument):
+                source = ResponseDocument(str(source))
+            nodes = source.xpath(xpath)
 
             if not nodes:
                 return None
@@ -445,9 +391,6 @@ class ExtractionEngine:
                 return nodes[0].text
             return etree.tostring(nodes[0], encoding='unicode')
 
-        except ImportError:
-            logger.warning("lxml库未安装，XPath提取不可用")
-            return None
         except Exception as e:
             logger.error(f"Error extracting with XPath {xpath}: {str(e)}")
             return None
@@ -457,9 +400,10 @@ class ExtractionEngine:
         使用CSS选择器从HTML中提取数据
 
         依赖BeautifulSoup库，如未安装则返回None并记录警告。
+        传入 ResponseDocument 时复用其已解析的文档树和编译缓存。
 
         Args:
-            source: HTML源文本
+            source: ResponseDocument 或 HTML源文本
             selector: CSS选择器表达式
 
         Returns:
@@ -469,18 +413,14 @@ class ExtractionEngine:
             return None
 
         try:
-            from bs4 import BeautifulSoup
-
-            soup = BeautifulSoup(str(source), 'html.parser')
-            elements = soup.select(selector)
+            if not isinstance(source, ResponseDocument):
+                source = ResponseDocument(str(source))
+            elements = source.select(selector)
 
             if elements:
                 return elements[0].get_text(strip=True)
             return None
 
-        except ImportError:
-            logger.warning("BeautifulSoup库未安装，CSS选择器提取不可用")
-            return None
         except Exception as e:
             logger.error(
                 f"Error extracting with CSS selector {selector}: {str(e)}"
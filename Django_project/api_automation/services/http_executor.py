@@ -8,12 +8,17 @@ HTTP请求执行引擎
 
 import json
 import logging
+import threading
 import time
 from typing import Any, Dict, Optional
 from urllib.parse import unquote, urljoin
 
 import requests
 
+from api_automation.services.request_template import (
+    compile_string, compile_template, mapping_resolver,
+)
+
 logger = logging.getLogger(__name__)
 
 
@@ -49,16 +54,29 @@ class HttpExecutor:
     # 支持携带请求体的HTTP方法集合
     BODY_METHODS = {'POST', 'PUT', 'PATCH'}
 
-    def __init__(self, timeout: int = 30, verify_ssl: bool = True):
+    def __init__(
+        self,
+        timeout: int = 30,
+        verify_ssl: bool = True,
+        proxy: Optional[str] = None,
+        pool_registry: Any = None
+    ):
         """
         初始化HTTP执行器
 
         Args:
             timeout: 请求超时时间（秒），默认30秒
             verify_ssl: 是否验证SSL证书，默认True
+            proxy: 代理地址（同时用于http和https），默认不使用代理
+            pool_registry: 连接池注册表（ConnectionPoolRegistry），
+                传入后按目标地址复用进程级共享连接池
         """
         self.timeout = timeout
         self.verify_ssl = verify_ssl
+        self.proxy = proxy
+        self.pool_registry = pool_registry
+        self._pooled_prefixes = set()
+        self._mount_lock = threading.Lock()
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'API-Automation-Platform/1.0'
@@ -112,6 +130,9 @@ class HttpExecutor:
             request_headers = dict(headers) if headers else {}
             request_params = params or {}
 
+            # 使用连接池注册表时，挂载目标地址对应的共享连接池
+            self.mount_pooled_adapter(full_url)
+
             start_time = time.time()
 
             # 步骤4：处理multipart文件上传（需要特殊的请求发送方式）
@@ -143,7 +164,8 @@ class HttpExecutor:
                 params=request_params,
                 data=request_body,
                 timeout=self.timeout,
-                verify=self.verify_ssl
+                verify=self.verify_ssl,
+                **self._proxy_kwargs()
             )
 
             # 步骤7：封装响应数据
@@ -356,7 +378,8 @@ class HttpExecutor:
             files=files,
             data=data,
             timeout=self.timeout,
-            verify=self.verify_ssl
+            verify=self.verify_ssl,
+            **self._proxy_kwargs()
         )
 
         # 填充响应对象
@@ -401,7 +424,8 @@ class HttpExecutor:
         """
         替换文本中的 ${key} 格式变量占位符
 
-        遍历变量字典，将文本中所有匹配的占位符替换为对应值的字符串形式。
+        文本被编译为模板（按文本缓存），只对其中实际出现的占位符查找变量，
+        不存在的变量保留原占位符。
 
         Args:
             text: 包含占位符的原始文本
@@ -410,15 +434,10 @@ class HttpExecutor:
         Returns:
             str: 替换后的文本
         """
-        if not text or not variables:
+        if not text or not variables or not isinstance(text, str):
             return text
 
-        for key, value in variables.items():
-            placeholder = f"${{{key}}}"
-            if placeholder in text:
-                text = text.replace(placeholder, str(value))
-
-        return text
+        return compile_string(text).render(mapping_resolver(variables))
 
     def _replace_variables_dict(
         self,
@@ -437,27 +456,51 @@ class HttpExecutor:
         Returns:
             替换后的新字典，原字典不被修改
         """
-        if not data or not variables:
+        if not data or not variables or not isinstance(data, dict):
             return data
 
-        result = {}
-        for key, value in data.items():
-            if isinstance(value, str):
-                result[key] = self._replace_variables(value, variables)
-            elif isinstance(value, dict):
-                result[key] = self._replace_variables_dict(value, variables)
-            elif isinstance(value, list):
-                result[key] = [
-                    self._replace_variables(item, variables)
-                    if isinstance(item, str) else item
-                    for item in value
-                ]
-            else:
-                result[key] = value
+        template = compile_template(data)
+        if not template.has_placeholders:
+            return dict(data)
+        return template.render(mapping_resolver(variables))
+
+    def mount_pooled_adapter(self, full_url: str):
+        """
+        将目标地址对应的共享连接池挂载到当前会话
+
+        未配置连接池注册表或URL无法识别时不做任何处理，
+        请求走会话自身的默认连接池。
 
-        return result
+        Args:
+            full_url: 完整请求URL
+        """
+        if self.pool_registry is None:
+            return
+
+        key = self.pool_registry.build_key(full_url, self.verify_ssl, self.proxy)
+        if key is None:
+            return
+
+        prefix = self.pool_registry.mount_prefix(key)
+        adapter = self.pool_registry.get_adapter(key)
+        if self.session.adapters.get(prefix) is adapter:
+            return
+
+        with self._mount_lock:
+            self.session.mount(prefix, adapter)
+            self._pooled_prefixes.add(prefix)
+
+    def _proxy_kwargs(self) -> Dict[str, Any]:
+        """构建 requests 的代理参数，未配置代理时返回空字典"""
+        if not self.proxy:
+            return {}
+        return {'proxies': {'http': self.proxy, 'https': self.proxy}}
 
     def close(self):
-        """关闭HTTP会话，释放连接池资源"""
+        """关闭HTTP会话，释放连接池资源（共享连接池由注册表管理，不随会话关闭）"""
         if self.session:
+            with self._mount_lock:
+                for prefix in self._pooled_prefixes:
+                    self.session.adapters.pop(prefix, None)
+                self._pooled_prefixes.clear()
             self.session.close()
\ No newline at end of file
@@ -0,0 +1,668 @@
+"""
+JSONPath 编译与求值服务
+
+断言引擎与提取引擎共用的 JSONPath 实现。路径字符串只在首次使用时解析，
+编译结果保存在有界 LRU 缓存中，之后每次求值只遍历预先构建的步骤序列，
+不再进行任何字符串处理。
+
+支持的语法：
+- 根节点与子节点:   $ / $.data.user / data.user（可省略 $ 前缀）
+- 方括号取键:       $['first name'] / $["key"]
+- 数组索引:         $.users[0] / $.users[-1]
+- 通配符:           $.users[*].id / $.data.*
+- 切片:             $.users[0:3] / $.users[::2] / $.users[-2:]
+- 并集:             $.users[0,2] / $['id','name']
+- 递归下降:         $..id / $..users[0] / $..*
+- 过滤表达式:       $.users[?(@.age >= 18 && @.active == true)]
+                    $.users[?(@.email)] / $.users[?(@.name =~ /^A/i)]
+
+求值结果：
+- 确定路径（仅包含子节点/索引）返回单个值，不存在时返回 None
+- 不确定路径（通配符/切片/并集/递归下降/过滤）返回匹配值列表，
+  无匹配时返回 None
+"""
+
+import logging
+import operator
+import re
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# 编译缓存的最大条目数
+JSONPATH_CACHE_SIZE = getattr(settings, 'API_JSONPATH_CACHE_SIZE', 2048)
+
+_MISSING = object()
+
+
+class JsonPathError(ValueError):
+    """JSONPath 表达式语法错误"""
+
+
+# ============================================================
+# 路径步骤
+# ============================================================
+
+class _Step:
+    """路径步骤基类：将当前节点集合映射为下一层节点集合"""
+
+    definite = False
+
+    def apply(self, nodes: List[Any], root: Any) -> List[Any]:
+        result = []
+        for node in nodes:
+            result.extend(self.select(node, root))
+        return result
+
+    def select(self, node: Any, root: Any) -> List[Any]:
+        raise NotImplementedError
+
+
+class _Child(_Step):
+    """按键名取子节点；作用于数组且键名为数字时按索引处理"""
+
+    __slots__ = ('name', 'index')
+
+    definite = True
+
+    def __init__(self, name: str):
+        self.name = name
+        self.index = int(name) if _INT_PATTERN.fullmatch(name) else None
+
+    def get(self, node: Any) -> Any:
+        if isinstance(node, dict):
+            return node.get(self.name, _MISSING)
+        if isinstance(node, list) and self.index is not None:
+            return _list_get(node, self.index)
+        return _MISSING
+
+    def select(self, node: Any, root: Any) -> List[Any]:
+        value = self.get(node)
+        return [] if value is _MISSING else [value]
+
+
+class _Index(_Step):
+    """数组索引；作用于对象时按字符串键处理"""
+
+    __slots__ = ('index', 'name')
+
+    definite = True
+
+    def __init__(self, index: int):
+        self.index = index
+        self.name = str(index)
+
+    def get(self, node: Any) -> Any:
+        if isinstance(node, list):
+            return _list_get(node, self.index)
+        if isinstance(node, dict):
+            return node.get(self.name, _MISSING)
+        return _MISSING
+
+    def select(self, node: Any, root: Any) -> List[Any]:
+        value = self.get(node)
+        return [] if value is _MISSING else [value]
+
+
+class _Wildcard(_Step):
+    """通配符：对象的所有值或数组的所有元素"""
+
+    def select(self, node: Any, root: Any) -> List[Any]:
+        if isinstance(node, dict):
+            return list(node.values())
+        if isinstance(node, list):
+            return list(node)
+        return []
+
+
+class _Slice(_Step):
+    """数组切片"""
+
+    __slots__ = ('slice',)
+
+    def __init__(self, start: Optional[int], stop: Optional[int], step: Optional[int]):
+        if step == 0:
+            raise JsonPathError("切片步长不能为0")
+        self.slice = slice(start, stop, step)
+
+    def select(self, node: Any, root: Any) -> List[Any]:
+        if isinstance(node, list):
+            return node[self.slice]
+        return []
+
+
+class _Union(_Step):
+    """并集：多个键名或索引"""
+
+    __slots__ = ('members',)
+
+    def __init__(self, members: List[_Step]):
+        self.members = members
+
+    def select(self, node: Any, root: Any) -> List[Any]:
+        result = []
+        for member in self.members:
+            result.extend(member.select(node, root))
+        return result
+
+
+class _Filter(_Step):
+    """过滤表达式：保留满足谓词的子节点"""
+
+    __slots__ = ('predicate',)
+
+    def __init__(self, predicate: Callable[[Any, Any], bool]):
+        self.predicate = predicate
+
+    def select(self, node: Any, root: Any) -> List[Any]:
+        if isinstance(node, dict):
+            children = node.values()
+        elif isinstance(node, list):
+            children = node
+        else:
+            return []
+        return [child for child in children if self.predicate(child, root)]
+
+
+class _Descent(_Step):
+    """递归下降：对当前节点及其所有后代应用内部步骤"""
+
+    __slots__ = ('inner',)
+
+    def __init__(self, inner: _Step):
+        self.inner = inner
+
+    def select(self, node: Any, root: Any) -> List[Any]:
+        result = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            result.extend(self.inner.select(current, root))
+            if isinstance(current, dict):
+                stack.extend(reversed(list(current.values())))
+            elif isinstance(current, list):
+                stack.extend(reversed(current))
+        return result
+
+
+# ============================================================
+# 编译结果
+# ============================================================
+
+class CompiledJsonPath:
+    """
+    编译后的 JSONPath 表达式
+
+    不可变对象，可在线程间共享。
+    """
+
+    __slots__ = ('expression', 'steps', 'is_definite')
+
+    def __init__(self, expression: str, steps: Tuple[_Step, ...]):
+        self.expression = expression
+        self.steps = steps
+        self.is_definite = all(step.definite for step in steps)
+
+    def find(self, data: Any) -> List[Any]:
+        """
+        返回所有匹配值
+
+        Args:
+            data: 已解析的JSON数据
+
+        Returns:
+            匹配值列表（无匹配时为空列表）
+        """
+        if self.is_definite:
+            value = self._get_definite(data)
+            return [] if value is _MISSING else [value]
+
+        nodes = [data]
+        for step in self.steps:
+            nodes = step.apply(nodes, data)
+            if not nodes:
+                break
+        return nodes
+
+    def evaluate(self, data: Any) -> Any:
+        """
+        求值：确定路径返回单个值，不确定路径返回匹配值列表
+
+        Args:
+            data: 已解析的JSON数据
+
+        Returns:
+            匹配结果，无匹配时返回None
+        """
+        if self.is_definite:
+            value = self._get_definite(data)
+            return None if value is _MISSING else value
+
+        matches = self.find(data)
+        return matches if matches else None
+
+    def first(self, data: Any, default: Any = None) -> Any:
+        """
+        返回第一个匹配值
+
+        Args:
+            data: 已解析的JSON数据
+            default: 无匹配时的返回值
+
+        Returns:
+            第一个匹配值
+        """
+        matches = self.find(data)
+        return matches[0] if matches else default
+
+    def _get_definite(self, data: Any) -> Any:
+        """确定路径的快速求值（逐级取值，不构建中间列表）"""
+        current = data
+        for step in self.steps:
+            current = step.get(current)
+            if current is _MISSING:
+                return _MISSING
+        return current
+
+    def __repr__(self) -> str:
+        return f"<CompiledJsonPath {self.expression!r}>"
+
+
+@lru_cache(maxsize=JSONPATH_CACHE_SIZE)
+def compile_json_path(expression: str) -> CompiledJsonPath:
+    """
+    编译 JSONPath 表达式（结果按表达式字符串缓存）
+
+    Args:
+        expression: JSONPath 表达式
+
+    Returns:
+        CompiledJsonPath 实例
+
+    Raises:
+        JsonPathError: 表达式语法错误
+    """
+    return CompiledJsonPath(expression, tuple(_PathParser(expression).parse()))
+
+
+def evaluate_json_path(data: Any, expression: str) -> Any:
+    """
+    编译（命中缓存）并求值 JSONPath 表达式
+
+    Args:
+        data: 已解析的JSON数据
+        expression: JSONPath 表达式
+
+    Returns:
+        求值结果，见 CompiledJsonPath.evaluate
+
+    Raises:
+        JsonPathError: 表达式语法错误
+    """
+    return compile_json_path(expression).evaluate(data)
+
+
+# ============================================================
+# 路径解析
+# ============================================================
+
+_INT_PATTERN = re.compile(r'-?\d+')
+_NAME_STOP_CHARS = '.['
+
+
+def _list_get(node: list, index: int) -> Any:
+    if -len(node) <= index < len(node):
+        return node[index]
+    return _MISSING
+
+
+class _PathParser:
+    """将 JSONPath 字符串解析为步骤列表"""
+
+    def __init__(self, expression: str):
+        self.text = (expression or '').strip()
+        self.pos = 0
+
+    def parse(self) -> List[_Step]:
+        text = self.text
+        steps = []
+
+        if text.startswith('$') or text.startswith('@'):
+            self.pos = 1
+        elif text and text[0] not in _NAME_STOP_CHARS:
+            # 省略 $ 前缀的裸路径，如 data.users[0]
+            steps.append(self._name_step(self._read_name()))
+
+        while self.pos < len(text):
+            char = text[self.pos]
+            if text.startswith('..', self.pos):
+                self.pos += 2
+                if self.pos < len(text) and text[self.pos] == '[':
+                    steps.append(_Descent(self._parse_bracket()))
+                else:
+                    steps.append(_Descent(self._name_step(self._read_name())))
+            elif char == '.':
+                self.pos += 1
+                steps.append(self._name_step(self._read_name()))
+            elif char == '[':
+                steps.append(self._parse_bracket())
+            else:
+                raise JsonPathError(f"无法解析的JSONPath: {self.text}（位置 {self.pos}）")
+
+        return steps
+
+    def _read_name(self) -> str:
+        start = self.pos
+        while self.pos < len(self.text) and self.text[self.pos] not in _NAME_STOP_CHARS:
+            self.pos += 1
+        name = self.text[start:self.pos].strip()
+        if not name:
+            raise JsonPathError(f"JSONPath中缺少字段名: {self.text}")
+        return name
+
+    @staticmethod
+    def _name_step(name: str) -> _Step:
+        return _Wildcard() if name == '*' else _Child(name)
+
+    def _parse_bracket(self) -> _Step:
+        """解析 [...] 片段，self.pos 指向 '['"""
+        end = _find_closing(self.text, self.pos, '[', ']')
+        content = self.text[self.pos + 1:end].strip()
+        self.pos = end + 1
+
+        if not content:
+            raise JsonPathError(f"JSONPath中存在空的方括号: {self.text}")
+
+        if content.startswith('?'):
+            expression = content[1:].strip()
+            return _Filter(_FilterParser(expression).parse())
+
+        if content == '*':
+            return _Wildcard()
+
+        members = _split_top_level(content, ',')
+        if len(members) > 1:
+            return _Union([self._bracket_member(member) for member in members])
+
+        if ':' in content and not _is_quoted(content):
+            return self._parse_slice(content)
+
+        return self._bracket_member(content)
+
+    def _bracket_member(self, member: str) -> _Step:
+        member = member.strip()
+        if _is_quoted(member):
+            return _Child(member[1:-1])
+        if _INT_PATTERN.fullmatch(member):
+            return _Index(int(member))
+        if member == '*':
+            return _Wildcard()
+        return _Child(member)
+
+    def _parse_slice(self, content: str) -> _Step:
+        parts = content.split(':')
+        if len(parts) > 3:
+            raise JsonPathError(f"无效的切片表达式: [{content}]")
+        values = []
+        for part in parts:
+            part = part.strip()
+            if not part:
+                values.append(None)
+            elif _INT_PATTERN.fullmatch(part):
+                values.append(int(part))
+            else:
+                raise JsonPathError(f"无效的切片表达式: [{content}]")
+        values.extend([None] * (3 - len(values)))
+        return _Slice(*values)
+
+
+def _is_quoted(text: str) -> bool:
+    return len(text) >= 2 and text[0] == text[-1] and text[0] in ('"', "'")
+
+
+def _find_closing(text: str, start: int, opening: str, closing: str) -> int:
+    """查找与 start 处开括号匹配的闭括号位置（跳过引号和正则字面量内的内容）"""
+    depth = 0
+    quote = None
+    pos = start
+    while pos < len(text):
+        char = text[pos]
+        if quote:
+            if char == '\\':
+                pos += 1
+            elif char == quote:
+                quote = None
+        elif char in ('"', "'"):
+            quote = char
+        elif char == opening:
+            depth += 1
+        elif char == closing:
+            depth -= 1
+            if depth == 0:
+                return pos
+        pos += 1
+    raise JsonPathError(f"JSONPath括号不匹配: {text}")
+
+
+def _split_top_level(text: str, separator: str) -> List[str]:
+    """按分隔符拆分文本，忽略引号和括号内的分隔符"""
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    for pos, char in enumerate(text):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ('"', "'"):
+            quote = char
+        elif char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:pos])
+            start = pos + 1
+    parts.append(text[start:])
+    return parts
+
+
+# ============================================================
+# 过滤表达式解析
+# ============================================================
+
+def _regex_match(left: Any, right: Any) -> bool:
+    pattern = right if hasattr(right, 'search') else re.compile(str(right))
+    return left is not None and bool(pattern.search(str(left)))
+
+
+_COMPARISONS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    '=~': _regex_match,
+}
+
+_FILTER_TOKEN = re.compile(r'''
+    \s*(?:
+        (?P<op>==|!=|<=|>=|=~|<|>|&&|\|\||!|\(|\))
+      | (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+      | (?P<regex>/(?:[^/\\]|\\.)*/[imsx]*)
+      | (?P<number>-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)
+      | (?P<literal>true|false|null)\b
+      | (?P<path>[@$])
+    )
+''', re.VERBOSE)
+
+_LITERALS = {'true': True, 'false': False, 'null': None}
+_REGEX_FLAGS = {'i': re.IGNORECASE, 'm': re.MULTILINE, 's': re.DOTALL, 'x': re.VERBOSE}
+
+
+class _FilterParser:
+    """
+    过滤表达式解析器
+
+    文法：
+        or_expr    := and_expr ('||' and_expr)*
+        and_expr   := unary ('&&' unary)*
+        unary      := '!' unary | comparison
+        comparison := operand (比较运算符 operand)?
+        operand    := '(' or_expr ')' | @路径 | $路径 | 字符串 | 数字 | 正则 | true/false/null
+    """
+
+    def __init__(self, expression: str):
+        self.text = expression
+        self.tokens = self._tokenize(expression)
+        self.pos = 0
+
+    def parse(self) -> Callable[[Any, Any], bool]:
+        predicate = self._or_expr()
+        if self.pos != len(self.tokens):
+            raise JsonPathError(f"无法解析的过滤表达式: {self.text}")
+        return predicate
+
+    def _tokenize(self, expression: str) -> List[Tuple[str, Any]]:
+        tokens = []
+        pos = 0
+        text = expression.rstrip()
+        while pos < len(text):
+            match = _FILTER_TOKEN.match(text, pos)
+            if not match:
+                raise JsonPathError(f"无法解析的过滤表达式: {expression}")
+            kind = match.lastgroup
+            pos = match.end()
+            raw = match.group(kind)
+
+            if kind == 'path':
+                end = _scan_path(text, pos)
+                tokens.append(('path', _compile_relative(raw, text[pos:end])))
+                pos = end
+            elif kind == 'string':
+                tokens.append(('value', _unescape(raw[1:-1])))
+            elif kind == 'number':
+                number = float(raw) if any(c in raw for c in '.eE') else int(raw)
+                tokens.append(('value', number))
+            elif kind == 'literal':
+                tokens.append(('value', _LITERALS[raw]))
+            elif kind == 'regex':
+                body, _, flags = raw[1:].rpartition('/')
+                flag_value = 0
+                for flag in flags:
+                    flag_value |= _REGEX_FLAGS[flag]
+                tokens.append(('value', re.compile(body, flag_value)))
+            else:
+                tokens.append(('op', raw))
+        return tokens
+
+    def _peek(self) -> Optional[Tuple[str, Any]]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _accept(self, op: str) -> bool:
+        token = self._peek()
+        if token == ('op', op):
+            self.pos += 1
+            return True
+        return False
+
+    def _or_expr(self) -> Callable:
+        terms = [self._and_expr()]
+        while self._accept('||'):
+            terms.append(self._and_expr())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda node, root: any(term(node, root) for term in terms)
+
+    def _and_expr(self) -> Callable:
+        terms = [self._unary()]
+        while self._accept('&&'):
+            terms.append(self._unary())
+        if len(terms) == 1:
+            return terms[0]
+        return lambda node, root: all(term(node, root) for term in terms)
+
+    def _unary(self) -> Callable:
+        if self._accept('!'):
+            inner = self._unary()
+            return lambda node, root: not inner(node, root)
+        return self._comparison()
+
+    def _comparison(self) -> Callable:
+        if self._accept('('):
+            inner = self._or_expr()
+            if not self._accept(')'):
+                raise JsonPathError(f"过滤表达式括号不匹配: {self.text}")
+            return inner
+
+        left = self._operand()
+        token = self._peek()
+        if token and token[0] == 'op' and token[1] in _COMPARISONS:
+            self.pos += 1
+            compare = _COMPARISONS[token[1]]
+            right = self._operand()
+
+            def predicate(node, root):
+                left_value = left(node, root)
+                right_value = right(node, root)
+                if left_value is _MISSING or right_value is _MISSING:
+                    return False
+                try:
+                    return bool(compare(left_value, right_value))
+                except (TypeError, re.error):
+                    return False
+            return predicate
+
+        # 单独的路径表示存在性判断，单独的字面量按真值判断
+        return lambda node, root: _truthy(left(node, root))
+
+    def _operand(self) -> Callable:
+        token = self._peek()
+        if token is None:
+            raise JsonPathError(f"过滤表达式不完整: {self.text}")
+        self.pos += 1
+        kind, value = token
+        if kind == 'path':
+            return value
+        if kind == 'value':
+            return lambda node, root: value
+        raise JsonPathError(f"过滤表达式中存在多余的运算符 '{value}': {self.text}")
+
+
+def _truthy(value: Any) -> bool:
+    if value is _MISSING:
+        return False
+    if isinstance(value, bool):
+        return value
+    return True
+
+
+def _scan_path(text: str, pos: int) -> int:
+    """从 @/$ 之后扫描路径结束位置（路径遇到空白或运算符时结束，方括号内除外）"""
+    while pos < len(text):
+        char = text[pos]
+        if char == '[':
+            pos = _find_closing(text, pos, '[', ']') + 1
+            continue
+        if char.isspace() or char in '=!<>&|()~':
+            break
+        pos += 1
+    return pos
+
+
+def _compile_relative(anchor: str, path: str) -> Callable[[Any, Any], Any]:
+    """编译过滤表达式中的 @路径 / $路径，返回取值函数（无匹配时返回 _MISSING）"""
+    compiled = CompiledJsonPath('$' + path, tuple(_PathParser('$' + path).parse()))
+
+    def resolve(node: Any, root: Any) -> Any:
+        matches = compiled.find(root if anchor == '$' else node)
+        return matches[0] if matches else _MISSING
+    return resolve
+
+
+def _unescape(text: str) -> str:
+    return re.sub(r'\\(.)', r'\1', text)
@@ -2,17 +2,21 @@
 回收站管理服务
 
 管理逻辑删除（软删除）的数据，提供以下功能：
-- 查询回收站中的已删除数据（支持分页、搜索、类型过滤）
+- 查询回收站中的已删除数据（支持分页、搜索、类型过滤）：各软删除表以 UNION ALL
+  合并为统一列表，在数据库中按删除时间全局排序，支持页码分页与游标（keyset）分页
 - 恢复已删除的数据（含权限验证）
 - 彻底删除数据（物理删除，不可恢复）
 - 批量恢复和批量删除
 - 回收站统计信息
 """
 
+import base64
+import json
 import logging
-from typing import Any, Dict, List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 
-from django.core.paginator import Paginator
+from django.db.models import CharField, F, Q, Value
 
 logger = logging.getLogger(__name__)
 
@@ -26,55 +30,31 @@ class RecycleBinService:
     """
 
     # 支持回收站功能的模型配置
-    # key: 类型标识符, model: 模型类名, display_name: 前端显示名, fields: 序列化字段
+    # key: 类型标识符, model: 模型类名, display_name: 前端显示名
     RECYCLE_BIN_MODELS = {
         'apiproject': {
             'model': 'ApiProject',
-            'display_name': '项目',
-            'fields': [
-                'id', 'name', 'description', 'owner',
-                'created_time', 'updated_time'
-            ]
+            'display_name': '项目'
         },
         'apicollection': {
             'model': 'ApiCollection',
-            'display_name': '集合',
-            'fields': [
-                'id', 'name', 'description', 'project',
-                'created_time', 'updated_time'
-            ]
+            'display_name': '集合'
         },
         'apitestcase': {
             'model': 'ApiTestCase',
-            'display_name': '测试用例',
-            'fields': [
-                'id', 'name', 'description', 'project', 'collection',
-                'method', 'url', 'created_time', 'updated_time'
-            ]
+            'display_name': '测试用例'
         },
         'apitestenvironment': {
             'model': 'ApiTestEnvironment',
-            'display_name': '测试环境',
-            'fields': [
-                'id', 'name', 'description', 'project', 'base_url',
-                'is_default', 'created_time', 'updated_time'
-            ]
+            'display_name': '测试环境'
         },
         'apidatadriver': {
             'model': 'ApiDataDriver',
-            'display_name': '数据驱动',
-            'fields': [
-                'id', 'name', 'description', 'project', 'test_case',
-                'data_type', 'created_time', 'updated_time'
-            ]
+            'display_name': '数据驱动'
         },
         'apitestexecution': {
             'model': 'ApiTestExecution',
-            'display_name': '测试执行',
-            'fields': [
-                'id', 'name', 'description', 'project', 'environment',
-                'status', 'created_time', 'updated_time'
-            ]
+            'display_name': '测试执行'
         },
     }
 
@@ -150,124 +130,169 @@ class RecycleBinService:
         user=None,
         search: Optional[str] = None,
         page: int = 1,
-        page_size: int = 20
+        page_size: int = 20,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         获取回收站中的已删除数据
 
-        支持两种查询模式：
-        - 指定 item_type: 查询单一类型，返回标准分页结果
-        - 不指定 item_type: 查询所有类型，每种类型最多返回20条
+        所有类型（或指定类型）的已删除数据以一条 UNION ALL 查询合并，
+        按删除时间倒序全局排序（删除时间相同时按类型、ID 倒序，保证顺序稳定）。
+        支持两种分页方式：
+        - 页码分页：返回总数和总页数
+        - 游标分页（传入 cursor，首页传空串）：按上一页的 next_cursor 继续，
+          不统计总数，一条查询返回一页，深翻页性能不随页码下降
 
         Args:
-            item_type: 数据类型标识符（如 'apiproject', 'apitestcase'）
+            item_type: 数据类型标识符（如 'apiproject', 'apitestcase'），为空表示所有类型
             user: 当前用户（用于权限过滤）
             search: 按名称搜索的关键词
-            page: 页码
+            page: 页码（页码分页）
             page_size: 每页数量
+            cursor: 分页游标（游标分页）
 
         Returns:
             分页的已删除数据列表
-        """
-        # 单一类型查询，返回标准分页
-        if item_type:
-            return self._get_single_type_items(
-                item_type, user, search, page, page_size
-            )
-
-        # 多类型查询，每种类型取前20条
-        return self._get_all_type_items(user, search)
-
-    def _get_single_type_items(
-        self,
-        item_type: str,
-        user,
-        search: Optional[str],
-        page: int,
-        page_size: int
-    ) -> Dict[str, Any]:
-        """
-        查询单一类型的回收站数据（带分页）
-
-        Args:
-            item_type: 数据类型标识符
-            user: 当前用户
-            search: 搜索关键词
-            page: 页码
-            page_size: 每页数量
 
-        Returns:
-            标准分页结果
+        Raises:
+            ValueError: 游标无效
         """
-        config = self.RECYCLE_BIN_MODELS.get(item_type, {})
-        model_name = config.get('model')
-        model_class = self.model_classes.get(model_name) if model_name else None
+        after = self._decode_cursor(cursor) if cursor else None
+        union = self._deleted_union(item_type, user, search, after)
+
+        if cursor is not None:
+            rows = list(union[:page_size + 1]) if union is not None else []
+            next_cursor = self._encode_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+            return {
+                'results': [self._serialize_row(row) for row in rows[:page_size]],
+                'page_size': page_size,
+                'next_cursor': next_cursor,
+            }
 
-        if not model_class:
+        if union is None:
             return {'results': [], 'count': 0, 'page': page,
                     'page_size': page_size, 'total_pages': 0}
 
-        queryset = model_class.objects.filter(is_deleted=True)
-        queryset = self._apply_permission_filter(queryset, model_class, user)
-
-        if search:
-            queryset = queryset.filter(name__icontains=search)
-
-        total_count = queryset.count()
-        paginator = Paginator(queryset, page_size)
-        page_obj = paginator.get_page(page)
-
-        results = [
-            self._serialize_deleted_item(item, item_type)
-            for item in page_obj.object_list
-        ]
+        total_count = union.count()
+        offset = (max(page, 1) - 1) * page_size
+        rows = list(union[offset:offset + page_size])
 
         return {
-            'results': results,
+            'results': [self._serialize_row(row) for row in rows],
             'count': total_count,
             'page': page,
             'page_size': page_size,
-            'total_pages': paginator.num_pages
+            'total_pages': (total_count + page_size - 1) // page_size
         }
 
-    def _get_all_type_items(
+    def _deleted_union(
         self,
+        item_type: Optional[str],
         user,
-        search: Optional[str]
-    ) -> Dict[str, Any]:
+        search: Optional[str],
+        after: Optional[Tuple[datetime, str, int]] = None
+    ):
         """
-        查询所有类型的回收站数据（每种类型最多20条）
+        构建已删除数据的 UNION ALL 查询
+
+        每个分支投影 (类型, ID, 名称, 描述, 创建时间, 删除时间)，权限、搜索和
+        游标条件下推到各分支中，由 (is_deleted, updated_time) 索引过滤。
 
         Args:
+            item_type: 数据类型标识符，为空表示所有类型
             user: 当前用户
             search: 搜索关键词
+            after: 游标位置 (删除时间, 类型, ID)，只返回排在其后的数据
 
         Returns:
-            汇总结果
+            按删除时间倒序的合并查询集，无可查询类型时返回 None
         """
-        results = []
-        total_count = 0
-
+        branches = []
         for type_key, config in self.RECYCLE_BIN_MODELS.items():
-            model_name = config['model']
-            model_class = self.model_classes.get(model_name)
-
+            if item_type and type_key != item_type:
+                continue
+            model_class = self.model_classes.get(config['model'])
             if not model_class or not hasattr(model_class, 'is_deleted'):
                 continue
 
             queryset = model_class.objects.filter(is_deleted=True)
             queryset = self._apply_permission_filter(queryset, model_class, user)
-
             if search:
                 queryset = queryset.filter(name__icontains=search)
+            if after:
+                queryset = queryset.filter(self._after_cursor_filter(type_key, after))
+
+            branches.append(
+                queryset.order_by().annotate(
+                    item_type=Value(type_key, output_field=CharField()),
+                    item_id=F('id'),
+                    item_name=F('name'),
+                    item_description=F('description'),
+                    item_created_time=F('created_time'),
+                    deleted_time=F('updated_time'),
+                ).values_list(
+                    'item_type', 'item_id', 'item_name', 'item_description',
+                    'item_created_time', 'deleted_time'
+                )
+            )
+
+        if not branches:
+            return None
 
-            total_count += queryset.count()
+        union = branches[0].union(*branches[1:], all=True) if len(branches) > 1 else branches[0]
+        return union.order_by('-deleted_time', '-item_type', '-item_id')
+
+    @staticmethod
+    def _after_cursor_filter(type_key: str, after: Tuple[datetime, str, int]) -> Q:
+        """
+        游标条件：排在 (删除时间, 类型, ID) 之后的数据
 
-            # 每种类型最多返回20条
-            for item in queryset[:20]:
-                results.append(self._serialize_deleted_item(item, type_key))
+        同一分支内类型为常量，条件化简为只涉及删除时间和ID的范围查询。
+        """
+        deleted_time, cursor_type, cursor_id = after
+        if type_key < cursor_type:
+            return Q(updated_time__lte=deleted_time)
+        if type_key == cursor_type:
+            return Q(updated_time__lt=deleted_time) | Q(updated_time=deleted_time, id__lt=cursor_id)
+        return Q(updated_time__lt=deleted_time)
+
+    @staticmethod
+    def _encode_cursor(row) -> str:
+        """将一页最后一行的排序键编码为游标"""
+        payload = json.dumps([row[5].isoformat(), row[0], row[1]])
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[datetime, str, int]:
+        """解析游标，无效时抛出 ValueError"""
+        try:
+            deleted_time, type_key, item_id = json.loads(
+                base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+            )
+            return datetime.fromisoformat(deleted_time), str(type_key), int(item_id)
+        except (TypeError, ValueError, UnicodeError):
+            raise ValueError("无效的分页游标")
 
-        return {'results': results, 'count': total_count}
+    def _serialize_row(self, row) -> Dict[str, Any]:
+        """
+        将 UNION 查询的一行转换为前端展示的字典
+
+        Args:
+            row: (类型, ID, 名称, 描述, 创建时间, 删除时间)
+
+        Returns:
+            序列化后的字典（updated_time 即删除时间）
+        """
+        type_key, item_id, name, description, created_time, deleted_time = row
+        return {
+            'type': type_key,
+            'display_type': self.RECYCLE_BIN_MODELS[type_key]['display_name'],
+            'id': item_id,
+            'name': name,
+            'description': description,
+            'created_time': created_time,
+            'updated_time': deleted_time,
+        }
 
     def _get_model_and_object(
         self,
@@ -475,49 +500,6 @@ class RecycleBinService:
             'total_count': total_count
         }
 
-    def _serialize_deleted_item(self, item, item_type: str) -> Dict[str, Any]:
-        """
-        将已删除的模型实例序列化为前端可展示的字典
-
-        对于外键字段（如 project、owner），序列化为 {id, name} 格式。
-
-        Args:
-            item: 模型实例
-            item_type: 数据类型标识符
-
-        Returns:
-            序列化后的字典
-        """
-        config = self.RECYCLE_BIN_MODELS.get(item_type, {})
-        fields = config.get('fields', [])
-
-        data = {
-            'type': item_type,
-            'display_type': config.get('display_name', item_type),
-            'id': item.id,
-            'name': getattr(item, 'name', str(item)),
-        }
-
-        for field in fields:
-            # id 和 name 已在上面处理
-            if field in ('id', 'name'):
-                continue
-
-            value = getattr(item, field, None)
-            if value is None:
-                continue
-
-            # 外键字段序列化为 {id, name} 格式
-            if hasattr(value, 'id'):
-                data[field] = {
-                    'id': value.id,
-                    'name': getattr(value, 'name', str(value))
-                }
-            else:
-                data[field] = value
-
-        return data
-
 
 # 全局服务实例，供视图层直接导入使用
 recycle_bin_service = RecycleBinService()
@@ -0,0 +1,196 @@
+"""
+请求模板编译服务
+
+将请求定义（url/headers/params/body）中的变量占位符预先编译为模板：
+字符串被拆分为「字面量片段 + 占位符名称」序列，嵌套的 dict/list 结构
+只保留包含占位符的分支。渲染时只需按占位符数量查找变量并拼接，
+开销与占位符个数成正比，而与变量总数及文本长度无关。
+
+同时支持两种占位符语法：
+- ${key}         HttpExecutor 直接执行时的全局变量
+- ${scope.name}  VariablePool 作用域变量（env/global/shared/local）
+
+占位符如何取值由渲染时传入的 resolve 回调决定：回调返回替换后的字符串，
+返回 None 表示保留原占位符文本。
+
+测试用例的编译结果通过 request_template_cache 按用例ID缓存，
+用例的 updated_time 变化时自动重新编译。
+"""
+
+import logging
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+
+from api_automation.services.compiled_cache import CompiledCaseCache
+
+logger = logging.getLogger(__name__)
+
+# 通用占位符模式：${...}，具体语法由 resolve 回调判定
+PLACEHOLDER_PATTERN = re.compile(r'\$\{([^{}]+)\}')
+
+Resolver = Callable[[str], Optional[str]]
+
+# 参与编译的测试用例请求字段
+REQUEST_FIELDS = ('url', 'headers', 'params', 'body')
+
+
+class Template:
+    """编译后模板节点的基类"""
+
+    has_placeholders = False
+
+    def render(self, resolve: Resolver) -> Any:
+        raise NotImplementedError
+
+
+class ConstantTemplate(Template):
+    """
+    不含占位符的常量节点
+
+    渲染时直接返回原始值（不复制），调用方不应原地修改渲染结果中的常量部分。
+    """
+
+    __slots__ = ('value',)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    def render(self, resolve: Resolver) -> Any:
+        return self.value
+
+
+class StringTemplate(Template):
+    """包含占位符的字符串节点"""
+
+    __slots__ = ('source', 'literals', 'names')
+
+    has_placeholders = True
+
+    def __init__(self, source: str):
+        parts = PLACEHOLDER_PATTERN.split(source)
+        self.source = source
+        self.literals = parts[0::2]
+        self.names = parts[1::2]
+
+    def render(self, resolve: Resolver) -> str:
+        chunks = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            value = resolve(name)
+            chunks.append('${' + name + '}' if value is None else value)
+            chunks.append(literal)
+        return ''.join(chunks)
+
+
+class DictTemplate(Template):
+    """包含占位符的字典节点"""
+
+    __slots__ = ('items',)
+
+    has_placeholders = True
+
+    def __init__(self, items: list):
+        self.items = items
+
+    def render(self, resolve: Resolver) -> Dict[str, Any]:
+        return {key: node.render(resolve) for key, node in self.items}
+
+
+class ListTemplate(Template):
+    """包含占位符的列表节点"""
+
+    __slots__ = ('nodes',)
+
+    has_placeholders = True
+
+    def __init__(self, nodes: list):
+        self.nodes = nodes
+
+    def render(self, resolve: Resolver) -> list:
+        return [node.render(resolve) for node in self.nodes]
+
+
+def compile_template(value: Any) -> Template:
+    """
+    将任意 JSON 结构编译为模板
+
+    Args:
+        value: 字符串、dict、list 或其他标量
+
+    Returns:
+        编译后的模板节点
+    """
+    if isinstance(value, str):
+        return compile_string(value)
+
+    if isinstance(value, dict):
+        items = [(key, compile_template(item)) for key, item in value.items()]
+        if any(node.has_placeholders for _, node in items):
+            return DictTemplate(items)
+        return ConstantTemplate(value)
+
+    if isinstance(value, (list, tuple)):
+        nodes = [compile_template(item) for item in value]
+        if any(node.has_placeholders for node in nodes):
+            return ListTemplate(nodes)
+        return ConstantTemplate(value)
+
+    return ConstantTemplate(value)
+
+
+@lru_cache(maxsize=4096)
+def compile_string(text: str) -> Template:
+    """
+    编译单个字符串（带进程级LRU缓存）
+
+    Args:
+        text: 可能包含占位符的字符串
+
+    Returns:
+        StringTemplate，不含占位符时返回 ConstantTemplate
+    """
+    if '${' not in text or not PLACEHOLDER_PATTERN.search(text):
+        return ConstantTemplate(text)
+    return StringTemplate(text)
+
+
+def mapping_resolver(variables: Dict[str, Any]) -> Resolver:
+    """
+    构建 ${key} 语法的取值回调：变量存在时替换为 str(值)，否则保留占位符
+
+    Args:
+        variables: 变量名到值的映射
+
+    Returns:
+        resolve 回调
+    """
+    def resolve(name: str) -> Optional[str]:
+        if name in variables:
+            return str(variables[name])
+        return None
+    return resolve
+
+
+def compile_test_case(test_case: Any) -> Dict[str, Template]:
+    """
+    编译测试用例的请求定义
+
+    Args:
+        test_case: 测试用例对象
+
+    Returns:
+        {字段名: 模板} 字典，字段为 url/headers/params/body
+    """
+    return {
+        field: compile_template(getattr(test_case, field, None))
+        for field in REQUEST_FIELDS
+    }
+
+
+# 测试用例请求模板缓存（用例 updated_time 变化时自动重新编译）
+request_template_cache = CompiledCaseCache(
+    compile_test_case,
+    maxsize=getattr(settings, 'API_REQUEST_TEMPLATE_CACHE_SIZE', 1024),
+)
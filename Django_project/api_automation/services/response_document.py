@@ -0,0 +1,201 @@
+"""
+响应文档缓存
+
+一次HTTP响应在断言和提取阶段可能被多条规则反复使用：JSONPath 需要
+解析后的JSON，正则和文本断言需要响应文本，XPath 需要 lxml 文档树，
+CSS 选择器需要 BeautifulSoup 文档树。ResponseDocument 对同一响应的
+每种表示形式只解析一次，并在该用例的所有断言与提取规则之间共享。
+
+XPath 表达式和 CSS 选择器同样只编译一次，编译结果按表达式缓存在进程级 LRU 中。
+
+lxml / BeautifulSoup 为可选依赖，未安装时对应的提取方式返回None。
+"""
+
+import json
+import logging
+from functools import lru_cache
+from typing import Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# 尝试导入lxml（非必须依赖，不可用时静默降级）
+try:
+    from lxml import etree
+    LXML_ENABLED = True
+except ImportError:
+    etree = None
+    LXML_ENABLED = False
+
+# 尝试导入BeautifulSoup与soupsieve（非必须依赖，不可用时静默降级）
+try:
+    import soupsieve
+    from bs4 import BeautifulSoup
+    BS4_ENABLED = True
+except ImportError:
+    soupsieve = None
+    BeautifulSoup = None
+    BS4_ENABLED = False
+
+_UNPARSED = object()
+
+
+class ResponseDocument:
+    """
+    单个响应的惰性解析文档
+
+    各属性在首次访问时解析并缓存，解析失败时缓存 None，不会重复尝试。
+    """
+
+    def __init__(self, body: Any = None, raw_text: Optional[str] = None):
+        """
+        初始化响应文档
+
+        Args:
+            body: 已解析的响应体（dict/list/str）
+            raw_text: 原始响应文本，仅在 body 为 None 时使用
+        """
+        self.body = body
+        self.raw_text = raw_text
+        self._text = _UNPARSED
+        self._json = _UNPARSED
+        self._html_tree = _UNPARSED
+        self._soup = _UNPARSED
+
+    @classmethod
+    def from_response(cls, http_response: Any) -> 'ResponseDocument':
+        """
+        从 HttpResponse 构建响应文档
+
+        Args:
+            http_response: HTTP响应对象
+
+        Returns:
+            ResponseDocument 实例
+        """
+        raw_response = getattr(http_response, 'raw_response', None)
+        raw_text = getattr(raw_response, 'text', None)
+        return cls(
+            getattr(http_response, 'body', None),
+            raw_text if isinstance(raw_text, str) else None,
+        )
+
+    @property
+    def text(self) -> Optional[str]:
+        """
+        响应文本
+
+        dict/list 响应体序列化为JSON文本（只序列化一次），
+        其他响应体转为字符串，响应体为空时使用原始响应文本。
+        """
+        if self._text is _UNPARSED:
+            if isinstance(self.body, (dict, list)):
+                self._text = json.dumps(self.body, ensure_ascii=False)
+            elif self.body is not None:
+                self._text = str(self.body)
+            else:
+                self._text = self.raw_text
+        return self._text
+
+    @property
+    def json(self) -> Any:
+        """解析后的JSON数据，响应体不是JSON时为None"""
+        if self._json is _UNPARSED:
+            if isinstance(self.body, (dict, list)):
+                self._json = self.body
+            else:
+                try:
+                    self._json = json.loads(self.text) if self.text else None
+                except (TypeError, ValueError):
+                    self._json = None
+        return self._json
+
+    @property
+    def html_tree(self) -> Any:
+        """lxml HTML 文档树"""
+        if self._html_tree is _UNPARSED:
+            self._html_tree = None
+            if not LXML_ENABLED:
+                logger.warning("lxml库未安装，XPath提取不可用")
+            elif self.text:
+                try:
+                    self._html_tree = _parse_html(self.text)
+                except Exception as e:
+                    logger.error(f"Error parsing HTML document: {str(e)}")
+        return self._html_tree
+
+    @property
+    def soup(self) -> Any:
+        """BeautifulSoup 文档树"""
+        if self._soup is _UNPARSED:
+            self._soup = None
+            if not BS4_ENABLED:
+                logger.warning("BeautifulSoup库未安装，CSS选择器提取不可用")
+            elif self.text is not None:
+                self._soup = BeautifulSoup(self.text, 'html.parser')
+        return self._soup
+
+    def xpath(self, expression: str) -> List[Any]:
+        """
+        在文档树上执行（已编译的）XPath
+
+        Args:
+            expression: XPath表达式
+
+        Returns:
+            匹配结果列表，文档不可用时为空列表
+        """
+        tree = self.html_tree
+        if tree is None:
+            return []
+        return compile_xpath(expression)(tree)
+
+    def select(self, selector: str) -> List[Any]:
+        """
+        在文档树上执行（已编译的）CSS选择器
+
+        Args:
+            selector: CSS选择器
+
+        Returns:
+            匹配元素列表，文档不可用时为空列表
+        """
+        soup = self.soup
+        if soup is None:
+            return []
+        return compile_css_selector(selector).select(soup)
+
+
+def _parse_html(text: str) -> Any:
+    """解析HTML文本；带编码声明的文本需以字节形式交给 lxml"""
+    try:
+        return etree.fromstring(text, etree.HTMLParser())
+    except ValueError:
+        return etree.fromstring(text.encode('utf-8'), etree.HTMLParser())
+
+
+@lru_cache(maxsize=1024)
+def compile_xpath(expression: str) -> Any:
+    """
+    编译XPath表达式（带进程级LRU缓存）
+
+    Args:
+        expression: XPath表达式
+
+    Returns:
+        lxml.etree.XPath 对象
+    """
+    return etree.XPath(expression)
+
+
+@lru_cache(maxsize=1024)
+def compile_css_selector(selector: str) -> Any:
+    """
+    编译CSS选择器（带进程级LRU缓存）
+
+    Args:
+        selector: CSS选择器
+
+    Returns:
+        soupsieve 编译后的选择器对象
+    """
+    return soupsieve.compile(selector)
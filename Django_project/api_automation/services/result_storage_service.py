@@ -6,6 +6,9 @@
 - HTTP 非2xx（失败）: 存储完整请求/响应详情，方便问题排查
 - 异常情况: 存储完整错误信息
 
+完整模式下的请求体/响应体存入内容寻址存储（blob_store），结果行只保存摘要，
+展示时再按需加载。
+
 同时提供前端展示数据获取和存储大小估算功能。
 """
 
@@ -13,6 +16,7 @@ import logging
 from typing import Any, Dict, Optional
 
 from api_automation.models import ApiTestResult
+from api_automation.services.blob_store import blob_store
 
 logger = logging.getLogger(__name__)
 
@@ -165,8 +169,10 @@ class ResultStorageService:
                 'path': request_data.get('path'),
                 'headers': request_data.get('headers', {}),
                 'params': request_data.get('params', {}),
-                'body': request_data.get('body', {}),
             }
+            test_result.request_body_hash = ResultStorageService._store_body(
+                test_result.request_body_hash, request_data.get('body')
+            )
 
         if response_data:
             test_result.response_full = {
@@ -174,9 +180,11 @@ class ResultStorageService:
                 'status_text': response_data.get('status_text'),
                 'response_time': response_data.get('response_time'),
                 'headers': response_data.get('headers', {}),
-                'body': response_data.get('body', {}),
                 'content_length': response_data.get('content_length', 0),
             }
+            test_result.response_body_hash = ResultStorageService._store_body(
+                test_result.response_body_hash, response_data.get('body')
+            )
 
         if error_info:
             test_result.error_info = error_info
@@ -184,6 +192,41 @@ class ResultStorageService:
         if assertion_results:
             test_result.assertion_results = assertion_results
 
+    @staticmethod
+    def _store_body(current_hash: str, body: Any) -> str:
+        """
+        将请求/响应体写入内容寻址存储
+
+        Args:
+            current_hash: 结果行上已有的摘要（已存储过时不再重复写入）
+            body: 请求体或响应体
+
+        Returns:
+            内容摘要，空内容返回空串
+        """
+        if current_hash or body in (None, '', {}, []):
+            return current_hash or ''
+        return blob_store.put_json(body)
+
+    @staticmethod
+    def load_full_bodies(test_result: ApiTestResult) -> Dict[str, Any]:
+        """
+        加载完整请求/响应信息（按摘要从内容寻址存储读取请求体与响应体）
+
+        Args:
+            test_result: ApiTestResult实例
+
+        Returns:
+            {'request': 完整请求信息, 'response': 完整响应信息}
+        """
+        request_full = dict(test_result.request_full or {})
+        response_full = dict(test_result.response_full or {})
+        if test_result.request_body_hash:
+            request_full['body'] = blob_store.get_json(test_result.request_body_hash, {})
+        if test_result.response_body_hash:
+            response_full['body'] = blob_store.get_json(test_result.response_body_hash, {})
+        return {'request': request_full, 'response': response_full}
+
     @staticmethod
     def _extract_key_headers(headers: Dict[str, str]) -> Dict[str, str]:
         """
@@ -230,15 +273,16 @@ class ResultStorageService:
         )
 
         if has_full_data:
+            full = ResultStorageService.load_full_bodies(test_result)
             return {
                 'storage_level': 'full',
-                'request': test_result.request_full or {
+                'request': full['request'] or {
                     'method': test_result.request_method,
                     'url': test_result.request_url,
                     'headers': test_result.request_headers,
                     'body': test_result.request_body,
                 },
-                'response': test_result.response_full or {
+                'response': full['response'] or {
                     'status_code': test_result.response_status,
                     'headers': test_result.response_headers,
                     'body': test_result.response_body,
@@ -15,13 +15,21 @@ class TrafficFilterService:
     HEALTH_KEYWORDS = ("/health", "/ping", "/status")
 
     def filter_entries(self, entries):
-        filtered = []
-        fingerprints = set()
-        stats = {
+        stats = self.new_stats()
+        filtered = list(self.iter_filtered(entries, stats))
+        return filtered, stats
+
+    @staticmethod
+    def new_stats():
+        return {
             "filtered_count": 0,
             "deduplicated_count": 0,
         }
 
+    def iter_filtered(self, entries, stats):
+        """逐条标记 entry（可接收生成器），stats 在迭代过程中原地累加。"""
+        fingerprints = set()
+
         for entry in entries:
             entry = dict(entry)
             entry.setdefault("is_valuable", True)
@@ -46,9 +54,7 @@ class TrafficFilterService:
                 stats["filtered_count"] += 1
 
             entry["fingerprint"] = fingerprint
-            filtered.append(entry)
-
-        return filtered, stats
+            yield entry
 
     def _fingerprint(self, entry):
         payload = {
@@ -2,12 +2,28 @@
 流量录制解析服务
 
 负责解析代理抓包生成的 JSON/HAR 数据，转换为标准化的请求/响应结构。
+
+浏览器导出的 HAR 常达数百 MB，iter_entries 从文件对象按块读取，只定位
+log.entries（或顶层 entries / 顶层数组）并逐条解码，内存占用取决于单条
+entry 的大小而不是整个文件。log.entries 与顶层 entries 同时存在时只使用
+log.entries，与一次性加载后取值的结果一致。
 """
 
+import codecs
+import io
 import json
 import hashlib
+import re
 from urllib.parse import urlparse, parse_qs
 
+# 完整字符串、括号或未闭合字符串的起点（跳过值时只需关注这几类记号）、完整字符串、标量结束位置
+_STRING_PATTERN = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+_TOKEN = re.compile(_STRING_PATTERN + r'|[\[\]{}"]', re.S)
+_STRING = re.compile(_STRING_PATTERN, re.S)
+_SCALAR_END = re.compile(r'[\s,\]}]')
+_WHITESPACE = re.compile(r'\S')
+_DECODER = json.JSONDecoder()
+
 
 class TrafficParseError(Exception):
     """解析错误，携带错误码与描述。"""
@@ -21,11 +37,12 @@ class TrafficParseError(Exception):
 class TrafficParseService:
     """流量解析服务。"""
 
-    def __init__(self, max_file_size=5 * 1024 * 1024):
+    def __init__(self, max_file_size=5 * 1024 * 1024, chunk_size=64 * 1024):
         self.max_file_size = max_file_size
+        self.chunk_size = chunk_size
 
     def parse_content(self, content, file_format="JSON"):
-        """解析文本内容，返回标准化 entry 列表。"""
+        """解析内存中的文本内容（受 max_file_size 限制），返回标准化 entry 列表。"""
         if content is None:
             return []
         if isinstance(content, str) and not content.strip():
@@ -34,12 +51,11 @@ class TrafficParseService:
         if len(content.encode("utf-8")) > self.max_file_size:
             raise TrafficParseError("文件大小超过限制", code="FILE_TOO_LARGE")
 
-        try:
-            raw_data = json.loads(content) if isinstance(content, str) else content
-        except (TypeError, json.JSONDecodeError) as exc:
-            raise TrafficParseError("文件格式解析失败") from exc
+        if isinstance(content, str):
+            return list(self.iter_entries(io.StringIO(content), file_format=file_format))
 
         entries = []
+        raw_data = content
 
         if isinstance(raw_data, dict):
             if "log" in raw_data and "entries" in raw_data["log"]:
@@ -60,6 +76,29 @@ class TrafficParseService:
 
         return entries
 
+    def iter_entries(self, fileobj, file_format="JSON"):
+        """
+        从文件对象流式解析，逐条产出标准化 entry
+
+        Args:
+            fileobj: 文本或二进制（UTF-8）文件对象，按 chunk_size 分块读取
+            file_format: 文件格式（JSON/HAR 结构相同，仅作记录）
+
+        Returns:
+            生成器，逐条产出 _normalize_entry 的结果
+
+        Raises:
+            TrafficParseError: 内容不是合法 JSON（可能在已产出部分 entry 之后抛出）
+        """
+        reader = _JSONStreamReader(fileobj, self.chunk_size)
+        try:
+            for item in reader.iter_entries():
+                normalized = self._normalize_entry(item)
+                if normalized:
+                    yield normalized
+        except (ValueError, UnicodeDecodeError) as exc:
+            raise TrafficParseError("文件格式解析失败") from exc
+
     def _normalize_entry(self, item):
         if not isinstance(item, dict):
             return None
@@ -134,3 +173,228 @@ class TrafficParseService:
             return ""
         payload = content if isinstance(content, (bytes, bytearray)) else str(content).encode("utf-8")
         return hashlib.sha256(payload).hexdigest()
+
+
+class _JSONStreamReader:
+    """
+    增量 JSON 扫描器。
+
+    只解码目标数组的元素：完整位于缓冲区的元素直接交给 raw_decode，其余值用正则
+    按字符串/括号记号跳过，不构建对象。缓冲区在每个元素之后丢弃已消费部分，
+    因此驻留内存约为单个元素加一个读取块。
+    """
+
+    def __init__(self, fileobj, chunk_size):
+        self.fileobj = fileobj
+        self.chunk_size = chunk_size
+        self.start = self._tell(fileobj)
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def iter_entries(self):
+        """
+        按顶层结构定位 entry 数组：顶层数组、log.entries 或顶层 entries。
+
+        log.entries 优先于顶层 entries。顶层 entries 出现在 log 之前时无法确定
+        是否使用，先跳过；对象结束且没有 log.entries 时回到起始位置再读一遍，
+        文件不可定位时才暂存这部分 entry。
+        """
+        deferred, replay = None, False
+        char = self._peek()
+        if char == "[":
+            yield from self._iter_array()
+        elif char == "{":
+            found_log_entries = False
+            seen_log = False
+            for key in self._iter_object_keys():
+                if key == "log" and self._peek() == "{":
+                    seen_log = True
+                    for log_key in self._iter_object_keys():
+                        if log_key == "entries":
+                            found_log_entries = True
+                            if self._peek() == "[":
+                                yield from self._iter_array()
+                                continue
+                        self._skip_value()
+                elif key == "entries" and not found_log_entries and self._peek() == "[":
+                    if seen_log:
+                        yield from self._iter_array()
+                    elif self.start is not None:
+                        self._skip_value()
+                        replay = True
+                    else:
+                        deferred = list(self._iter_array())
+                else:
+                    self._skip_value()
+            if found_log_entries:
+                deferred, replay = None, False
+        elif char:
+            # 顶层为标量时与 json.loads 行为一致：合法则无 entry，否则报错
+            self._read_value()
+
+        if self._peek():
+            raise ValueError("JSON 结束后存在多余内容")
+
+        if deferred:
+            yield from deferred
+        if replay:
+            self.fileobj.seek(self.start)
+            yield from _JSONStreamReader(self.fileobj, self.chunk_size)._iter_top_level_entries()
+
+    def _iter_top_level_entries(self):
+        """第二遍读取：只产出顶层 entries 数组的元素。"""
+        for key in self._iter_object_keys():
+            if key == "entries" and self._peek() == "[":
+                yield from self._iter_array()
+            else:
+                self._skip_value()
+
+    @staticmethod
+    def _tell(fileobj):
+        """返回可定位文件的当前位置，不可定位时返回 None。"""
+        try:
+            if fileobj.seekable():
+                return fileobj.tell()
+        except (AttributeError, OSError, ValueError):
+            pass
+        return None
+
+    def _iter_array(self):
+        self._expect("[")
+        if self._peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self._read_value()
+            self._compact()
+            char = self._peek()
+            self.pos += 1
+            if char == "]":
+                return
+            if char != ",":
+                raise ValueError("数组元素之间缺少逗号")
+
+    def _iter_object_keys(self):
+        """逐个产出对象的键，调用方负责消费对应的值。"""
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            if self._peek() != '"':
+                raise ValueError("对象键必须为字符串")
+            key = self._read_value()
+            self._expect(":")
+            yield key
+            self._compact()
+            char = self._peek()
+            self.pos += 1
+            if char == "}":
+                return
+            if char != ",":
+                raise ValueError("对象成员之间缺少逗号")
+
+    def _read_value(self):
+        # 字符串、数组和对象自带结束记号，完整位于缓冲区时直接解码；数字和字面量
+        # 可能在 "." 或 "e" 之后被读取块截断，raw_decode 仍会成功，需先扫描到分隔符
+        char = self._peek()
+        if char and char in '"[{':
+            try:
+                value, end = _DECODER.raw_decode(self.buf, self.pos)
+            except ValueError:
+                pass
+            else:
+                self.pos = end
+                return value
+        end = self._value_end()
+        value = json.loads(self.buf[self.pos:end])
+        self.pos = end
+        return value
+
+    def _skip_value(self):
+        self.pos = self._value_end()
+        self._compact()
+
+    def _value_end(self):
+        """返回当前值结束后的位置；扫描期间只追加缓冲区，位置保持有效。"""
+        char = self._peek()
+        start = self.pos
+        if char == '"':
+            return self._string_end(start)
+        if char in ("[", "{"):
+            depth = 0
+            index = start
+            while True:
+                match = _TOKEN.search(self.buf, index)
+                if match is None:
+                    index = len(self.buf)
+                    if not self._read_more():
+                        raise ValueError("JSON 内容不完整")
+                    continue
+                token = self.buf[match.start()]
+                index = match.end()
+                if token == '"':
+                    if index - match.start() == 1:
+                        # 字符串被读取块截断，补齐后从引号处重新匹配
+                        index = self._string_end(match.start())
+                elif token in "[{":
+                    depth += 1
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        return index
+        if not char:
+            raise ValueError("JSON 内容不完整")
+        while True:
+            match = _SCALAR_END.search(self.buf, start)
+            if match is not None:
+                return match.start()
+            if not self._read_more():
+                return len(self.buf)
+
+    def _string_end(self, start):
+        """返回从 start 处引号开始的字符串结束后的位置。"""
+        while True:
+            match = _STRING.match(self.buf, start)
+            if match is not None:
+                return match.end()
+            # 按已缓冲长度成倍读取，超长字符串的重复匹配总代价保持线性
+            if not self._read_more(len(self.buf) - start):
+                raise ValueError("字符串未闭合")
+
+    def _peek(self):
+        """跳过空白并返回下一个字符，文件结束时返回空串。"""
+        while True:
+            match = _WHITESPACE.search(self.buf, self.pos)
+            if match is not None:
+                self.pos = match.start()
+                return self.buf[self.pos]
+            self.pos = len(self.buf)
+            if not self._read_more():
+                return ""
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError(f"期望 {char!r}")
+        self.pos += 1
+
+    def _read_more(self, size=0):
+        while not self.eof:
+            chunk = self.fileobj.read(max(self.chunk_size, size))
+            if isinstance(chunk, (bytes, bytearray)):
+                self.eof = not chunk
+                # 多字节字符可能被读取块截断，解码结果为空时继续读取
+                chunk = self.decoder.decode(chunk, final=self.eof)
+            elif not chunk:
+                self.eof = True
+            if chunk:
+                self.buf += chunk
+                return True
+        return False
+
+    def _compact(self):
+        if self.pos:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
@@ -18,6 +18,9 @@ import re
 from typing import Any, Dict, Optional
 
 from api_automation.models import ApiTestEnvironment
+from api_automation.services.request_template import (
+    Template, compile_string, compile_template,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +35,7 @@ class VariablePool:
 
     # 变量引用的正则模式：匹配 ${scope.variable_name} 格式
     VARIABLE_PATTERN = re.compile(r'\$\{([a-z_]+\.[-a-zA-Z0-9_.]+)\}')
+    VARIABLE_NAME_PATTERN = re.compile(r'[a-z_]+\.[-a-zA-Z0-9_.]+')
 
     def __init__(self, environment: Optional[ApiTestEnvironment] = None):
         """
@@ -207,11 +211,27 @@ class VariablePool:
         pool.pool = data
         return pool
 
+    def resolve_placeholder(self, name: str) -> Optional[str]:
+        """
+        模板渲染回调：解析单个 ${scope.name} 占位符
+
+        Args:
+            name: 占位符内的变量路径
+
+        Returns:
+            替换文本（变量不存在时为空字符串）；
+            不符合 scope.name 格式的占位符返回None，保留原文
+        """
+        if not self.VARIABLE_NAME_PATTERN.fullmatch(name):
+            return None
+        value = self.get(name, '')
+        return str(value) if value is not None else ''
+
     def replace_variables(self, text: str) -> str:
         """
         替换文本中的 ${scope.name} 格式变量占位符
 
-        遍历文本中所有匹配 ${scope.variable_name} 模式的占位符，
+        文本被编译为模板（按文本缓存），只对其中出现的占位符
         从变量池中查找对应值并替换。
 
         Args:
@@ -223,13 +243,8 @@ class VariablePool:
         if not text or not isinstance(text, str):
             return text
 
-        def replacer(match):
-            var_path = match.group(1)
-            value = self.get(var_path, '')
-            return str(value) if value is not None else ''
-
         try:
-            return self.VARIABLE_PATTERN.sub(replacer, text)
+            return compile_string(text).render(self.resolve_placeholder)
         except Exception as e:
             logger.error(f"Error replacing variables: {e}")
             return text
@@ -249,23 +264,22 @@ class VariablePool:
         if not isinstance(data, dict):
             return data
 
-        result = {}
-        for key, value in data.items():
-            if isinstance(value, str):
-                result[key] = self.replace_variables(value)
-            elif isinstance(value, dict):
-                result[key] = self.replace_variables_in_dict(value)
-            elif isinstance(value, list):
-                result[key] = [
-                    self.replace_variables_in_dict(item) if isinstance(item, dict)
-                    else self.replace_variables(item) if isinstance(item, str)
-                    else item
-                    for item in value
-                ]
-            else:
-                result[key] = value
-
-        return result
+        template = compile_template(data)
+        if not template.has_placeholders:
+            return dict(data)
+        return template.render(self.resolve_placeholder)
+
+    def render_template(self, template: Template) -> Any:
+        """
+        使用当前变量池渲染预编译模板
+
+        Args:
+            template: compile_template 生成的模板节点
+
+        Returns:
+            渲染结果
+        """
+        return template.render(self.resolve_placeholder)
 
     def get_all_shared_variables(self) -> Dict[str, Any]:
         """获取所有共享变量的拷贝"""
@@ -4,7 +4,7 @@ WebSocket广播服务
 负责在测试执行过程中，通过Django Channels将实时状态更新
 推送到前端客户端。支持以下类型的广播：
 - 执行状态变更（开始、完成、失败、取消）
-- 单条测试用例结果
+- 单条测试用例结果（及批量结果）
 - 执行进度百分比
 - 执行日志
 - 断言结果
@@ -14,7 +14,7 @@ WebSocket广播服务
 
 import logging
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -128,6 +128,28 @@ class WebSocketBroadcastService:
             'error_message': error_message,
         })
 
+    def broadcast_test_results(
+        self,
+        execution_id: int,
+        results: List[Dict[str, Any]]
+    ):
+        """
+        批量广播多个测试用例的执行结果
+
+        由 ExecutionBroadcaster 攒批后调用，每个元素的字段与
+        broadcast_test_result 的参数一致。
+
+        Args:
+            execution_id: 执行ID
+            results: 测试结果列表
+        """
+        if not results:
+            return
+        self._send_to_group(execution_id, 'test.results', {
+            'execution_id': execution_id,
+            'results': results,
+        })
+
     def broadcast_execution_progress(
         self,
         execution_id: int,
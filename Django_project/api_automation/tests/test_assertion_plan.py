@@ -0,0 +1,108 @@
+"""
+断言计划测试用例
+验证模型/字典两种配置的编译、操作符映射、预编译正则与缓存
+"""
+
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+from api_automation.services.assertion_plan import AssertionPlan
+from api_automation.services.compiled_cache import CompiledCaseCache
+from api_automation.services.http_executor import HttpResponse
+
+
+def _response(status_code=200, body=None, headers=None, response_time=120):
+    response = HttpResponse()
+    response.status_code = status_code
+    response.body = body
+    response.headers = headers or {}
+    response.response_time = response_time
+    return response
+
+
+def _assertion(assertion_type, operator, expected_value, target='', is_enabled=True):
+    return SimpleNamespace(
+        assertion_type=assertion_type, operator=operator,
+        expected_value=expected_value, target=target, is_enabled=is_enabled,
+    )
+
+
+class TestAssertionPlan(unittest.TestCase):
+    """断言计划编译与执行测试"""
+
+    def test_model_assertions(self):
+        """模型配置：期望值反序列化、操作符别名、响应头大小写不敏感"""
+        plan = AssertionPlan.from_models([
+            _assertion('status_code', 'equals', '200'),
+            _assertion('response_time', 'less_than_equal', '500'),
+            _assertion('json_value', 'equals', '"alice"', '$.data.name'),
+            _assertion('json_value', 'range', '[1, 10]', '$.data.count'),
+            _assertion('response_headers', 'contains', 'json', 'headers.content-type'),
+            _assertion('response_body', 'regex', '^al', '$.data.name'),
+            _assertion('text_contains', 'contains', 'alice'),
+        ])
+        response = _response(
+            body={'data': {'name': 'alice', 'count': 3}},
+            headers={'Content-Type': 'application/json'},
+        )
+
+        results = plan.evaluate(response)
+        self.assertEqual(len(results), 7)
+        for result in results:
+            self.assertTrue(result.passed, result.message)
+
+    def test_failures_and_invalid_config(self):
+        """断言失败与非法配置都返回失败结果而不是抛出异常"""
+        plan = AssertionPlan.from_models([
+            _assertion('status_code', 'equals', '[200, 201]'),
+            _assertion('json_value', 'regex', '([', '$.data'),
+            _assertion('unknown_type', 'equals', '1'),
+        ])
+        results = plan.evaluate(_response(status_code=500, body={'data': 'x'}))
+
+        self.assertEqual([r.passed for r in results], [False, False, False])
+        self.assertIn('断言配置错误', results[1].message)
+
+    def test_dict_configs(self):
+        """兼容断言引擎的字典配置格式"""
+        plan = AssertionPlan.from_configs([
+            {'type': 'json_value', 'json_path': 'items[*].id', 'operator': 'equals', 'expected': [1, 2]},
+            {'type': 'response_header', 'source': 'X-Trace', 'operator': 'exists'},
+            {'type': 'status_code', 'expected': 404, 'enabled': False},
+        ])
+        results = plan.evaluate(_response(
+            body={'items': [{'id': 1}, {'id': 2}]}, headers={'X-Trace': 'abc'},
+        ))
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(r.passed for r in results))
+
+    def test_from_test_case_skips_disabled(self):
+        """从用例编译时跳过禁用的断言"""
+        manager = Mock()
+        manager.all.return_value = [
+            _assertion('status_code', 'equals', '200'),
+            _assertion('status_code', 'equals', '404', is_enabled=False),
+        ]
+        plan = AssertionPlan.from_test_case(SimpleNamespace(assertions=manager))
+        self.assertEqual(len(plan), 1)
+
+    def test_plan_cached_by_updated_time(self):
+        """断言计划按用例版本缓存，未变更时不重复查询断言"""
+        manager = Mock()
+        manager.all.return_value = [_assertion('status_code', 'equals', '200')]
+        cache = CompiledCaseCache(AssertionPlan.from_test_case)
+        now = datetime(2024, 1, 1)
+
+        first = cache.get(SimpleNamespace(pk=1, updated_time=now, assertions=manager))
+        second = cache.get(SimpleNamespace(pk=1, updated_time=now, assertions=manager))
+        self.assertIs(first, second)
+        self.assertEqual(manager.all.call_count, 1)
+
+        cache.get(SimpleNamespace(pk=1, updated_time=now + timedelta(seconds=1), assertions=manager))
+        self.assertEqual(manager.all.call_count, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
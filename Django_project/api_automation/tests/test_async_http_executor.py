@@ -0,0 +1,106 @@
+"""
+异步HTTP执行引擎测试用例
+验证与同步执行器一致的响应结构及并发执行能力
+"""
+
+import asyncio
+import json
+import unittest
+
+from api_automation.services.async_http_executor import (
+    ASYNC_HTTP_ENABLED, AsyncHttpExecutor,
+)
+
+if ASYNC_HTTP_ENABLED:
+    import httpx
+
+
+@unittest.skipUnless(ASYNC_HTTP_ENABLED, 'httpx未安装')
+class TestAsyncHttpExecutor(unittest.TestCase):
+    """异步HTTP执行器测试类"""
+
+    def _make_executor(self, handler):
+        """构造使用 MockTransport 的执行器"""
+        executor = AsyncHttpExecutor(timeout=5, max_connections=10)
+        executor.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        return executor
+
+    def _run(self, executor, coroutine):
+        async def runner():
+            try:
+                return await coroutine
+            finally:
+                await executor.aclose()
+        return asyncio.run(runner())
+
+    def test_json_request(self):
+        """JSON请求体、变量替换与响应解析"""
+        captured = {}
+
+        def handler(request):
+            captured['url'] = str(request.url)
+            captured['body'] = json.loads(request.content)
+            return httpx.Response(201, json={'id': 1})
+
+        executor = self._make_executor(handler)
+        response = self._run(executor, executor.execute_request(
+            'POST', '/users/${uid}', 'https://api.example.com',
+            headers={'Content-Type': 'application/json'},
+            body={'name': '${name}'},
+            global_variables={'uid': '7', 'name': 'tom'},
+        ))
+
+        self.assertIsNone(response.error)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.body, {'id': 1})
+        self.assertGreater(response.body_size, 0)
+        self.assertEqual(captured['url'], 'https://api.example.com/users/7')
+        self.assertEqual(captured['body'], {'name': 'tom'})
+
+    def test_connection_error(self):
+        """连接异常写入 error 字段而不是抛出"""
+        def handler(request):
+            raise httpx.ConnectError('refused', request=request)
+
+        executor = self._make_executor(handler)
+        response = self._run(
+            executor, executor.execute_request('GET', 'https://api.example.com')
+        )
+
+        self.assertEqual(response.status_code, 0)
+        self.assertTrue(response.error.startswith('Connection error'))
+
+    def test_timeout_error(self):
+        """超时异常的错误信息与同步执行器一致"""
+        def handler(request):
+            raise httpx.ReadTimeout('timeout', request=request)
+
+        executor = self._make_executor(handler)
+        response = self._run(
+            executor, executor.execute_request('GET', 'https://api.example.com')
+        )
+
+        self.assertEqual(response.error, 'Request timeout after 5 seconds')
+
+    def test_execute_many_keeps_order(self):
+        """并发执行多个请求，结果顺序与输入一致"""
+        async def handler(request):
+            index = int(request.url.params['i'])
+            await asyncio.sleep(0.01 * (5 - index))
+            return httpx.Response(200, json={'i': index})
+
+        executor = self._make_executor(handler)
+        responses = self._run(executor, executor.execute_many(
+            [
+                {'method': 'GET', 'url': 'https://api.example.com',
+                 'params': {'i': str(i)}}
+                for i in range(5)
+            ],
+            concurrency=3,
+        ))
+
+        self.assertEqual([r.body['i'] for r in responses], [0, 1, 2, 3, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+"""
+批量执行服务测试用例
+验证用例预取、测试结果分块批量写入，以及数据库往返次数与用例数无关
+"""
+
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from api_automation.models import (
+    ApiProject,
+    ApiTestCase,
+    ApiTestCaseAssertion,
+    ApiTestCaseExtraction,
+    ApiTestEnvironment,
+    ApiTestResult,
+)
+from api_automation.services.batch_execution_service import BatchExecutionService
+from api_automation.services.http_executor import HttpExecutor, HttpResponse
+
+
+if os.environ.get('RUN_DJANGO_TESTS') != '1':
+    raise unittest.SkipTest('未开启 Django 集成测试开关')
+
+
+def _response(status_code=200):
+    response = HttpResponse()
+    response.status_code = status_code
+    response.body = {'token': 'abc', 'ok': True}
+    response.body_size = 26
+    response.response_time = 12.5
+    return response
+
+
+class TestBatchExecutionService(TestCase):
+    """批量执行服务集成测试"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='runner', password='pass1234')
+        self.project = ApiProject.objects.create(name='批量项目', owner=self.user)
+        self.environment = ApiTestEnvironment.objects.create(
+            name='测试环境', project=self.project, base_url='http://example.com',
+        )
+
+    def _create_cases(self, count):
+        case_ids = []
+        for index in range(count):
+            test_case = ApiTestCase.objects.create(
+                name=f'用例{index}', project=self.project, method='GET', url=f'/items/{index}',
+            )
+            ApiTestCaseAssertion.objects.create(
+                test_case=test_case, assertion_type='status_code',
+                operator='equals', expected_value='200',
+            )
+            ApiTestCaseExtraction.objects.create(
+                test_case=test_case, variable_name=f'token{index}',
+                extract_type='json_path', extract_expression='$.token',
+            )
+            case_ids.append(test_case.id)
+        return case_ids
+
+    def _run(self, case_ids, **service_kwargs):
+        service = BatchExecutionService(**service_kwargs)
+        with patch.object(HttpExecutor, 'execute_request', return_value=_response()):
+            execution = service.execute_by_selection(case_ids, self.environment.id, self.user.id)
+        return service, execution
+
+    def test_results_written_in_chunks(self):
+        """结果按块批量写入，统计与结果数一致，提取变量写入变量池"""
+        case_ids = self._create_cases(5)
+        service, execution = self._run(case_ids, result_chunk_size=2)
+
+        execution.refresh_from_db()
+        self.assertEqual(execution.status, 'COMPLETED')
+        self.assertEqual(execution.passed_count, 5)
+        self.assertEqual(ApiTestResult.objects.filter(execution=execution, status='PASSED').count(), 5)
+        self.assertEqual(service.variable_pool.get_shared_variable('token4'), 'abc')
+
+    def test_query_count_independent_of_case_count(self):
+        """数据库往返次数不随用例数增长"""
+        small = self._create_cases(2)
+        large = self._create_cases(8)
+
+        with CaptureQueriesContext(connection) as small_queries:
+            self._run(small, result_chunk_size=100)
+        with CaptureQueriesContext(connection) as large_queries:
+            self._run(large, result_chunk_size=100)
+
+        self.assertEqual(len(small_queries), len(large_queries))
+
+    def test_cancel_aborts_in_flight_request(self):
+        """取消后立即放弃等待中的请求，剩余用例不再执行"""
+        case_ids = self._create_cases(3)
+        service = BatchExecutionService()
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_request(*args, **kwargs):
+            started.set()
+            release.wait(5)
+            return _response()
+
+        def cancel_when_started():
+            started.wait(5)
+            service._cancel_token.cancel()
+
+        canceller = threading.Thread(target=cancel_when_started)
+        canceller.start()
+        begin = time.monotonic()
+        try:
+            with patch.object(HttpExecutor, 'execute_request', side_effect=slow_request) as request:
+                execution = service.execute_by_selection(case_ids, self.environment.id, self.user.id)
+        finally:
+            release.set()
+            canceller.join()
+
+        self.assertLess(time.monotonic() - begin, 3)
+        self.assertEqual(request.call_count, 1)
+        execution.refresh_from_db()
+        self.assertEqual(execution.status, 'CANCELLED')
+        self.assertFalse(ApiTestResult.objects.filter(execution=execution).exists())
+
+    @override_settings(API_BATCH_REQUEST_TIMEOUT=1)
+    def test_abandoned_request_bounded_by_request_timeout(self):
+        """取消后被放弃的真实请求最迟在 API_BATCH_REQUEST_TIMEOUT 后结束"""
+        started = threading.Event()
+        release = threading.Event()
+
+        class SlowHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                started.set()
+                release.wait(10)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.addCleanup(release.set)
+        self.environment.base_url = f'http://127.0.0.1:{server.server_address[1]}'
+        self.environment.save()
+
+        case_ids = self._create_cases(1)
+        service = BatchExecutionService()
+        self.assertEqual(service.request_timeout, 1)
+
+        def cancel_when_started():
+            started.wait(5)
+            service._cancel_token.cancel()
+
+        canceller = threading.Thread(target=cancel_when_started)
+        canceller.start()
+        begin = time.monotonic()
+        execution = service.execute_by_selection(case_ids, self.environment.id, self.user.id)
+        canceller.join()
+        self.assertLess(time.monotonic() - begin, 1)
+
+        def in_flight():
+            return [t for t in threading.enumerate() if t.name.startswith('api-http')]
+
+        deadline = time.monotonic() + 3
+        while in_flight() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(in_flight(), [])
+        execution.refresh_from_db()
+        self.assertEqual(execution.status, 'CANCELLED')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,147 @@
+"""
+内容寻址存储测试用例
+验证相同内容去重与压缩、引用计数释放、孤立对象回收，以及测试结果与执行记录的延迟加载
+"""
+
+import os
+import unittest
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from api_automation.models import (
+    ApiContentBlob,
+    ApiHttpExecutionRecord,
+    ApiProject,
+    ApiTestCase,
+    ApiTestExecution,
+    ApiTestResult,
+)
+from api_automation.serializers import ApiHttpExecutionRecordSerializer
+from api_automation.services.blob_store import BlobStore
+from api_automation.services.result_storage_service import ResultStorageService
+
+
+if os.environ.get('RUN_DJANGO_TESTS') != '1':
+    raise unittest.SkipTest('未开启 Django 集成测试开关')
+
+
+class TestBlobStore(TestCase):
+    """内容寻址存储集成测试"""
+
+    def setUp(self):
+        self.store = BlobStore(compress_level=6, cache_bytes=1024 * 1024)
+        self.user = User.objects.create_user(username='blob', password='pass1234')
+        self.project = ApiProject.objects.create(name='存储项目', owner=self.user)
+        self.test_case = ApiTestCase.objects.create(
+            name='用例', project=self.project, method='POST', url='/orders',
+        )
+        self.execution = ApiTestExecution.objects.create(name='执行', project=self.project)
+
+    def _create_result(self):
+        return ApiTestResult(
+            execution=self.execution, test_case=self.test_case,
+            status='FAILED', start_time=timezone.now(),
+        )
+
+    def test_put_deduplicates_and_compresses(self):
+        """相同内容只存储一份并累加引用，可压缩内容以 zlib 存储"""
+        page = '<html>' + 'Internal Server Error ' * 200 + '</html>'
+        first = self.store.put_json(page)
+        second = self.store.put_json(page)
+
+        self.assertEqual(first, second)
+        blob = ApiContentBlob.objects.get(digest=first)
+        self.assertEqual(blob.ref_count, 2)
+        self.assertEqual(blob.encoding, 'zlib')
+        self.assertLess(blob.stored_size, blob.size)
+
+        # 绕过缓存从数据库读取
+        self.assertEqual(BlobStore().get_json(first), page)
+
+        tiny = self.store.put(b'x')
+        self.assertEqual(ApiContentBlob.objects.get(digest=tiny).encoding, 'identity')
+
+    def test_release_deletes_unreferenced_blobs(self):
+        """引用计数归零时删除对象"""
+        shared = self.store.put_json({'error': 'boom'})
+        self.store.put_json({'error': 'boom'})
+        single = self.store.put_json({'error': 'other'})
+
+        self.assertEqual(self.store.release([shared, single, '']), 1)
+        self.assertEqual(ApiContentBlob.objects.get(digest=shared).ref_count, 1)
+        self.assertFalse(ApiContentBlob.objects.filter(digest=single).exists())
+
+        self.assertEqual(self.store.release([shared]), 1)
+        self.assertFalse(ApiContentBlob.objects.exists())
+
+    def test_full_details_store_bodies_by_reference(self):
+        """失败结果只保存摘要，展示时加载请求体与响应体"""
+        body = {'message': 'upstream unavailable', 'trace': ['a'] * 50}
+        results = []
+        for _ in range(3):
+            result = self._create_result()
+            ResultStorageService.save_result(
+                result,
+                request_data={'method': 'POST', 'url': '/orders', 'body': {'id': 1}},
+                response_data={'status_code': 502, 'headers': {}, 'body': body},
+            )
+            result.save()
+            results.append(result)
+
+        result = ApiTestResult.objects.get(pk=results[0].pk)
+        self.assertNotIn('body', result.response_full)
+        self.assertEqual(ApiContentBlob.objects.count(), 2)
+        self.assertEqual(
+            ApiContentBlob.objects.get(digest=result.response_body_hash).ref_count, 3
+        )
+
+        display = ResultStorageService.get_display_data(result)
+        self.assertEqual(display['response']['body'], body)
+        self.assertEqual(display['request']['body'], {'id': 1})
+
+        # 删除结果前释放引用
+        queryset = ApiTestResult.objects.filter(pk__in=[r.pk for r in results])
+        self.store.release_for(queryset)
+        queryset.delete()
+        self.assertFalse(ApiContentBlob.objects.exists())
+
+    def test_sweep_recounts_and_removes_orphans(self):
+        """回收命令按实际引用重算计数，删除超过保护期的孤立对象"""
+        result = self._create_result()
+        result.response_body_hash = self.store.put_json({'kept': True})
+        result.save()
+        ApiContentBlob.objects.filter(digest=result.response_body_hash).update(ref_count=5)
+        orphan = self.store.put_json({'orphan': True})
+        fresh = self.store.put_json({'fresh': True})
+        ApiContentBlob.objects.exclude(digest=fresh).update(
+            created_time=timezone.now() - timezone.timedelta(hours=2)
+        )
+
+        call_command('gc_content_blobs', stdout=StringIO())
+
+        self.assertEqual(
+            ApiContentBlob.objects.get(digest=result.response_body_hash).ref_count, 1
+        )
+        self.assertFalse(ApiContentBlob.objects.filter(digest=orphan).exists())
+        self.assertTrue(ApiContentBlob.objects.filter(digest=fresh).exists())
+
+    def test_execution_record_serializer_restores_body_type(self):
+        """执行记录按摘要还原 JSON 或文本响应体"""
+        records = [
+            ApiHttpExecutionRecord.objects.create(
+                project=self.project, request_method='GET', request_url='/a',
+                request_time=timezone.now(),
+                response_body_hash=self.store.put_json(body),
+            )
+            for body in ({'ok': True}, 'plain text')
+        ]
+
+        data = ApiHttpExecutionRecordSerializer(records, many=True).data
+        self.assertEqual(data[0]['response_body'], {'ok': True})
+        self.assertIsNone(data[0]['response_body_text'])
+        self.assertEqual(data[1]['response_body'], {})
+        self.assertEqual(data[1]['response_body_text'], 'plain text')
@@ -0,0 +1,128 @@
+"""
+级联删除服务测试用例
+验证按层批量执行的软删除、恢复与物理删除，以及语句数不随数据量增长
+"""
+
+import os
+import unittest
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from api_automation.models import (
+    ApiCollection,
+    ApiDataDriver,
+    ApiProject,
+    ApiTestCase,
+    ApiTestCaseAssertion,
+    ApiTestEnvironment,
+    ApiTestExecution,
+)
+from api_automation.services.cascade_delete_service import cascade_delete_service
+
+
+if os.environ.get('RUN_DJANGO_TESTS') != '1':
+    raise unittest.SkipTest('未开启 Django 集成测试开关')
+
+
+class TestCascadeDeleteService(TestCase):
+    """级联删除集成测试"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='deleter', password='pass1234')
+
+    def _create_tree(self, size):
+        """创建包含 size 个集合/用例/环境/执行的项目"""
+        project = ApiProject.objects.create(name=f'项目{size}', owner=self.user)
+        for index in range(size):
+            collection = ApiCollection.objects.create(name=f'集合{index}', project=project)
+            test_case = ApiTestCase.objects.create(
+                name=f'用例{index}', project=project, collection=collection,
+                method='GET', url='/a',
+            )
+            ApiTestCaseAssertion.objects.create(
+                test_case=test_case, assertion_type='status_code', operator='equals',
+                expected_value='200',
+            )
+            ApiDataDriver.objects.create(name=f'数据{index}', project=project, test_case=test_case)
+            environment = ApiTestEnvironment.objects.create(
+                name=f'环境{index}', project=project, base_url='http://example.com',
+            )
+            # 同时属于项目和环境的执行只应统计一次
+            ApiTestExecution.objects.create(name=f'执行{index}', project=project, environment=environment)
+        return project
+
+    def test_preview_counts_are_grouped_and_deduplicated(self):
+        """预览按模型分组计数，多条路径到达的数据不重复统计"""
+        project = self._create_tree(12)
+
+        preview = cascade_delete_service.preview_delete(project)
+
+        self.assertEqual(preview['cascade_count'], {
+            'apicollection': 12,
+            'apitestenvironment': 12,
+            'apidatadriver': 12,
+            'apitestexecution': 12,
+            'apitestcase': 12,
+        })
+        details = {item['type']: item for item in preview['cascade_details']}
+        self.assertEqual(len(details['apitestcase']['names']), 11)
+        self.assertEqual(details['apitestcase']['names'][-1], '...等12个')
+
+    def test_statement_count_does_not_grow_with_tree_size(self):
+        """删除、恢复与物理删除的语句数与子数据数量无关"""
+        def count_queries(project):
+            counts = []
+            with CaptureQueriesContext(connection) as queries:
+                cascade_delete_service.cascade_delete(project)
+            counts.append(len(queries))
+            with CaptureQueriesContext(connection) as queries:
+                cascade_delete_service.restore('ApiProject', project.id)
+            counts.append(len(queries))
+            return counts
+
+        small = count_queries(self._create_tree(1))
+        large = count_queries(self._create_tree(8))
+        self.assertEqual(small, large)
+
+    def test_delete_and_restore_tree(self):
+        """级联删除标记所有子数据，恢复后全部还原"""
+        project = self._create_tree(3)
+
+        result = cascade_delete_service.cascade_delete(project)
+        self.assertEqual(result['cascade_deleted']['apitestcase'], 3)
+        self.assertEqual(result['cascade_deleted']['apitestexecution'], 3)
+        self.assertFalse(ApiTestCase.objects.filter(project=project, is_deleted=False).exists())
+        self.assertFalse(ApiDataDriver.objects.filter(project=project, is_deleted=False).exists())
+        self.assertFalse(ApiTestExecution.objects.filter(project=project, is_deleted=False).exists())
+
+        result = cascade_delete_service.restore('ApiProject', project.id)
+        self.assertEqual(result['cascade_restored']['apicollection'], 3)
+        self.assertEqual(result['cascade_restored']['apitestcase'], 3)
+        self.assertFalse(ApiCollection.objects.filter(project=project, is_deleted=True).exists())
+        self.assertFalse(ApiTestCase.objects.filter(project=project, is_deleted=True).exists())
+        self.assertFalse(ApiProject.objects.get(pk=project.pk).is_deleted)
+
+    def test_collection_delete_keeps_siblings(self):
+        """删除集合只影响该集合下的用例"""
+        project = self._create_tree(2)
+        collection = ApiCollection.objects.filter(project=project).order_by('pk').first()
+
+        cascade_delete_service.cascade_delete(collection)
+
+        self.assertEqual(ApiTestCase.objects.filter(project=project, is_deleted=True).count(), 1)
+        self.assertEqual(ApiDataDriver.objects.filter(project=project, is_deleted=True).count(), 1)
+
+    def test_permanent_delete(self):
+        """物理删除移除整棵树（包括不带删除标记的断言配置）"""
+        project = self._create_tree(3)
+        cascade_delete_service.cascade_delete(project)
+
+        result = cascade_delete_service.permanent_delete('ApiProject', project.id)
+
+        self.assertEqual(result['cascade_permanent_deleted']['apitestcase'], 3)
+        self.assertFalse(ApiProject.objects.filter(pk=project.pk).exists())
+        self.assertFalse(ApiTestCase.objects.filter(project_id=project.pk).exists())
+        self.assertFalse(ApiTestCaseAssertion.objects.exists())
@@ -0,0 +1,201 @@
+"""
+冷归档测试用例
+验证清理前的分区归档、内容内联、按日期/状态/用例的惰性查询与裁剪、重试去重以及归档查询接口
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api_automation.models import (
+    ApiHttpExecutionRecord,
+    ApiProject,
+    ApiTestCase,
+    ApiTestExecution,
+    ApiTestResult,
+)
+from api_automation.services.blob_store import blob_store
+from api_automation.services.cold_archive import (
+    KIND_HTTP_RECORDS,
+    KIND_RESULTS,
+    ColdArchive,
+    cold_archive,
+)
+from api_automation.services.data_cleanup_service import RetentionCleanup
+
+
+if os.environ.get('RUN_DJANGO_TESTS') != '1':
+    raise unittest.SkipTest('未开启 Django 集成测试开关')
+
+
+class TestColdArchive(TestCase):
+    """冷归档集成测试"""
+
+    def setUp(self):
+        archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(archive_dir.cleanup)
+        self.root = Path(archive_dir.name)
+        self.archive = ColdArchive(root=archive_dir.name, enabled=True)
+
+        self.user = User.objects.create_user(username='archiver', password='pass1234')
+        self.project = ApiProject.objects.create(name='归档项目', owner=self.user)
+        self.case_a = ApiTestCase.objects.create(
+            name='用例A', project=self.project, method='GET', url='/a',
+        )
+        self.case_b = ApiTestCase.objects.create(
+            name='用例B', project=self.project, method='GET', url='/b',
+        )
+        self.days_ago = [timezone.now() - timezone.timedelta(days=days) for days in (20, 19)]
+
+    def _create_results(self):
+        """两天各一次执行：第一天 A 通过、B 失败；第二天 A 通过"""
+        execution = ApiTestExecution.objects.create(
+            name='执行', project=self.project, status='COMPLETED',
+        )
+        ApiTestExecution.objects.filter(pk=execution.pk).update(created_time=self.days_ago[0])
+        specs = [
+            (self.case_a, 'PASSED', 100, self.days_ago[0]),
+            (self.case_b, 'FAILED', 300, self.days_ago[0]),
+            (self.case_a, 'PASSED', 200, self.days_ago[1]),
+        ]
+        ApiTestResult.objects.bulk_create([
+            ApiTestResult(
+                execution=execution, test_case=test_case, status=status,
+                response_time=response_time, start_time=start_time,
+                response_body_hash=blob_store.put_json({'error': 'bad gateway'}) if status == 'FAILED' else '',
+            )
+            for test_case, status, response_time, start_time in specs
+        ])
+        return execution
+
+    def test_cleanup_archives_before_deleting(self):
+        """清理时结果与HTTP记录先按天/项目归档，响应体内联到归档行"""
+        self._create_results()
+        record = ApiHttpExecutionRecord.objects.create(
+            project=self.project, request_method='GET', request_url='/a',
+            request_time=timezone.now(), response_body_hash=blob_store.put_json('plain'),
+        )
+        ApiHttpExecutionRecord.objects.filter(pk=record.pk).update(created_time=self.days_ago[0])
+
+        with patch.object(cold_archive, 'root', self.root):
+            RetentionCleanup(batch_size=2, sleep_ms=0).run('archive', days=7)
+
+        self.assertFalse(ApiTestResult.objects.exists())
+        partitions = sorted(
+            path.relative_to(self.root / KIND_RESULTS).as_posix()
+            for path in (self.root / KIND_RESULTS).glob('project=*/date=*')
+        )
+        self.assertEqual(partitions, [
+            f'project={self.project.id}/date={timezone.localtime(day).date().isoformat()}'
+            for day in self.days_ago
+        ])
+
+        archive = ColdArchive(root=self.root)
+        rows = list(archive.scan(KIND_RESULTS))
+        self.assertEqual(len(rows), 3)
+        failed = [row for row in rows if row['status'] == 'FAILED'][0]
+        self.assertEqual(failed['response_full']['body'], {'error': 'bad gateway'})
+        self.assertEqual(failed['test_case__name'], '用例B')
+        self.assertNotIn('response_body_hash', failed)
+
+        records = list(archive.scan(KIND_HTTP_RECORDS, project_ids=[self.project.id]))
+        self.assertEqual(records[0]['response_body_text'], 'plain')
+
+    def test_scan_prunes_partitions_and_parts(self):
+        """按日期裁剪目录、按清单跳过不含目标用例/状态的分片"""
+        self._create_results()
+        self.archive.archive(KIND_RESULTS, ApiTestResult.objects.filter(test_case=self.case_a))
+        self.archive.archive(KIND_RESULTS, ApiTestResult.objects.filter(test_case=self.case_b))
+
+        with patch.object(ColdArchive, '_read_part', wraps=ColdArchive._read_part) as read_part:
+            rows = list(self.archive.scan(KIND_RESULTS, test_case_ids=[self.case_b.id]))
+        self.assertEqual([row['test_case_id'] for row in rows], [self.case_b.id])
+        self.assertEqual(read_part.call_count, 1)
+
+        second_day = timezone.localtime(self.days_ago[1]).date()
+        with patch.object(ColdArchive, '_read_part', wraps=ColdArchive._read_part) as read_part:
+            rows = list(self.archive.scan(KIND_RESULTS, start_date=second_day, statuses=['PASSED']))
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(read_part.call_count, 1)
+
+        self.assertEqual(list(self.archive.scan(KIND_RESULTS, project_ids=[0])), [])
+
+    def test_daily_summary(self):
+        """趋势统计不按用例过滤时只读清单，按用例过滤时扫描数据文件"""
+        self._create_results()
+        self.archive.archive(KIND_RESULTS, ApiTestResult.objects.all())
+
+        with patch.object(ColdArchive, '_read_part') as read_part:
+            summary = self.archive.daily_summary(project_ids=[self.project.id])
+        read_part.assert_not_called()
+        self.assertEqual([day['total'] for day in summary], [2, 1])
+        self.assertEqual(summary[0]['pass_rate'], 50.0)
+        self.assertEqual(summary[0]['avg_response_time'], 200)
+
+        summary = self.archive.daily_summary(test_case_ids=[self.case_a.id])
+        self.assertEqual([day['passed'] for day in summary], [1, 1])
+
+        summary = self.archive.daily_summary(statuses=['FAILED'])
+        self.assertEqual([day['failed'] for day in summary], [1])
+
+    def test_rearchiving_a_retried_batch_replaces_overlapping_parts(self):
+        """同一批数据重复归档（清理事务回滚后重试）不会产生重复行"""
+        self._create_results()
+        self.archive.archive(KIND_RESULTS, ApiTestResult.objects.filter(test_case=self.case_a))
+        self.archive.archive(KIND_RESULTS, ApiTestResult.objects.all())
+
+        self.assertEqual(len(list(self.archive.scan(KIND_RESULTS))), 3)
+
+    def test_interleaved_batches_keep_both_parts(self):
+        """主键交错但行不同的两批数据写入同一分区时都被保留"""
+        execution = self._create_results()
+        day = self.days_ago[0]
+        ApiTestResult.objects.bulk_create([
+            ApiTestResult(execution=execution, test_case=self.case_a, status='PASSED', start_time=day)
+            for _ in range(4)
+        ])
+        pks = list(
+            ApiTestResult.objects.filter(start_time=day).order_by('pk').values_list('pk', flat=True)
+        )
+        self.archive.archive(KIND_RESULTS, ApiTestResult.objects.filter(pk__in=pks[0::2]))
+        self.archive.archive(KIND_RESULTS, ApiTestResult.objects.filter(pk__in=pks[1::2]))
+
+        self.assertEqual(sorted(row['id'] for row in self.archive.scan(KIND_RESULTS)), pks)
+        summary = self.archive.daily_summary()
+        self.assertEqual(summary[0]['total'], len(pks))
+
+        # 重试其中一批仍然是幂等的
+        self.archive.archive(KIND_RESULTS, ApiTestResult.objects.filter(pk__in=pks[1::2]))
+        self.assertEqual(sorted(row['id'] for row in self.archive.scan(KIND_RESULTS)), pks)
+
+    def test_archive_endpoints(self):
+        """归档查询接口按用户可见项目过滤"""
+        self._create_results()
+        self.archive.archive(KIND_RESULTS, ApiTestResult.objects.all())
+
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        with patch.object(cold_archive, 'root', self.root):
+            response = client.get('/api/v1/api-automation/dashboard/archived_trends/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data['results']), 2)
+
+            response = client.get(
+                '/api/v1/api-automation/dashboard/archived_results/',
+                {'status': 'PASSED', 'limit': 1},
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.data['count'], 1)
+            self.assertEqual(response.data['results'][0]['status'], 'PASSED')
+
+            other = User.objects.create_user(username='other', password='pass1234')
+            client.force_authenticate(user=other)
+            response = client.get('/api/v1/api-automation/dashboard/archived_trends/')
+            self.assertEqual(response.data['results'], [])
@@ -0,0 +1,100 @@
+"""
+进程级连接池注册表测试用例
+验证连接池键、复用、空闲回收以及与 HttpExecutor 的集成
+"""
+
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from api_automation.services.connection_pool_registry import ConnectionPoolRegistry
+from api_automation.services.http_executor import HttpExecutor
+
+
+class TestConnectionPoolRegistry(unittest.TestCase):
+    """连接池注册表测试类"""
+
+    def setUp(self):
+        self.registry = ConnectionPoolRegistry(pool_size=4, idle_timeout=60)
+
+    def tearDown(self):
+        self.registry.close_all()
+
+    def test_build_key(self):
+        """连接池键包含 scheme/host/port/verify_ssl/proxy，并补全默认端口"""
+        self.assertEqual(
+            self.registry.build_key('https://API.example.com/users?id=1'),
+            ('https', 'api.example.com', 443, True, None),
+        )
+        self.assertEqual(
+            self.registry.build_key('http://localhost:8000/x', False, 'http://proxy:3128'),
+            ('http', 'localhost', 8000, False, 'http://proxy:3128'),
+        )
+        self.assertIsNone(self.registry.build_key('/relative/path'))
+
+    def test_adapter_reused_and_counted(self):
+        """相同键复用同一连接池并记录命中次数"""
+        key = self.registry.build_key('https://api.example.com/a')
+        first = self.registry.get_adapter(key)
+        second = self.registry.get_adapter(key)
+        other = self.registry.get_adapter(
+            self.registry.build_key('https://api.example.com/a', verify_ssl=False)
+        )
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        stats = self.registry.get_stats()
+        self.assertEqual(stats['pools'], 2)
+        self.assertEqual(stats['pool_hits'], 1)
+        self.assertEqual(stats['pool_misses'], 2)
+
+    def test_idle_pools_evicted(self):
+        """超过空闲时间的连接池被回收"""
+        key = self.registry.build_key('https://api.example.com')
+        self.registry.get_adapter(key)
+        self.registry._entries[key].last_used = time.monotonic() - 120
+
+        self.assertEqual(self.registry.evict_idle(), 1)
+        stats = self.registry.get_stats()
+        self.assertEqual(stats['pools'], 0)
+        self.assertEqual(stats['evictions'], 1)
+
+
+class TestHttpExecutorWithRegistry(unittest.TestCase):
+    """HttpExecutor 使用共享连接池测试"""
+
+    def test_executors_share_adapter(self):
+        """不同执行器访问同一主机时挂载同一个共享连接池，关闭执行器不影响连接池"""
+        registry = ConnectionPoolRegistry(pool_size=2, idle_timeout=60)
+        url = 'https://api.example.com/ping'
+        adapters = []
+
+        for _ in range(2):
+            executor = HttpExecutor(pool_registry=registry)
+            executor.mount_pooled_adapter(url)
+            adapters.append(executor.session.get_adapter(url))
+            executor.close()
+            self.assertNotIn(adapters[-1], executor.session.adapters.values())
+
+        self.assertIs(adapters[0], adapters[1])
+        self.assertEqual(registry.get_stats()['pool_hits'], 1)
+        registry.close_all()
+
+    @patch('requests.Session.request')
+    def test_proxy_passed_to_request(self, mock_request):
+        """配置代理时随请求传递 proxies 参数"""
+        mock_request.return_value = Mock(
+            status_code=200, headers={}, text='ok', content=b'ok'
+        )
+        executor = HttpExecutor(proxy='http://proxy:3128')
+        executor.execute_request('GET', 'https://api.example.com/ping')
+        executor.close()
+
+        self.assertEqual(
+            mock_request.call_args.kwargs['proxies'],
+            {'http': 'http://proxy:3128', 'https': 'http://proxy:3128'},
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
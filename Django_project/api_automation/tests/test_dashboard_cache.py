@@ -0,0 +1,128 @@
+"""
+仪表盘响应缓存测试用例
+验证相同筛选参数命中缓存、项目版本递增后失效，以及按用户可见范围隔离
+"""
+
+import os
+import unittest
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api_automation.models import ApiProject, ApiTestCase, ApiTestEnvironment
+from api_automation.services.batch_execution_service import BatchExecutionService
+from api_automation.services.dashboard_cache import dashboard_cache
+from api_automation.services.http_executor import HttpExecutor, HttpResponse
+
+
+if os.environ.get('RUN_DJANGO_TESTS') != '1':
+    raise unittest.SkipTest('未开启 Django 集成测试开关')
+
+
+DASHBOARD_PATH = '/api/v1/api-automation/dashboard/'
+
+
+class TestDashboardCache(TestCase):
+    """仪表盘响应缓存集成测试"""
+
+    def setUp(self):
+        dashboard_cache.cache.clear()
+        self.addCleanup(dashboard_cache.cache.clear)
+        patcher = patch.object(dashboard_cache, 'enabled', True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(username='viewer', password='pass1234')
+        self.project = ApiProject.objects.create(name='缓存项目', owner=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _get(self, path, params=None):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response, queries.captured_queries
+
+    def test_repeated_requests_hit_cache(self):
+        """相同参数的重复请求只读取项目版本"""
+        first, _ = self._get(DASHBOARD_PATH, {'module': '订单'})
+        second, queries = self._get(DASHBOARD_PATH, {'module': '订单'})
+
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(len(queries), 1)
+        self.assertIn('api_projects', queries[0]['sql'])
+
+        _, queries = self._get(DASHBOARD_PATH, {'module': '支付'})
+        self.assertGreater(len(queries), 1)
+
+    def test_bump_invalidates_cached_responses(self):
+        """项目版本递增后重新计算"""
+        self._get(DASHBOARD_PATH)
+
+        # 可见项目集合变化时缓存键随之变化
+        ApiProject.objects.create(name='新项目', owner=self.user)
+        response, _ = self._get(DASHBOARD_PATH)
+        self.assertEqual(response.data['overview']['total_projects'], 2)
+
+        dashboard_cache.bump([self.project.id])
+        _, queries = self._get(DASHBOARD_PATH)
+        self.assertGreater(len(queries), 1)
+
+    def test_finished_execution_invalidates_cache(self):
+        """批量执行结束后仪表盘返回新的执行统计"""
+        environment = ApiTestEnvironment.objects.create(
+            name='测试环境', project=self.project, base_url='http://example.com',
+        )
+        test_case = ApiTestCase.objects.create(
+            name='用例', project=self.project, method='GET', url='/items',
+        )
+        response, _ = self._get(DASHBOARD_PATH)
+        self.assertEqual(response.data['overview']['total_executions'], 0)
+
+        http_response = HttpResponse()
+        http_response.status_code = 200
+        http_response.body = {}
+        with patch.object(HttpExecutor, 'execute_request', return_value=http_response):
+            BatchExecutionService().execute_by_selection([test_case.id], environment.id, self.user.id)
+
+        response, _ = self._get(DASHBOARD_PATH)
+        self.assertEqual(response.data['overview']['total_executions'], 1)
+        self.assertEqual(response.data['test_stats']['total_cases'], 1)
+
+    @override_settings(API_EXECUTION_QUEUE_ENABLED=True)
+    def test_queued_and_cancelled_execution_invalidates_cache(self):
+        """入队新执行与取消未运行的执行后，仪表盘返回新的执行统计"""
+        environment = ApiTestEnvironment.objects.create(
+            name='测试环境', project=self.project, base_url='http://example.com',
+        )
+        ApiTestCase.objects.create(name='用例', project=self.project, method='GET', url='/items')
+        response, _ = self._get(DASHBOARD_PATH)
+        self.assertEqual(response.data['overview']['total_executions'], 0)
+
+        queued = self.client.post(
+            f'/api/v1/api-automation/projects/{self.project.id}/execute/',
+            {'environment_id': environment.id}, format='json',
+        )
+        self.assertEqual(queued.status_code, 202)
+        response, _ = self._get(DASHBOARD_PATH)
+        self.assertEqual(response.data['overview']['total_executions'], 1)
+
+        cancel = self.client.post(
+            f"/api/v1/api-automation/executions/{queued.data['id']}/cancel/"
+        )
+        self.assertEqual(cancel.status_code, 200)
+        _, queries = self._get(DASHBOARD_PATH)
+        self.assertGreater(len(queries), 1)
+
+    def test_cache_is_scoped_by_user(self):
+        """不同用户的可见范围使用不同缓存键"""
+        self._get(DASHBOARD_PATH)
+
+        other = User.objects.create_user(username='other', password='pass1234')
+        self.client.force_authenticate(user=other)
+        response, _ = self._get(DASHBOARD_PATH)
+        self.assertEqual(response.data['overview']['total_projects'], 0)
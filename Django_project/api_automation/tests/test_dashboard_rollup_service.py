@@ -0,0 +1,327 @@
+"""
+仪表盘日汇总服务测试用例
+验证执行结束时的增量累加、幂等与撤销、历史回填，以及仪表盘接口读取汇总的结果
+"""
+
+import os
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api_automation.models import (
+    ApiCollection,
+    ApiDashboardRollup,
+    ApiProject,
+    ApiTestCase,
+    ApiTestEnvironment,
+    ApiTestExecution,
+    ApiTestResult,
+)
+from api_automation.services.dashboard_cache import dashboard_cache
+from api_automation.services.dashboard_rollup_service import DashboardRollupService
+
+
+if os.environ.get('RUN_DJANGO_TESTS') != '1':
+    raise unittest.SkipTest('未开启 Django 集成测试开关')
+
+
+class TestDashboardRollupService(TestCase):
+    """仪表盘日汇总集成测试"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='viewer', password='pass1234')
+        self.project = ApiProject.objects.create(name='汇总项目', owner=self.user)
+        self.environment = ApiTestEnvironment.objects.create(
+            name='测试环境', project=self.project, base_url='http://example.com',
+        )
+        self.collection = ApiCollection.objects.create(name='集合A', project=self.project)
+        self.case_a = ApiTestCase.objects.create(
+            name='用例A', project=self.project, collection=self.collection,
+            method='GET', url='/a', module='订单',
+        )
+        self.case_b = ApiTestCase.objects.create(
+            name='用例B', project=self.project, method='GET', url='/b', owner=self.user,
+        )
+        self.service = DashboardRollupService(batch_size=2)
+
+        # 本用例直接写入汇总表，不经过递增项目版本的执行流程，关闭响应缓存
+        patcher = patch.object(dashboard_cache, 'enabled', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _create_execution(self, statuses, status='COMPLETED'):
+        """创建一次执行，statuses 为 (用例, 结果状态, 响应时间) 列表"""
+        execution = ApiTestExecution.objects.create(
+            name='执行', project=self.project, environment=self.environment, status=status,
+        )
+        ApiTestResult.objects.bulk_create([
+            ApiTestResult(
+                execution=execution, test_case=test_case, status=result_status,
+                response_time=response_time, start_time=timezone.now(),
+            )
+            for test_case, result_status, response_time in statuses
+        ])
+        return execution
+
+    def _summary(self, **filters):
+        return self.service.summarize(
+            self.service.filter_rollups([self.project.id], **filters)
+        )
+
+    def test_apply_execution_is_incremental_and_idempotent(self):
+        """执行结束后按维度累加，重复调用不会重复计数"""
+        execution = self._create_execution([
+            (self.case_a, 'PASSED', 100),
+            (self.case_a, 'FAILED', 300),
+            (self.case_b, 'PASSED', None),
+        ])
+
+        self.assertTrue(self.service.apply_execution(execution))
+        self.assertFalse(self.service.apply_execution(execution))
+
+        summary = self._summary()
+        self.assertEqual(summary['total'], 3)
+        self.assertEqual(summary['passed'], 2)
+        self.assertEqual(summary['failed'], 1)
+        self.assertEqual(summary['pass_rate'], 66.67)
+        self.assertEqual(summary['avg_response_time'], 200)
+
+        self.assertEqual(self._summary(collection_id=self.collection.id)['total'], 2)
+        self.assertEqual(self._summary(owner_id=self.user.id)['total'], 1)
+        self.assertEqual(self._summary(module='订单')['total'], 2)
+
+        today = timezone.localdate()
+        self.assertEqual(self._summary(start_date=today, end_date=today)['total'], 3)
+        self.assertEqual(
+            self._summary(end_date=today - timezone.timedelta(days=1))['total'], 0
+        )
+
+    def test_running_execution_is_not_rolled_up(self):
+        """未结束的执行不计入汇总"""
+        execution = self._create_execution([(self.case_a, 'PASSED', 10)], status='RUNNING')
+        self.assertFalse(self.service.apply_execution(execution))
+        self.assertEqual(self._summary()['total'], 0)
+
+    def test_revert_execution(self):
+        """撤销后汇总恢复为累加前的值"""
+        first = self._create_execution([(self.case_a, 'PASSED', 10)])
+        second = self._create_execution([(self.case_a, 'PASSED', 30)])
+        self.service.apply_execution(first)
+        self.service.apply_execution(second)
+
+        self.assertTrue(self.service.revert_execution(second))
+        self.assertFalse(self.service.revert_execution(second))
+
+        summary = self._summary()
+        self.assertEqual(summary['total'], 1)
+        self.assertEqual(summary['avg_response_time'], 10)
+
+    def test_delete_execution_reverts_rollup(self):
+        """通过接口删除执行时撤销其汇总贡献并递增项目版本"""
+        first = self._create_execution([(self.case_a, 'PASSED', 10)])
+        second = self._create_execution([(self.case_a, 'FAILED', 30), (self.case_b, 'PASSED', 50)])
+        self.service.apply_execution(first)
+        self.service.apply_execution(second)
+        version = ApiProject.objects.get(pk=self.project.pk).dashboard_version
+
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        response = client.delete(f'/api/v1/api-automation/executions/{second.id}/')
+        self.assertEqual(response.status_code, 204)
+
+        self.assertFalse(ApiTestResult.objects.filter(execution_id=second.id).exists())
+        summary = self._summary()
+        self.assertEqual(summary['total'], 1)
+        self.assertEqual(summary['avg_response_time'], 10)
+        self.assertEqual(
+            ApiProject.objects.get(pk=self.project.pk).dashboard_version, version + 1
+        )
+
+    def test_purge_from_recycle_bin_reverts_rollup(self):
+        """回收站彻底删除环境时撤销其下已删除执行的汇总贡献并释放结果内容"""
+        from api_automation.services.blob_store import blob_store
+        from api_automation.services.cascade_delete_service import cascade_delete_service
+
+        other_environment = ApiTestEnvironment.objects.create(
+            name='预发环境', project=self.project, base_url='http://example.org',
+        )
+        kept = self._create_execution([(self.case_a, 'PASSED', 10)])
+        purged = self._create_execution([(self.case_a, 'FAILED', 30), (self.case_b, 'PASSED', 50)])
+        purged.environment = other_environment
+        purged.save(update_fields=['environment'])
+        self.service.apply_execution(kept)
+        self.service.apply_execution(purged)
+        cascade_delete_service.cascade_delete(other_environment)
+        self.assertTrue(ApiTestExecution.objects.get(pk=purged.pk).is_deleted)
+
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        released = []
+        with patch.object(blob_store, 'release_for', side_effect=lambda qs: released.extend(qs)):
+            response = client.post(
+                f'/api/v1/api-automation/recycle-bin/permanent-delete/'
+                f'apitestenvironment/{other_environment.id}/'
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+
+        self.assertFalse(ApiTestExecution.objects.filter(pk=purged.pk).exists())
+        self.assertEqual({result.execution_id for result in released}, {purged.pk})
+        self.assertEqual(len(released), 2)
+        summary = self._summary()
+        self.assertEqual(summary['total'], 1)
+        self.assertEqual(summary['avg_response_time'], 10)
+
+        # 直接清除执行本身同样撤销其汇总贡献
+        kept.created_by = self.user
+        kept.save(update_fields=['created_by'])
+        cascade_delete_service.cascade_delete(kept)
+        response = client.post(
+            f'/api/v1/api-automation/recycle-bin/permanent-delete/apitestexecution/{kept.id}/'
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self._summary()['total'], 0)
+
+    def test_backfill_uses_constant_queries_per_batch(self):
+        """回填按批处理历史执行，之后的增量累加与回填结果合并"""
+        for _ in range(4):
+            self._create_execution([(self.case_a, 'PASSED', 10), (self.case_b, 'ERROR', None)])
+        self._create_execution([(self.case_a, 'PASSED', 10)], status='RUNNING')
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.service.backfill(), 4)
+        # 两批各：保存点、查询执行、标记、分组统计、批量插入、释放保存点，
+        # 外加最后一次空批次（保存点、查询、释放）
+        self.assertLessEqual(len(queries), 2 * 6 + 3)
+
+        self.assertEqual(self.service.backfill(), 0)
+        summary = self._summary()
+        self.assertEqual(summary['total'], 8)
+        self.assertEqual(summary['error'], 4)
+
+        execution = self._create_execution([(self.case_a, 'PASSED', 10)])
+        self.service.apply_execution(execution)
+        self.assertEqual(self._summary()['passed'], 5)
+
+    def test_rebuild_command(self):
+        """--rebuild 清空后按当前结果重算"""
+        execution = self._create_execution([(self.case_a, 'PASSED', 10)])
+        self.service.apply_execution(execution)
+        ApiDashboardRollup.objects.update(result_count=99)
+
+        call_command('backfill_dashboard_rollups', '--rebuild', stdout=StringIO())
+
+        self.assertEqual(self._summary()['total'], 1)
+
+    def test_dashboard_reads_rollups(self):
+        """仪表盘概览与项目报告读取汇总表，不再查询测试结果表"""
+        execution = self._create_execution([
+            (self.case_a, 'PASSED', 100),
+            (self.case_b, 'FAILED', 200),
+        ])
+        self.service.apply_execution(execution)
+
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/v1/api-automation/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['test_stats']['total_cases'], 2)
+        self.assertEqual(response.data['test_stats']['passed_cases'], 1)
+        self.assertEqual(response.data['test_stats']['avg_response_time'], 150)
+        self.assertFalse(
+            any('api_test_results' in query['sql'] for query in queries.captured_queries)
+        )
+
+        response = client.get(
+            '/api/v1/api-automation/dashboard/', {'collection_id': self.collection.id}
+        )
+        self.assertEqual(response.data['test_stats']['total_cases'], 1)
+
+        response = client.get('/api/v1/api-automation/dashboard/project_reports/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['stats']['total'], 2)
+        self.assertEqual(response.data['results'][0]['avg_response_time'], 150)
+
+    def test_estimate_percentile(self):
+        """分位数在所在区间内线性插值，最后一个区间以最大值为上界"""
+        buckets = [0] * len(ApiDashboardRollup.LATENCY_FIELDS)
+        buckets[2] = 10   # (100, 200]
+        buckets[-1] = 10  # > 10000
+        estimate = DashboardRollupService._estimate_percentile
+
+        self.assertEqual(estimate(buckets, 20000, 50), 200)
+        self.assertEqual(estimate(buckets, 20000, 25), 150)
+        self.assertEqual(estimate(buckets, 20000, 100), 20000)
+        self.assertEqual(estimate([0] * len(buckets), 0, 90), 0)
+
+    def _report_queries(self, path):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries)
+
+    def test_environment_and_collection_reports_use_constant_queries(self):
+        """环境与集合报告的查询次数不随环境/集合数量增长，并返回响应时间与最近执行"""
+        execution = self._create_execution([
+            (self.case_a, 'PASSED', 80),
+            (self.case_a, 'PASSED', 120),
+            (self.case_b, 'FAILED', 400),
+        ])
+        self.service.apply_execution(execution)
+
+        env_path = '/api/v1/api-automation/dashboard/environment_reports/'
+        collection_path = '/api/v1/api-automation/dashboard/collection_reports/'
+        response, env_queries = self._report_queries(env_path)
+        item = response.data['results'][0]
+        self.assertEqual(item['environment_id'], self.environment.id)
+        self.assertEqual(item['project_id'], self.project.id)
+        self.assertEqual(item['stats']['total'], 3)
+        self.assertEqual(item['avg_response_time'], 200)
+        self.assertEqual(item['max_response_time'], 400)
+        self.assertEqual(item['execution_id'], execution.id)
+        self.assertIsNotNone(item['last_execution_time'])
+        self.assertGreater(item['p90_response_time'], item['p50_response_time'])
+
+        response, collection_queries = self._report_queries(collection_path)
+        item = response.data['results'][0]
+        self.assertEqual(item['collection_id'], self.collection.id)
+        self.assertEqual(item['test_case_count'], 1)
+        self.assertEqual(item['stats']['total'], 2)
+        self.assertEqual(item['execution_id'], execution.id)
+
+        for index in range(5):
+            environment = ApiTestEnvironment.objects.create(
+                name=f'环境{index}', project=self.project, base_url='http://example.com',
+            )
+            collection = ApiCollection.objects.create(name=f'集合{index}', project=self.project)
+            test_case = ApiTestCase.objects.create(
+                name=f'用例{index}', project=self.project, collection=collection,
+                method='GET', url='/c',
+            )
+            execution = ApiTestExecution.objects.create(
+                name='执行', project=self.project, environment=environment, status='COMPLETED',
+            )
+            ApiTestResult.objects.create(
+                execution=execution, test_case=test_case, status='PASSED',
+                response_time=50, start_time=timezone.now(),
+            )
+            self.service.apply_execution(execution)
+
+        response, queries = self._report_queries(env_path)
+        self.assertEqual(response.data['count'], 6)
+        self.assertEqual(queries, env_queries)
+
+        response, queries = self._report_queries(collection_path)
+        self.assertEqual(response.data['count'], 6)
+        self.assertEqual(queries, collection_queries)
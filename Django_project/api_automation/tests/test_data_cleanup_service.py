@@ -0,0 +1,175 @@
+"""
+过期数据清理服务测试用例
+验证按主键分批删除、执行中记录的保留、检查点续跑以及清理命令
+"""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from api_automation.models import (
+    ApiCleanupCheckpoint,
+    ApiContentBlob,
+    ApiHttpExecutionRecord,
+    ApiProject,
+    ApiTestCase,
+    ApiTestExecution,
+    ApiTestResult,
+)
+from api_automation.services.blob_store import blob_store
+from api_automation.services.cold_archive import cold_archive
+from api_automation.services.data_cleanup_service import (
+    RetentionCleanup,
+    cleanup_by_project,
+)
+
+
+if os.environ.get('RUN_DJANGO_TESTS') != '1':
+    raise unittest.SkipTest('未开启 Django 集成测试开关')
+
+
+class TestRetentionCleanup(TestCase):
+    """分批清理集成测试"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='cleaner', password='pass1234')
+        self.project = ApiProject.objects.create(name='清理项目', owner=self.user)
+        self.other_project = ApiProject.objects.create(name='其他项目', owner=self.user)
+        self.test_case = ApiTestCase.objects.create(
+            name='用例', project=self.project, method='GET', url='/a',
+        )
+        self.cleanup = RetentionCleanup(batch_size=2, sleep_ms=0)
+
+        # 清理前的归档写入临时目录
+        archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(archive_dir.cleanup)
+        patcher = patch.object(cold_archive, 'root', Path(archive_dir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.old_time = timezone.now() - timezone.timedelta(days=30)
+
+    def _create_execution(self, project=None, status='COMPLETED', old=True, results=3):
+        execution = ApiTestExecution.objects.create(
+            name='执行', project=project or self.project, status=status,
+        )
+        ApiTestResult.objects.bulk_create([
+            ApiTestResult(
+                execution=execution, test_case=self.test_case, status='FAILED',
+                start_time=timezone.now(),
+                response_body_hash=blob_store.put_json({'error': 'boom'}),
+            )
+            for _ in range(results)
+        ])
+        if old:
+            ApiTestExecution.objects.filter(pk=execution.pk).update(created_time=self.old_time)
+        return execution
+
+    def _create_http_record(self, old=True):
+        record = ApiHttpExecutionRecord.objects.create(
+            project=self.project, request_method='GET', request_url='/a',
+            request_time=timezone.now(),
+        )
+        if old:
+            ApiHttpExecutionRecord.objects.filter(pk=record.pk).update(created_time=self.old_time)
+        return record
+
+    def test_deletes_expired_data_in_batches(self):
+        """过期数据分批删除，执行中和未过期的数据保留，内容引用随之释放"""
+        expired = [self._create_execution() for _ in range(2)]
+        running = self._create_execution(status='RUNNING')
+        recent = self._create_execution(old=False)
+        for _ in range(3):
+            self._create_http_record()
+        kept_record = self._create_http_record(old=False)
+
+        with patch.object(
+            RetentionCleanup, '_delete_batch', wraps=RetentionCleanup._delete_batch
+        ) as delete_batch:
+            result = self.cleanup.run('test', days=7)
+
+        self.assertEqual(result['results_deleted'], 6)
+        self.assertEqual(result['http_records_deleted'], 3)
+        self.assertEqual(result['executions_deleted'], 2)
+        self.assertFalse(result['resumed'])
+        self.assertGreaterEqual(result['rows_per_second'], 0)
+        # 6 条结果、3 条HTTP记录、2 条执行，每批 2 行
+        self.assertEqual(delete_batch.call_count, 3 + 2 + 1)
+        for call in delete_batch.call_args_list:
+            self.assertLessEqual(len(call.args[1]), 2)
+
+        self.assertFalse(ApiTestExecution.objects.filter(pk__in=[e.pk for e in expired]).exists())
+        self.assertEqual(
+            set(ApiTestExecution.objects.values_list('pk', flat=True)), {running.pk, recent.pk}
+        )
+        self.assertEqual(ApiTestResult.objects.count(), 6)
+        self.assertEqual(list(ApiHttpExecutionRecord.objects.values_list('pk', flat=True)), [kept_record.pk])
+        self.assertEqual(ApiContentBlob.objects.get().ref_count, 6)
+
+        checkpoint = ApiCleanupCheckpoint.objects.get(name='test')
+        self.assertEqual(checkpoint.status, 'COMPLETED')
+
+    def test_interrupted_run_resumes_from_checkpoint(self):
+        """中断后再次执行从检查点继续，沿用原截止时间并累计删除数"""
+        for _ in range(3):
+            self._create_execution(results=2)
+
+        original = RetentionCleanup._delete_batch
+        calls = []
+
+        def failing_delete(stage, ids):
+            calls.append(stage)
+            if len(calls) == 3:
+                raise RuntimeError('connection lost')
+            return original(stage, ids)
+
+        with patch.object(RetentionCleanup, '_delete_batch', side_effect=failing_delete):
+            with self.assertRaises(RuntimeError):
+                self.cleanup.run('resume', days=7)
+
+        checkpoint = ApiCleanupCheckpoint.objects.get(name='resume')
+        self.assertEqual(checkpoint.status, 'RUNNING')
+        self.assertEqual(checkpoint.deleted_counts['results'], 4)
+        cutoff = checkpoint.cutoff_time
+
+        result = self.cleanup.run('resume', days=7)
+        self.assertTrue(result['resumed'])
+        self.assertEqual(result['results_deleted'], 6)
+        self.assertEqual(result['executions_deleted'], 3)
+        self.assertEqual(result['deleted_this_run'], 2 + 3)
+        self.assertEqual(ApiCleanupCheckpoint.objects.get(name='resume').cutoff_time, cutoff)
+
+        # 已完成的检查点不会被续跑
+        self.assertFalse(self.cleanup.run('resume', days=7)['resumed'])
+
+    def test_cleanup_by_project_is_scoped(self):
+        """按项目清理只删除该项目的过期执行"""
+        self._create_execution()
+        other = self._create_execution(project=self.other_project)
+
+        result = cleanup_by_project(self.project.id)
+
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['executions_deleted'], 1)
+        self.assertEqual(list(ApiTestExecution.objects.values_list('pk', flat=True)), [other.pk])
+
+    def test_cleanup_old_records_command(self):
+        """清理命令分批删除过期HTTP记录并输出速率"""
+        for _ in range(3):
+            self._create_http_record()
+        self._create_http_record(old=False)
+
+        out = StringIO()
+        call_command('cleanup_old_records', '--batch-size', '2', '--sleep-ms', '0', stdout=out)
+
+        self.assertIn('成功删除 3 条执行记录', out.getvalue())
+        self.assertIn('行/秒', out.getvalue())
+        self.assertEqual(ApiHttpExecutionRecord.objects.count(), 1)
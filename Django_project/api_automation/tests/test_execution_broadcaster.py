@@ -0,0 +1,69 @@
+"""
+执行进度节流广播测试用例
+验证进度合并、结果攒批、状态事件立即发送及后台刷新
+"""
+
+import threading
+import unittest
+from unittest.mock import Mock
+
+from api_automation.services.execution_broadcaster import ExecutionBroadcaster
+
+
+class TestExecutionBroadcaster(unittest.TestCase):
+    """节流广播器测试"""
+
+    def setUp(self):
+        self.service = Mock()
+        self.sent = []
+        self.service.broadcast_execution_progress.side_effect = (
+            lambda execution_id, **data: self.sent.append(('progress', data['current']))
+        )
+        self.service.broadcast_test_results.side_effect = (
+            lambda execution_id, results: self.sent.append(('results', len(results)))
+        )
+        self.service.broadcast_execution_status.side_effect = (
+            lambda execution_id, status, message=None: self.sent.append(('status', status))
+        )
+
+    def test_progress_merged_and_results_batched(self):
+        """多次进度只发送最新一条，结果按批大小拆分"""
+        broadcaster = ExecutionBroadcaster(1, self.service, max_batch_size=2)
+        for index in range(5):
+            broadcaster.test_result(test_case_id=index, result='PASSED')
+            broadcaster.progress(index + 1, 5)
+
+        self.assertEqual(self.sent, [])
+        broadcaster.flush()
+        self.assertEqual(self.sent, [('results', 2), ('results', 2), ('results', 1), ('progress', 5)])
+
+        broadcaster.flush()
+        self.assertEqual(len(self.sent), 4)
+
+    def test_status_flushes_pending_first(self):
+        """状态事件立即发送，且在此之前发送已缓冲的事件"""
+        broadcaster = ExecutionBroadcaster(1, self.service)
+        broadcaster.test_result(test_case_id=1, result='FAILED')
+        broadcaster.progress(1, 1)
+        broadcaster.status('COMPLETED', 'done')
+        self.assertEqual(self.sent, [('results', 1), ('progress', 1), ('status', 'COMPLETED')])
+
+    def test_background_flush(self):
+        """后台线程按频率刷新，关闭时发送剩余事件"""
+        flushed = threading.Event()
+        self.service.broadcast_execution_progress.side_effect = lambda *args, **kwargs: flushed.set()
+
+        broadcaster = ExecutionBroadcaster(1, self.service, messages_per_second=50).start()
+        try:
+            broadcaster.progress(1, 10)
+            self.assertTrue(flushed.wait(2))
+        finally:
+            broadcaster.close()
+
+        broadcaster.test_result(test_case_id=2, result='PASSED')
+        broadcaster.close()
+        self.assertEqual(self.service.broadcast_test_results.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+"""
+执行任务队列测试用例
+验证优先级领取、项目并发上限、租约回收与工作者执行
+"""
+
+import os
+import unittest
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api_automation.models import (
+    ApiExecutionJob,
+    ApiProject,
+    ApiTestCase,
+    ApiTestEnvironment,
+    ApiTestExecution,
+)
+from api_automation.services.cancellation import REASON_LEASE_LOST, cancellation_registry
+from api_automation.services.execution_queue import ExecutionQueue, ExecutionWorker, _Heartbeat
+from api_automation.services.http_executor import HttpExecutor, HttpResponse
+
+
+if os.environ.get('RUN_DJANGO_TESTS') != '1':
+    raise unittest.SkipTest('未开启 Django 集成测试开关')
+
+
+class TestExecutionQueue(TestCase):
+    """执行任务队列集成测试"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='queue', password='pass1234')
+        self.queue = ExecutionQueue(lease_seconds=600, project_concurrency=1, max_attempts=2)
+
+    def _project(self, name):
+        project = ApiProject.objects.create(name=name, owner=self.user)
+        environment = ApiTestEnvironment.objects.create(
+            name='环境', project=project, base_url='http://example.com',
+        )
+        test_case = ApiTestCase.objects.create(
+            name='用例', project=project, method='GET', url='/ping',
+        )
+        return project, environment, test_case
+
+    def _execution(self, project, environment, test_case, name='执行'):
+        return ApiTestExecution.objects.create(
+            name=name, project=project, environment=environment,
+            test_cases=[test_case.id], total_count=1, created_by=self.user,
+        )
+
+    def test_claim_by_priority_with_project_cap(self):
+        """按优先级领取，同一项目的并发数不超过上限"""
+        project_a, env_a, case_a = self._project('A')
+        project_b, env_b, case_b = self._project('B')
+        low = self.queue.enqueue(self._execution(project_a, env_a, case_a, 'low'), priority=0)
+        high = self.queue.enqueue(self._execution(project_a, env_a, case_a, 'high'), priority=5)
+        other = self.queue.enqueue(self._execution(project_b, env_b, case_b, 'other'), priority=1)
+
+        self.assertEqual(self.queue.claim('w1').pk, high.pk)
+        # 项目 A 已达上限，跳过更早入队的 low
+        self.assertEqual(self.queue.claim('w2').pk, other.pk)
+        self.assertIsNone(self.queue.claim('w3'))
+
+        self.assertTrue(self.queue.complete(high, 'w1'))
+        self.assertEqual(self.queue.claim('w3').pk, low.pk)
+
+    def test_recover_expired_leases(self):
+        """租约过期的任务重新入队，超过最大尝试次数后标记失败"""
+        project, environment, test_case = self._project('A')
+        execution = self._execution(project, environment, test_case)
+        job = self.queue.enqueue(execution)
+
+        for attempt in range(2):
+            claimed = self.queue.claim(f'w{attempt}')
+            self.assertEqual(claimed.attempts, attempt + 1)
+            ApiExecutionJob.objects.filter(pk=job.pk).update(
+                lease_expires_at=timezone.now() - timedelta(seconds=1)
+            )
+            self.assertFalse(self.queue.heartbeat(claimed, 'someone-else'))
+            self.assertEqual(self.queue.recover_expired(), 1)
+
+        job.refresh_from_db()
+        execution.refresh_from_db()
+        self.assertEqual(job.status, 'FAILED')
+        self.assertEqual(execution.status, 'FAILED')
+
+    def test_worker_runs_execution(self):
+        """工作者领取任务并执行批量测试"""
+        project, environment, test_case = self._project('A')
+        execution = self._execution(project, environment, test_case)
+        job = self.queue.enqueue(execution)
+
+        response = HttpResponse()
+        response.status_code = 200
+        worker = ExecutionWorker(queue=self.queue, threads=1)
+        with patch.object(HttpExecutor, 'execute_request', return_value=response):
+            self.assertTrue(worker.run_once('w1'))
+        self.assertFalse(worker.run_once('w1'))
+
+        job.refresh_from_db()
+        execution.refresh_from_db()
+        self.assertEqual(job.status, 'SUCCEEDED')
+        self.assertEqual(execution.status, 'COMPLETED')
+        self.assertEqual(execution.passed_count, 1)
+
+    def test_lost_lease_cancels_running_execution(self):
+        """续约失败时取消本进程内的执行令牌"""
+        queue = Mock(lease_seconds=0)
+        queue.heartbeat.return_value = False
+        job = Mock(pk=1, execution_id=987654)
+        token = cancellation_registry.register(job.execution_id)
+        try:
+            with _Heartbeat(queue, job, 'w1'):
+                self.assertTrue(token.wait(5))
+        finally:
+            cancellation_registry.unregister(job.execution_id)
+        self.assertEqual(token.reason, REASON_LEASE_LOST)
+
+    def test_abandoned_execution_keeps_state_for_next_attempt(self):
+        """失去租约的执行停止后不写入结果，也不覆盖执行状态"""
+        project, environment, test_case = self._project('A')
+        execution = self._execution(project, environment, test_case)
+        job = self.queue.enqueue(execution)
+
+        response = HttpResponse()
+        response.status_code = 200
+
+        def lose_lease(*args, **kwargs):
+            cancellation_registry.cancel(execution.id, reason=REASON_LEASE_LOST)
+            return response
+
+        worker = ExecutionWorker(queue=self.queue, threads=1)
+        with patch.object(HttpExecutor, 'execute_request', side_effect=lose_lease):
+            self.assertTrue(worker.run_once('w1'))
+
+        execution.refresh_from_db()
+        self.assertNotEqual(execution.status, 'CANCELLED')
+        self.assertFalse(execution.test_results.exists())
+
+    def test_execute_endpoint_enqueues(self):
+        """执行接口只入队并返回 202"""
+        project, environment, test_case = self._project('A')
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        with self.settings(API_EXECUTION_QUEUE_ENABLED=True):
+            response = client.post(
+                f'/api/v1/api-automation/projects/{project.id}/execute/',
+                {'environment_id': environment.id, 'priority': 3}, format='json',
+            )
+
+        self.assertEqual(response.status_code, 202)
+        job = ApiExecutionJob.objects.get(execution_id=response.data['id'])
+        self.assertEqual(job.priority, 3)
+        self.assertEqual(job.execution.status, 'PENDING')
+
+    def test_enqueue_failure_rolls_back_execution(self):
+        """入队失败时不遗留没有队列任务的 PENDING 执行"""
+        project, environment, test_case = self._project('A')
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        with self.settings(API_EXECUTION_QUEUE_ENABLED=True), \
+                patch('api_automation.views.execution_queue.enqueue', side_effect=RuntimeError('boom')):
+            response = client.post(
+                f'/api/v1/api-automation/projects/{project.id}/execute/',
+                {'environment_id': environment.id}, format='json',
+            )
+
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(ApiTestExecution.objects.filter(project=project).exists())
+
+    def test_run_test_stays_synchronous(self):
+        """单用例调试接口即使开启队列也同步执行并返回结果"""
+        project, environment, test_case = self._project('A')
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+        http_response = HttpResponse()
+        http_response.status_code = 200
+        http_response.body = {}
+
+        with self.settings(API_EXECUTION_QUEUE_ENABLED=True), \
+                patch.object(HttpExecutor, 'execute_request', return_value=http_response):
+            response = client.post(
+                f'/api/v1/api-automation/test-cases/{test_case.id}/run_test/',
+                {'environment_id': environment.id}, format='json',
+            )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['status'], 'COMPLETED')
+        self.assertFalse(ApiExecutionJob.objects.exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+"""
+执行列表与执行结果子接口测试用例
+验证列表不加载测试结果、精简模式只输出状态与计数、结果子接口默认不读取大字段，
+以及分页、显式 include 与 NDJSON 流式输出
+"""
+
+import json
+import os
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api_automation.models import (
+    ApiProject,
+    ApiTestCase,
+    ApiTestEnvironment,
+    ApiTestExecution,
+    ApiTestResult,
+)
+from api_automation.services.blob_store import BlobStore
+from api_automation.views import ApiTestExecutionViewSet
+
+
+if os.environ.get('RUN_DJANGO_TESTS') != '1':
+    raise unittest.SkipTest('未开启 Django 集成测试开关')
+
+
+class TestExecutionResultsApi(TestCase):
+    """执行结果接口集成测试"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='runner', password='pass1234')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.project = ApiProject.objects.create(name='执行项目', owner=self.user)
+        self.environment = ApiTestEnvironment.objects.create(
+            name='环境', project=self.project, base_url='http://example.com',
+        )
+        self.test_case = ApiTestCase.objects.create(
+            name='用例', project=self.project, method='GET', url='/a',
+        )
+        self.base_time = timezone.now() - timedelta(hours=1)
+
+    def _create_execution(self, statuses):
+        execution = ApiTestExecution.objects.create(
+            name='执行', project=self.project, environment=self.environment,
+            status='COMPLETED', total_count=len(statuses),
+            passed_count=statuses.count('PASSED'),
+        )
+        ApiTestResult.objects.bulk_create([
+            ApiTestResult(
+                execution=execution, test_case=self.test_case, status=result_status,
+                start_time=self.base_time + timedelta(seconds=index),
+                request_full={'url': '/a', 'headers': {'X-Big': 'x' * 100}},
+                response_full={'status_code': 200},
+                assertion_results=[{'passed': result_status == 'PASSED'}],
+            )
+            for index, result_status in enumerate(statuses)
+        ])
+        return execution
+
+    def test_list_does_not_load_results(self):
+        """执行列表不查询测试结果表，精简模式只输出状态与计数"""
+        self._create_execution(['PASSED'] * 5)
+        self._create_execution(['FAILED'] * 5)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/v1/api-automation/executions/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 2)
+        self.assertFalse(
+            any('api_test_results' in query['sql'] for query in queries.captured_queries)
+        )
+
+        response = self.client.get('/api/v1/api-automation/executions/', {'lean': 'true'})
+        item = response.data['results'][0]
+        self.assertEqual(item['total_count'], 5)
+        self.assertEqual(item['environment_name'], '环境')
+        self.assertNotIn('test_cases', item)
+        self.assertNotIn('description', item)
+
+    def test_results_defer_heavy_fields(self):
+        """结果子接口默认不读取大字段，include 显式请求时才输出"""
+        execution = self._create_execution(['PASSED', 'FAILED', 'PASSED'])
+        path = f'/api/v1/api-automation/executions/{execution.id}/results/'
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+        self.assertNotIn('request_full', response.data['results'][0])
+        results_sql = [
+            query['sql'] for query in queries.captured_queries
+            if 'FROM "api_test_results"' in query['sql'] and 'COUNT' not in query['sql']
+        ]
+        self.assertEqual(len(results_sql), 1)
+        self.assertNotIn('request_full', results_sql[0])
+        self.assertNotIn('assertion_results', results_sql[0])
+
+        response = self.client.get(path, {'include': 'assertion_results,request_full,unknown'})
+        item = response.data['results'][0]
+        self.assertIn('assertion_results', item)
+        self.assertEqual(item['request_full']['url'], '/a')
+        self.assertNotIn('response_full', item)
+        self.assertNotIn('unknown', item)
+
+        response = self.client.get(path, {'status': 'FAILED'})
+        self.assertEqual(response.data['count'], 1)
+
+    def test_results_cursor_and_stream(self):
+        """结果子接口支持键集分页与 NDJSON 流式输出"""
+        execution = self._create_execution(['PASSED'] * 5)
+        path = f'/api/v1/api-automation/executions/{execution.id}/results/'
+
+        ids, cursor = [], ''
+        while True:
+            response = self.client.get(path, {'cursor': cursor, 'page_size': 2})
+            ids.extend(item['id'] for item in response.data['results'])
+            cursor = response.data['next_cursor']
+            if not cursor:
+                break
+        expected = list(
+            execution.test_results.order_by('-start_time', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+        response = self.client.get(path, {'stream': 'true'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = b''.join(response.streaming_content).decode('utf-8').splitlines()
+        self.assertEqual([json.loads(line)['id'] for line in lines], list(reversed(expected)))
+
+    def test_stream_reads_keyset_batches(self):
+        """流式输出按 (start_time, id) 键集分批查询，同一时间的多行不丢不重"""
+        execution = self._create_execution(['PASSED'] * 5)
+        execution.test_results.filter(
+            id__in=list(execution.test_results.order_by('id').values_list('id', flat=True)[1:4])
+        ).update(start_time=self.base_time)
+        expected = list(
+            execution.test_results.order_by('start_time', 'id').values_list('id', flat=True)
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            lines = list(ApiTestExecutionViewSet._stream_results(
+                execution.test_results.all(), {'include': []}, chunk_size=2,
+            ))
+        self.assertEqual([json.loads(line)['id'] for line in lines], expected)
+        results_sql = [
+            query['sql'] for query in queries.captured_queries if 'FROM "api_test_results"' in query['sql']
+        ]
+        self.assertEqual(len(results_sql), 3)
+        self.assertTrue(all('LIMIT 2' in sql for sql in results_sql))
+
+    def test_results_prefetch_full_bodies(self):
+        """请求完整请求/响应体时，每页及每个流式分块只查询一次内容存储"""
+        execution = self._create_execution(['FAILED'] * 3)
+        writer = BlobStore()
+        for index, result in enumerate(execution.test_results.order_by('start_time')):
+            result.request_body_hash = writer.put_json({'id': index})
+            result.response_body_hash = writer.put_json({'error': index})
+            result.save(update_fields=['request_body_hash', 'response_body_hash'])
+        path = f'/api/v1/api-automation/executions/{execution.id}/results/'
+
+        for extra in ({}, {'stream': 'true'}):
+            store = BlobStore()
+            with patch('api_automation.serializers.blob_store', store), \
+                    patch('api_automation.services.result_storage_service.blob_store', store), \
+                    CaptureQueriesContext(connection) as queries:
+                response = self.client.get(path, {'include': 'request_full,response_full', **extra})
+                if extra:
+                    items = [
+                        json.loads(line)
+                        for line in b''.join(response.streaming_content).decode('utf-8').splitlines()
+                    ]
+                else:
+                    items = list(reversed(response.data['results']))
+
+            blob_queries = [
+                query for query in queries.captured_queries if 'api_content_blobs' in query['sql']
+            ]
+            self.assertEqual(len(blob_queries), 1)
+            self.assertEqual([item['request_full']['body'] for item in items], [{'id': i} for i in range(3)])
+            self.assertEqual(items[2]['response_full']['body'], {'error': 2})
+
+    def test_retrieve_still_nests_results(self):
+        """详情接口仍返回嵌套的测试结果"""
+        execution = self._create_execution(['PASSED', 'FAILED'])
+        response = self.client.get(f'/api/v1/api-automation/executions/{execution.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['test_results']), 2)
+        self.assertEqual(response.data['test_results'][0]['test_case_name'], '用例')
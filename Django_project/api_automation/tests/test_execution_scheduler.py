@@ -0,0 +1,237 @@
+"""
+依赖感知并发调度器测试用例
+验证依赖图构建与并发调度的执行顺序
+"""
+
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from api_automation.services.cancellation import CancellationRegistry, CancellationToken
+from api_automation.services.execution_scheduler import DependencyScheduler
+
+
+def _make_case(case_id, url='/api', headers=None, body=None, extractions=None):
+    """构造带有提取配置的模拟测试用例，extractions 为 (变量名, 作用域[, 是否启用]) 列表"""
+    manager = Mock()
+    manager.all.return_value = [
+        SimpleNamespace(
+            variable_name=item[0],
+            variable_scope=item[1],
+            is_enabled=item[2] if len(item) > 2 else True,
+        )
+        for item in extractions or []
+    ]
+    return SimpleNamespace(
+        id=case_id,
+        url=url,
+        headers=headers or {},
+        params={},
+        body=body or {},
+        extractions=manager,
+    )
+
+
+class TestDependencyGraph(unittest.TestCase):
+    """依赖图构建测试"""
+
+    def setUp(self):
+        self.scheduler = DependencyScheduler(max_workers=4)
+
+    def test_collect_references(self):
+        """识别请求定义中的 shared/global 引用，忽略 env 作用域"""
+        case = _make_case(
+            1,
+            url='/users/${shared.user_id}',
+            headers={'Authorization': 'Bearer ${global.token}'},
+            body={'items': [{'ref': '${env.base_url}'}]},
+        )
+        self.assertEqual(
+            self.scheduler.collect_references(case),
+            {('shared', 'user_id'), ('global', 'token')},
+        )
+
+    def test_collect_productions_uses_prefetched_extractions(self):
+        """从 all() 读取提取规则（复用预取结果），跳过未启用的规则"""
+        case = _make_case(1, extractions=[('token', 'global'), ('id', 'local'), ('old', 'local', False)])
+        self.assertEqual(
+            self.scheduler.collect_productions(case),
+            {('global', 'token'), ('shared', 'id')},
+        )
+        case.extractions.filter.assert_not_called()
+
+    def test_consumer_depends_on_producer(self):
+        """消费者依赖于之前最近的生产者，独立用例无依赖"""
+        cases = [
+            _make_case(1, extractions=[('token', 'global')]),
+            _make_case(2, url='/health'),
+            _make_case(3, headers={'Authorization': '${global.token}'}),
+        ]
+        dependencies = self.scheduler.build_dependencies(cases)
+        self.assertEqual(dependencies, {0: set(), 1: set(), 2: {0}})
+
+    def test_rewrite_waits_for_previous_readers(self):
+        """重新写入同名变量时需等待之前的读取者完成"""
+        cases = [
+            _make_case(1, extractions=[('id', 'local')]),
+            _make_case(2, url='/items/${shared.id}'),
+            _make_case(3, extractions=[('id', 'local')]),
+            _make_case(4, url='/items/${shared.id}'),
+        ]
+        dependencies = self.scheduler.build_dependencies(cases)
+        self.assertEqual(dependencies[1], {0})
+        self.assertEqual(dependencies[2], {0, 1})
+        self.assertEqual(dependencies[3], {2})
+
+
+class TestDependencyScheduling(unittest.TestCase):
+    """并发调度测试"""
+
+    def test_sequential_mode_keeps_order(self):
+        """max_workers=1 时按列表顺序执行"""
+        cases = [_make_case(i) for i in range(5)]
+        executed = []
+        DependencyScheduler(max_workers=1).run(
+            cases, lambda index, case: executed.append(index)
+        )
+        self.assertEqual(executed, [0, 1, 2, 3, 4])
+
+    def test_parallel_mode_respects_dependencies(self):
+        """并发模式下独立用例并行，依赖用例在生产者完成后执行"""
+        cases = [
+            _make_case(1, extractions=[('token', 'global')]),
+            _make_case(2),
+            _make_case(3),
+            _make_case(4, url='/me?token=${global.token}'),
+        ]
+        started = {}
+        finished = {}
+        active = []
+        peak = [0]
+        lock = threading.Lock()
+
+        def worker(index, case):
+            with lock:
+                started[index] = time.monotonic()
+                active.append(index)
+                peak[0] = max(peak[0], len(active))
+            time.sleep(0.05)
+            with lock:
+                active.remove(index)
+                finished[index] = time.monotonic()
+
+        DependencyScheduler(max_workers=4).run(cases, worker)
+
+        self.assertEqual(set(finished), {0, 1, 2, 3})
+        self.assertGreaterEqual(peak[0], 2)
+        self.assertGreaterEqual(started[3], finished[0])
+
+    def test_worker_exception_does_not_block_dependents(self):
+        """单个用例异常时其后继用例仍被调度"""
+        cases = [
+            _make_case(1, extractions=[('token', 'global')]),
+            _make_case(2, url='/me?token=${global.token}'),
+        ]
+        executed = []
+
+        def worker(index, case):
+            executed.append(index)
+            if index == 0:
+                raise RuntimeError('boom')
+
+        DependencyScheduler(max_workers=2).run(cases, worker)
+        self.assertEqual(executed, [0, 1])
+
+    def test_worker_connections_closed_once_per_thread(self):
+        """数据库连接在用例之间复用，调度结束时每个工作线程各关闭一次"""
+        task_threads = set()
+        closed_threads = []
+        lock = threading.Lock()
+
+        def worker(index, case):
+            time.sleep(0.01)
+            with lock:
+                task_threads.add(threading.get_ident())
+
+        def close_all():
+            with lock:
+                closed_threads.append(threading.get_ident())
+
+        with patch('api_automation.services.execution_scheduler.connections') as connections:
+            connections.close_all.side_effect = close_all
+            DependencyScheduler(max_workers=3).run([_make_case(i) for i in range(12)], worker)
+
+        self.assertEqual(len(closed_threads), 3)
+        self.assertEqual(len(set(closed_threads)), 3)
+        self.assertLessEqual(task_threads, set(closed_threads))
+        self.assertNotIn(threading.get_ident(), closed_threads)
+
+    def test_cancel_stops_sequential_scheduling(self):
+        """顺序模式下取消后不再执行剩余用例"""
+        token = CancellationToken()
+        executed = []
+
+        def worker(index, case):
+            executed.append(index)
+            if index == 1:
+                token.cancel()
+
+        DependencyScheduler(max_workers=1).run(
+            [_make_case(i) for i in range(5)], worker, cancel_token=token
+        )
+        self.assertEqual(executed, [0, 1])
+
+    def test_cancel_stops_parallel_scheduling(self):
+        """并发模式下取消后不再提交后继用例"""
+        token = CancellationToken()
+        cases = [
+            _make_case(1, extractions=[('token', 'global')]),
+            _make_case(2, url='/me?token=${global.token}'),
+            _make_case(3, url='/again?token=${global.token}'),
+        ]
+        executed = []
+
+        def worker(index, case):
+            executed.append(index)
+            token.cancel()
+
+        DependencyScheduler(max_workers=2).run(cases, worker, cancel_token=token)
+        self.assertEqual(executed, [0])
+
+
+class TestCancellation(unittest.TestCase):
+    """取消标志与注册表测试"""
+
+    def test_token_callbacks(self):
+        """取消时触发回调，已移除的回调不再触发，取消后注册的回调立即执行"""
+        token = CancellationToken()
+        calls = []
+        token.add_callback(lambda: calls.append('a'))
+        removed = lambda: calls.append('removed')  # noqa: E731
+        token.add_callback(removed)
+        token.remove_callback(removed)
+
+        token.cancel()
+        token.cancel()
+        token.add_callback(lambda: calls.append('late'))
+
+        self.assertTrue(token.is_cancelled)
+        self.assertEqual(calls, ['a', 'late'])
+
+    def test_registry_cancel(self):
+        """只能取消本进程内已登记的执行"""
+        registry = CancellationRegistry(poll_interval=0)
+        token = registry.register(7)
+        self.assertIs(registry.register(7), token)
+        self.assertFalse(registry.cancel(8))
+        self.assertTrue(registry.cancel(7))
+        self.assertTrue(token.is_cancelled)
+
+        registry.unregister(7)
+        self.assertIsNone(registry.get(7))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,180 @@
+"""
+HTTP执行器批量端点测试用例
+验证并发执行时的结果顺序、会话隔离和耗时统计
+"""
+
+import json
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, Mock, patch
+
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from api_automation.http_executor import execute_batch_requests
+from api_automation.services.async_http_executor import ASYNC_HTTP_ENABLED
+from api_automation.services.connection_pool_registry import connection_pool_registry
+from api_automation.services.http_executor import HttpExecutor, HttpResponse
+
+
+def _fake_execute(self, method, url, **kwargs):
+    """按URL中的序号倒序延迟返回，模拟乱序完成的并发请求"""
+    index = int(url.rsplit('/', 1)[-1])
+    time.sleep(0.01 * (5 - index))
+    if index == 3:
+        raise RuntimeError('broken')
+    response = HttpResponse()
+    response.status_code = 200
+    response.body = {'index': index, 'thread': threading.current_thread().name}
+    return response
+
+
+class TestBatchEndpoint(unittest.TestCase):
+    """批量执行端点测试"""
+
+    def _post(self, payload):
+        request = APIRequestFactory().post('/batch/', payload, format='json')
+        force_authenticate(request, user=Mock(is_authenticated=True))
+        return execute_batch_requests(request)
+
+    @override_settings(API_HTTP_BATCH_ASYNC_ENABLED=False)
+    @patch.object(HttpExecutor, 'execute_request', _fake_execute)
+    def test_concurrent_results_keep_order(self):
+        """并发执行时结果按输入顺序返回，失败条目保持原有信封结构"""
+        payload = {
+            'concurrency': 4,
+            'requests': [
+                {'method': 'GET', 'url': f'https://api.example.com/items/{i}'}
+                for i in range(5)
+            ],
+        }
+        data = self._post(payload).data['data']
+
+        self.assertEqual(data['concurrency'], 4)
+        self.assertEqual([r['index'] for r in data['results']], [0, 1, 2, 3, 4])
+        self.assertEqual(data['success_count'], 4)
+        self.assertEqual(
+            data['results'][3], {'index': 3, 'success': False, 'error': 'broken'}
+        )
+        self.assertEqual(data['results'][0]['data']['body']['index'], 0)
+        self.assertIn('execution_time', data['results'][0]['data'])
+        threads = {r['data']['body']['thread'] for r in data['results'] if r['success']}
+        self.assertGreater(len(threads), 1)
+
+    @patch.object(HttpExecutor, 'execute_request', _fake_execute)
+    def test_concurrency_is_bounded(self):
+        """并发数限制在配置上限内，非法值退化为顺序执行"""
+        with override_settings(API_HTTP_BATCH_MAX_CONCURRENCY=2):
+            data = self._post({'concurrency': 50, 'requests': []}).data['data']
+            self.assertEqual(data['concurrency'], 2)
+        data = self._post({'concurrency': 'abc', 'requests': []}).data['data']
+        self.assertEqual(data['concurrency'], 1)
+
+    @patch('api_automation.http_executor.ASYNC_HTTP_ENABLED', True)
+    def test_async_path_selection(self):
+        """设置一致且无代理时走异步执行器，否则回退到线程池"""
+        requests_data = [
+            {'method': 'GET', 'url': f'https://api.example.com/items/{i}',
+             'settings': {'timeout': 5}}
+            for i in range(2)
+        ]
+        async_results = [
+            {'index': i, 'success': True, 'data': {}} for i in range(2)
+        ]
+        with patch('api_automation.http_executor._execute_batch_async',
+                   AsyncMock(return_value=async_results)) as run_async, \
+                patch('api_automation.http_executor.execute_single_request',
+                      return_value={}) as run_sync:
+            data = self._post({'concurrency': 2, 'requests': requests_data}).data['data']
+            self.assertEqual(data['results'], async_results)
+            run_async.assert_awaited_once_with(requests_data, 2, 5, True)
+            self.assertFalse(run_sync.called)
+
+            requests_data[1]['settings'] = {'timeout': 5, 'proxy': 'http://proxy:8080'}
+            self._post({'concurrency': 2, 'requests': requests_data})
+            with override_settings(API_HTTP_BATCH_ASYNC_ENABLED=False):
+                self._post({'concurrency': 2, 'requests': requests_data[:1] * 2})
+            self.assertEqual(run_async.await_count, 1)
+            self.assertEqual(run_sync.call_count, 4)
+
+
+class _CookieHandler(BaseHTTPRequestHandler):
+    """/login 下发 Cookie，其余路径回显请求携带的 Cookie"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = json.dumps({'cookie': self.headers.get('Cookie', '')}).encode('utf-8')
+        self.send_response(200)
+        if self.path == '/login':
+            self.send_header('Set-Cookie', 'sid=secret; Path=/')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestBatchSessionIsolation(unittest.TestCase):
+    """批量执行的会话隔离测试（本地 HTTP 服务）"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _CookieHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    def _post(self, payload):
+        request = APIRequestFactory().post('/batch/', payload, format='json')
+        force_authenticate(request, user=Mock(is_authenticated=True))
+        return execute_batch_requests(request)
+
+    @override_settings(API_HTTP_BATCH_ASYNC_ENABLED=False)
+    def test_cookie_not_shared_between_items(self):
+        """前一条请求收到的 Set-Cookie 不会被后续请求携带，连接池仍然共享"""
+        hits_before = connection_pool_registry.get_stats()['pool_hits']
+        for concurrency in (1, 2):
+            payload = {
+                'concurrency': concurrency,
+                'requests': [
+                    {'method': 'GET', 'url': f'{self.base_url}/login'},
+                    {'method': 'GET', 'url': f'{self.base_url}/profile'},
+                    {'method': 'GET', 'url': f'{self.base_url}/profile'},
+                ],
+            }
+            results = self._post(payload).data['data']['results']
+
+            self.assertTrue(all(r['success'] for r in results))
+            self.assertEqual(results[0]['data']['status_code'], 200)
+            self.assertEqual(results[1]['data']['body'], {'cookie': ''})
+            self.assertEqual(results[2]['data']['body'], {'cookie': ''})
+        self.assertGreater(connection_pool_registry.get_stats()['pool_hits'], hits_before)
+
+    @unittest.skipUnless(ASYNC_HTTP_ENABLED, 'httpx未安装')
+    def test_async_cookie_not_shared_between_items(self):
+        """异步执行路径同样为每条请求使用独立的 Cookie"""
+        payload = {
+            'concurrency': 2,
+            'requests': [
+                {'method': 'GET', 'url': f'{self.base_url}/login'},
+                {'method': 'GET', 'url': f'{self.base_url}/profile'},
+                {'method': 'GET', 'url': f'{self.base_url}/profile'},
+            ],
+        }
+        with patch('api_automation.http_executor.execute_single_request') as run_sync:
+            results = self._post(payload).data['data']['results']
+
+        self.assertFalse(run_sync.called)
+        self.assertTrue(all(r['success'] for r in results))
+        self.assertEqual(results[0]['data']['status_code'], 200)
+        self.assertEqual(results[1]['data']['body'], {'cookie': ''})
+        self.assertEqual(results[2]['data']['body'], {'cookie': ''})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+自定义 JSONField 测试用例
+验证模型属性的延迟解析、未访问字段原样写回、defer 预设与 values() 行为
+"""
+
+import os
+import unittest
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from api_automation.models import (
+    ApiProject,
+    ApiTestCase,
+    JSONField,
+    RawJSON,
+)
+
+
+if os.environ.get('RUN_DJANGO_TESTS') != '1':
+    raise unittest.SkipTest('未开启 Django 集成测试开关')
+
+
+class TestLazyJSONField(TestCase):
+    """JSONField 延迟解析集成测试"""
+
+    def setUp(self):
+        self.project = ApiProject.objects.create(name='JSON项目')
+        self.test_case = ApiTestCase.objects.create(
+            name='用例', project=self.project, method='POST', url='/a',
+            headers={'Content-Type': 'application/json'}, body={'名称': '值'},
+        )
+
+    def test_value_is_parsed_on_first_access(self):
+        """查询结果保留原始文本，首次访问属性时解析并缓存"""
+        test_case = ApiTestCase.objects.get(pk=self.test_case.pk)
+        self.assertIs(type(test_case.__dict__['headers']), RawJSON)
+
+        self.assertEqual(test_case.headers, {'Content-Type': 'application/json'})
+        self.assertIsInstance(test_case.__dict__['headers'], dict)
+        self.assertIs(test_case.headers, test_case.headers)
+        self.assertIs(type(test_case.__dict__['body']), RawJSON)
+
+    def test_save_writes_untouched_text_back(self):
+        """未访问的字段保存时原样写回，修改过的字段重新序列化"""
+        ApiTestCase.objects.filter(pk=self.test_case.pk).update(params=RawJSON('{"a":  1}'))
+        test_case = ApiTestCase.objects.get(pk=self.test_case.pk)
+        test_case.body = {'changed': True}
+        test_case.save()
+
+        row = ApiTestCase.objects.filter(pk=self.test_case.pk).values('params', 'body').get()
+        self.assertEqual(row['params'], '{"a":  1}')
+        self.assertIs(type(row['params']), RawJSON)
+        self.assertEqual(JSONField.parse(row['body']), {'changed': True})
+
+    def test_invalid_json(self):
+        """非法 JSON 原样返回字符串"""
+        ApiTestCase.objects.filter(pk=self.test_case.pk).update(body=RawJSON('not json'))
+        test_case = ApiTestCase.objects.get(pk=self.test_case.pk)
+        self.assertEqual(test_case.body, 'not json')
+        self.assertIs(type(test_case.body), str)
+
+    def test_list_deferred_fields_load_on_access(self):
+        """defer 预设的字段不随列表查询读取，访问时再单独加载"""
+        test_case = ApiTestCase.objects.defer(*ApiTestCase.LIST_DEFERRED_FIELDS).get(
+            pk=self.test_case.pk
+        )
+        self.assertNotIn('body', test_case.__dict__)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(test_case.body, {'名称': '值'})
+        self.assertEqual(len(queries), 1)
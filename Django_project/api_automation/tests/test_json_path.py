@@ -0,0 +1,103 @@
+"""
+JSONPath 编译器测试用例
+覆盖基础导航、通配符、切片、递归下降、过滤表达式及两个引擎的集成
+"""
+
+import unittest
+from types import SimpleNamespace
+
+from api_automation.services.assertion_engine import AssertionEngine
+from api_automation.services.extraction_engine import ExtractionEngine
+from api_automation.services.json_path import (
+    JsonPathError, compile_json_path, evaluate_json_path,
+)
+
+DATA = {
+    'data': {
+        'users': [
+            {'id': 1, 'name': 'Ann', 'age': 20, 'active': True},
+            {'id': 2, 'name': 'bob', 'age': 15, 'active': False, 'email': 'b@x.com'},
+            {'id': 3, 'name': 'Al', 'age': 30, 'active': True},
+        ],
+        'total': 3,
+    },
+    'first name': 'Zed',
+}
+
+
+class TestJsonPathSyntax(unittest.TestCase):
+    """JSONPath 语法测试"""
+
+    def test_definite_paths(self):
+        """确定路径返回单个值，兼容省略 $ 前缀的写法"""
+        self.assertEqual(evaluate_json_path(DATA, '$.data.users[0].name'), 'Ann')
+        self.assertEqual(evaluate_json_path(DATA, 'data.users[-1].id'), 3)
+        self.assertEqual(evaluate_json_path(DATA, 'data.users.1.id'), 2)
+        self.assertEqual(evaluate_json_path(DATA, "$['first name']"), 'Zed')
+        self.assertIsNone(evaluate_json_path(DATA, '$.data.missing.key'))
+        self.assertIsNone(evaluate_json_path(DATA, '$.data.users[10]'))
+
+    def test_wildcard_slice_union(self):
+        """通配符、切片和并集返回匹配值列表"""
+        self.assertEqual(evaluate_json_path(DATA, '$.data.users[*].id'), [1, 2, 3])
+        self.assertEqual(evaluate_json_path(DATA, '$.data.users[0:2].name'), ['Ann', 'bob'])
+        self.assertEqual(evaluate_json_path(DATA, '$.data.users[::2].id'), [1, 3])
+        self.assertEqual(evaluate_json_path(DATA, '$.data.users[-1:].id'), [3])
+        self.assertEqual(evaluate_json_path(DATA, "$.data.users[0]['id','name']"), [1, 'Ann'])
+
+    def test_recursive_descent(self):
+        """递归下降查找所有层级的字段"""
+        self.assertEqual(evaluate_json_path(DATA, '$..id'), [1, 2, 3])
+        self.assertEqual(evaluate_json_path(DATA, '$..users[1].name'), ['bob'])
+        self.assertIsNone(evaluate_json_path(DATA, '$..nothing'))
+
+    def test_filter_predicates(self):
+        """过滤表达式支持比较、逻辑运算、存在性和正则匹配"""
+        cases = {
+            '$.data.users[?(@.age >= 18 && @.active == true)].id': [1, 3],
+            '$.data.users[?(@.age < 18 || @.name == "Al")].id': [2, 3],
+            '$.data.users[?(@.email)].id': [2],
+            '$.data.users[?(!(@.age < 18))].id': [1, 3],
+            '$.data.users[?(@.name =~ /^a/i)].id': [1, 3],
+            '$.data.users[?(@.id == $.data.total)].name': ['Al'],
+        }
+        for path, expected in cases.items():
+            with self.subTest(path=path):
+                self.assertEqual(evaluate_json_path(DATA, path), expected)
+
+    def test_compile_is_cached_and_validates(self):
+        """相同表达式复用编译结果，非法表达式抛出 JsonPathError"""
+        self.assertIs(compile_json_path('$.a.b'), compile_json_path('$.a.b'))
+        for path in ('$.a[', '$.users[?(@.age >)]', '$.a[1:2:0]'):
+            with self.subTest(path=path):
+                with self.assertRaises(JsonPathError):
+                    compile_json_path(path)
+
+
+class TestEngineIntegration(unittest.TestCase):
+    """断言引擎与提取引擎使用共享编译器"""
+
+    def test_assertion_engine_json_value(self):
+        """json_value 断言支持过滤表达式"""
+        response = SimpleNamespace(status_code=200, headers={}, response_time=10)
+        results, passed = AssertionEngine().evaluate_assertions(
+            [{
+                'type': 'json_value',
+                'json_path': '$.data.users[?(@.active == true)].id',
+                'operator': 'equals',
+                'expected': [1, 3],
+            }],
+            response, DATA,
+        )
+        self.assertTrue(passed, results[0].message)
+
+    def test_extraction_engine_json_path(self):
+        """json_path 提取支持递归下降，非法表达式返回 None"""
+        engine = ExtractionEngine()
+        self.assertEqual(engine._extract_json_path(DATA, '$..users[0].name'), ['Ann'])
+        self.assertEqual(engine._extract_json_path('{"a": {"b": 1}}', '$.a.b'), 1)
+        self.assertIsNone(engine._extract_json_path(DATA, '$.data['))
+
+
+if __name__ == '__main__':
+    unittest.main()
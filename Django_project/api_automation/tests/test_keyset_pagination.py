@@ -0,0 +1,154 @@
+"""
+键集分页测试用例
+验证执行记录、测试结果和仪表盘结果列表的游标分页：时间相同时不重复不遗漏、
+保留筛选条件、每页查询次数与翻页深度无关
+"""
+
+import os
+import unittest
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api_automation.models import (
+    ApiHttpExecutionRecord,
+    ApiProject,
+    ApiTestCase,
+    ApiTestEnvironment,
+    ApiTestExecution,
+    ApiTestResult,
+)
+from api_automation.pagination import KeysetPagination
+from api_automation.services.dashboard_cache import dashboard_cache
+
+
+if os.environ.get('RUN_DJANGO_TESTS') != '1':
+    raise unittest.SkipTest('未开启 Django 集成测试开关')
+
+
+class TestKeysetPagination(TestCase):
+    """键集分页集成测试"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='scroller', password='pass1234')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.project = ApiProject.objects.create(name='分页项目', owner=self.user)
+        self.other_project = ApiProject.objects.create(name='其他项目', owner=self.user)
+        self.base_time = timezone.now() - timedelta(days=1)
+
+        patcher = patch.object(dashboard_cache, 'enabled', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _scroll(self, path, params):
+        """按游标翻完所有页，返回 (ID 列表, 每页查询次数列表)"""
+        ids, query_counts = [], []
+        cursor = ''
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(path, {**params, 'cursor': cursor})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('count', response.data)
+            query_counts.append(len(queries))
+            ids.extend(item['id'] for item in response.data['results'])
+            cursor = response.data['next_cursor']
+            if not cursor:
+                return ids, query_counts
+
+    def _create_records(self, project, minutes_list):
+        records = []
+        for minutes in minutes_list:
+            record = ApiHttpExecutionRecord.objects.create(
+                project=project, request_method='GET', request_url='/a',
+                request_time=timezone.now(),
+            )
+            ApiHttpExecutionRecord.objects.filter(pk=record.pk).update(
+                created_time=self.base_time + timedelta(minutes=minutes)
+            )
+            records.append(record)
+        return records
+
+    def test_http_records_cursor_pages(self):
+        """执行记录按 (created_time, id) 倒序翻页，时间相同的记录不重复不遗漏"""
+        records = self._create_records(self.project, [1, 2, 2, 2, 2, 3, 4])
+        self._create_records(self.other_project, [2, 5])
+
+        ids, query_counts = self._scroll(
+            '/api/v1/api-automation/http-execution-records/',
+            {'project': self.project.id, 'page_size': 2},
+        )
+
+        expected = sorted(
+            records,
+            key=lambda record: (
+                ApiHttpExecutionRecord.objects.get(pk=record.pk).created_time, record.pk
+            ),
+            reverse=True,
+        )
+        self.assertEqual(ids, [record.pk for record in expected])
+        self.assertEqual(len(set(query_counts[:-1])), 1)
+
+    def test_page_number_pagination_is_unchanged(self):
+        """未传 cursor 时仍返回页码分页结构"""
+        self._create_records(self.project, [1, 2, 3])
+        response = self.client.get('/api/v1/api-automation/http-execution-records/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+        self.assertNotIn('next_cursor', response.data)
+
+    def test_invalid_cursor(self):
+        """无效游标返回 400"""
+        response = self.client.get(
+            '/api/v1/api-automation/http-execution-records/', {'cursor': 'broken'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get(
+            '/api/v1/api-automation/dashboard/test_results/', {'cursor': 'broken'}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_results_cursor_pages(self):
+        """测试结果列表与仪表盘结果列表按 (start_time, id) 倒序翻页，并保留筛选条件"""
+        environment = ApiTestEnvironment.objects.create(
+            name='环境', project=self.project, base_url='http://example.com',
+        )
+        test_case = ApiTestCase.objects.create(
+            name='用例', project=self.project, method='GET', url='/a',
+        )
+        execution = ApiTestExecution.objects.create(
+            name='执行', project=self.project, environment=environment, status='COMPLETED',
+        )
+        ApiTestResult.objects.bulk_create([
+            ApiTestResult(
+                execution=execution, test_case=test_case, status=status,
+                start_time=self.base_time + timedelta(minutes=minutes),
+            )
+            for minutes, status in [(1, 'PASSED'), (2, 'FAILED'), (2, 'PASSED'),
+                                    (2, 'PASSED'), (3, 'PASSED'), (4, 'FAILED')]
+        ])
+        results = list(ApiTestResult.objects.order_by('-start_time', '-id'))
+
+        ids, _ = self._scroll(
+            '/api/v1/api-automation/test-results/', {'test_case': test_case.id, 'page_size': 2}
+        )
+        self.assertEqual(ids, [result.pk for result in results])
+
+        ids, _ = self._scroll(
+            '/api/v1/api-automation/dashboard/test_results/',
+            {'status': 'PASSED', 'page_size': 1},
+        )
+        self.assertEqual(ids, [result.pk for result in results if result.status == 'PASSED'])
+
+    def test_cursor_round_trip(self):
+        """游标编码后可还原排序键"""
+        value = timezone.now()
+        cursor = KeysetPagination.encode_cursor(value, 42)
+        self.assertEqual(KeysetPagination.decode_cursor(cursor), (value, 42))
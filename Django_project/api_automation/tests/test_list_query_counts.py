@@ -0,0 +1,90 @@
+"""
+列表接口查询次数测试用例
+验证项目、集合列表的统计字段来自查询集注解，查询次数不随行数增长
+"""
+
+import os
+import unittest
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from api_automation.models import ApiCollection, ApiProject, ApiTestCase
+
+
+if os.environ.get('RUN_DJANGO_TESTS') != '1':
+    raise unittest.SkipTest('未开启 Django 集成测试开关')
+
+
+class TestListQueryCounts(TestCase):
+    """列表接口统计字段集成测试"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='lister', password='pass1234')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def _create_project(self, index, collections=2, cases_per_collection=3):
+        project = ApiProject.objects.create(name=f'项目{index}', owner=self.user)
+        for number in range(collections):
+            collection = ApiCollection.objects.create(
+                name=f'集合{index}-{number}', project=project, owner=self.user,
+            )
+            for case_number in range(cases_per_collection):
+                ApiTestCase.objects.create(
+                    name=f'用例{case_number}', project=project, collection=collection,
+                    method='GET', url='/x',
+                )
+        ApiCollection.objects.create(
+            name='已删除集合', project=project, owner=self.user, is_deleted=True,
+        )
+        ApiTestCase.objects.create(
+            name='已删除用例', project=project, method='GET', url='/x', is_deleted=True,
+        )
+        return project
+
+    def _get(self, path):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response.data['results'], len(queries)
+
+    def test_project_list_counts(self):
+        """项目列表的集合、用例数量正确，查询次数与项目数量无关"""
+        self._create_project(0)
+        results, single_queries = self._get('/api/v1/api-automation/projects/')
+        self.assertEqual(results[0]['collections_count'], 2)
+        self.assertEqual(results[0]['test_cases_count'], 6)
+
+        for index in range(1, 5):
+            self._create_project(index, collections=index, cases_per_collection=1)
+        results, queries = self._get('/api/v1/api-automation/projects/')
+        self.assertEqual(len(results), 5)
+        self.assertEqual(queries, single_queries)
+
+        counts = {item['name']: item['collections_count'] for item in results}
+        self.assertEqual(counts['项目3'], 3)
+
+    def test_collection_list_counts(self):
+        """集合列表的用例数量正确，查询次数与集合数量无关"""
+        project = self._create_project(0, collections=1)
+        results, single_queries = self._get('/api/v1/api-automation/collections/')
+        self.assertEqual(
+            [item['test_cases_count'] for item in results if not item['name'].startswith('已删除')],
+            [3],
+        )
+
+        for index in range(4):
+            collection = ApiCollection.objects.create(
+                name=f'新集合{index}', project=project, owner=self.user,
+            )
+            ApiTestCase.objects.create(
+                name='用例', project=project, collection=collection, method='GET', url='/x',
+            )
+        results, queries = self._get('/api/v1/api-automation/collections/')
+        self.assertEqual(len(results), 5)
+        self.assertEqual(queries, single_queries)
+        self.assertTrue(all(item['project_name'] == '项目0' for item in results))
@@ -0,0 +1,141 @@
+"""
+回收站服务测试用例
+验证统一列表按删除时间全局排序、游标分页稳定、搜索与权限过滤在数据库中完成
+"""
+
+import os
+import unittest
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api_automation.models import ApiCollection, ApiProject, ApiTestCase
+from api_automation.services.recycle_bin_service import RecycleBinService
+
+
+if os.environ.get('RUN_DJANGO_TESTS') != '1':
+    raise unittest.SkipTest('未开启 Django 集成测试开关')
+
+
+class TestRecycleBinService(TestCase):
+    """回收站统一列表集成测试"""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass1234')
+        self.other = User.objects.create_user(username='other', password='pass1234')
+        self.project = ApiProject.objects.create(name='回收站项目', owner=self.owner)
+        self.service = RecycleBinService()
+        self.base_time = timezone.now() - timedelta(days=1)
+
+    def _deleted(self, model, minutes, **fields):
+        """创建一条已删除数据，删除时间为 base_time 之后 minutes 分钟"""
+        obj = model.objects.create(is_deleted=True, **fields)
+        model.objects.filter(pk=obj.pk).update(
+            updated_time=self.base_time + timedelta(minutes=minutes)
+        )
+        return obj
+
+    def _case(self, name, minutes):
+        return self._deleted(
+            ApiTestCase, minutes, name=name, project=self.project, owner=self.owner,
+            method='GET', url='/x',
+        )
+
+    def _collection(self, name, minutes):
+        return self._deleted(
+            ApiCollection, minutes, name=name, project=self.project, owner=self.owner
+        )
+
+    def _keys(self, results):
+        return [(item['type'], item['id']) for item in results]
+
+    def test_items_are_ordered_by_deletion_time_across_types(self):
+        """不同类型的数据按删除时间倒序合并"""
+        case_old = self._case('旧用例', 1)
+        collection = self._collection('集合', 2)
+        case_new = self._case('新用例', 3)
+
+        result = self.service.get_deleted_items(user=self.owner, page_size=10)
+
+        self.assertEqual(result['count'], 3)
+        self.assertEqual(result['total_pages'], 1)
+        self.assertEqual(self._keys(result['results']), [
+            ('apitestcase', case_new.id),
+            ('apicollection', collection.id),
+            ('apitestcase', case_old.id),
+        ])
+        item = result['results'][1]
+        self.assertEqual(item['display_type'], '集合')
+        self.assertEqual(item['name'], '集合')
+        self.assertEqual(item['updated_time'], self.base_time + timedelta(minutes=2))
+
+        page_two = self.service.get_deleted_items(user=self.owner, page=2, page_size=2)
+        self.assertEqual(self._keys(page_two['results']), [('apitestcase', case_old.id)])
+
+    def test_cursor_pages_are_stable_with_equal_timestamps(self):
+        """删除时间相同时游标分页不重复、不遗漏"""
+        expected = set()
+        for index in range(4):
+            expected.add(('apitestcase', self._case(f'用例{index}', 5).id))
+            expected.add(('apicollection', self._collection(f'集合{index}', 5).id))
+        expected.add(('apitestcase', self._case('更早', 1).id))
+
+        full = self._keys(
+            self.service.get_deleted_items(user=self.owner, page_size=100)['results']
+        )
+
+        seen = []
+        cursor = ''
+        while True:
+            with CaptureQueriesContext(connection) as queries:
+                result = self.service.get_deleted_items(
+                    user=self.owner, page_size=2, cursor=cursor
+                )
+            self.assertEqual(len(queries), 1)
+            self.assertNotIn('count', result)
+            seen.extend(self._keys(result['results']))
+            cursor = result['next_cursor']
+            if not cursor:
+                break
+
+        self.assertEqual(seen, full)
+        self.assertEqual(set(seen), expected)
+        self.assertEqual(len(seen), len(expected))
+
+    def test_search_and_type_filters(self):
+        """搜索与类型筛选在各分支内执行"""
+        self._case('登录接口', 1)
+        self._collection('登录集合', 2)
+        self._case('订单接口', 3)
+
+        result = self.service.get_deleted_items(user=self.owner, search='登录')
+        self.assertEqual(result['count'], 2)
+
+        result = self.service.get_deleted_items(
+            user=self.owner, search='登录', item_type='apicollection'
+        )
+        self.assertEqual([item['name'] for item in result['results']], ['登录集合'])
+
+    def test_permission_filter(self):
+        """普通用户只能看到自己的数据"""
+        self._case('我的用例', 1)
+        other_project = ApiProject.objects.create(name='他人项目', owner=self.other)
+        self._deleted(
+            ApiTestCase, 2, name='他人用例', project=other_project, owner=self.other,
+            method='GET', url='/y',
+        )
+
+        names = [
+            item['name']
+            for item in self.service.get_deleted_items(user=self.owner)['results']
+        ]
+        self.assertEqual(names, ['我的用例'])
+
+    def test_invalid_cursor(self):
+        """无效游标抛出 ValueError"""
+        with self.assertRaises(ValueError):
+            self.service.get_deleted_items(user=self.owner, cursor='not-a-cursor')
@@ -0,0 +1,102 @@
+"""
+请求模板编译测试用例
+验证两种占位符语法的渲染结果与模板缓存失效
+"""
+
+import unittest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from api_automation.services.compiled_cache import CompiledCaseCache
+from api_automation.services.http_executor import HttpExecutor
+from api_automation.services.request_template import (
+    ConstantTemplate, compile_template, compile_test_case, mapping_resolver,
+)
+from api_automation.services.variable_pool_service import VariablePool
+
+
+class TestCompileTemplate(unittest.TestCase):
+    """模板编译与渲染测试"""
+
+    def test_render_mapping_syntax(self):
+        """${key} 语法：已知变量替换，未知变量保留原文"""
+        template = compile_template({
+            'url': '/users/${id}/${missing}',
+            'items': [{'token': 'Bearer ${token}'}, 1, None],
+            'static': {'a': 'b'},
+        })
+        rendered = template.render(mapping_resolver({'id': 7, 'token': 'abc'}))
+
+        self.assertEqual(rendered['url'], '/users/7/${missing}')
+        self.assertEqual(rendered['items'], [{'token': 'Bearer abc'}, 1, None])
+        self.assertEqual(rendered['static'], {'a': 'b'})
+
+    def test_constant_without_placeholders(self):
+        """不含占位符的结构编译为常量"""
+        self.assertIsInstance(compile_template({'a': ['x', 1]}), ConstantTemplate)
+        self.assertIsInstance(compile_template('$notaplaceholder'), ConstantTemplate)
+
+    def test_variable_pool_scope_syntax(self):
+        """${scope.name} 语法：缺失变量替换为空串，非作用域占位符保留"""
+        pool = VariablePool()
+        pool.add_shared_variable('user', {'id': 42})
+        pool.add_global_variable('token', 'abc')
+
+        self.assertEqual(
+            pool.replace_variables('/u/${shared.user.id}?t=${global.token}&x=${shared.none}'),
+            '/u/42?t=abc&x=',
+        )
+        self.assertEqual(pool.replace_variables('${plain}'), '${plain}')
+        self.assertEqual(
+            pool.replace_variables_in_dict({'h': ['${global.token}'], 'n': 1}),
+            {'h': ['abc'], 'n': 1},
+        )
+
+    def test_http_executor_replacement(self):
+        """HttpExecutor 的变量替换沿用 ${key} 语义"""
+        executor = HttpExecutor()
+        try:
+            self.assertEqual(
+                executor._replace_variables('${a}-${b}-${c}', {'a': 1, 'b': 'x'}),
+                '1-x-${c}',
+            )
+            self.assertEqual(
+                executor._replace_variables_dict({'k': '${a}'}, {'a': 'v'}),
+                {'k': 'v'},
+            )
+        finally:
+            executor.close()
+
+
+class TestRequestTemplateCache(unittest.TestCase):
+    """用例模板缓存测试"""
+
+    def _case(self, updated_time, url='/a/${shared.id}'):
+        return SimpleNamespace(
+            pk=1, updated_time=updated_time, url=url,
+            headers={}, params={}, body=None,
+        )
+
+    def test_cache_hit_and_invalidate_on_update(self):
+        """updated_time 不变时命中缓存，变化后重新编译"""
+        cache = CompiledCaseCache(compile_test_case, maxsize=2)
+        now = datetime(2024, 1, 1)
+
+        first = cache.get(self._case(now))
+        self.assertIs(first, cache.get(self._case(now, url='/changed')))
+
+        updated = cache.get(self._case(now + timedelta(seconds=1), url='/b'))
+        self.assertIsNot(first, updated)
+        self.assertEqual(updated['url'].render(mapping_resolver({})), '/b')
+
+    def test_cache_is_bounded(self):
+        """超过容量时淘汰最久未使用的用例"""
+        cache = CompiledCaseCache(compile_test_case, maxsize=1)
+        now = datetime(2024, 1, 1)
+        cache.get(SimpleNamespace(pk=1, updated_time=now, url='/1', headers={}, params={}, body=None))
+        cache.get(SimpleNamespace(pk=2, updated_time=now, url='/2', headers={}, params={}, body=None))
+        self.assertEqual(list(cache._entries), [2])
+
+
+if __name__ == '__main__':
+    unittest.main()
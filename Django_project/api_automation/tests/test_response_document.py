@@ -0,0 +1,92 @@
+"""
+响应文档缓存测试用例
+验证多条提取规则共享同一次解析结果，以及 XPath/CSS 编译缓存
+"""
+
+import unittest
+from unittest.mock import patch
+
+from api_automation.services import response_document
+from api_automation.services.extraction_engine import ExtractionEngine
+from api_automation.services.response_document import (
+    ResponseDocument, compile_css_selector, compile_xpath,
+)
+
+HTML = (
+    '<html><body><h1 class="title">Hello</h1>'
+    '<a id="next" href="/page/2">next</a>'
+    '<span class="token">abc123</span></body></html>'
+)
+
+
+class TestResponseDocument(unittest.TestCase):
+    """响应文档惰性解析测试"""
+
+    def test_text_and_json(self):
+        """dict 响应体序列化一次，字符串响应体解析为JSON"""
+        document = ResponseDocument({'name': '张三'})
+        self.assertEqual(document.text, '{"name": "张三"}')
+        self.assertIs(document.text, document.text)
+        self.assertEqual(document.json, {'name': '张三'})
+
+        self.assertEqual(ResponseDocument('[1, 2]').json, [1, 2])
+        self.assertIsNone(ResponseDocument('<p>x</p>').json)
+        self.assertEqual(ResponseDocument(None, 'raw').text, 'raw')
+
+    @unittest.skipUnless(response_document.LXML_ENABLED, "lxml未安装")
+    def test_xml_with_encoding_declaration(self):
+        """带编码声明的文本也能解析"""
+        document = ResponseDocument('<?xml version="1.0" encoding="utf-8"?><root><id>7</id></root>')
+        self.assertEqual(document.xpath('//id')[0].text, '7')
+
+    @unittest.skipUnless(
+        response_document.LXML_ENABLED and response_document.BS4_ENABLED,
+        "lxml或BeautifulSoup未安装",
+    )
+    def test_extraction_rules_share_single_parse(self):
+        """多条 XPath/CSS 规则只解析一次响应体"""
+        extractions = [
+            {'variable_name': 'title', 'extract_type': 'xpath', 'extract_expression': '//h1'},
+            {'variable_name': 'href', 'extract_type': 'xpath', 'extract_expression': '//a/@href'},
+            {'variable_name': 'token', 'extract_type': 'css_selector', 'extract_expression': '.token'},
+            {'variable_name': 'link', 'extract_type': 'css_selector', 'extract_expression': 'a#next'},
+            {'variable_name': 'word', 'extract_type': 'regex', 'extract_expression': r'<h1[^>]*>(\w+)'},
+        ]
+        with patch.object(response_document, '_parse_html', wraps=response_document._parse_html) as parse_html, \
+                patch.object(response_document, 'BeautifulSoup', wraps=response_document.BeautifulSoup) as soup:
+            variables, results = ExtractionEngine().extract_variables(
+                extractions, http_response=None, response_body=HTML,
+            )
+
+        self.assertEqual(variables, {
+            'title': 'Hello', 'href': '/page/2', 'token': 'abc123',
+            'link': 'next', 'word': 'Hello',
+        })
+        self.assertTrue(all(result.success for result in results))
+        self.assertEqual(parse_html.call_count, 1)
+        self.assertEqual(soup.call_count, 1)
+
+    @unittest.skipUnless(
+        response_document.LXML_ENABLED and response_document.BS4_ENABLED,
+        "lxml或BeautifulSoup未安装",
+    )
+    def test_compiled_expressions_cached(self):
+        """相同表达式返回同一个编译对象"""
+        self.assertIs(compile_xpath('//h1'), compile_xpath('//h1'))
+        self.assertIs(compile_css_selector('.token'), compile_css_selector('.token'))
+
+    def test_invalid_xpath_returns_none(self):
+        """非法 XPath 表达式不影响其他规则"""
+        variables, results = ExtractionEngine().extract_variables(
+            [
+                {'variable_name': 'bad', 'extract_type': 'xpath', 'extract_expression': '//['},
+                {'variable_name': 'id', 'extract_type': 'json_path', 'extract_expression': '$.id'},
+            ],
+            http_response=None, response_body={'id': 5},
+        )
+        self.assertEqual(variables, {'id': 5})
+        self.assertFalse(results[0].success)
+
+
+if __name__ == '__main__':
+    unittest.main()
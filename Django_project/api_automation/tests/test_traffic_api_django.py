@@ -2,10 +2,12 @@
 
 import json
 import os
+import tempfile
 import unittest
 
 from django.contrib.auth.models import User
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
 from django.utils import timezone
 from rest_framework.test import APIClient
 
@@ -15,6 +17,7 @@ from api_automation.models import (
     ApiTestCase,
     ApiTestScenario,
     ApiTrafficCapture,
+    ApiTrafficEntry,
     ApiTrafficSession,
     ApiTrafficVariableRule,
 )
@@ -28,6 +31,13 @@ class TestTrafficApi(TestCase):
     """流量录制生成 API 集成测试。"""
 
     def setUp(self):
+        # 上传文件写入临时目录，不落到项目的 uploads 目录
+        upload_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(upload_dir.cleanup)
+        upload_override = override_settings(API_TRAFFIC_UPLOAD_ROOT=upload_dir.name)
+        upload_override.enable()
+        self.addCleanup(upload_override.disable)
+
         self.client = APIClient()
         self.user = User.objects.create_user(username='tester', password='pass1234')
         self.client.force_authenticate(user=self.user)
@@ -255,3 +265,48 @@ class TestTrafficApi(TestCase):
         self.assertEqual(parse.status_code, 200)
         self.assertEqual(parse.data['sessions_count'], 0)
         self.assertEqual(parse.data.get('message'), '无可用会话')
+
+    def _upload_har_file(self, content):
+        return self.client.post('/api/v1/api-automation/traffic-captures/', {
+            'project': self.project.id,
+            'name': '录制-HAR',
+            'file_format': 'HAR',
+            'file': SimpleUploadedFile('capture.har', content.encode('utf-8')),
+        }, format='multipart')
+
+    def test_har_file_streamed_into_batches(self):
+        entries = [
+            {
+                'request': {'method': 'GET', 'url': f'https://example.com/api/items/{index}'},
+                'response': {'status': 200, 'content': {'text': json.dumps({'id': index})}},
+                'time': 10,
+            }
+            for index in range(1200)
+        ]
+        entries.append({'request': {'method': 'GET', 'url': 'https://example.com/app.css'}})
+        upload = self._upload_har_file(json.dumps({'log': {'version': '1.2', 'entries': entries}}))
+        self.assertEqual(upload.status_code, 201)
+
+        parse = self._parse_capture(upload.data['id'])
+        self.assertEqual(parse.status_code, 200)
+        self.assertEqual(parse.data['total_entries'], 1201)
+        self.assertEqual(parse.data['filtered_entries'], 1200)
+
+        session = ApiTrafficSession.objects.get(capture_id=upload.data['id'])
+        self.assertEqual(session.entry_count, 1200)
+        self.assertEqual(session.entries.count(), 1201)
+        self.assertEqual(session.entries.filter(is_valuable=False).count(), 1)
+
+    def test_har_file_truncated_rolls_back(self):
+        content = json.dumps({'log': {'entries': [
+            {'request': {'method': 'GET', 'url': f'https://example.com/api/{index}'}}
+            for index in range(600)
+        ]}})
+        upload = self._upload_har_file(content[:-100])
+        self.assertEqual(upload.status_code, 201)
+
+        parse = self._parse_capture(upload.data['id'])
+        self.assertEqual(parse.status_code, 400)
+        self.assertFalse(ApiTrafficSession.objects.filter(capture_id=upload.data['id']).exists())
+        self.assertEqual(ApiTrafficEntry.objects.count(), 0)
+        self.assertEqual(ApiTrafficCapture.objects.get(id=upload.data['id']).status, 'FAILED')
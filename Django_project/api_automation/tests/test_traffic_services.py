@@ -4,6 +4,7 @@
 覆盖解析、过滤、参数化、场景拼接与门禁逻辑。
 """
 
+import io
 import json
 from types import SimpleNamespace
 
@@ -87,6 +88,104 @@ def test_parse_error_has_readable_message_and_code():
     assert exc.value.message == "文件格式解析失败"
 
 
+def _build_har(count):
+    entry = {
+        "request": {
+            "method": "POST",
+            "url": "https://example.com/api/orders?page=1",
+            "headers": [{"name": "x-note", "value": "括号 ] } 与 \\ 转义 \""}],
+            "postData": {"text": json.dumps({"items": ["[", "{", "\""]})},
+        },
+        "response": {"status": 201, "content": {"text": json.dumps({"id": 1, "msg": "已创建"})}},
+        "time": 35.6,
+    }
+    return {
+        "log": {
+            "version": "1.2",
+            "creator": {"name": "browser ] {", "version": "1"},
+            "pages": [{"id": "page_1", "title": "[\"]"}],
+            "entries": [entry] * count,
+        }
+    }
+
+
+def test_stream_har_entries_across_chunk_boundaries():
+    content = json.dumps(_build_har(5), ensure_ascii=False)
+    expected = TrafficParseService(max_file_size=1024 * 1024).parse_content(content)
+    assert len(expected) == 5
+    assert expected[0]["request_params"] == {"page": "1"}
+    assert expected[0]["response_body"] == {"id": 1, "msg": "已创建"}
+
+    for chunk_size in (1, 3, 17, 4096):
+        service = TrafficParseService(chunk_size=chunk_size)
+        streamed = list(service.iter_entries(io.BytesIO(content.encode("utf-8")), file_format="HAR"))
+        assert streamed == expected
+
+
+def test_stream_reads_file_incrementally():
+    content = json.dumps(_build_har(2000)).encode("utf-8")
+    fileobj = io.BytesIO(content)
+    entries = TrafficParseService(chunk_size=4096).iter_entries(fileobj, file_format="HAR")
+
+    first = next(entries)
+    assert first["request_method"] == "POST"
+    assert fileobj.tell() < len(content) // 100
+    assert sum(1 for _ in entries) == 1999
+
+
+def test_stream_top_level_entries_and_list():
+    service = TrafficParseService(chunk_size=8)
+    content = json.dumps({"entries": _build_sample_entries()})
+    assert len(list(service.iter_entries(io.StringIO(content)))) == 2
+    content = json.dumps(_build_sample_entries())
+    assert len(list(service.iter_entries(io.StringIO(content)))) == 2
+
+
+class _NonSeekable(io.BytesIO):
+    def seekable(self):
+        return False
+
+
+def test_stream_log_entries_take_precedence():
+    first, second = _build_sample_entries()
+    service = TrafficParseService(chunk_size=8)
+    cases = [
+        ({"entries": [first], "log": {"entries": [second]}}, [second]),
+        ({"log": {"entries": [second]}, "entries": [first]}, [second]),
+        ({"entries": [first], "log": {"version": "1.2"}}, [first]),
+        ({"log": {"version": "1.2"}, "entries": [first]}, [first]),
+        ({"log": {"entries": None}, "entries": [first]}, []),
+    ]
+    for data, expected_items in cases:
+        content = json.dumps(data)
+        expected = [service._normalize_entry(item) for item in expected_items]
+        assert service.parse_content(content) == expected
+        for fileobj in (
+            io.StringIO(content),
+            io.BytesIO(content.encode("utf-8")),
+            _NonSeekable(content.encode("utf-8")),
+        ):
+            assert list(service.iter_entries(fileobj)) == expected
+
+
+def test_stream_scalars_split_by_chunks():
+    first, second = _build_sample_entries()
+    service = TrafficParseService(chunk_size=3)
+    for data in ([1.5, first], [12.25e-1, first, -3E+2, second], [True, None, first]):
+        content = json.dumps(data)
+        for fileobj in (io.StringIO(content), io.BytesIO(content.encode("utf-8"))):
+            assert list(service.iter_entries(fileobj)) == service.parse_content(content)
+    assert list(service.iter_entries(io.StringIO("1.5e10"))) == []
+
+
+def test_stream_truncated_content_raises():
+    content = json.dumps(_build_har(3))[:-40]
+    entries = TrafficParseService(chunk_size=64).iter_entries(io.StringIO(content))
+    with pytest.raises(TrafficParseError) as exc:
+        list(entries)
+    assert exc.value.message == "文件格式解析失败"
+
+
 def test_filter_static_resource_and_health():
     entries = [
         {
@@ -116,6 +215,17 @@ def test_filter_deduplicate():
     assert sum(1 for item in filtered if not item.get("is_valuable", True)) == 1
 
 
+def test_filter_iter_filtered_accepts_generator():
+    entries = _build_sample_entries()
+    entries.append(entries[0].copy())
+    service = TrafficFilterService()
+    stats = service.new_stats()
+    filtered = service.iter_filtered((entry for entry in entries), stats)
+
+    assert [item["is_valuable"] for item in filtered] == [True, True, False]
+    assert stats["deduplicated_count"] == 1
+
+
 def test_parameterize_dynamic_fields():
     entries = _build_sample_entries()
     parameterized, rules, conflicts = ParameterizeService().parameterize(entries)
@@ -21,6 +21,7 @@ from .http_executor import (
     cancel_execution,
     execute_batch_requests,
     execute_http_request,
+    get_connection_pool_stats,
     get_execution_history,
 )
 from .views import (
@@ -91,6 +92,8 @@ urlpatterns = [
          csrf_exempt(execute_batch_requests), name='http-execute-batch'),
     path('api/v1/api-automation/test-execute/history/',
          csrf_exempt(get_execution_history), name='http-execute-history'),
+    path('api/v1/api-automation/test-execute/pool-stats/',
+         csrf_exempt(get_connection_pool_stats), name='http-execute-pool-stats'),
     path('api/v1/api-automation/test-execute/<str:execution_id>/cancel/',
          csrf_exempt(cancel_execution), name='http-execute-cancel'),
 
@@ -31,11 +31,18 @@ API自动化测试模块的视图层定义。
     UserViewSet                 -- 用户列表 + 注册
     CurrentUserView             -- 当前用户信息
 """
+import hashlib
+import itertools
+import json
 import os
 import uuid
 
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db.models import Count, Q
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, Max, Prefetch, Q
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
@@ -43,11 +50,13 @@ from django_filters.rest_framework import DjangoFilterBackend
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import permissions, status, views, viewsets
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 
 from .models import (
     ApiCollection,
     ApiDataDriver,
+    ApiExecutionJob,
     ApiHttpExecutionRecord,
     ApiProject,
     ApiGeneratedArtifact,
@@ -64,6 +73,7 @@ from .models import (
     ApiTestResult,
     ApiTestScenario,
 )
+from .pagination import CreatedTimeKeysetPagination, StartTimeKeysetPagination
 from .serializers import (
     ApiCollectionDetailSerializer,
     ApiCollectionSerializer,
@@ -83,14 +93,22 @@ from .serializers import (
     ApiTestEnvironmentSerializer,
     ApiTestExecutionDetailSerializer,
     ApiTestExecutionSerializer,
+    ApiTestExecutionSummarySerializer,
     ApiTestReportSerializer,
     ApiTestResultSerializer,
+    ApiTestResultSummarySerializer,
     ApiTestScenarioSerializer,
     ApiTestCaseAssertionSerializer,
     ApiTestCaseExtractionSerializer,
     UserSerializer,
 )
+from .services.cancellation import cancellation_registry
 from .services.cascade_delete_service import cascade_delete_service
+from .services.cold_archive import KIND_RESULTS, cold_archive
+from .services.blob_store import blob_store
+from .services.dashboard_cache import cache_dashboard_response, dashboard_cache
+from .services.dashboard_rollup_service import dashboard_rollup_service
+from .services.execution_queue import execution_queue
 from .services.traffic_artifact_gate_service import ArtifactGateService
 from .services.traffic_filter_service import TrafficFilterService
 from .services.traffic_parameterize_service import ParameterizeService
@@ -131,6 +149,59 @@ def format_datetime(dt):
     return dt.strftime('%Y-%m-%d %H:%M:%S')
 
 
+def touch_test_case(test_case_id):
+    """
+    刷新测试用例的 updated_time。
+
+    断言计划、请求模板等编译缓存以用例的 updated_time 为版本号，
+    修改用例下属的断言配置后需调用本函数使各进程中的缓存失效。
+
+    参数:
+        test_case_id: 测试用例ID，为空时不做处理
+    """
+    if test_case_id:
+        ApiTestCase.objects.filter(pk=test_case_id).update(updated_time=timezone.now())
+
+
+def dispatch_execution(execute, request, allow_queue=True):
+    """
+    创建执行记录，并按配置入队或在请求线程内同步执行。
+
+    启用执行队列（API_EXECUTION_QUEUE_ENABLED，默认关闭）时只创建 PENDING
+    执行记录并入队，由 run_execution_worker 工作进程执行，立即返回 202；
+    未启用时在请求线程内执行完毕后返回 201。
+
+    参数:
+        execute: 接收 run_now 关键字参数并返回执行记录的可调用对象
+        request: 当前请求，可通过 priority 字段指定队列优先级
+        allow_queue: 为 False 时始终同步执行（调用方需要立即拿到执行结果）
+
+    返回:
+        包含执行记录序列化数据的 Response
+    """
+    queued = allow_queue and getattr(settings, 'API_EXECUTION_QUEUE_ENABLED', False)
+
+    if not queued:
+        execution = execute(run_now=True)
+        # 新建的执行会改变仪表盘的执行数与最近执行列表
+        dashboard_cache.bump([execution.project_id])
+        serializer = ApiTestExecutionSerializer(execution)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    try:
+        priority = int(request.data.get('priority') or 0)
+    except (TypeError, ValueError):
+        priority = 0
+    # 执行记录与队列任务同时提交，入队失败时不遗留没有任务的 PENDING 执行
+    with transaction.atomic():
+        execution = execute(run_now=False)
+        execution_queue.enqueue(execution, priority=priority)
+    dashboard_cache.bump([execution.project_id])
+
+    serializer = ApiTestExecutionSerializer(execution)
+    return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+
 # =============================================================================
 # 项目管理
 # =============================================================================
@@ -161,7 +232,7 @@ class ApiProjectViewSet(viewsets.ModelViewSet):
         queryset = ApiProject.objects.filter(is_deleted=False)
         if not user.is_superuser:
             queryset = queryset.filter(owner=user)
-        return queryset
+        return ApiProjectSerializer.annotate_queryset(queryset)
 
     def get_serializer_class(self):
         """详情页使用包含集合列表的详情序列化器。"""
@@ -194,16 +265,17 @@ class ApiProjectViewSet(viewsets.ModelViewSet):
 
         try:
             service = BatchExecutionService()
-            execution = service.execute_by_project(
-                project_id=project.id,
-                environment_id=environment_id,
-                user_id=request.user.id,
-                execution_name=request.data.get('execution_name'),
+            return dispatch_execution(
+                lambda run_now: service.execute_by_project(
+                    project_id=project.id,
+                    environment_id=environment_id,
+                    user_id=request.user.id,
+                    execution_name=request.data.get('execution_name'),
+                    run_now=run_now,
+                ),
+                request,
             )
 
-            serializer = ApiTestExecutionSerializer(execution)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-
         except Exception as e:
             return Response(
                 {'error': f'执行失败: {str(e)}'},
@@ -214,7 +286,9 @@ class ApiProjectViewSet(viewsets.ModelViewSet):
     def collections(self, request, pk=None):
         """获取指定项目下的所有集合（分页）。"""
         project = self.get_object()
-        collections = project.api_collections.filter(is_deleted=False)
+        collections = ApiCollectionSerializer.annotate_queryset(
+            project.api_collections.filter(is_deleted=False)
+        )
         page = self.paginate_queryset(collections)
         serializer = ApiCollectionSerializer(page, many=True)
         return self.get_paginated_response(serializer.data)
@@ -223,7 +297,9 @@ class ApiProjectViewSet(viewsets.ModelViewSet):
     def test_cases(self, request, pk=None):
         """获取指定项目下的所有测试用例（分页）。"""
         project = self.get_object()
-        test_cases = project.test_cases.filter(is_deleted=False)
+        test_cases = project.test_cases.filter(is_deleted=False).select_related(
+            'project', 'collection'
+        ).defer(*ApiTestCase.LIST_DEFERRED_FIELDS)
         page = self.paginate_queryset(test_cases)
         serializer = ApiTestCaseListSerializer(page, many=True)
         return self.get_paginated_response(serializer.data)
@@ -261,7 +337,7 @@ class ApiCollectionViewSet(viewsets.ModelViewSet):
         if not user.is_superuser:
             queryset = queryset.filter(project__owner=user)
 
-        return queryset
+        return ApiCollectionSerializer.annotate_queryset(queryset)
 
     def get_serializer_class(self):
         """详情页使用包含用例列表的详情序列化器。"""
@@ -356,16 +432,17 @@ class ApiCollectionViewSet(viewsets.ModelViewSet):
 
         try:
             service = BatchExecutionService()
-            execution = service.execute_by_collection(
-                collection_id=collection.id,
-                environment_id=environment_id,
-                user_id=request.user.id,
-                execution_name=request.data.get('execution_name'),
+            return dispatch_execution(
+                lambda run_now: service.execute_by_collection(
+                    collection_id=collection.id,
+                    environment_id=environment_id,
+                    user_id=request.user.id,
+                    execution_name=request.data.get('execution_name'),
+                    run_now=run_now,
+                ),
+                request,
             )
 
-            serializer = ApiTestExecutionSerializer(execution)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-
         except Exception as e:
             return Response(
                 {'error': f'执行失败: {str(e)}'},
@@ -406,6 +483,9 @@ class ApiTestCaseViewSet(viewsets.ModelViewSet):
         if not user.is_superuser:
             queryset = queryset.filter(project__owner=user)
 
+        if self.action == 'list':
+            queryset = queryset.defer(*ApiTestCase.LIST_DEFERRED_FIELDS)
+
         return queryset.select_related('project', 'collection', 'created_by')
 
     def get_serializer_class(self):
@@ -447,16 +527,17 @@ class ApiTestCaseViewSet(viewsets.ModelViewSet):
 
         try:
             service = BatchExecutionService()
-            execution = service.execute_by_selection(
-                test_case_ids=test_case_ids,
-                environment_id=environment_id,
-                user_id=request.user.id,
-                execution_name=request.data.get('execution_name'),
+            return dispatch_execution(
+                lambda run_now: service.execute_by_selection(
+                    test_case_ids=test_case_ids,
+                    environment_id=environment_id,
+                    user_id=request.user.id,
+                    execution_name=request.data.get('execution_name'),
+                    run_now=run_now,
+                ),
+                request,
             )
 
-            serializer = ApiTestExecutionSerializer(execution)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-
         except Exception as e:
             return Response(
                 {'error': f'执行失败: {str(e)}'},
@@ -465,7 +546,7 @@ class ApiTestCaseViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['post'])
     def run_test(self, request, pk=None):
-        """执行单个测试用例，需指定 environment_id。"""
+        """执行单个测试用例，需指定 environment_id；始终同步执行，不经过执行队列。"""
         from .services.batch_execution_service import BatchExecutionService
 
         test_case = self.get_object()
@@ -479,16 +560,19 @@ class ApiTestCaseViewSet(viewsets.ModelViewSet):
 
         try:
             service = BatchExecutionService()
-            execution = service.execute_by_selection(
-                test_case_ids=[test_case.id],
-                environment_id=environment_id,
-                user_id=request.user.id,
-                execution_name=f"执行用例: {test_case.name}",
+            return dispatch_execution(
+                lambda run_now: service.execute_by_selection(
+                    test_case_ids=[test_case.id],
+                    environment_id=environment_id,
+                    user_id=request.user.id,
+                    execution_name=f"执行用例: {test_case.name}",
+                    run_now=run_now,
+                ),
+                request,
+                # 单用例调试（TestCaseRunner）需要在响应中拿到执行结果，不入队
+                allow_queue=False,
             )
 
-            serializer = ApiTestExecutionSerializer(execution)
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
-
         except Exception as e:
             return Response(
                 {'error': f'执行失败: {str(e)}'},
@@ -598,6 +682,8 @@ class ApiTestExecutionViewSet(viewsets.ModelViewSet):
     API测试执行视图集 -- 提供执行记录查询和取消执行能力。
 
     支持通过 WebSocket 实时推送执行状态变更通知。
+    列表不加载测试结果，传入 lean=true 时只读取状态和计数列；
+    大量测试结果通过 results 子接口分页或流式读取。
     """
     serializer_class = ApiTestExecutionSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -608,7 +694,7 @@ class ApiTestExecutionViewSet(viewsets.ModelViewSet):
     ordering = ['-created_time']
 
     def get_queryset(self):
-        """获取执行记录列表（使用 select_related 和 prefetch_related 优化）。"""
+        """获取执行记录列表（使用 select_related 优化，仅详情预加载测试结果）。"""
         user = self.request.user
         if getattr(self, 'swagger_fake_view', False):
             return ApiTestExecution.objects.none()
@@ -618,19 +704,120 @@ class ApiTestExecutionViewSet(viewsets.ModelViewSet):
         if not user.is_superuser:
             queryset = queryset.filter(project__owner=user)
 
-        return queryset.select_related(
-            'project', 'environment', 'created_by'
-        ).prefetch_related('test_results')
+        if self._is_lean_list():
+            return ApiTestExecutionSummarySerializer.load_only(queryset)
+
+        queryset = queryset.select_related('project', 'environment', 'created_by')
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related(Prefetch(
+                'test_results',
+                queryset=ApiTestResult.objects.select_related('test_case').defer(
+                    *ApiTestResult.LIST_DEFERRED_FIELDS
+                ),
+            ))
+        return queryset
 
     def get_serializer_class(self):
-        """详情页使用包含测试结果和报告的详情序列化器。"""
+        """详情页使用包含测试结果和报告的详情序列化器，精简列表使用精简序列化器。"""
         if self.action == 'retrieve':
             return ApiTestExecutionDetailSerializer
+        if self._is_lean_list():
+            return ApiTestExecutionSummarySerializer
         return ApiTestExecutionSerializer
 
+    def perform_destroy(self, instance):
+        """
+        删除执行记录及其测试结果。
+
+        删除前先从仪表盘日汇总中减去该执行的贡献、释放结果引用的内容存储对象，
+        并递增项目的仪表盘数据版本，避免汇总统计与实际数据长期不一致。
+        """
+        with transaction.atomic():
+            dashboard_rollup_service.revert_execution(instance)
+            blob_store.release_for(instance.test_results.all())
+            dashboard_cache.bump([instance.project_id])
+            instance.delete()
+
+    def _is_lean_list(self):
+        """是否为精简模式的列表请求。"""
+        return (
+            self.action == 'list'
+            and self.request.query_params.get('lean', 'false').lower() == 'true'
+        )
+
+    @action(detail=True, methods=['get'])
+    def results(self, request, pk=None):
+        """
+        获取执行下的测试结果（精简字段，分页或流式返回）。
+
+        查询参数:
+            status    -- 按结果状态筛选
+            include   -- 逗号分隔的大字段：assertion_results, request_full, response_full
+            cursor    -- 键集分页游标（首页传空值），不传时按 page 页码分页
+            page_size -- 键集分页每页数量（默认 20，最大 100）
+            stream    -- 为 true 时以 NDJSON 逐行流式返回全部结果，不分页
+        """
+        # status 参数用于筛选测试结果，不能作为执行记录的过滤条件
+        execution = get_object_or_404(self.get_queryset(), pk=pk)
+        self.check_object_permissions(request, execution)
+        include = [
+            field.strip() for field in request.query_params.get('include', '').split(',')
+            if field.strip() in ApiTestResultSummarySerializer.INCLUDE_FIELDS
+        ]
+
+        queryset = ApiTestResultSummarySerializer.load_only(execution.test_results.all(), include)
+        result_status = request.query_params.get('status')
+        if result_status:
+            queryset = queryset.filter(status=result_status)
+        context = {'request': request, 'include': include}
+
+        if request.query_params.get('stream', 'false').lower() == 'true':
+            return StreamingHttpResponse(
+                self._stream_results(queryset, context),
+                content_type='application/x-ndjson',
+            )
+
+        paginator = StartTimeKeysetPagination()
+        page = paginator.paginate_queryset(
+            queryset.order_by('-start_time', '-id'), request, view=self
+        )
+        serializer = ApiTestResultSummarySerializer(page, many=True, context=context)
+        return paginator.get_paginated_response(serializer.data)
+
+    @staticmethod
+    def _stream_results(queryset, context, chunk_size=500):
+        """
+        按 (start_time, id) 键集分块读取测试结果，每块预取完整请求/响应体后逐行输出 JSON。
+
+        每块重新查询上一块最后一行之后的数据，而不是依赖数据库游标：MySQL 驱动会在
+        客户端缓冲整个结果集，iterator() 无法真正流式读取。
+        """
+        queryset = queryset.order_by('start_time', 'id')
+        batch = queryset
+        while True:
+            chunk = list(batch[:chunk_size])
+            if not chunk:
+                return
+            ApiTestResultSummarySerializer.prefetch_bodies(chunk, context.get('include', ()))
+            for result in chunk:
+                data = ApiTestResultSummarySerializer(result, context=context).data
+                yield json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+            if len(chunk) < chunk_size:
+                return
+            last = chunk[-1]
+            batch = queryset.filter(
+                Q(start_time__gte=last.start_time),
+                Q(start_time__gt=last.start_time) | Q(id__gt=last.pk),
+            )
+
     @action(detail=True, methods=['post'])
     def cancel(self, request, pk=None):
-        """取消正在执行或待执行的任务，仅 PENDING/RUNNING 状态可取消。"""
+        """
+        取消正在执行或待执行的任务，仅 PENDING/RUNNING 状态可取消。
+
+        排队中的任务直接标记为已取消；运行中的执行在本进程内立即收到取消信号，
+        在其他进程（队列工作进程）中由取消检查线程在数秒内感知。
+        """
         execution = self.get_object()
 
         if execution.status not in ['PENDING', 'RUNNING']:
@@ -639,15 +826,21 @@ class ApiTestExecutionViewSet(viewsets.ModelViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
 
         try:
+            now = timezone.now()
             execution.status = 'CANCELLED'
-            execution.end_time = timezone.now()
-            execution.save()
+            execution.end_time = now
+            execution.save(update_fields=['status', 'end_time', 'updated_time'])
+
+            ApiExecutionJob.objects.filter(
+                execution=execution, status='QUEUED'
+            ).update(status='CANCELLED', finished_time=now, updated_time=now)
+            cancellation_registry.cancel(execution.id)
+            dashboard_cache.bump([execution.project_id])
 
             # 通过WebSocket通知取消
             if WEBSOCKET_ENABLED and websocket_service:
-                websocket_service.broadcast_execution_update(
-                    execution.id,
-                    {'status': 'CANCELLED', 'message': '执行已取消'}
+                websocket_service.broadcast_execution_status(
+                    execution.id, 'CANCELLED', '执行已取消'
                 )
 
             return Response({
@@ -669,9 +862,14 @@ class ApiTestExecutionViewSet(viewsets.ModelViewSet):
 @method_decorator(csrf_exempt, name='dispatch')
 @swagger_auto_schema(tags=['Test Result Management'])
 class ApiTestResultViewSet(viewsets.ReadOnlyModelViewSet):
-    """API测试结果视图集（只读） -- 查询单个用例的执行结果。"""
+    """
+    API测试结果视图集（只读） -- 查询单个用例的执行结果。
+
+    列表传入 cursor 参数时按 (start_time, id) 键集分页，适合深翻页和无限滚动。
+    """
     serializer_class = ApiTestResultSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = StartTimeKeysetPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['execution', 'test_case', 'status']
     search_fields = ['test_case__name', 'test_case__url']
@@ -691,7 +889,7 @@ class ApiTestResultViewSet(viewsets.ReadOnlyModelViewSet):
 
         return queryset.select_related(
             'execution', 'test_case', 'execution__project', 'execution__environment'
-        )
+        ).defer(*ApiTestResult.LIST_DEFERRED_FIELDS)
 
 
 @method_decorator(csrf_exempt, name='dispatch')
@@ -768,9 +966,11 @@ class ApiHttpExecutionRecordViewSet(viewsets.ReadOnlyModelViewSet):
     HTTP执行记录视图集（只读） -- 查询和统计 HTTP 请求的历史执行记录。
 
     支持按状态、方法、环境等多维度筛选，以及聚合统计查询。
+    列表传入 cursor 参数时按 (created_time, id) 键集分页，适合深翻页和无限滚动。
     """
     serializer_class = ApiHttpExecutionRecordSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CreatedTimeKeysetPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = [
         'test_case', 'execution', 'project', 'environment',
@@ -858,37 +1058,52 @@ class ApiTrafficCaptureViewSet(viewsets.ModelViewSet):
         name = request.data.get('name') or '流量录制'
         capture_type = request.data.get('capture_type', 'PROXY_UPLOAD')
 
+        parse_service = TrafficParseService()
         if file_obj:
-            file_bytes = file_obj.read()
+            # 上传文件按块落盘并增量计算哈希，不整体读入内存
+            if file_obj.size > getattr(settings, 'API_TRAFFIC_MAX_UPLOAD_SIZE', 1024 * 1024 * 1024):
+                return Response({
+                    'error': '文件大小超过限制',
+                    'code': 'FILE_TOO_LARGE',
+                }, status=status.HTTP_400_BAD_REQUEST)
+            chunks = file_obj.chunks()
         elif file_content:
             file_bytes = file_content.encode('utf-8')
+            if len(file_bytes) > parse_service.max_file_size:
+                return Response({
+                    'error': '文件大小超过限制',
+                    'code': 'FILE_TOO_LARGE',
+                }, status=status.HTTP_400_BAD_REQUEST)
+            chunks = [file_bytes]
         else:
             return Response({'error': '请上传文件或提供 file_content'}, status=status.HTTP_400_BAD_REQUEST)
 
-        parse_service = TrafficParseService()
-        if len(file_bytes) > parse_service.max_file_size:
-            return Response({
-                'error': '文件大小超过限制',
-                'code': 'FILE_TOO_LARGE',
-            }, status=status.HTTP_400_BAD_REQUEST)
+        upload_dir = getattr(
+            settings, 'API_TRAFFIC_UPLOAD_ROOT',
+            os.path.join(os.path.dirname(__file__), '..', 'uploads', 'traffic'),
+        )
+        os.makedirs(upload_dir, exist_ok=True)
+        file_name = f"{uuid.uuid4().hex}.{file_format.lower()}"
+        file_path = os.path.abspath(os.path.join(upload_dir, file_name))
+        digest = hashlib.sha256()
+        file_size = 0
+        with open(file_path, 'wb') as f:
+            for chunk in chunks:
+                digest.update(chunk)
+                file_size += len(chunk)
+                f.write(chunk)
 
-        content_hash = TrafficParseService.compute_hash(file_bytes)
+        content_hash = digest.hexdigest()
         existing = ApiTrafficCapture.objects.filter(
             project_id=project_id,
             content_hash=content_hash,
             is_deleted=False
         ).first()
         if existing and not request.data.get('force_new'):
+            os.remove(file_path)
             serializer = self.get_serializer(existing)
             return Response({'duplicated': True, 'capture': serializer.data})
 
-        upload_dir = os.path.join(os.path.dirname(__file__), '..', 'uploads', 'traffic')
-        os.makedirs(upload_dir, exist_ok=True)
-        file_name = f"{uuid.uuid4().hex}.{file_format.lower()}"
-        file_path = os.path.abspath(os.path.join(upload_dir, file_name))
-        with open(file_path, 'wb') as f:
-            f.write(file_bytes)
-
         capture = ApiTrafficCapture.objects.create(
             project_id=project_id,
             name=name,
@@ -896,7 +1111,7 @@ class ApiTrafficCaptureViewSet(viewsets.ModelViewSet):
             capture_type=capture_type,
             file_path=file_path,
             file_format=file_format,
-            file_size=len(file_bytes),
+            file_size=file_size,
             content_hash=content_hash,
             processing_config={
                 'file_format': file_format,
@@ -917,15 +1132,14 @@ class ApiTrafficCaptureViewSet(viewsets.ModelViewSet):
         parse_service = TrafficParseService()
         filter_service = TrafficFilterService()
 
+        batch_size = getattr(settings, 'API_TRAFFIC_PARSE_BATCH_SIZE', 500)
+        stats = filter_service.new_stats()
+        total_entries = 0
+        valuable_count = 0
+
         try:
-            with open(capture.file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            entries = parse_service.parse_content(content, file_format=capture.file_format)
-            capture.total_entries = len(entries)
-
-            filtered_entries, stats = filter_service.filter_entries(entries)
-            valuable_entries = [e for e in filtered_entries if e.get('is_valuable', True)]
-            if valuable_entries:
+            # 逐条流式解析并分批写入；会话先行创建，解析失败时整体回滚，无可用 entry 时删除
+            with transaction.atomic(), open(capture.file_path, 'rb') as f:
                 session = ApiTrafficSession.objects.create(
                     project=capture.project,
                     capture=capture,
@@ -933,13 +1147,16 @@ class ApiTrafficCaptureViewSet(viewsets.ModelViewSet):
                     start_time=timezone.now(),
                     end_time=timezone.now(),
                     duration_ms=0,
-                    entry_count=len(valuable_entries),
+                    entry_count=0,
                     status='READY',
                     tags=[]
                 )
-
-                for entry in filtered_entries:
-                    ApiTrafficEntry.objects.create(
+                entries = parse_service.iter_entries(f, file_format=capture.file_format)
+                batch = []
+                for entry in filter_service.iter_filtered(entries, stats):
+                    total_entries += 1
+                    valuable_count += bool(entry.get('is_valuable', True))
+                    batch.append(ApiTrafficEntry(
                         session=session,
                         request_method=entry.get('request_method') or 'GET',
                         request_url=entry.get('request_url') or '',
@@ -954,10 +1171,21 @@ class ApiTrafficCaptureViewSet(viewsets.ModelViewSet):
                         fingerprint=entry.get('fingerprint') or '',
                         is_valuable=entry.get('is_valuable', True),
                         filter_reason=entry.get('filter_reason', ''),
-                    )
-
-            capture.filtered_entries = len(valuable_entries)
-            capture.sessions_count = 1 if valuable_entries else 0
+                    ))
+                    if len(batch) >= batch_size:
+                        ApiTrafficEntry.objects.bulk_create(batch)
+                        batch = []
+                ApiTrafficEntry.objects.bulk_create(batch)
+
+                if valuable_count:
+                    session.entry_count = valuable_count
+                    session.save(update_fields=['entry_count'])
+                else:
+                    session.delete()
+
+            capture.total_entries = total_entries
+            capture.filtered_entries = valuable_count
+            capture.sessions_count = 1 if valuable_count else 0
             capture.status = 'PARSED'
             capture.processing_config.update({
                 'filter_stats': stats,
@@ -1008,7 +1236,7 @@ class ApiTrafficSessionViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=True, methods=['post'])
     def generate(self, request, pk=None):
         session = self.get_object()
-        entries = list(session.entries.all().order_by('created_time'))
+        entries = list(session.entries.all().order_by('created_time', 'id'))
         entry_dicts = [
             {
                 'request_method': entry.request_method,
@@ -1244,9 +1472,11 @@ class DashboardViewSet(viewsets.ViewSet):
     仪表盘视图集 -- 提供统计概览和多维度报告。
 
     支持按项目、集合、环境、负责人、模块和时间范围筛选。
+    概览、报告与结果列表的响应按项目数据版本缓存，见 services.dashboard_cache。
     """
     permission_classes = [permissions.IsAuthenticated]
 
+    @cache_dashboard_response
     def list(self, request):
         """
         获取仪表盘统计概览。
@@ -1351,32 +1581,19 @@ class DashboardViewSet(viewsets.ViewSet):
 
         stats.update(execution_stats)
 
-        # 测试结果统计（应用筛选条件）
-        result_queryset = ApiTestResult.objects.filter(execution__project__in=project_ids)
-
-        # 应用测试用例筛选
-        if test_case_filters:
-            result_queryset = result_queryset.filter(test_case__in=ApiTestCase.objects.filter(
-                project__in=project_ids, is_deleted=False, **test_case_filters
-            ))
-
-        result_stats = result_queryset.aggregate(
-            total_results=Count('id'),
-            passed_results=Count('id', filter=Q(status='PASSED')),
-            failed_results=Count('id', filter=Q(status='FAILED')),
-            skipped_results=Count('id', filter=Q(status='SKIPPED')),
-            error_results=Count('id', filter=Q(status='ERROR')),
+        # 测试结果统计（读取日汇总表，应用测试用例筛选条件）
+        result_stats = dashboard_rollup_service.summarize(
+            dashboard_rollup_service.filter_rollups(project_ids, **test_case_filters)
         )
 
-        stats.update(result_stats)
-
-        # 计算通过率
-        if stats['total_results'] > 0:
-            stats['pass_rate'] = round(
-                (stats['passed_results'] / stats['total_results']) * 100, 2
-            )
-        else:
-            stats['pass_rate'] = 0.0
+        stats.update({
+            'total_results': result_stats['total'],
+            'passed_results': result_stats['passed'],
+            'failed_results': result_stats['failed'],
+            'skipped_results': result_stats['skipped'],
+            'error_results': result_stats['error'],
+            'pass_rate': result_stats['pass_rate'],
+        })
 
         # 最近执行记录（最近10条）
         recent_executions = execution_queryset.select_related(
@@ -1404,7 +1621,7 @@ class DashboardViewSet(viewsets.ViewSet):
             'skipped_cases': stats.get('skipped_results', 0),
             'error_cases': stats.get('error_results', 0),
             'pass_rate': stats.get('pass_rate', 0.0),
-            'avg_response_time': 0  # 暂时设为0，可后续计算
+            'avg_response_time': result_stats['avg_response_time']
         }
 
         return Response({
@@ -1414,8 +1631,14 @@ class DashboardViewSet(viewsets.ViewSet):
         })
 
     @action(detail=False, methods=['get'])
+    @cache_dashboard_response
     def environment_reports(self, request):
-        """按环境维度统计测试执行结果，按执行次数降序排列。"""
+        """
+        按环境维度统计测试执行结果，按执行次数降序排列。
+
+        查询次数与环境数量无关：环境及其执行次数、最近执行ID一条分组查询，
+        结果统计从日汇总表一条分组查询，最近执行详情一条查询。
+        """
         user = request.user
 
         # 基础查询
@@ -1424,78 +1647,39 @@ class DashboardViewSet(viewsets.ViewSet):
         else:
             projects = ApiProject.objects.filter(owner=user, is_deleted=False)
 
-        # 获取有执行记录的环境
+        # 获取有执行记录的环境，同时统计执行次数和最近一次执行
         environments = ApiTestEnvironment.objects.filter(
             project__in=projects,
             is_deleted=False,
-            test_executions__isnull=False
-        ).distinct().select_related('project')
+        ).annotate(
+            total_executions=Count('test_executions'),
+            last_execution_id=Max('test_executions__id'),
+        ).filter(
+            total_executions__gt=0
+        ).select_related('project').order_by('-total_executions', 'id')
+        environments = list(environments)
+
+        # 各环境的结果统计
+        environment_stats = dashboard_rollup_service.summarize_by(
+            dashboard_rollup_service.filter_rollups(projects.values('id')),
+            ('environment_id',),
+        )
+        last_executions = self._get_executions(env.last_execution_id for env in environments)
 
-        # 为每个环境统计执行结果
-        environment_data = []
+        # 构建符合前端期望的响应结构
+        formatted_data = []
         for env in environments:
-            executions = ApiTestExecution.objects.filter(
-                environment=env,
-                project__in=projects
-            )
-
-            # 统计该环境的所有执行结果
-            results = ApiTestResult.objects.filter(
-                execution__in=executions
-            ).aggregate(
-                total=Count('id'),
-                passed=Count('id', filter=Q(status='PASSED')),
-                failed=Count('id', filter=Q(status='FAILED')),
-                skipped=Count('id', filter=Q(status='SKIPPED')),
-                error=Count('id', filter=Q(status='ERROR')),
-            )
-
-            # 计算通过率
-            if results['total'] > 0:
-                pass_rate = round((results['passed'] / results['total']) * 100, 2)
-            else:
-                pass_rate = 0.0
-
-            environment_data.append({
+            stats = environment_stats.get((env.id,), dashboard_rollup_service.empty_stats())
+            item = {
                 'environment_id': env.id,
                 'environment_name': env.name,
+                'project_id': env.project_id,
                 'project_name': env.project.name,
                 'base_url': env.base_url,
-                'total_executions': executions.count(),
-                'total_results': results['total'],
-                'passed': results['passed'],
-                'failed': results['failed'],
-                'skipped': results['skipped'],
-                'error': results['error'],
-                'pass_rate': pass_rate,
-            })
-
-        # 按执行次数降序排序
-        environment_data.sort(key=lambda x: x['total_executions'], reverse=True)
-
-        # 构建符合前端期望的响应结构
-        formatted_data = []
-        for item in environment_data:
-            formatted_data.append({
-                'environment_id': item['environment_id'],
-                'environment_name': item['environment_name'],
-                'project_id': 0,  # 需要从project_name获取
-                'project_name': item['project_name'],
-                'base_url': item['base_url'],
-                'execution_id': None,  # 可以从最新的执行记录获取
-                'execution_name': None,
-                'execution_status': None,
-                'stats': {
-                    'total': item['total_results'],
-                    'passed': item['passed'],
-                    'failed': item['failed'],
-                    'skipped': item['skipped'],
-                    'error': item['error'],
-                    'pass_rate': item['pass_rate']
-                },
-                'avg_response_time': 0,  # 可以计算平均响应时间
-                'last_execution_time': None
-            })
+                'total_executions': env.total_executions,
+            }
+            item.update(self._format_report_stats(stats, last_executions.get(env.last_execution_id)))
+            formatted_data.append(item)
 
         return Response({
             'results': formatted_data,
@@ -1503,8 +1687,14 @@ class DashboardViewSet(viewsets.ViewSet):
         })
 
     @action(detail=False, methods=['get'])
+    @cache_dashboard_response
     def collection_reports(self, request):
-        """按集合维度统计测试执行结果，按结果总数降序排列。"""
+        """
+        按集合维度统计测试执行结果，按结果总数降序排列。
+
+        查询次数与集合数量无关：结果统计与最近执行ID从日汇总表一条分组查询，
+        集合及其用例数一条查询，最近执行详情一条查询。
+        """
         user = request.user
 
         # 基础查询
@@ -1513,89 +1703,98 @@ class DashboardViewSet(viewsets.ViewSet):
         else:
             projects = ApiProject.objects.filter(owner=user, is_deleted=False)
 
-        # 获取有执行记录的集合
-        collection_ids = ApiTestResult.objects.filter(
-            execution__project__in=projects
-        ).values_list('test_case__collection_id', flat=True).distinct()
+        # 各集合的结果统计（有执行结果的集合）
+        collection_stats = dashboard_rollup_service.summarize_by(
+            dashboard_rollup_service.filter_rollups(projects.values('id')),
+            ('collection_id',),
+        )
 
         collections = ApiCollection.objects.filter(
-            id__in=collection_ids,
+            id__in=[key[0] for key in collection_stats if key[0] is not None],
             is_deleted=False
-        ).select_related('project')
+        ).select_related('project').annotate(
+            test_case_count=Count('test_cases', filter=Q(test_cases__is_deleted=False))
+        )
+        collections = sorted(
+            collections,
+            key=lambda collection: collection_stats[(collection.id,)]['total'],
+            reverse=True,
+        )
+        last_executions = self._get_executions(
+            collection_stats[(collection.id,)]['last_execution_id'] for collection in collections
+        )
 
-        # 为每个集合统计执行结果
-        collection_data = []
+        # 构建符合前端期望的响应结构
+        formatted_data = []
         for collection in collections:
-            # 获取集合的所有测试用例
-            test_cases = ApiTestCase.objects.filter(
-                collection=collection,
-                is_deleted=False
-            )
-
-            # 获取这些测试用例的执行结果
-            results = ApiTestResult.objects.filter(
-                test_case__in=test_cases,
-                execution__project__in=projects
-            ).aggregate(
-                total=Count('id'),
-                passed=Count('id', filter=Q(status='PASSED')),
-                failed=Count('id', filter=Q(status='FAILED')),
-                skipped=Count('id', filter=Q(status='SKIPPED')),
-                error=Count('id', filter=Q(status='ERROR')),
-            )
-
-            # 计算通过率
-            if results['total'] > 0:
-                pass_rate = round((results['passed'] / results['total']) * 100, 2)
-            else:
-                pass_rate = 0.0
-
-            collection_data.append({
+            stats = collection_stats[(collection.id,)]
+            item = {
                 'collection_id': collection.id,
                 'collection_name': collection.name,
+                'project_id': collection.project_id,
                 'project_name': collection.project.name,
-                'test_cases_count': test_cases.count(),
-                'total_results': results['total'],
-                'passed': results['passed'],
-                'failed': results['failed'],
-                'skipped': results['skipped'],
-                'error': results['error'],
-                'pass_rate': pass_rate,
-            })
-
-        # 按结果总数降序排序
-        collection_data.sort(key=lambda x: x['total_results'], reverse=True)
-
-        # 构建符合前端期望的响应结构
-        formatted_data = []
-        for item in collection_data:
-            formatted_data.append({
-                'collection_id': item['collection_id'],
-                'collection_name': item['collection_name'],
-                'project_id': 0,  # 需要从project_name获取
-                'project_name': item['project_name'],
-                'test_case_count': item['test_cases_count'],
-                'execution_id': None,
-                'execution_name': None,
-                'execution_status': None,
-                'stats': {
-                    'total': item['total_results'],
-                    'passed': item['passed'],
-                    'failed': item['failed'],
-                    'skipped': item['skipped'],
-                    'error': item['error'],
-                    'pass_rate': item['pass_rate']
-                },
-                'avg_response_time': 0,
-                'last_execution_time': None
-            })
+                'test_case_count': collection.test_case_count,
+            }
+            item.update(self._format_report_stats(
+                stats, last_executions.get(stats['last_execution_id'])
+            ))
+            formatted_data.append(item)
 
         return Response({
             'results': formatted_data,
             'count': len(formatted_data)
         })
 
+    @staticmethod
+    def _get_executions(execution_ids):
+        """
+        一条查询获取报告所需的最近执行记录。
+
+        参数:
+            execution_ids: 执行ID（可含 None）
+
+        返回:
+            {执行ID: ApiTestExecution}
+        """
+        return ApiTestExecution.objects.only(
+            'id', 'name', 'status', 'created_time'
+        ).in_bulk([execution_id for execution_id in execution_ids if execution_id])
+
+    @staticmethod
+    def _format_report_stats(stats, last_execution):
+        """
+        将汇总统计和最近执行整理为报告条目的公共字段。
+
+        参数:
+            stats: dashboard_rollup_service 返回的统计字典
+            last_execution: 最近执行记录，可为 None
+
+        返回:
+            包含 stats、响应时间与最近执行信息的字典
+        """
+        return {
+            'execution_id': last_execution.id if last_execution else None,
+            'execution_name': last_execution.name if last_execution else None,
+            'execution_status': last_execution.status if last_execution else None,
+            'stats': {
+                'total': stats['total'],
+                'passed': stats['passed'],
+                'failed': stats['failed'],
+                'skipped': stats['skipped'],
+                'error': stats['error'],
+                'pass_rate': stats['pass_rate']
+            },
+            'avg_response_time': stats['avg_response_time'],
+            'p50_response_time': stats['p50_response_time'],
+            'p90_response_time': stats['p90_response_time'],
+            'p95_response_time': stats['p95_response_time'],
+            'p99_response_time': stats['p99_response_time'],
+            'max_response_time': stats['max_response_time'],
+            'last_execution_time': last_execution.created_time if last_execution else None,
+        }
+
     @action(detail=False, methods=['get'])
+    @cache_dashboard_response
     def project_reports(self, request):
         """
         按项目维度统计测试执行结果。
@@ -1636,12 +1835,14 @@ class DashboardViewSet(viewsets.ViewSet):
 
         # 时间范围筛选
         date_filters = Q()
+        start_day = end_day = None
         if start_date:
             try:
                 start_datetime = timezone.make_aware(
                     timezone.datetime.strptime(start_date, '%Y-%m-%d').replace(hour=0, minute=0, second=0)
                 )
                 date_filters &= Q(created_time__gte=start_datetime)
+                start_day = start_datetime.date()
             except ValueError:
                 pass
 
@@ -1651,9 +1852,23 @@ class DashboardViewSet(viewsets.ViewSet):
                     timezone.datetime.strptime(end_date, '%Y-%m-%d').replace(hour=23, minute=59, second=59)
                 )
                 date_filters &= Q(created_time__lte=end_datetime)
+                end_day = end_datetime.date()
             except ValueError:
                 pass
 
+        # 结果统计读取日汇总表，一条查询得到所有项目的统计
+        project_stats = dashboard_rollup_service.summarize_by(
+            dashboard_rollup_service.filter_rollups(
+                project_ids,
+                collection_id=collection_id,
+                owner_id=owner_id,
+                module=module,
+                start_date=start_day,
+                end_date=end_day,
+            ),
+            ('project_id',),
+        )
+
         # 为每个项目统计执行结果
         project_data = []
         for project in projects:
@@ -1674,24 +1889,11 @@ class DashboardViewSet(viewsets.ViewSet):
             if executions.count() == 0:
                 continue
 
-            # 统计该项目的所有执行结果
-            results = ApiTestResult.objects.filter(
-                execution__in=executions,
-                test_case__in=test_cases
-            ).aggregate(
-                total=Count('id'),
-                passed=Count('id', filter=Q(status='PASSED')),
-                failed=Count('id', filter=Q(status='FAILED')),
-                skipped=Count('id', filter=Q(status='SKIPPED')),
-                error=Count('id', filter=Q(status='ERROR')),
+            # 该项目的执行结果统计
+            results = project_stats.get(
+                (project.id,), dashboard_rollup_service.empty_stats()
             )
 
-            # 计算通过率
-            if results['total'] > 0:
-                pass_rate = round((results['passed'] / results['total']) * 100, 2)
-            else:
-                pass_rate = 0.0
-
             # 获取最后执行时间
             last_execution = executions.order_by('-created_time').first()
             last_execution_time = last_execution.created_time if last_execution else None
@@ -1708,8 +1910,8 @@ class DashboardViewSet(viewsets.ViewSet):
                 'failed': results['failed'],
                 'skipped': results['skipped'],
                 'error': results['error'],
-                'pass_rate': pass_rate,
-                'avg_response_time': 0,  # 可后续计算
+                'pass_rate': results['pass_rate'],
+                'avg_response_time': results['avg_response_time'],
                 'last_execution_time': last_execution_time
             })
 
@@ -1742,12 +1944,15 @@ class DashboardViewSet(viewsets.ViewSet):
         })
 
     @action(detail=False, methods=['get'])
+    @cache_dashboard_response
     def test_results(self, request):
         """
         获取测试结果详情列表（分页）。
 
         支持筛选参数: environment_id, collection_id, project_id, owner_id,
                       module, status, start_date, end_date
+        分页方式: 默认 page/page_size 页码分页；传入 cursor（首页为空值）时
+                  按 (start_time, id) 键集分页，返回 next_cursor 而不统计总数
         """
         user = request.user
 
@@ -1775,7 +1980,7 @@ class DashboardViewSet(viewsets.ViewSet):
             execution__project__in=projects
         ).select_related(
             'execution', 'test_case', 'test_case__collection'
-        )
+        ).defer(*ApiTestResult.LIST_DEFERRED_FIELDS)
 
         # 应用筛选参数
         if environment_id:
@@ -1815,7 +2020,23 @@ class DashboardViewSet(viewsets.ViewSet):
             except ValueError:
                 pass
 
-        # 分页
+        # 键集分页
+        if 'cursor' in request.query_params:
+            paginator = StartTimeKeysetPagination()
+            page_size = paginator.get_keyset_page_size(request)
+            try:
+                results, next_cursor = paginator.paginate_keyset(
+                    queryset, request.query_params.get('cursor'), page_size
+                )
+            except ValueError as e:
+                return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({
+                'results': ApiTestResultSerializer(results, many=True).data,
+                'next_cursor': next_cursor,
+                'page_size': page_size,
+            })
+
+        # 页码分页
         page = self.request.query_params.get('page', 1)
         page_size = self.request.query_params.get('page_size', 20)
 
@@ -1840,6 +2061,85 @@ class DashboardViewSet(viewsets.ViewSet):
             'total_pages': total_pages
         })
 
+    @action(detail=False, methods=['get'])
+    def archived_trends(self, request):
+        """
+        按天统计已归档（已从数据库清理）的测试结果，用于历史趋势报告。
+
+        不按用例筛选时直接读取归档清单中的统计，无需解压数据文件。
+
+        支持筛选参数: project_id, start_date, end_date, status（逗号分隔）,
+                      test_case_id（逗号分隔）
+        """
+        filters = self._get_archive_filters(request)
+        return Response({
+            'results': cold_archive.daily_summary(**filters),
+        })
+
+    @action(detail=False, methods=['get'])
+    def archived_results(self, request):
+        """
+        查询已归档的测试结果（只读，按项目、日期、主键顺序返回前 limit 条）。
+
+        归档按需流式解压，取满 limit 条后即停止读取。
+
+        支持筛选参数: project_id, start_date, end_date, status（逗号分隔）,
+                      test_case_id（逗号分隔）, limit（默认100，最大1000）
+        """
+        filters = self._get_archive_filters(request)
+        try:
+            limit = min(1000, max(1, int(request.query_params.get('limit', 100))))
+        except ValueError:
+            limit = 100
+
+        results = list(itertools.islice(
+            cold_archive.scan(KIND_RESULTS, **filters), limit
+        ))
+        return Response({
+            'results': results,
+            'count': len(results),
+            'limit': limit,
+        })
+
+    @staticmethod
+    def _get_archive_filters(request):
+        """
+        解析归档查询的筛选参数，项目范围限定为当前用户可见的项目。
+
+        参数:
+            request: DRF 请求
+
+        返回:
+            cold_archive 查询方法的关键字参数
+        """
+        user = request.user
+        if user.is_superuser:
+            projects = ApiProject.objects.filter(is_deleted=False)
+        else:
+            projects = ApiProject.objects.filter(owner=user, is_deleted=False)
+
+        project_id = request.query_params.get('project_id')
+        if project_id:
+            projects = projects.filter(id=project_id)
+
+        def parse_date(value):
+            try:
+                return timezone.datetime.strptime(value, '%Y-%m-%d').date() if value else None
+            except ValueError:
+                return None
+
+        def parse_list(value):
+            return [item.strip() for item in value.split(',') if item.strip()] if value else None
+
+        test_case_ids = parse_list(request.query_params.get('test_case_id'))
+        return {
+            'project_ids': list(projects.values_list('id', flat=True)),
+            'start_date': parse_date(request.query_params.get('start_date')),
+            'end_date': parse_date(request.query_params.get('end_date')),
+            'statuses': parse_list(request.query_params.get('status')),
+            'test_case_ids': [int(value) for value in test_case_ids if value.isdigit()] if test_case_ids else None,
+        }
+
     @action(detail=False, methods=['post'])
     def retry_failed(self, request):
         """
@@ -2006,9 +2306,21 @@ class ApiTestCaseAssertionViewSet(viewsets.ModelViewSet):
         """创建时自动从 URL 参数中设置 test_case 关联。"""
         test_case_id = self.kwargs.get('test_case_id')
         if test_case_id:
-            serializer.save(test_case_id=test_case_id)
+            assertion = serializer.save(test_case_id=test_case_id)
         else:
-            serializer.save()
+            assertion = serializer.save()
+        touch_test_case(assertion.test_case_id)
+
+    def perform_update(self, serializer):
+        """更新断言后刷新所属用例的版本，使断言计划缓存失效。"""
+        assertion = serializer.save()
+        touch_test_case(assertion.test_case_id)
+
+    def perform_destroy(self, instance):
+        """删除断言后刷新所属用例的版本，使断言计划缓存失效。"""
+        test_case_id = instance.test_case_id
+        instance.delete()
+        touch_test_case(test_case_id)
 
     @action(detail=False, methods=['post'])
     def batch_update(self, request):
@@ -2082,6 +2394,9 @@ class ApiTestCaseAssertionViewSet(viewsets.ModelViewSet):
             return Response({
                 'error': f'批量操作失败: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        finally:
+            # 断言配置变更后刷新所属用例的版本，使断言计划缓存失效
+            touch_test_case(test_case_id)
 
 
 @method_decorator(csrf_exempt, name='dispatch')
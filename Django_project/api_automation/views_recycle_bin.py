@@ -42,19 +42,26 @@ class RecycleBinViewSet(viewsets.ViewSet):
             search    -- 搜索关键词
             page      -- 页码（默认 1）
             page_size -- 每页数量（默认 20）
+            cursor    -- 游标分页：首页传空值，之后传上一页返回的 next_cursor，
+                         传入时忽略 page，响应不含总数
         """
         item_type = request.query_params.get('type', '').lower()
         search = request.query_params.get('search', '')
         page = int(request.query_params.get('page', 1))
         page_size = int(request.query_params.get('page_size', 20))
+        cursor = request.query_params.get('cursor')
 
-        result = recycle_bin_service.get_deleted_items(
-            item_type=item_type if item_type else None,
-            user=request.user,
-            search=search if search else None,
-            page=page,
-            page_size=page_size
-        )
+        try:
+            result = recycle_bin_service.get_deleted_items(
+                item_type=item_type if item_type else None,
+                user=request.user,
+                search=search if search else None,
+                page=page,
+                page_size=page_size,
+                cursor=cursor
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response(result)
 
@@ -0,0 +1,28 @@
+"""
+跨应用共享的查询工具
+
+供 api_automation 与 ui_automation 的序列化器共用。
+"""
+
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(queryset, field):
+    """
+    相关子查询：统计 queryset 中 field 指向外层行的记录数。
+
+    与 JOIN + GROUP BY 计数相比，多个一对多关系各自计数时行数不会相乘，
+    外层查询也不会因分组而丢失模型默认排序。
+
+    Args:
+        queryset: 被统计的查询集
+        field: 指向外层模型的外键字段名
+
+    Returns:
+        可用于 annotate 的表达式，无记录时为 0
+    """
+    counts = queryset.filter(
+        **{field: OuterRef('pk')}
+    ).order_by().values(field).annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
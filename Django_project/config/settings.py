@@ -314,6 +314,88 @@ LOGGING = {
     },
 }
 
+# ============================================================
+# API 自动化执行引擎配置
+# ============================================================
+
+# 批量执行的最大并发用例数（1 表示按顺序逐条执行）
+API_BATCH_MAX_WORKERS = int(os.environ.get('API_BATCH_MAX_WORKERS', 1))
+
+# 批量执行时测试结果批量写入（bulk_create）的块大小
+API_BATCH_RESULT_CHUNK_SIZE = int(os.environ.get('API_BATCH_RESULT_CHUNK_SIZE', 50))
+
+# 批量执行中单个HTTP请求的超时（秒）；取消执行时被放弃的在途请求最迟在该时间后结束并释放连接
+API_BATCH_REQUEST_TIMEOUT = int(os.environ.get('API_BATCH_REQUEST_TIMEOUT', 30))
+
+# 异步HTTP执行器连接池的最大连接数
+API_ASYNC_MAX_CONNECTIONS = int(os.environ.get('API_ASYNC_MAX_CONNECTIONS', 100))
+
+# HTTP执行器 /batch/ 端点允许的最大并发数
+API_HTTP_BATCH_MAX_CONCURRENCY = int(os.environ.get('API_HTTP_BATCH_MAX_CONCURRENCY', 20))
+
+# /batch/ 并发执行时是否使用异步HTTP执行器（需要安装 httpx，未安装时自动使用线程池）
+API_HTTP_BATCH_ASYNC_ENABLED = os.environ.get('API_HTTP_BATCH_ASYNC_ENABLED', '1') == '1'
+
+# 进程级共享连接池：单个目标地址的最大连接数、空闲回收时间（秒）
+API_HTTP_POOL_SIZE = int(os.environ.get('API_HTTP_POOL_SIZE', 10))
+API_HTTP_POOL_IDLE_TIMEOUT = int(os.environ.get('API_HTTP_POOL_IDLE_TIMEOUT', 300))
+
+# 测试用例请求模板编译缓存的最大用例数
+API_REQUEST_TEMPLATE_CACHE_SIZE = int(os.environ.get('API_REQUEST_TEMPLATE_CACHE_SIZE', 1024))
+
+# JSONPath 编译结果LRU缓存的最大表达式数
+API_JSONPATH_CACHE_SIZE = int(os.environ.get('API_JSONPATH_CACHE_SIZE', 2048))
+
+# 测试用例断言计划缓存的最大用例数
+API_ASSERTION_PLAN_CACHE_SIZE = int(os.environ.get('API_ASSERTION_PLAN_CACHE_SIZE', 1024))
+
+# 批量执行任务队列：为 1 时视图只入队，由 run_execution_worker 工作进程执行；为 0（默认）时在请求线程内同步执行。
+# 开启前必须部署 python manage.py run_execution_worker，否则执行记录会一直停留在 PENDING
+API_EXECUTION_QUEUE_ENABLED = os.environ.get('API_EXECUTION_QUEUE_ENABLED', '0') == '1'
+
+# 执行队列工作进程数、每个进程的工作线程数、队列为空时的轮询间隔（秒）
+API_EXECUTION_WORKER_PROCESSES = int(os.environ.get('API_EXECUTION_WORKER_PROCESSES', 1))
+API_EXECUTION_WORKER_THREADS = int(os.environ.get('API_EXECUTION_WORKER_THREADS', 2))
+API_EXECUTION_QUEUE_POLL_INTERVAL = int(os.environ.get('API_EXECUTION_QUEUE_POLL_INTERVAL', 2))
+
+# 执行任务租约时长（秒，心跳间隔为其 1/3）、单项目最大并发任务数、崩溃恢复的最大尝试次数
+API_EXECUTION_LEASE_SECONDS = int(os.environ.get('API_EXECUTION_LEASE_SECONDS', 60))
+API_EXECUTION_PROJECT_CONCURRENCY = int(os.environ.get('API_EXECUTION_PROJECT_CONCURRENCY', 2))
+API_EXECUTION_MAX_ATTEMPTS = int(os.environ.get('API_EXECUTION_MAX_ATTEMPTS', 3))
+
+# 运行中执行检查数据库取消状态的间隔（秒，每个进程一条批量查询，与用例数无关）
+API_EXECUTION_CANCEL_CHECK_INTERVAL = int(os.environ.get('API_EXECUTION_CANCEL_CHECK_INTERVAL', 2))
+
+# WebSocket 执行进度广播：每秒最多刷新次数、单条批量结果消息包含的最大结果数
+API_WS_MESSAGES_PER_SECOND = int(os.environ.get('API_WS_MESSAGES_PER_SECOND', 4))
+API_WS_RESULT_BATCH_SIZE = int(os.environ.get('API_WS_RESULT_BATCH_SIZE', 200))
+
+# 仪表盘日汇总：回填时每批处理的执行数
+API_DASHBOARD_ROLLUP_BATCH_SIZE = int(os.environ.get('API_DASHBOARD_ROLLUP_BATCH_SIZE', 500))
+
+# 仪表盘响应缓存：是否启用、使用的缓存别名（CACHES 中的本地内存或文件缓存）、过期秒数
+API_DASHBOARD_CACHE_ENABLED = os.environ.get('API_DASHBOARD_CACHE_ENABLED', '1') == '1'
+API_DASHBOARD_CACHE_ALIAS = os.environ.get('API_DASHBOARD_CACHE_ALIAS', 'default')
+API_DASHBOARD_CACHE_TIMEOUT = int(os.environ.get('API_DASHBOARD_CACHE_TIMEOUT', 60))
+
+# 请求/响应体内容存储：zlib 压缩级别（0-9）、进程内解压内容缓存的最大字节数
+API_BLOB_COMPRESS_LEVEL = int(os.environ.get('API_BLOB_COMPRESS_LEVEL', 6))
+API_BLOB_CACHE_BYTES = int(os.environ.get('API_BLOB_CACHE_BYTES', 32 * 1024 * 1024))
+
+# 过期数据清理：每批删除的行数、批间休眠毫秒数
+API_CLEANUP_BATCH_SIZE = int(os.environ.get('API_CLEANUP_BATCH_SIZE', 1000))
+API_CLEANUP_SLEEP_MS = int(os.environ.get('API_CLEANUP_SLEEP_MS', 100))
+
+# 冷归档：清理前是否将过期结果导出为压缩文件、归档根目录、压缩级别
+API_ARCHIVE_ENABLED = os.environ.get('API_ARCHIVE_ENABLED', '1') == '1'
+API_ARCHIVE_ROOT = os.environ.get('API_ARCHIVE_ROOT', str(BASE_DIR / 'archives'))
+API_ARCHIVE_COMPRESS_LEVEL = int(os.environ.get('API_ARCHIVE_COMPRESS_LEVEL', 6))
+
+# 流量录制：上传文件的保存目录、最大字节数（文件按块落盘并流式解析）、解析时每批写入的 entry 数
+API_TRAFFIC_UPLOAD_ROOT = os.environ.get('API_TRAFFIC_UPLOAD_ROOT', str(BASE_DIR / 'uploads' / 'traffic'))
+API_TRAFFIC_MAX_UPLOAD_SIZE = int(os.environ.get('API_TRAFFIC_MAX_UPLOAD_SIZE', 1024 * 1024 * 1024))
+API_TRAFFIC_PARSE_BATCH_SIZE = int(os.environ.get('API_TRAFFIC_PARSE_BATCH_SIZE', 500))
+
 # ============================================================
 # Swagger / OpenAPI 文档配置
 # ============================================================
@@ -21,8 +21,11 @@ UI 自动化测试模块 - API 序列化器
 
 import json
 
+from django.db.models import OuterRef, Subquery
 from rest_framework import serializers
 
+from config.query_utils import count_subquery
+
 from .models import UiTestProject, UiTestCase, UiTestExecution, UiTestReport, UiScreenshot
 
 
@@ -109,9 +112,21 @@ class UiTestProjectSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['created_by', 'created_at', 'updated_at']
 
+    @staticmethod
+    def annotate_queryset(queryset):
+        """为查询集附加创建人和用例数量，列表序列化时不再逐行查询。"""
+        return queryset.select_related('created_by').annotate(
+            test_cases_count=count_subquery(
+                UiTestCase.objects.filter(is_deleted=False), 'project'
+            )
+        )
+
     def get_test_cases_count(self, obj):
-        """获取项目下未删除的测试用例数量。"""
-        return obj.test_cases.filter(is_deleted=False).count()
+        """获取项目下未删除的测试用例数量（优先读取查询集注解）。"""
+        count = getattr(obj, 'test_cases_count', None)
+        if count is None:
+            count = obj.test_cases.filter(is_deleted=False).count()
+        return count
 
 
 class UiTestProjectDetailSerializer(UiTestProjectSerializer):
@@ -128,7 +143,9 @@ class UiTestProjectDetailSerializer(UiTestProjectSerializer):
 
     def get_test_cases(self, obj):
         """获取项目下最近 10 条未删除的测试用例列表。"""
-        cases = obj.test_cases.filter(is_deleted=False)[:10]
+        cases = UiTestCaseListSerializer.annotate_queryset(
+            obj.test_cases.filter(is_deleted=False)
+        )[:10]
         return UiTestCaseListSerializer(cases, many=True).data
 
 
@@ -209,12 +226,37 @@ class UiTestCaseListSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
 
+    @staticmethod
+    def annotate_queryset(queryset):
+        """
+        为查询集附加项目、执行次数和最近一次执行的状态/时间，
+        列表序列化时不再逐行查询执行记录。
+        """
+        latest = UiTestExecution.objects.filter(
+            test_case=OuterRef('pk')
+        ).order_by('-created_at', '-pk')
+        return queryset.select_related('project').annotate(
+            execution_count=count_subquery(UiTestExecution.objects.all(), 'test_case'),
+            latest_execution_status=Subquery(latest.values('status')[:1]),
+            latest_execution_created_at=Subquery(latest.values('created_at')[:1]),
+        )
+
     def get_execution_count(self, obj):
-        """获取该用例的总执行次数。"""
-        return obj.executions.count()
+        """获取该用例的总执行次数（优先读取查询集注解）。"""
+        count = getattr(obj, 'execution_count', None)
+        if count is None:
+            count = obj.executions.count()
+        return count
 
     def get_last_execution_status(self, obj):
         """获取最近一次执行的状态和时间，无执行记录时返回 None。"""
+        if hasattr(obj, 'latest_execution_status'):
+            if obj.latest_execution_status is None:
+                return None
+            return {
+                'status': obj.latest_execution_status,
+                'created_at': obj.latest_execution_created_at,
+            }
         last_execution = obj.executions.order_by('-created_at').first()
         if last_execution:
             return {
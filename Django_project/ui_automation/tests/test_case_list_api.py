@@ -0,0 +1,75 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from ui_automation.models import UiTestCase, UiTestExecution, UiTestProject
+
+
+class UiTestCaseListApiTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='ui_lister', password='pwd12345')
+        self.client.force_authenticate(user=self.user)
+
+        self.project = UiTestProject.objects.create(
+            name='UI项目',
+            description='',
+            base_url='https://example.com',
+            created_by=self.user,
+        )
+
+    def _create_case(self, name, statuses=()):
+        test_case = UiTestCase.objects.create(
+            project=self.project,
+            name=name,
+            natural_language_task='打开页面',
+        )
+        for offset, status in enumerate(statuses):
+            execution = UiTestExecution.objects.create(
+                project=self.project,
+                test_case=test_case,
+                status=status,
+                executed_by=self.user,
+            )
+            UiTestExecution.objects.filter(pk=execution.pk).update(
+                created_at=timezone.now() + timedelta(minutes=offset)
+            )
+        return test_case
+
+    def _get(self, path):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        return (data['results'] if isinstance(data, dict) else data), len(queries)
+
+    def test_case_list_reads_annotated_execution_stats(self):
+        self._create_case('无执行')
+        self._create_case('两次执行', ['failed', 'passed'])
+
+        results, single_queries = self._get('/api/v1/ui-automation/test-cases/')
+        by_name = {item['name']: item for item in results}
+        self.assertEqual(by_name['无执行']['execution_count'], 0)
+        self.assertIsNone(by_name['无执行']['last_execution_status'])
+        self.assertEqual(by_name['两次执行']['execution_count'], 2)
+        self.assertEqual(by_name['两次执行']['last_execution_status']['status'], 'passed')
+
+        for index in range(4):
+            self._create_case(f'用例{index}', ['error'])
+        results, queries = self._get('/api/v1/ui-automation/test-cases/')
+        self.assertEqual(len(results), 6)
+        self.assertEqual(queries, single_queries)
+
+    def test_project_list_counts_undeleted_cases(self):
+        self._create_case('用例A')
+        self._create_case('用例B')
+        UiTestCase.objects.filter(name='用例B').update(is_deleted=True)
+
+        results, _ = self._get('/api/v1/ui-automation/projects/')
+        self.assertEqual(results[0]['test_cases_count'], 1)
+        self.assertEqual(results[0]['created_by_name'], 'ui_lister')
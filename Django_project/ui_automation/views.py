@@ -273,10 +273,10 @@ class UiTestProjectViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         """获取当前用户创建的、未软删除的项目查询集。"""
-        return UiTestProject.objects.filter(
+        return UiTestProjectSerializer.annotate_queryset(UiTestProject.objects.filter(
             created_by=self.request.user,
             is_deleted=False
-        )
+        ))
 
     def get_serializer_class(self):
         """详情页使用包含用例列表的详情序列化器，其他操作使用基础序列化器。"""
@@ -297,7 +297,9 @@ class UiTestProjectViewSet(viewsets.ModelViewSet):
     def test_cases(self, request, pk=None):
         """获取项目下所有未删除的测试用例列表。"""
         project = self.get_object()
-        test_cases = project.test_cases.filter(is_deleted=False)
+        test_cases = UiTestCaseListSerializer.annotate_queryset(
+            project.test_cases.filter(is_deleted=False)
+        )
         serializer = UiTestCaseListSerializer(test_cases, many=True)
         return Response(serializer.data)
 
@@ -371,11 +373,14 @@ class UiTestCaseViewSet(viewsets.ModelViewSet):
     ordering = ['-created_at']
 
     def get_queryset(self):
-        """获取当前用户项目下的、未软删除的用例查询集（预加载项目信息）。"""
-        return UiTestCase.objects.filter(
+        """获取当前用户项目下的、未软删除的用例查询集（预加载项目信息，列表附加执行统计）。"""
+        queryset = UiTestCase.objects.filter(
             project__created_by=self.request.user,
             is_deleted=False
         ).select_related('project')
+        if self.action == 'list':
+            queryset = UiTestCaseListSerializer.annotate_queryset(queryset)
+        return queryset
 
     def get_serializer_class(self):
         """列表使用精简序列化器，详情使用含执行记录的序列化器，其他使用完整序列化器。"""
@@ -22,6 +22,19 @@ export const executionApi = {
     return http.get<ApiTestExecution>(`${API_URL}/executions/${id}/`)
   },
 
+  /** 分页获取执行下的测试结果（精简字段，include 指定需要的大字段） */
+  getExecutionResults(id: number, params?: {
+    status?: string
+    include?: string
+    cursor?: string
+    page?: number
+    page_size?: number
+  }) {
+    return http.get<{ results: any[], count?: number, next_cursor?: string | null }>(
+      `${API_URL}/executions/${id}/results/`, params
+    )
+  },
+
   /** 创建新的执行任务 */
   createExecution(data: any) {
     return http.post<ApiTestExecution>(`${API_URL}/executions/`, data)
@@ -32,10 +32,12 @@ export interface RecycleBinStats {
 /** 回收站列表的分页响应 */
 export interface RecycleBinListResponse {
   results: RecycleBinItem[]
-  count: number
+  count?: number
   page?: number
   page_size?: number
   total_pages?: number
+  /** 游标分页时下一页的游标，没有更多数据时为 null */
+  next_cursor?: string | null
 }
 
 /** 级联删除预览响应（展示删除目标及其关联数据） */
@@ -64,6 +66,7 @@ export const recycleBinApi = {
     search?: string
     page?: number
     page_size?: number
+    cursor?: string
   }) {
     return http.get<RecycleBinListResponse>(`${API_URL}/recycle-bin/`, params)
   },
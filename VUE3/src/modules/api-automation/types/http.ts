@@ -338,6 +338,8 @@ export interface HttpExecutionRecordListResponse {
   next: string | null
   previous: string | null
   results: HttpExecutionRecord[]
+  /** 游标分页（请求携带 cursor）时的下一页游标，此时不返回 count/next/previous */
+  next_cursor?: string | null
 }
 
 /** 执行记录汇总统计 */
@@ -354,6 +356,8 @@ export interface HttpExecutionRecordStatistics {
 export interface HttpExecutionRecordQuery {
   page?: number
   page_size?: number
+  /** 游标分页：首页传空串，之后传上一页的 next_cursor */
+  cursor?: string
   test_case?: number
   execution?: number
   project?: number